@@ -13,6 +13,11 @@ from dataclasses import dataclass
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import safe_yaml  # noqa: E402
+
 APP_CONTAINER_NAMES = {"tokenplace": {"tokenplace", "relay"}}
 REQUIRED_ENVS = {
     "tokenplace": [
@@ -83,37 +88,12 @@ class ReleaseInputs:
 
 
 def safe_yaml_documents(text: str) -> list[object]:
-    """Parse JSON-compatible YAML via Psych's AST, rejecting tags and aliases."""
-    ruby = r"""
-require "psych"
-require "json"
-scanner = Psych::ScalarScanner.new(Psych::ClassLoader::Restricted.new([], []))
-def convert(node, scanner)
-  case node
-  when Psych::Nodes::Stream then node.children.map { |child| convert(child, scanner) }
-  when Psych::Nodes::Document then convert(node.root, scanner)
-  when Psych::Nodes::Mapping
-    Hash[*node.children.map { |child| convert(child, scanner) }]
-  when Psych::Nodes::Sequence then node.children.map { |child| convert(child, scanner) }
-  when Psych::Nodes::Scalar
-    raise "unsafe YAML tag #{node.tag}" if node.tag && !node.tag.start_with?("tag:yaml.org,2002:")
-    node.quoted ? node.value : scanner.tokenize(node.value)
-  when Psych::Nodes::Alias then raise "YAML aliases are not allowed"
-  else raise "unsupported YAML node #{node.class}"
-  end
-end
-puts JSON.generate(convert(Psych.parse_stream(STDIN.read), scanner))
-"""
-    try:
-        parsed = subprocess.run(
-            ["ruby", "-e", ruby], input=text, capture_output=True, text=True, check=False
-        )
-    except OSError as error:
-        raise ValueError(f"YAML parser launch failed: {error}") from error
-    if parsed.returncode != 0:
-        raise ValueError((parsed.stderr or "invalid YAML").strip())
-    value = json.loads(parsed.stdout)
-    return value if isinstance(value, list) else []
+    """Parse JSON-compatible YAML via Psych's AST, rejecting tags and aliases.
+
+    Parsing goes through the shared `safe_yaml` worker, so one Ruby process serves
+    every guardrail in a run and identical documents are parsed only once.
+    """
+    return safe_yaml.safe_yaml_documents(text)
 
 
 def nested_value(document: object, path: tuple[str, ...]) -> tuple[bool, object]:
@@ -237,9 +217,90 @@ def dspace_production_metrics_token_is_unsafe(
     return has_unsafe_token(document)
 
 
-def validate_rendered_manifest(manifest: str, inputs: ReleaseInputs) -> list[str]:
+WORKLOAD_KINDS = ("Deployment", "StatefulSet", "DaemonSet")
+
+
+class RenderedManifest:
+    """One parse of `helm template` output, indexed for the render guardrails.
+
+    Objects are indexed by kind, so each guardrail looks objects up instead of
+    rescanning every document. Release association is computed once per
+    ``(release, allow_name)`` and shared by every validator given the index.
+    """
+
+    def __init__(self, documents: list[object]) -> None:
+        self.documents = documents
+        self.objects: list[dict[str, object]] = [doc for doc in documents if isinstance(doc, dict)]
+        self.by_kind: dict[str, list[dict[str, object]]] = {}
+        self._associated: dict[tuple[str, bool], dict[int, bool]] = {}
+        self._ids = {id(doc) for doc in self.objects}
+        for document in self.objects:
+            self.by_kind.setdefault(scalar(document.get("kind")), []).append(document)
+
+    @classmethod
+    def parse(cls, manifest: str) -> RenderedManifest:
+        return cls(safe_yaml_documents(manifest))
+
+    def kind(self, *kinds: str) -> list[dict[str, object]]:
+        """Return objects of the given kinds in render order."""
+        if len(kinds) == 1:
+            return list(self.by_kind.get(kinds[0], []))
+        wanted = set(kinds)
+        return [doc for doc in self.objects if scalar(doc.get("kind")) in wanted]
+
+    def associated(
+        self, document: dict[str, object], release: str, *, allow_name: bool = True
+    ) -> bool:
+        """Return `release_associated` for ``document``, memoized for indexed objects."""
+        if id(document) not in self._ids:
+            return release_associated(document, release, allow_name=allow_name)
+        cache = self._associated.setdefault((release, allow_name), {})
+        if id(document) not in cache:
+            cache[id(document)] = release_associated(document, release, allow_name=allow_name)
+        return cache[id(document)]
+
+    def release_objects(
+        self, release: str, *kinds: str, allow_name: bool = False
+    ) -> list[dict[str, object]]:
+        """Return objects of ``kinds`` associated with ``release`` in render order."""
+        return [
+            doc for doc in self.kind(*kinds) if self.associated(doc, release, allow_name=allow_name)
+        ]
+
+    @staticmethod
+    def containers(document: dict[str, object], names: set[str]) -> list[dict[str, object]]:
+        """Return the pod template containers of ``document`` named in ``names``."""
+        found, containers = nested_value(document, ("spec", "template", "spec", "containers"))
+        if not found or not isinstance(containers, list):
+            return []
+        return [
+            item
+            for item in containers
+            if isinstance(item, dict) and scalar(item.get("name")) in names
+        ]
+
+    @staticmethod
+    def env_names(container: dict[str, object]) -> set[str]:
+        envs = container.get("env")
+        if not isinstance(envs, list):
+            return set()
+        return {
+            scalar(item.get("name"))
+            for item in envs
+            if isinstance(item, dict) and scalar(item.get("name"))
+        }
+
+
+def rendered_manifest(manifest: str | RenderedManifest) -> RenderedManifest:
+    """Return ``manifest`` as an index, parsing rendered text when necessary."""
+    return manifest if isinstance(manifest, RenderedManifest) else RenderedManifest.parse(manifest)
+
+
+def validate_rendered_manifest(
+    manifest: str | RenderedManifest, inputs: ReleaseInputs
+) -> list[str]:
     try:
-        documents = safe_yaml_documents(manifest)
+        rendered = rendered_manifest(manifest)
     except (ValueError, json.JSONDecodeError) as error:
         return [f"rendered output is not safe structural YAML: {error}"]
     workloads: list[tuple[str, str]] = []
@@ -251,23 +312,15 @@ def validate_rendered_manifest(manifest: str, inputs: ReleaseInputs) -> list[str
     errors: list[str] = []
     coherent_workload = False
     intended_container_found = False
-    for document in documents:
-        if not isinstance(document, dict):
-            continue
+    for document in rendered.objects:
         kind = scalar(document.get("kind"))
         metadata = document.get("metadata") if isinstance(document.get("metadata"), dict) else {}
         name = scalar(metadata.get("name"))
         namespace = scalar(metadata.get("namespace"))
-        labels = metadata.get("labels") if isinstance(metadata.get("labels"), dict) else {}
-        annotations = (
-            metadata.get("annotations") if isinstance(metadata.get("annotations"), dict) else {}
-        )
-        associated = release_associated(
+        associated = rendered.associated(
             document,
             inputs.release,
-            allow_name=(
-                inputs.app != "dspace" and kind not in {"Deployment", "StatefulSet", "DaemonSet"}
-            ),
+            allow_name=inputs.app != "dspace" and kind not in WORKLOAD_KINDS,
         )
         if inputs.app == "dspace" and kind == "Secret":
             errors.append(
@@ -277,23 +330,12 @@ def validate_rendered_manifest(manifest: str, inputs: ReleaseInputs) -> list[str
             errors.append(
                 f"rendered {kind or 'resource'} {name or '<unnamed>'} has namespace {namespace!r}"
             )
-        if kind in {"Deployment", "StatefulSet", "DaemonSet"}:
+        if kind in WORKLOAD_KINDS:
             workloads.append((kind, name))
             coherent = associated
             coherent_workload = coherent_workload or coherent
             if coherent:
-                found, containers = nested_value(
-                    document, ("spec", "template", "spec", "containers")
-                )
-                intended = (
-                    [
-                        item
-                        for item in containers
-                        if isinstance(item, dict) and scalar(item.get("name")) in candidates
-                    ]
-                    if found and isinstance(containers, list)
-                    else []
-                )
+                intended = RenderedManifest.containers(document, candidates)
                 intended_container_found = intended_container_found or bool(intended)
                 for item in intended:
                     if not scalar(item.get("image")).endswith(expected_suffix):
@@ -320,12 +362,7 @@ def validate_rendered_manifest(manifest: str, inputs: ReleaseInputs) -> list[str
         errors.append(f"no Ingress rule exactly matches expected host {inputs.host!r}")
     if inputs.app == "dspace":
         for required in ("Deployment", "Service"):
-            if not any(
-                isinstance(doc, dict)
-                and scalar(doc.get("kind")) == required
-                and release_associated(doc, inputs.release, allow_name=False)
-                for doc in documents
-            ):
+            if not rendered.release_objects(inputs.release, required):
                 errors.append(f"DSPACE intended {required} did not render")
         if inputs.host and not ingress_hosts:
             errors.append("DSPACE intended Ingress did not render")
@@ -355,29 +392,24 @@ def validate_rendered_manifest(manifest: str, inputs: ReleaseInputs) -> list[str
         )
         if inputs.env == "prod":
             unsafe = any(
-                isinstance(doc, dict)
-                and (
-                    contains_exact_scalar(doc, production_leaks)
-                    or (
-                        contains_exact_scalar(doc, {"METRICS_TOKEN"})
-                        and not release_associated(doc, inputs.release, allow_name=False)
-                    )
-                    or (
-                        release_associated(doc, inputs.release, allow_name=False)
-                        and dspace_production_metrics_token_is_unsafe(
-                            doc, inputs, metrics_enabled=metrics_enabled
-                        )
+                contains_exact_scalar(doc, production_leaks)
+                or (
+                    contains_exact_scalar(doc, {"METRICS_TOKEN"})
+                    and not rendered.associated(doc, inputs.release, allow_name=False)
+                )
+                or (
+                    rendered.associated(doc, inputs.release, allow_name=False)
+                    and dspace_production_metrics_token_is_unsafe(
+                        doc, inputs, metrics_enabled=metrics_enabled
                     )
                 )
-                for doc in documents
+                for doc in rendered.objects
             )
             if metrics_enabled:
                 token_entries: list[object] = []
-                for document in documents:
-                    if not isinstance(document, dict):
-                        continue
-                    if scalar(document.get("kind")) == "Secret":
-                        unsafe = True
+                if rendered.by_kind.get("Secret"):
+                    unsafe = True
+                for document in rendered.objects:
                     found, containers = nested_value(
                         document, ("spec", "template", "spec", "containers")
                     )
@@ -514,48 +546,20 @@ def is_prerelease(v: str) -> bool:
 
 
 def deployment_app_container_env_sets(
-    manifest: str, app: str, release: str
+    manifest: str | RenderedManifest, app: str, release: str
 ) -> list[tuple[str, set[str]]]:
     """Return env var names for each candidate Deployment application container."""
     candidates = {app, release, *APP_CONTAINER_NAMES.get(app, set())}
-    found: list[tuple[str, set[str]]] = []
-    for document in safe_yaml_documents(manifest):
-        if (
-            not isinstance(document, dict)
-            or scalar(document.get("kind")) != "Deployment"
-            or not release_associated(document, release, allow_name=False)
-        ):
-            continue
-        has_containers, containers = nested_value(
-            document, ("spec", "template", "spec", "containers")
-        )
-        if not has_containers or not isinstance(containers, list):
-            continue
-        for container in containers:
-            if not isinstance(container, dict):
-                continue
-            container_name = scalar(container.get("name"))
-            if container_name not in candidates:
-                continue
-            envs = container.get("env")
-            found.append(
-                (
-                    container_name,
-                    (
-                        {
-                            scalar(item.get("name"))
-                            for item in envs
-                            if isinstance(item, dict) and scalar(item.get("name"))
-                        }
-                        if isinstance(envs, list)
-                        else set()
-                    ),
-                )
-            )
-    return found
+    return [
+        (scalar(container.get("name")), RenderedManifest.env_names(container))
+        for document in rendered_manifest(manifest).release_objects(release, "Deployment")
+        for container in RenderedManifest.containers(document, candidates)
+    ]
 
 
-def deployment_app_container_envs(manifest: str, app: str, release: str) -> set[str]:
+def deployment_app_container_envs(
+    manifest: str | RenderedManifest, app: str, release: str
+) -> set[str]:
     """Return the union of env var names rendered on candidate app containers."""
     merged: set[str] = set()
     for _container_name, envs in deployment_app_container_env_sets(manifest, app, release):
@@ -620,7 +624,7 @@ def resolved_values_scalar(values: tuple[str, ...], path_parts: tuple[str, ...])
     return scalar(resolved)
 
 
-def validate_dspace_values(manifest: str, inputs: ReleaseInputs) -> list[str]:
+def validate_dspace_values(manifest: str | RenderedManifest, inputs: ReleaseInputs) -> list[str]:
     metrics_enabled = (
         resolved_values_scalar(inputs.values, ("metrics", "enabled")).lower() == "true"
     )
@@ -629,11 +633,8 @@ def validate_dspace_values(manifest: str, inputs: ReleaseInputs) -> list[str]:
     )
     secret = resolved_values_scalar(inputs.values, ("metrics", "auth", "existingSecret"))
     secret_key = resolved_values_scalar(inputs.values, ("metrics", "auth", "secretKey")) or "token"
-    rendered_monitor = any(
-        isinstance(document, dict)
-        and scalar(document.get("kind")) == "ServiceMonitor"
-        and release_associated(document, inputs.release, allow_name=False)
-        for document in safe_yaml_documents(manifest)
+    rendered_monitor = bool(
+        rendered_manifest(manifest).release_objects(inputs.release, "ServiceMonitor")
     )
     errors: list[str] = []
     if inputs.env == "prod" and metrics_enabled:
@@ -779,9 +780,18 @@ def cmd_preflight(args: argparse.Namespace) -> int:
         )
         return tmpl.returncode or 1
     try:
-        errors = validate_rendered_manifest(tmpl.stdout, inputs)
+        rendered = RenderedManifest.parse(tmpl.stdout)
+    except (ValueError, json.JSONDecodeError) as error:
+        print(
+            "ERROR: render contract failed: rendered output is not safe structural YAML: "
+            f"{error}; {context}",
+            file=sys.stderr,
+        )
+        return 1
+    try:
+        errors = validate_rendered_manifest(rendered, inputs)
         if inputs.app == "dspace":
-            errors += validate_dspace_values(tmpl.stdout, inputs)
+            errors += validate_dspace_values(rendered, inputs)
     except (ValueError, json.JSONDecodeError) as error:
         print(f"ERROR: rendered-YAML parsing failed; {context}: {error}", file=sys.stderr)
         return 1
@@ -792,7 +802,7 @@ def cmd_preflight(args: argparse.Namespace) -> int:
     req = REQUIRED_ENVS.get(args.app, [])
     if not req:
         return 0
-    app_container_env_sets = deployment_app_container_env_sets(tmpl.stdout, args.app, args.release)
+    app_container_env_sets = deployment_app_container_env_sets(rendered, args.app, args.release)
     complete_envs = next(
         (
             envs
@@ -11,7 +11,15 @@ import sys
 import tempfile
 from pathlib import Path
 
-from app_verify import base_url_from_host, discover_host, env_flag, int_env, normalize_path
+import http_probe
+from app_verify import (
+    base_url_from_host,
+    curl_result,
+    discover_host,
+    env_flag,
+    int_env,
+    normalize_path,
+)
 
 DEFAULT_ORIGIN = "https://cors-smoke.invalid"
 
@@ -108,6 +116,42 @@ def run_curl(args: list[str]) -> tuple[int, str, dict[str, list[str]], bytes, st
         header_path.unlink(missing_ok=True)
 
 
+_ENGINE: http_probe.ProbeEngine | None = None
+
+
+def run_http(args: list[str]) -> tuple[int, str, dict[str, list[str]], bytes, str]:
+    """Send the request ``run_curl`` would through the shared probe engine.
+
+    The preflight and the actual request target one origin, so the second one
+    reuses the first one's connection instead of repeating the TLS handshake.
+    """
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = http_probe.ProbeEngine(
+            connect_timeout=int_env("SUGARKUBE_APP_VERIFY_CURL_CONNECT_TIMEOUT", 10),
+            max_time=int_env("SUGARKUBE_APP_VERIFY_CURL_MAX_TIME", 30),
+            follow_redirects=False,
+            allowed_schemes=("http", "https"),
+        )
+    method, headers, data = "GET", {}, None
+    options = iter(args[:-1])
+    for option in options:
+        value = next(options)
+        if option == "-X":
+            method = value
+        elif option == "-H":
+            name, _, header_value = value.partition(":")
+            headers[name.strip()] = header_value.strip()
+        elif option == "--data-raw":
+            data = value.encode()
+            method = method if "-X" in args else "POST"
+    if data is not None and not any(name.lower() == "content-type" for name in headers):
+        headers["Content-Type"] = "application/x-www-form-urlencoded"  # curl's --data default
+    sample = _ENGINE.request(args[-1], method=method, headers=headers, body=data)
+    rc, status, body, detail = curl_result([sample])
+    return rc, status, sample.headers, body, detail
+
+
 def print_failure_context(
     app: str, env: str, host: str, path: str, origin: str, status: str, detail: str
 ) -> None:
@@ -239,7 +283,8 @@ def main(argv: list[str] | None = None) -> int:
     print(f"Path: {path}")
     print(f"Origin: {args.origin}")
 
-    rc, status, headers, _body, stderr = run_curl(preflight_args)
+    send = run_http if http_probe.enabled() else run_curl
+    rc, status, headers, _body, stderr = send(preflight_args)
     if rc != 0:
         print_failure_context(
             app, env, base_url, path, args.origin, status, curl_failure_detail(stderr)
@@ -266,7 +311,7 @@ def main(argv: list[str] | None = None) -> int:
         print_failure_context(app, env, base_url, path, args.origin, status, error)
         return 1
 
-    rc, status, headers, actual_body, stderr = run_curl(actual_args)
+    rc, status, headers, actual_body, stderr = send(actual_args)
     if rc != 0:
         print_failure_context(
             app, env, base_url, path, args.origin, status, curl_failure_detail(stderr)
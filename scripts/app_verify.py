@@ -11,6 +11,12 @@ import sys
 import tempfile
 from pathlib import Path
 
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+import http_probe  # noqa: E402
+
 
 def env_flag(name: str, default: bool = False) -> bool:
     value = os.environ.get(name)
@@ -178,6 +184,34 @@ def run_curl(url: str) -> tuple[int, str, bytes, str]:
         body_path.unlink(missing_ok=True)
 
 
+CURL_EXIT_CODES = {"none": 0, "timeout": 28}
+
+
+def curl_result(samples: list[http_probe.Sample]) -> tuple[int, str, bytes, str]:
+    """Describe engine samples with the ``run_curl`` tuple; the first failure wins."""
+    sample = next((item for item in samples if not item.ok), samples[-1])
+    status = f"{sample.status:03d}" if sample.status else "000"
+    return CURL_EXIT_CODES.get(sample.error, 7), status, sample.body, sample.detail
+
+
+def engine_results(
+    urls: list[str],
+) -> dict[str, tuple[tuple[int, str, bytes, str], dict[str, object]]]:
+    """Probe every URL concurrently over reused connections, sampling each N times."""
+    samples = max(1, int_env(http_probe.SAMPLES_ENV, 1))
+    with http_probe.ProbeEngine(
+        connect_timeout=int_env("SUGARKUBE_APP_VERIFY_CURL_CONNECT_TIMEOUT", 10),
+        max_time=int_env("SUGARKUBE_APP_VERIFY_CURL_MAX_TIME", 30),
+        follow_redirects=False,
+        allowed_schemes=("http", "https"),
+    ) as engine:
+        results = engine.probe_all(urls, samples=samples)
+    return {
+        url: (curl_result(url_samples), http_probe.summarize(url_samples))
+        for url, url_samples in results.items()
+    }
+
+
 def tokenplace_meta_failure(env: str, raw: bytes) -> str:
     try:
         data = json.loads(raw.decode("utf-8"))
@@ -231,15 +265,25 @@ def main(argv: list[str] | None = None) -> int:
     passed = 0
     failures: list[tuple[str, str]] = []
     total = len(paths)
+    probed = engine_results([f"{base_url}{path}" for path in paths]) if http_probe.enabled() else {}
 
     for index, path in enumerate(paths, start=1):
         url = f"{base_url}{path}"
-        curl_rc, http_status, body, curl_stderr = run_curl(url)
+        summary = None
+        if url in probed:
+            (curl_rc, http_status, body, curl_stderr), summary = probed[url]
+        else:
+            curl_rc, http_status, body, curl_stderr = run_curl(url)
         if curl_rc == 0 and http_status.isdigit() and int(http_status) >= 400:
             curl_rc = 22
 
         print(f"\n[{index}/{total}] GET {path}")
         print(f"  URL: {url}")
+        if summary is not None:
+            print(
+                f"  Latency: p50 {summary['totalSeconds']:.3f}s, "
+                f"p95 {summary['totalP95Seconds']:.3f}s over {summary['samples']} sample(s)"
+            )
         http_suffix = (
             f" (HTTP {http_status})" if http_status.isdigit() and http_status != "000" else ""
         )
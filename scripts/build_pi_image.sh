@@ -509,6 +509,9 @@ fi
 install -Dm755 "${REPO_ROOT}/scripts/pi_node_verifier.sh" \
   "${PI_GEN_DIR}/stage2/02-sugarkube-tools/files/usr/local/sbin/pi_node_verifier.sh"
 
+install -Dm755 "${REPO_ROOT}/scripts/pi_node_verifier.py" \
+  "${PI_GEN_DIR}/stage2/02-sugarkube-tools/files/usr/local/sbin/pi_node_verifier.py"
+
 install -Dm755 "${REPO_ROOT}/scripts/first_boot_service.py" \
   "${PI_GEN_DIR}/stage2/01-sys-tweaks/files/opt/sugarkube/first_boot_service.py"
 
@@ -578,6 +581,13 @@ install -Dm644 "${REPO_ROOT}/scripts/systemd/ssd-clone.service" \
 install -Dm644 "${REPO_ROOT}/scripts/systemd/avahi-configure.service" \
   "${PI_GEN_DIR}/stage2/01-sys-tweaks/files/etc/systemd/system/avahi-configure.service"
 
+for mdns_module in mdns_discovery_daemon.py k3s_mdns_parser.py mdns_helpers.py; do
+  install -Dm755 "${REPO_ROOT}/scripts/${mdns_module}" \
+    "${PI_GEN_DIR}/stage2/01-sys-tweaks/files/opt/sugarkube/${mdns_module}"
+done
+install -Dm644 "${REPO_ROOT}/scripts/systemd/sugarkube-mdns-discovery.service" \
+  "${PI_GEN_DIR}/stage2/01-sys-tweaks/files/etc/systemd/system/sugarkube-mdns-discovery.service"
+
 install -Dm644 "${REPO_ROOT}/scripts/systemd/sugarkube-export-kubeconfig.service" \
   "${PI_GEN_DIR}/stage2/01-sys-tweaks/files/etc/systemd/system/sugarkube-export-kubeconfig.service"
 install -Dm644 "${REPO_ROOT}/scripts/systemd/sugarkube-export-kubeconfig.path" \
@@ -602,6 +612,8 @@ ln -sf ../first-boot-prepare.service \
   "${PI_GEN_DIR}/stage2/01-sys-tweaks/files/etc/systemd/system/multi-user.target.wants/first-boot-prepare.service"
 ln -sf ../avahi-configure.service \
   "${PI_GEN_DIR}/stage2/01-sys-tweaks/files/etc/systemd/system/multi-user.target.wants/avahi-configure.service"
+ln -sf ../sugarkube-mdns-discovery.service \
+  "${PI_GEN_DIR}/stage2/01-sys-tweaks/files/etc/systemd/system/multi-user.target.wants/sugarkube-mdns-discovery.service"
 
 
 install -Dm644 "${REPO_ROOT}/scripts/udev/99-sugarkube-ssd-clone.rules" \
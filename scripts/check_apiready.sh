@@ -16,6 +16,7 @@ fi
 SERVER_IP="${SERVER_IP:-}"
 TIMEOUT_RAW="${TIMEOUT:-120}"
 POLL_INTERVAL_RAW="${POLL_INTERVAL:-2}"
+POLL_INITIAL_INTERVAL_RAW="${POLL_INITIAL_INTERVAL:-0.25}"
 ALLOW_HTTP_401="${ALLOW_HTTP_401:-0}"
 
 cleanup_files() {
@@ -76,6 +77,26 @@ print(str(numeric))
 PY
 }
 
+# Retries back off exponentially from POLL_INITIAL_INTERVAL up to POLL_INTERVAL. Each sleep
+# drops up to half of the current delay at random so joining nodes do not probe in lockstep,
+# and no sleep runs past the deadline.
+jittered_delay() {
+  awk -v delay="$1" -v remaining="$2" -v seed="${RANDOM}" 'BEGIN {
+    srand(seed)
+    wait = delay * (1 - 0.5 * rand())
+    if (wait > remaining) wait = remaining
+    printf "%.3f\n", wait
+  }'
+}
+
+grow_delay() {
+  awk -v delay="$1" -v maximum="$2" 'BEGIN {
+    delay *= 2
+    if (delay > maximum) delay = maximum
+    print delay
+  }'
+}
+
 validate_ready_body() {
   local body_path="$1"
   python3 - "$body_path" <<'PY'
@@ -128,6 +149,14 @@ if [ "${POLL_INTERVAL}" = "INVALID" ]; then
   exit 2
 fi
 
+POLL_INITIAL_INTERVAL="$(resolve_positive_float "${POLL_INITIAL_INTERVAL_RAW}")"
+if [ "${POLL_INITIAL_INTERVAL}" = "INVALID" ]; then
+  echo "Invalid POLL_INITIAL_INTERVAL: ${POLL_INITIAL_INTERVAL_RAW}" >&2
+  exit 2
+fi
+poll_delay="$(awk -v initial="${POLL_INITIAL_INTERVAL}" -v maximum="${POLL_INTERVAL}" \
+  'BEGIN { print (initial < maximum ? initial : maximum) }')"
+
 start_epoch="$(date +%s)"
 end_epoch=$((start_epoch + TIMEOUT_SECS))
 
@@ -232,5 +261,6 @@ while :; do
     exit 1
   fi
 
-  sleep "${POLL_INTERVAL}"
+  sleep "$(jittered_delay "${poll_delay}" "$((end_epoch - now))")"
+  poll_delay="$(grow_delay "${poll_delay}" "${POLL_INTERVAL}")"
 done
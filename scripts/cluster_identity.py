@@ -9,6 +9,12 @@ import subprocess
 import sys
 from pathlib import Path
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import kube_api_client  # noqa: E402
+
 VALID_ENVS = {"dev", "staging", "prod"}
 LAST_DETAILS = {"envs": set(), "clusters": set(), "nodes": []}
 
@@ -19,9 +25,13 @@ def norm_env(value: str) -> str:
 
 
 def run_kubectl(kubeconfig: str, args: list[str]) -> subprocess.CompletedProcess[str]:
+    argv = ["kubectl", "--kubeconfig", kubeconfig, *args]
+    proc = kube_api_client.run(argv)
+    if proc is not None:
+        return proc
     env = os.environ.copy()
     env["KUBECONFIG"] = kubeconfig
-    return subprocess.run(["kubectl", "--kubeconfig", kubeconfig, *args], env=env, text=True, capture_output=True, check=False)
+    return subprocess.run(argv, env=env, text=True, capture_output=True, check=False)
 
 
 def safe_info(kubeconfig: str) -> tuple[str, str]:
@@ -4,19 +4,38 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import io
 import json
+import os
 import re
 import shlex
+import shutil
 import subprocess
 import sys
 import tarfile
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import BinaryIO, Callable, ContextManager, Iterable, Iterator, List, Sequence, TypeVar
 
 DEFAULT_COMMAND_TIMEOUT = 120
 DEFAULT_CONNECT_TIMEOUT = 10
+# sshd allows 10 sessions per multiplexed connection by default (MaxSessions).
+DEFAULT_JOBS = 8
+DEFAULT_MAX_PARALLEL = 32  # remote commands in flight across every host of a cluster bundle.
+DEFAULT_CLUSTER = "sugar"
+DEFAULT_ENVIRONMENT = "dev"
+SCRIPT_DIR = Path(__file__).resolve().parent
+CONTROL_PERSIST_SECONDS = 60
+DEFAULT_MAX_ENTRY_MB = 64  # per-file cap for --stream-archive; journals can grow without bound.
+SPOOL_MEMORY_BYTES = 8 * 1024 * 1024  # streamed entries spill to a temp file beyond this.
+STREAM_CHUNK_BYTES = 64 * 1024
+MAX_STDERR_BYTES = 64 * 1024
 DEFAULT_OUTPUT_DIR = "support-bundles"
 DEFAULT_USER = "pi"
 KUBECONFIG_PATH = "/etc/rancher/k3s/k3s.yaml"
@@ -31,12 +50,15 @@ class CommandSpec:
     output_path: Path
     remote_command: str
     description: str
+    # "cluster" specs return the same data from every node and run once per cluster bundle.
+    scope: str = "node"
 
     def to_dict(self) -> dict[str, str]:
         return {
             "output_path": self.output_path.as_posix(),
             "remote_command": self.remote_command,
             "description": self.description,
+            "scope": self.scope,
         }
 
 
@@ -56,21 +78,25 @@ def default_specs() -> List[CommandSpec]:
             Path("kubernetes/events.txt"),
             f"{kube_env} kubectl get events --all-namespaces --sort-by=.lastTimestamp -o wide",
             "Chronological Kubernetes events to pinpoint regressions.",
+            scope="cluster",
         ),
         CommandSpec(
             Path("kubernetes/pods.txt"),
             f"{kube_env} kubectl get pods --all-namespaces -o wide",
             "Running workloads across namespaces.",
+            scope="cluster",
         ),
         CommandSpec(
             Path("kubernetes/nodes.txt"),
             f"{kube_env} kubectl describe nodes",
             "Node inventory with taints, addresses, and resource pressure.",
+            scope="cluster",
         ),
         CommandSpec(
             Path("helm/releases.txt"),
             f"{kube_env} helm list -A",
             "Helm release summary for the cluster.",
+            scope="cluster",
         ),
         CommandSpec(
             Path("systemd/systemd-analyze-blame.txt"),
@@ -149,7 +175,57 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description=("SSH into a Sugarkube Pi and collect diagnostics into a support bundle.")
     )
-    parser.add_argument("host", help="Hostname or IP address of the Pi to inspect.")
+    parser.add_argument(
+        "host",
+        nargs="?",
+        help=(
+            "Hostname or IP address of the Pi to inspect. With --discover kubectl this node "
+            "is asked for the cluster's node list."
+        ),
+    )
+    parser.add_argument(
+        "--hosts",
+        action="append",
+        default=[],
+        metavar="HOST[,HOST...]",
+        help="Collect from several nodes into one cluster bundle (repeatable, comma-separated).",
+    )
+    parser.add_argument(
+        "--discover",
+        choices=("kubectl", "mdns"),
+        help=(
+            "Add cluster nodes automatically: 'kubectl' lists nodes from the given host, "
+            "'mdns' browses k3s server advertisements on the local network."
+        ),
+    )
+    parser.add_argument(
+        "--cluster",
+        default=os.environ.get("SUGARKUBE_CLUSTER", DEFAULT_CLUSTER),
+        help=f"Cluster name used for --discover mdns. Defaults to '{DEFAULT_CLUSTER}'.",
+    )
+    parser.add_argument(
+        "--environment",
+        default=os.environ.get("SUGARKUBE_ENV", DEFAULT_ENVIRONMENT),
+        help=f"Environment used for --discover mdns. Defaults to '{DEFAULT_ENVIRONMENT}'.",
+    )
+    parser.add_argument(
+        "--control-plane",
+        metavar="HOST",
+        help=(
+            "Server node that runs the cluster-scoped kubectl and helm captures. Defaults to "
+            "the first k3s server found by --discover, falling back to the next reachable host."
+        ),
+    )
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=DEFAULT_MAX_PARALLEL,
+        metavar="N",
+        help=(
+            "Cap on remote commands in flight across all hosts of a cluster bundle. "
+            f"Defaults to {DEFAULT_MAX_PARALLEL}."
+        ),
+    )
     parser.add_argument(
         "--user",
         default=DEFAULT_USER,
@@ -197,10 +273,50 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         help="Extra -o options passed directly to ssh (repeatable).",
     )
     parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        metavar="N",
+        help=(
+            "Remote commands and copies to run concurrently over the shared SSH connection. "
+            f"Defaults to {DEFAULT_JOBS}."
+        ),
+    )
+    parser.add_argument(
+        "--no-multiplex",
+        action="store_true",
+        help="Open a separate SSH connection per command instead of sharing a ControlMaster.",
+    )
+    archive_mode = parser.add_mutually_exclusive_group()
+    archive_mode.add_argument(
         "--no-archive",
         action="store_true",
         help="Skip creating a compressed tarball (leave raw files on disk).",
     )
+    archive_mode.add_argument(
+        "--stream-archive",
+        action="store_true",
+        help=(
+            "Append each command's output to the compressed archive as soon as it completes "
+            "instead of writing the bundle directory first."
+        ),
+    )
+    parser.add_argument(
+        "--compression",
+        choices=("auto", "zstd", "pigz", "gzip"),
+        default="auto",
+        help="Compressor for --stream-archive. 'auto' prefers zstd, then pigz, then Python gzip.",
+    )
+    parser.add_argument(
+        "--max-entry-mb",
+        type=float,
+        default=DEFAULT_MAX_ENTRY_MB,
+        metavar="MB",
+        help=(
+            "Truncate any single command output beyond this size in --stream-archive mode, "
+            f"leaving a marker. Defaults to {DEFAULT_MAX_ENTRY_MB}."
+        ),
+    )
     parser.add_argument(
         "--spec",
         action="append",
@@ -234,16 +350,36 @@ def parse_extra_specs(entries: Iterable[str]) -> List[CommandSpec]:
     return specs
 
 
-def build_bundle_dir(base: Path, host: str, timestamp: datetime) -> Path:
+def build_bundle_dir(base: Path, host: str, timestamp: datetime, *, create: bool = True) -> Path:
     safe_host = host.replace("/", "_").replace(":", "_")
     name = f"{safe_host}-{timestamp.strftime('%Y%m%dT%H%M%SZ')}"
     bundle_dir = base / name
-    bundle_dir.mkdir(parents=True, exist_ok=True)
+    if create:
+        bundle_dir.mkdir(parents=True, exist_ok=True)
     return bundle_dir
 
 
-def build_ssh_command(args: argparse.Namespace, remote_command: str) -> List[str]:
-    destination = f"{args.user}@{args.host}" if args.user else args.host
+def _multiplex_options(args: argparse.Namespace) -> List[str]:
+    control_path = getattr(args, "control_path", None)
+    if not control_path:
+        return []
+    return [
+        "-o",
+        "ControlMaster=auto",
+        "-o",
+        f"ControlPath={control_path}",
+        "-o",
+        f"ControlPersist={CONTROL_PERSIST_SECONDS}",
+    ]
+
+
+def _ssh_destination(args: argparse.Namespace) -> str:
+    return f"{args.user}@{args.host}" if args.user else args.host
+
+
+def _ssh_base_command(args: argparse.Namespace) -> List[str]:
+    """Return ``ssh`` plus every connection option, without a destination."""
+
     cmd: List[str] = [
         "ssh",
         "-o",
@@ -253,19 +389,25 @@ def build_ssh_command(args: argparse.Namespace, remote_command: str) -> List[str
         "-o",
         "StrictHostKeyChecking=no",
     ]
+    cmd.extend(_multiplex_options(args))
     if args.identity:
         cmd.extend(["-i", args.identity])
     if args.port and args.port != 22:
         cmd.extend(["-p", str(args.port)])
     for option in args.ssh_option:
         cmd.extend(["-o", option])
-    cmd.append(destination)
+    return cmd
+
+
+def build_ssh_command(args: argparse.Namespace, remote_command: str) -> List[str]:
+    cmd = _ssh_base_command(args)
+    cmd.append(_ssh_destination(args))
     cmd.extend(["bash", "-lc", f"set -o pipefail; {remote_command}"])
     return cmd
 
 
 def build_scp_command(args: argparse.Namespace, remote_path: str, destination: Path) -> List[str]:
-    remote = f"{args.user}@{args.host}" if args.user else args.host
+    remote = _ssh_destination(args)
     cmd: List[str] = [
         "scp",
         "-r",
@@ -278,6 +420,7 @@ def build_scp_command(args: argparse.Namespace, remote_path: str, destination: P
         "-o",
         "StrictHostKeyChecking=no",
     ]
+    cmd.extend(_multiplex_options(args))
     if args.identity:
         cmd.extend(["-i", args.identity])
     if args.port and args.port != 22:
@@ -289,6 +432,70 @@ def build_scp_command(args: argparse.Namespace, remote_path: str, destination: P
     return cmd
 
 
+@contextlib.contextmanager
+def shared_connection(args: argparse.Namespace) -> Iterator[None]:
+    """Let every ssh/scp call in the block multiplex over one ControlMaster.
+
+    The first command to connect becomes the master (``ControlMaster=auto``) and
+    later commands open channels on it instead of repeating the TCP and key
+    exchange handshakes. The master is shut down when the block exits.
+    """
+
+    if getattr(args, "no_multiplex", False) or os.name == "nt":
+        yield
+        return
+    # Unix socket paths are limited to ~104 bytes, so keep the directory short.
+    control_dir = tempfile.mkdtemp(prefix="skb-")
+    args.control_path = os.path.join(control_dir, "%C")
+    try:
+        yield
+    finally:
+        if any(Path(control_dir).iterdir()):
+            # Same port, identity, and -o options as the commands that opened the
+            # master, otherwise %C hashes to a different socket and ssh misses it.
+            exit_cmd = _ssh_base_command(args) + ["-O", "exit", _ssh_destination(args)]
+            try:
+                subprocess.run(
+                    exit_cmd,
+                    check=False,
+                    capture_output=True,
+                    timeout=args.connect_timeout,
+                )
+            except (OSError, subprocess.SubprocessError):
+                pass
+        args.control_path = None
+        shutil.rmtree(control_dir, ignore_errors=True)
+
+
+def _slot(args: argparse.Namespace) -> ContextManager[object]:
+    """Hold one of the cluster-wide command slots (see ``--max-parallel``)."""
+
+    limiter = getattr(args, "limiter", None)
+    return limiter if limiter is not None else contextlib.nullcontext()
+
+
+_Item = TypeVar("_Item")
+_Result = TypeVar("_Result")
+
+
+def run_bounded(
+    items: Sequence[_Item], func: Callable[[_Item], _Result], jobs: int
+) -> List[_Result]:
+    """Apply ``func`` to ``items`` on up to ``jobs`` threads, preserving order.
+
+    The first item runs on its own so it can establish the shared SSH
+    connection before the remaining items pile onto it.
+    """
+
+    if not items:
+        return []
+    results = [func(items[0])]
+    if len(items) > 1:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(items) - 1))) as pool:
+            results.extend(pool.map(func, items[1:]))
+    return results
+
+
 def write_command_output(path: Path, content: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(content, encoding="utf-8")
@@ -303,15 +510,72 @@ def _sanitize_target_name(target: str) -> str:
     return safe or "target"
 
 
+def _copy_target(
+    args: argparse.Namespace, bundle_dir: Path, target: str, destination: Path
+) -> dict[str, object]:
+    archive = getattr(args, "archive", None)
+    with contextlib.ExitStack() as stack:
+        local = destination
+        if archive is not None:
+            # scp needs a real directory; stage it only until it is appended to the archive.
+            staging = stack.enter_context(tempfile.TemporaryDirectory(prefix="skb-target-"))
+            local = Path(staging) / destination.name
+            local.mkdir()
+        with _slot(args):
+            started = time.monotonic()
+            try:
+                completed = subprocess.run(
+                    build_scp_command(args, target, local),
+                    check=False,
+                    text=True,
+                    capture_output=True,
+                    timeout=args.command_timeout,
+                )
+            except subprocess.TimeoutExpired:
+                completed = None
+            elapsed = round(time.monotonic() - started, 3)
+        if archive is not None and completed is not None and completed.returncode == 0:
+            archive.add_tree(destination, local)
+    if completed is None:
+        print(
+            f"warning: copying {target} timed out after {args.command_timeout} seconds",
+            file=sys.stderr,
+        )
+        return {
+            "path": target,
+            "status": "timeout",
+            "local_path": destination.relative_to(bundle_dir).as_posix(),
+            "duration_seconds": elapsed,
+        }
+
+    entry: dict[str, object] = {
+        "path": target,
+        "local_path": destination.relative_to(bundle_dir).as_posix(),
+        "status": "success" if completed.returncode == 0 else "failed",
+        "duration_seconds": elapsed,
+    }
+    if completed.returncode != 0:
+        entry["exit_code"] = completed.returncode
+        if completed.stderr:
+            entry["stderr"] = completed.stderr.strip()
+        print(
+            f"warning: failed to copy {target} (exit {completed.returncode})",
+            file=sys.stderr,
+        )
+    return entry
+
+
 def copy_targets(args: argparse.Namespace, bundle_dir: Path) -> list[dict[str, object]]:
     targets = getattr(args, "target", [])
     if not targets:
         return []
 
-    results: list[dict[str, object]] = []
     base_dir = bundle_dir / "targets"
-    base_dir.mkdir(parents=True, exist_ok=True)
+    streaming = getattr(args, "archive", None) is not None
+    if not streaming:
+        base_dir.mkdir(parents=True, exist_ok=True)
     used_names: dict[str, int] = {}
+    planned: list[tuple[str, Path]] = []
 
     for raw_target in targets:
         target = raw_target.strip()
@@ -323,45 +587,270 @@ def copy_targets(args: argparse.Namespace, bundle_dir: Path) -> list[dict[str, o
         if count:
             safe_name = f"{safe_name}-{count + 1}"
         destination = base_dir / safe_name
-        destination.mkdir(parents=True, exist_ok=True)
+        if not streaming:
+            destination.mkdir(parents=True, exist_ok=True)
+        planned.append((target, destination))
+
+    return run_bounded(
+        planned,
+        lambda item: _copy_target(args, bundle_dir, *item),
+        getattr(args, "jobs", DEFAULT_JOBS),
+    )
+
+
+def _entry_header(spec: CommandSpec, status_line: str) -> str:
+    return f"# {spec.description}\n# Command: {spec.remote_command}\n{status_line}\n"
+
 
+def _execute_spec(
+    args: argparse.Namespace, spec: CommandSpec, bundle_dir: Path
+) -> dict[str, object]:
+    """Run one spec; stdout is spooled so the exit status can lead the bundle file."""
+
+    archive = getattr(args, "archive", None)
+    if archive is not None:
+        return _execute_spec_streamed(args, spec, bundle_dir, archive)
+
+    output_path = bundle_dir / spec.output_path
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    ssh_cmd = build_ssh_command(args, spec.remote_command)
+    result: dict[str, object] = {"command": spec.to_dict()}
+    stdout = stderr = ""
+    with _slot(args), tempfile.TemporaryFile(dir=output_path.parent) as body:
+        started = time.monotonic()
         try:
             completed = subprocess.run(
-                build_scp_command(args, target, destination),
+                ssh_cmd,
                 check=False,
                 text=True,
-                capture_output=True,
+                stdout=body,
+                stderr=subprocess.PIPE,
                 timeout=args.command_timeout,
             )
         except subprocess.TimeoutExpired:
-            results.append(
+            status_line = f"# Timed out after {args.command_timeout} seconds\n"
+            result.update({"exit_code": None, "status": "timeout"})
+        except Exception as exc:  # pragma: no cover - defensive
+            status_line = f"# Error: {exc}\n"
+            result.update({"exit_code": None, "status": "error", "error": str(exc)})
+        else:
+            status_line = f"# Exit status: {completed.returncode}\n"
+            if isinstance(completed.stdout, str):
+                stdout = completed.stdout
+            stderr = completed.stderr or ""
+            result.update(
                 {
-                    "path": target,
-                    "status": "timeout",
-                    "local_path": destination.relative_to(bundle_dir).as_posix(),
+                    "exit_code": completed.returncode,
+                    "status": "success" if completed.returncode == 0 else "failed",
                 }
             )
-            print(
-                f"warning: copying {target} timed out after {args.command_timeout} seconds",
-                file=sys.stderr,
-            )
-            continue
+        result["duration_seconds"] = round(time.monotonic() - started, 3)
+        body.seek(0)
+        with output_path.open("wb") as handle:
+            handle.write(_entry_header(spec, status_line).encode())
+            body_start = handle.tell()
+            shutil.copyfileobj(body, handle)
+            handle.write(stdout.encode())
+            if handle.tell() == body_start:
+                handle.write(b"(no output)\n")
+            if stderr:
+                handle.write(("\n# stderr\n\n" + stderr).encode())
+    return result
 
-        entry: dict[str, object] = {
-            "path": target,
-            "local_path": destination.relative_to(bundle_dir).as_posix(),
-            "status": "success" if completed.returncode == 0 else "failed",
-        }
-        if completed.returncode != 0:
-            entry["exit_code"] = completed.returncode
-            if completed.stderr:
-                entry["stderr"] = completed.stderr.strip()
-            print(
-                f"warning: failed to copy {target} (exit {completed.returncode})",
-                file=sys.stderr,
-            )
-        results.append(entry)
-    return results
+
+def _archive_path(bundle_dir: Path, extension: str) -> Path:
+    # Hostnames contain dots, so append rather than Path.with_suffix().
+    return bundle_dir.parent / f"{bundle_dir.name}{extension}"
+
+
+def select_compressor(preference: str = "auto") -> tuple[str, List[str] | None]:
+    """Return ``(extension, command)`` for the archive stream.
+
+    ``auto`` prefers multithreaded ``zstd``, then parallel gzip (``pigz``), and
+    finally falls back to Python's single-threaded gzip (``command`` is None).
+    """
+
+    candidates = {
+        "zstd": (".tar.zst", ["zstd", "-q", "-T0", "-3", "-c"]),
+        "pigz": (".tar.gz", ["pigz", "-c"]),
+    }
+    order = ["zstd", "pigz"] if preference == "auto" else [preference]
+    for name in order:
+        if name in candidates and shutil.which(name):
+            return candidates[name]
+    if preference not in ("auto", "gzip"):
+        print(f"warning: {preference} not found; falling back to gzip", file=sys.stderr)
+    return ".tar.gz", None
+
+
+class StreamingArchive:
+    """Tar stream that bundle entries are appended to as soon as they complete.
+
+    Nothing is staged in the bundle directory: each entry is buffered in a
+    spooled temporary file (memory first) and written once into the
+    compressed stream, which halves disk I/O compared with writing the tree
+    and re-reading it for :func:`archive_bundle`.
+    """
+
+    def __init__(self, bundle_dir: Path, preference: str = "auto") -> None:
+        extension, command = select_compressor(preference)
+        self.bundle_dir = bundle_dir
+        self.path = _archive_path(bundle_dir, extension)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._dest = None
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._closed = False
+        if command:
+            self._dest = self.path.open("wb")
+            self._proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=self._dest)
+            self._tar = tarfile.open(fileobj=self._proc.stdin, mode="w|")
+        else:
+            self._tar = tarfile.open(str(self.path), mode="w|gz")
+
+    def _arcname(self, path: Path) -> str:
+        return (Path(self.bundle_dir.name) / path.relative_to(self.bundle_dir)).as_posix()
+
+    def add_stream(self, path: Path, fileobj: BinaryIO, size: int) -> None:
+        info = tarfile.TarInfo(self._arcname(path))
+        info.size = size
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        with self._lock:
+            self._tar.addfile(info, fileobj)
+
+    def add_bytes(self, path: Path, data: bytes) -> None:
+        self.add_stream(path, io.BytesIO(data), len(data))
+
+    def add_tree(self, path: Path, local: Path) -> None:
+        with self._lock:
+            self._tar.add(local, arcname=self._arcname(path))
+
+    def close(self) -> Path:
+        if self._closed:
+            return self.path
+        self._closed = True
+        self._tar.close()
+        if self._proc is not None:
+            assert self._proc.stdin is not None and self._dest is not None
+            self._proc.stdin.close()
+            returncode = self._proc.wait()
+            self._dest.close()
+            if returncode:
+                raise RuntimeError(f"archive compressor exited with status {returncode}")
+        return self.path
+
+
+class _Prefixed:
+    """Read ``prefix`` and then ``stream`` as a single file object for ``tarfile``."""
+
+    def __init__(self, prefix: bytes, stream: BinaryIO) -> None:
+        self._prefix = io.BytesIO(prefix)
+        self._stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._prefix.read(size)
+        if size < 0:
+            return data + self._stream.read()
+        if len(data) < size:
+            data += self._stream.read(size - len(data))
+        return data
+
+
+def _capture_capped(
+    cmd: Sequence[str], timeout: int, cap: int, spool: BinaryIO
+) -> tuple[int | None, int, int, str]:
+    """Run ``cmd`` writing at most ``cap`` bytes of its stdout to ``spool``.
+
+    Returns ``(exit_code, kept, dropped, stderr)``; ``exit_code`` is None when
+    the command was killed at ``timeout``. Output beyond the cap is drained and
+    counted so runaway commands cannot fill memory or disk.
+    """
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert proc.stdout is not None and proc.stderr is not None
+    stderr_chunks: list[bytes] = []
+
+    def drain_stderr() -> None:
+        kept_stderr = 0
+        for chunk in iter(lambda: proc.stderr.read(STREAM_CHUNK_BYTES), b""):
+            if kept_stderr < MAX_STDERR_BYTES:
+                stderr_chunks.append(chunk[: MAX_STDERR_BYTES - kept_stderr])
+                kept_stderr += len(stderr_chunks[-1])
+
+    stderr_reader = threading.Thread(target=drain_stderr, daemon=True)
+    stderr_reader.start()
+    timed_out = threading.Event()
+
+    def kill() -> None:
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    kept = dropped = 0
+    try:
+        for chunk in iter(lambda: proc.stdout.read(STREAM_CHUNK_BYTES), b""):
+            room = cap - kept
+            if room > 0:
+                spool.write(chunk[:room])
+                kept += min(room, len(chunk))
+            dropped += max(0, len(chunk) - max(room, 0))
+        proc.wait()
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+    stderr_reader.join(timeout=5)
+    stderr = b"".join(stderr_chunks).decode("utf-8", "replace")
+    return (None if timed_out.is_set() else proc.returncode), kept, dropped, stderr
+
+
+def _execute_spec_streamed(
+    args: argparse.Namespace, spec: CommandSpec, bundle_dir: Path, archive: StreamingArchive
+) -> dict[str, object]:
+    """Run one spec and append its capped output straight to ``archive``."""
+
+    cap = int(args.max_entry_mb * 1024 * 1024)
+    result: dict[str, object] = {"command": spec.to_dict()}
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES) as spool:
+        with _slot(args):
+            started = time.monotonic()
+            try:
+                exit_code, kept, dropped, stderr = _capture_capped(
+                    build_ssh_command(args, spec.remote_command),
+                    args.command_timeout,
+                    cap,
+                    spool,  # type: ignore[arg-type]
+                )
+            except OSError as exc:
+                exit_code, kept, dropped, stderr = None, 0, 0, ""
+                result.update({"exit_code": None, "status": "error", "error": str(exc)})
+            result["duration_seconds"] = round(time.monotonic() - started, 3)
+
+        if "error" in result:
+            status_line = f"# Error: {result['error']}\n"
+        elif exit_code is None:
+            status_line = f"# Timed out after {args.command_timeout} seconds\n"
+            result.update({"exit_code": None, "status": "timeout"})
+        else:
+            status_line = f"# Exit status: {exit_code}\n"
+            status = "success" if exit_code == 0 else "failed"
+            result.update({"exit_code": exit_code, "status": status})
+        trailer = "" if kept else "(no output)\n"
+        if dropped:
+            trailer += f"\n# [truncated: {dropped} bytes omitted after the first {kept} bytes]\n"
+            result["truncated_bytes"] = dropped
+        if stderr:
+            trailer += "\n# stderr\n\n" + stderr
+        spool.write(trailer.encode())
+        header = _entry_header(spec, status_line).encode()
+        size = len(header) + spool.tell()
+        spool.seek(0)
+        entry = _Prefixed(header, spool)  # type: ignore[arg-type]
+        archive.add_stream(bundle_dir / spec.output_path, entry, size)  # type: ignore[arg-type]
+    return result
 
 
 def execute_specs(
@@ -369,76 +858,221 @@ def execute_specs(
     specs: Sequence[CommandSpec],
     bundle_dir: Path,
 ) -> list[dict[str, object]]:
-    results: list[dict[str, object]] = []
-    for spec in specs:
-        output_path = bundle_dir / spec.output_path
-        ssh_cmd = build_ssh_command(args, spec.remote_command)
-        try:
-            completed = subprocess.run(
-                ssh_cmd,
-                check=False,
-                text=True,
-                capture_output=True,
-                timeout=args.command_timeout,
-            )
-            stdout = completed.stdout
-            stderr = completed.stderr
-            status = "success" if completed.returncode == 0 else "failed"
-            payload_lines = [
-                f"# {spec.description}\n",
-                f"# Command: {spec.remote_command}\n",
-                f"# Exit status: {completed.returncode}\n",
-                "\n",
-                stdout or "(no output)\n",
-            ]
-            if stderr:
-                payload_lines.extend(
-                    [
-                        "\n# stderr\n\n",
-                        stderr,
-                    ]
-                )
-            write_command_output(output_path, "".join(payload_lines))
-            results.append(
-                {
-                    "command": spec.to_dict(),
-                    "exit_code": completed.returncode,
-                    "status": status,
-                }
-            )
-        except subprocess.TimeoutExpired:
-            write_command_output(
-                output_path,
-                (
-                    f"# {spec.description}\n# Command: {spec.remote_command}\n"
-                    f"# Timed out after {args.command_timeout} seconds\n"
-                ),
-            )
-            results.append(
-                {
-                    "command": spec.to_dict(),
-                    "exit_code": None,
-                    "status": "timeout",
-                }
-            )
-        except Exception as exc:  # pragma: no cover - defensive
-            write_command_output(
-                output_path,
-                (f"# {spec.description}\n# Command: {spec.remote_command}\n" f"# Error: {exc}\n"),
-            )
-            results.append(
-                {
-                    "command": spec.to_dict(),
-                    "exit_code": None,
-                    "status": "error",
-                    "error": str(exc),
-                }
+    """Run ``specs`` concurrently (``args.jobs``) and return results in spec order."""
+
+    return run_bounded(
+        list(specs),
+        lambda spec: _execute_spec(args, spec, bundle_dir),
+        getattr(args, "jobs", DEFAULT_JOBS),
+    )
+
+
+@dataclass(frozen=True)
+class NodeTarget:
+    """A node in a cluster bundle: ``name`` labels its directory, ``address`` is dialled.
+
+    ``server`` marks k3s control-plane nodes, which hold the admin kubeconfig that
+    cluster-scoped captures need.
+    """
+
+    name: str
+    address: str
+    server: bool = False
+
+
+def _host_key(value: str) -> str:
+    key = value.strip().lower().rstrip(".")
+    return key[: -len(".local")] if key.endswith(".local") else key
+
+
+def discover_kubectl_nodes(args: argparse.Namespace, seed: str) -> List[NodeTarget]:
+    """List cluster nodes (name, InternalIP, control-plane role) via kubectl on ``seed``."""
+
+    jsonpath = (
+        '{range .items[*]}{.metadata.name}{" "}'
+        '{.status.addresses[?(@.type=="InternalIP")].address}{" "}'
+        '{.metadata.labels.node-role\\.kubernetes\\.io/control-plane}{"\\n"}{end}'
+    )
+    command = (
+        "sudo env KUBECONFIG="
+        + shlex.quote(KUBECONFIG_PATH)
+        + " kubectl get nodes -o jsonpath="
+        + shlex.quote(jsonpath)
+    )
+    seed_args = argparse.Namespace(**{**vars(args), "host": seed})
+    completed = subprocess.run(
+        build_ssh_command(seed_args, command),
+        check=False,
+        text=True,
+        capture_output=True,
+        timeout=args.command_timeout,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"kubectl node discovery on {seed} failed (exit {completed.returncode}): "
+            f"{completed.stderr.strip()}"
+        )
+    nodes: List[NodeTarget] = []
+    for line in completed.stdout.splitlines():
+        fields = line.split()
+        if fields:
+            address = fields[1] if len(fields) > 1 else fields[0]
+            server = len(fields) > 2 and fields[2] == "true"
+            nodes.append(NodeTarget(fields[0], address, server=server))
+    return nodes
+
+
+def discover_mdns_nodes(cluster: str, environment: str) -> List[NodeTarget]:
+    """List k3s servers advertised over mDNS via ``k3s_mdns_query.query_mdns``."""
+
+    if str(SCRIPT_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPT_DIR))
+    from k3s_mdns_query import query_mdns  # noqa: E402 - needs SCRIPT_DIR on sys.path
+
+    hosts: List[str] = []
+    for mode in ("server-hosts", "bootstrap-hosts"):
+        hosts.extend(query_mdns(mode, cluster, environment))
+    return [NodeTarget(_host_key(host), host, server=True) for host in hosts]
+
+
+def resolve_nodes(args: argparse.Namespace) -> List[NodeTarget]:
+    """Merge the positional host, ``--hosts`` entries, and discovered nodes.
+
+    Entries that name the same node (``pi-a`` vs ``pi-a.local`` vs its
+    InternalIP) are collapsed so each node is collected exactly once.
+    """
+
+    explicit = [args.host] if args.host else []
+    for entry in args.hosts:
+        explicit.extend(part.strip() for part in entry.split(",") if part.strip())
+
+    discovered: List[NodeTarget] = []
+    if args.discover == "kubectl":
+        if not explicit:
+            raise ValueError("--discover kubectl needs a host to query for the node list")
+        discovered = discover_kubectl_nodes(args, explicit[0])
+    elif args.discover == "mdns":
+        discovered = discover_mdns_nodes(args.cluster, args.environment)
+
+    nodes: List[NodeTarget] = []
+    seen: set[str] = set()
+    for node in discovered + [NodeTarget(_host_key(host), host) for host in explicit]:
+        keys = {_host_key(node.name), _host_key(node.address)}
+        if keys & seen:
+            continue
+        seen.update(keys)
+        nodes.append(node)
+    return nodes
+
+
+def cluster_host_candidates(
+    args: argparse.Namespace, nodes: Sequence[NodeTarget]
+) -> List[NodeTarget]:
+    """Order the hosts to try for cluster-scoped specs.
+
+    ``--control-plane`` goes first, then nodes known to be k3s servers, then
+    every other node as a last resort.
+    """
+
+    candidates: List[NodeTarget] = []
+    control_plane = getattr(args, "control_plane", None)
+    if control_plane:
+        key = _host_key(control_plane)
+        match = next(
+            (node for node in nodes if key in {_host_key(node.name), _host_key(node.address)}),
+            None,
+        )
+        candidates.append(match or NodeTarget(key, control_plane, server=True))
+    candidates.extend(node for node in nodes if node.server)
+    candidates.extend(nodes)
+    ordered: List[NodeTarget] = []
+    for node in candidates:
+        if node not in ordered:
+            ordered.append(node)
+    return ordered
+
+
+def probe_cluster_host(args: argparse.Namespace) -> bool:
+    """Return True when ``args.host`` answers over SSH and can read the k3s kubeconfig."""
+
+    command = "sudo -n test -r " + shlex.quote(KUBECONFIG_PATH)
+    try:
+        completed = subprocess.run(
+            build_ssh_command(args, command),
+            check=False,
+            capture_output=True,
+            timeout=args.command_timeout,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return completed.returncode == 0
+
+
+def collect_cluster(
+    args: argparse.Namespace,
+    nodes: Sequence[NodeTarget],
+    specs: Sequence[CommandSpec],
+    bundle_dir: Path,
+) -> tuple[str | None, list[dict[str, object]], list[dict[str, object]]]:
+    """Collect every node concurrently into ``bundle_dir/nodes/<name>``.
+
+    Cluster-scoped specs run once, into ``bundle_dir/cluster``, on the first
+    candidate from :func:`cluster_host_candidates` that passes
+    :func:`probe_cluster_host`; the first candidate is used if none does, so
+    its errors land in the bundle. A shared semaphore keeps at most
+    ``args.max_parallel`` remote commands in flight across all hosts. Returns
+    the cluster host's name, the cluster-scoped results, and one entry per node.
+    """
+
+    node_specs = [spec for spec in specs if spec.scope != "cluster"]
+    cluster_specs = [spec for spec in specs if spec.scope == "cluster"]
+    limiter = threading.BoundedSemaphore(max(1, args.max_parallel))
+
+    cluster_results: list[dict[str, object]] = []
+
+    def target_args(node: NodeTarget) -> argparse.Namespace:
+        return argparse.Namespace(**{**vars(args), "host": node.address, "limiter": limiter})
+
+    def collect_cluster_specs() -> str:
+        candidates = cluster_host_candidates(args, nodes)
+        chosen = next(
+            (node for node in candidates if probe_cluster_host(target_args(node))),
+            candidates[0],
+        )
+        cluster_args = target_args(chosen)
+        with shared_connection(cluster_args):
+            cluster_results.extend(
+                execute_specs(cluster_args, cluster_specs, bundle_dir / "cluster")
             )
-    return results
+        return chosen.name
+
+    def collect_node(index: int) -> dict[str, object]:
+        node = nodes[index]
+        node_args = target_args(node)
+        node_dir = bundle_dir / "nodes" / _sanitize_target_name(node.name)
+        if getattr(args, "archive", None) is None:
+            node_dir.mkdir(parents=True, exist_ok=True)
+        started = time.monotonic()
+        entry: dict[str, object] = {"name": node.name, "address": node.address}
+        with shared_connection(node_args):
+            results = execute_specs(node_args, node_specs, node_dir)
+            entry["results"] = results
+            targets = copy_targets(node_args, node_dir)
+        if targets:
+            entry["targets"] = targets
+        entry["bundle_path"] = node_dir.relative_to(bundle_dir).as_posix()
+        entry["duration_seconds"] = round(time.monotonic() - started, 3)
+        return entry
+
+    with ThreadPoolExecutor(max_workers=len(nodes) + 1) as pool:
+        cluster_future = pool.submit(collect_cluster_specs) if cluster_specs else None
+        collected = list(pool.map(collect_node, range(len(nodes))))
+        cluster_host = cluster_future.result() if cluster_future is not None else None
+    return cluster_host, cluster_results, collected
 
 
 def archive_bundle(bundle_dir: Path) -> Path:
-    tar_path = bundle_dir.with_suffix(".tar.gz")
+    tar_path = _archive_path(bundle_dir, ".tar.gz")
     with tarfile.open(tar_path, "w:gz") as tar:
         tar.add(bundle_dir, arcname=bundle_dir.name)
     return tar_path
@@ -454,29 +1088,80 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     specs = default_specs() + extra_specs
 
+    cluster_mode = bool(args.hosts or args.discover)
+    if cluster_mode:
+        try:
+            nodes = resolve_nodes(args)
+        except (ValueError, RuntimeError, OSError, subprocess.SubprocessError) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+        if not nodes:
+            print("error: no cluster nodes found to collect from", file=sys.stderr)
+            return 2
+    elif not args.host:
+        print("error: provide a host, --hosts, or --discover", file=sys.stderr)
+        return 2
+
     output_root = Path(args.output_dir)
     timestamp = datetime.now(timezone.utc)
-    bundle_dir = build_bundle_dir(output_root, args.host, timestamp)
-
-    results = execute_specs(args, specs, bundle_dir)
-    target_results = copy_targets(args, bundle_dir)
+    bundle_dir = build_bundle_dir(
+        output_root,
+        args.cluster if cluster_mode else args.host,
+        timestamp,
+        create=not args.stream_archive,
+    )
+    args.archive = StreamingArchive(bundle_dir, args.compression) if args.stream_archive else None
 
-    summary = {
-        "host": args.host,
-        "user": args.user,
-        "timestamp": timestamp.isoformat(),
-        "bundle": bundle_dir.name,
-        "results": results,
-    }
-    if target_results:
-        summary["targets"] = target_results
-    write_command_output(bundle_dir / "summary.json", json.dumps(summary, indent=2))
+    try:
+        started = time.monotonic()
+        if cluster_mode:
+            cluster_host, cluster_results, node_entries = collect_cluster(
+                args, nodes, specs, bundle_dir
+            )
+            results = list(cluster_results)
+            for entry in node_entries:
+                results.extend(entry["results"])  # type: ignore[arg-type]
+            summary = {
+                "cluster": args.cluster,
+                "user": args.user,
+                "timestamp": timestamp.isoformat(),
+                "bundle": bundle_dir.name,
+                "jobs": args.jobs,
+                "max_parallel": args.max_parallel,
+                "duration_seconds": round(time.monotonic() - started, 3),
+                "cluster_host": cluster_host,
+                "cluster_results": cluster_results,
+                "nodes": node_entries,
+            }
+        else:
+            with shared_connection(args):
+                results = execute_specs(args, specs, bundle_dir)
+                target_results = copy_targets(args, bundle_dir)
 
-    any_success = any(item["status"] == "success" for item in results)
-    if not args.no_archive:
-        tar_path = archive_bundle(bundle_dir)
-    else:
-        tar_path = None
+            summary = {
+                "host": args.host,
+                "user": args.user,
+                "timestamp": timestamp.isoformat(),
+                "bundle": bundle_dir.name,
+                "jobs": args.jobs,
+                "duration_seconds": round(time.monotonic() - started, 3),
+                "results": results,
+            }
+            if target_results:
+                summary["targets"] = target_results
+        any_success = any(item["status"] == "success" for item in results)
+        if args.archive is not None:
+            args.archive.add_bytes(
+                bundle_dir / "summary.json", json.dumps(summary, indent=2).encode()
+            )
+            tar_path = args.archive.close()
+        else:
+            write_command_output(bundle_dir / "summary.json", json.dumps(summary, indent=2))
+            tar_path = None if args.no_archive else archive_bundle(bundle_dir)
+    finally:
+        # Finish the compressor even when collection fails, so no child or fd is left behind.
+        if args.archive is not None:
+            args.archive.close()
 
     if tar_path:
         print(f"Support bundle saved to {tar_path}")
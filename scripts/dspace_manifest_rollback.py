@@ -26,6 +26,7 @@ if str(REPO_ROOT) not in sys.path:
 from scripts import app_config  # noqa: E402
 from scripts import app_chart  # noqa: E402
 from scripts import dspace_release_manifest as release  # noqa: E402
+from scripts import kube_api_client  # noqa: E402
 
 SCHEMA_VERSION = 1
 OPERATION = "dspaceManifestRollback"
@@ -101,7 +102,9 @@ Runner = Callable[[list[str]], str]
 
 
 def run(command: list[str]) -> str:
-    completed = subprocess.run(command, check=False, capture_output=True, text=True)
+    completed = kube_api_client.run(command)
+    if completed is None:
+        completed = subprocess.run(command, check=False, capture_output=True, text=True)
     if completed.returncode:
         # Command output is deliberately never reflected: verifier output may contain credentials.
         raise RollbackError(f"command failed: {command[0]}")
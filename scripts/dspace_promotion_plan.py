@@ -283,18 +283,12 @@ def render(
         )
         detail = detail[:240] if detail else "no stderr"
         raise PlanError(f"offline Helm render failed: {detail}")
-    errors = app_chart.validate_rendered_manifest(completed.stdout, inputs)
-    errors += app_chart.validate_dspace_values(completed.stdout, inputs)
+    rendered = app_chart.RenderedManifest.parse(completed.stdout)
+    errors = app_chart.validate_rendered_manifest(rendered, inputs)
+    errors += app_chart.validate_dspace_values(rendered, inputs)
     if errors:
         raise PlanError("rendered manifest validation failed: " + "; ".join(errors))
-    documents = app_chart.safe_yaml_documents(completed.stdout)
-    deployments = [
-        doc
-        for doc in documents
-        if isinstance(doc, dict)
-        and doc.get("kind") == "Deployment"
-        and app_chart.release_associated(doc, "dspace", allow_name=False)
-    ]
+    deployments = rendered.release_objects("dspace", "Deployment")
     if len(deployments) != 1 or deployments[0].get("spec", {}).get("replicas") != 2:
         raise PlanError("render must contain exactly one two-replica Deployment")
     containers = deployments[0]["spec"]["template"]["spec"]["containers"]
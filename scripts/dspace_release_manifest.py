@@ -17,6 +17,12 @@ import time
 from pathlib import Path
 from typing import Any
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import readiness_wait  # noqa: E402
+
 UPSTREAM_FIELDS_V1 = (
     "schemaVersion",
     "app",
@@ -106,6 +112,7 @@ PUBLIC_PATH_RE = re.compile(r"/[A-Za-z0-9._~!$&'()*+,;=:@%/-]*")
 PLATFORM_CHECK_RE = re.compile(r"^imagePlatformSourceRevision\[(0|[1-9][0-9]*)\]$")
 POD_SETTLE_TIMEOUT_SECONDS = 60.0
 POD_SETTLE_INTERVAL_SECONDS = 2.0
+POD_SETTLE_BACKOFF = readiness_wait.Backoff(maximum=POD_SETTLE_INTERVAL_SECONDS)
 
 
 class ManifestError(ValueError):
@@ -696,22 +703,24 @@ def _settle_release_pods(
 ) -> dict[str, Any]:
     """Wait boundedly for release pods undergoing graceful deletion to disappear."""
     runner = _run if runner is None else runner
-    monotonic = time.monotonic if monotonic is None else monotonic
-    sleeper = time.sleep if sleeper is None else sleeper
-    deadline = monotonic() + POD_SETTLE_TIMEOUT_SECONDS
-    while True:
-        pods = json.loads(runner(command))
-        terminating = [
-            item
+
+    def settled(pods: dict[str, Any]) -> bool:
+        return not any(
+            isinstance(item, dict) and item.get("metadata", {}).get("deletionTimestamp") is not None
             for item in pods.get("items", [])
-            if isinstance(item, dict)
-            and item.get("metadata", {}).get("deletionTimestamp") is not None
-        ]
-        if not terminating:
-            return pods
-        if monotonic() >= deadline:
-            raise ManifestError("timed out waiting for terminating release pods")
-        sleeper(POD_SETTLE_INTERVAL_SECONDS)
+        )
+
+    result = readiness_wait.poll_until(
+        lambda: json.loads(runner(command)),
+        settled,
+        timeout=POD_SETTLE_TIMEOUT_SECONDS,
+        backoff=POD_SETTLE_BACKOFF,
+        clock=time.monotonic if monotonic is None else monotonic,
+        sleeper=time.sleep if sleeper is None else sleeper,
+    )
+    if not result.ok:
+        raise ManifestError("timed out waiting for terminating release pods")
+    return result.value
 
 
 def finalize(
@@ -23,6 +23,9 @@ if str(REPO_ROOT) not in sys.path:
 
 from scripts import app_chart  # noqa: E402
 from scripts import app_config  # noqa: E402
+from scripts import http_probe  # noqa: E402
+from scripts import kube_api_client  # noqa: E402
+from scripts import readiness_wait  # noqa: E402
 from scripts import dspace_release_manifest as release_manifest  # noqa: E402
 
 CAPABILITIES = [
@@ -103,6 +106,7 @@ HTML_DOCUMENT_RE = re.compile(r"^\s*(?:<!doctype\s+html\b|<html\b)", re.IGNORECA
 PUBLIC_HTTP_USER_AGENT = "sugarkube-dspace-runtime-verifier/1.0"
 POD_SETTLE_TIMEOUT_SECONDS = 60.0
 POD_SETTLE_INTERVAL_SECONDS = 2.0
+POD_SETTLE_BACKOFF = readiness_wait.Backoff(maximum=POD_SETTLE_INTERVAL_SECONDS)
 BUILD_TIMESTAMP_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d{3})?Z$")
 
 
@@ -162,7 +166,11 @@ def helm_deployment_uid(metadata: object, release: str, namespace: str) -> str:
 
 def command(argv: list[str]) -> str:
     try:
-        completed = subprocess.run(argv, text=True, capture_output=True, check=False, timeout=15)
+        completed = kube_api_client.run(argv, timeout=15)
+        if completed is None:
+            completed = subprocess.run(
+                argv, text=True, capture_output=True, check=False, timeout=15
+            )
     except subprocess.TimeoutExpired:
         fail("cluster identity")
     if completed.returncode:
@@ -170,6 +178,14 @@ def command(argv: list[str]) -> str:
     return completed.stdout
 
 
+def _settled(pods: list[dict[str, Any]]) -> bool:
+    return not any(
+        isinstance(pod.get("metadata"), dict)
+        and pod["metadata"].get("deletionTimestamp") is not None
+        for pod in pods
+    )
+
+
 def settle_selected_pods(
     argv: list[str],
     *,
@@ -177,28 +193,48 @@ def settle_selected_pods(
     monotonic: Any = None,
     sleeper: Any = None,
 ) -> list[dict[str, Any]]:
-    """Fetch fresh pod snapshots until selector-matched terminations disappear."""
-    runner = command if runner is None else runner
-    monotonic = time.monotonic if monotonic is None else monotonic
-    sleeper = time.sleep if sleeper is None else sleeper
-    deadline = monotonic() + POD_SETTLE_TIMEOUT_SECONDS
-    while True:
+    """Wait until no selector-matched pod is terminating and return the settled snapshot.
+
+    With the in-process API client enabled the pods are watched, so the wait ends on the
+    deletion event itself. Otherwise fresh snapshots are fetched with backoff.
+    """
+    target = readiness_wait.kubectl_watch(argv) if runner is None else None
+    if target is not None:
         try:
-            payload = json.loads(runner(argv))
-            pods = payload.get("items") if isinstance(payload, dict) else None
-        except (json.JSONDecodeError, TypeError):
-            fail("pod/replica identity")
-        if not isinstance(pods, list) or not all(isinstance(pod, dict) for pod in pods):
+            result = readiness_wait.watch_until(
+                *target,
+                _settled,
+                timeout=POD_SETTLE_TIMEOUT_SECONDS,
+                backoff=POD_SETTLE_BACKOFF,
+                clock=time.monotonic if monotonic is None else monotonic,
+                sleeper=time.sleep if sleeper is None else sleeper,
+            )
+        except (kube_api_client.KubeApiError, OSError, ValueError):
             fail("pod/replica identity")
-        if not any(
-            isinstance(pod.get("metadata"), dict)
-            and pod["metadata"].get("deletionTimestamp") is not None
-            for pod in pods
-        ):
+    else:
+        runner = command if runner is None else runner
+
+        def snapshot() -> list[dict[str, Any]]:
+            try:
+                payload = json.loads(runner(argv))
+                pods = payload.get("items") if isinstance(payload, dict) else None
+            except (json.JSONDecodeError, TypeError):
+                fail("pod/replica identity")
+            if not isinstance(pods, list) or not all(isinstance(pod, dict) for pod in pods):
+                fail("pod/replica identity")
             return pods
-        if monotonic() >= deadline:
-            fail("pod/replica identity")
-        sleeper(POD_SETTLE_INTERVAL_SECONDS)
+
+        result = readiness_wait.poll_until(
+            snapshot,
+            _settled,
+            timeout=POD_SETTLE_TIMEOUT_SECONDS,
+            backoff=POD_SETTLE_BACKOFF,
+            clock=time.monotonic if monotonic is None else monotonic,
+            sleeper=time.sleep if sleeper is None else sleeper,
+        )
+    if not result.ok:
+        fail("pod/replica identity")
+    return result.value
 
 
 class SameOriginRedirect(urllib.request.HTTPRedirectHandler):
@@ -212,7 +248,28 @@ class SameOriginRedirect(urllib.request.HTTPRedirectHandler):
         return super().redirect_request(req, fp, code, msg, headers, newurl)
 
 
+_PROBE_ENGINE: http_probe.ProbeEngine | None = None
+
+
+def engine_fetch(url: str, public_origin: tuple[str, str] | None = None) -> bytes:
+    """Fetch through the shared probe engine so repeated public reads reuse one connection."""
+    global _PROBE_ENGINE
+    if _PROBE_ENGINE is None:
+        _PROBE_ENGINE = http_probe.ProbeEngine(
+            connect_timeout=15,
+            max_time=15,
+            allowed_schemes=("http", "https"),
+            user_agent=PUBLIC_HTTP_USER_AGENT,
+        )
+    sample = _PROBE_ENGINE.request(url, same_origin=public_origin is not None)
+    if not sample.ok or not 200 <= sample.status < 300:
+        fail("public identity" if public_origin else "direct identity")
+    return sample.body
+
+
 def fetch(url: str, public_origin: tuple[str, str] | None = None) -> bytes:
+    if http_probe.enabled():
+        return engine_fetch(url, public_origin)
     opener = (
         urllib.request.build_opener(SameOriginRedirect(public_origin))
         if public_origin
@@ -5,6 +5,12 @@ This helper expands the root filesystem when possible, waits for cloud-init to f
 invokes ``pi_node_verifier.sh`` until it succeeds (or attempts are exhausted), and writes
 machine- as well as human-readable status reports under ``/boot/first-boot-report``.
 
+The verifier runs the full suite once. It exits 0 even when checks fail, so retries follow
+the failed checks in its JSON and pass ``--only`` so that only those checks are re-run; their
+results are merged into the first run's. The merged result is the only source for
+``verifier.json`` (also read by ``publish_telemetry.py --verifier-result``), the summaries, and
+the legacy Markdown log. No check runs again just to produce another output format.
+
 Environment variables provide overridable paths so unit tests can exercise the logic
 without needing root privileges:
 
@@ -12,20 +18,21 @@ without needing root privileges:
     Directory that will receive ``summary.json``, ``summary.md``, ``summary.html``, and
     supporting log files. Defaults to ``/boot/first-boot-report``.
 ``FIRST_BOOT_LOG_PATH``
-    Destination for the legacy Markdown log appended by ``pi_node_verifier``. Defaults to
-    ``/boot/first-boot-report.txt``.
+    Destination for the legacy Markdown log (the format ``pi_node_verifier --log`` appends).
+    Defaults to ``/boot/first-boot-report.txt``.
 ``FIRST_BOOT_STATE_DIR``
     Directory that stores ``first-boot.ok``/``first-boot.failed`` markers and the
     ``rootfs-expanded`` flag. Defaults to ``/var/log/sugarkube``.
 ``FIRST_BOOT_VERIFIER``
-    Path to the verifier executable. Defaults to ``/usr/local/sbin/pi_node_verifier.sh``.
+    Path to the verifier executable. Defaults to ``/usr/local/sbin/pi_node_verifier.sh``,
+    or ``/usr/local/sbin/pi_node_verifier.py`` when ``SUGARKUBE_VERIFIER_ENGINE=python``
+    selects the concurrent engine.
 ``FIRST_BOOT_ATTEMPTS``
     Number of verifier attempts before giving up. Defaults to ``3``.
 ``FIRST_BOOT_RETRY_DELAY``
     Seconds to sleep between attempts. Defaults to ``30``.
 ``FIRST_BOOT_SKIP_LOG``
-    When set to ``1`` the script skips the additional ``--log`` invocation. Useful for
-    tests that stub the verifier.
+    When set to ``1`` the script does not append the legacy Markdown log.
 ``FIRST_BOOT_CLOUD_INIT_TIMEOUT``
     Timeout (seconds) for ``cloud-init status --wait --long``. Defaults to ``300``.
 """
@@ -192,6 +199,34 @@ def _gather_cloud_init(timeout: int) -> tuple[Optional[str], Optional[int]]:
     return stdout, result.returncode
 
 
+def _failed_checks(data: Optional[dict]) -> list[str]:
+    if not isinstance(data, dict) or not isinstance(data.get("checks"), list):
+        return []
+    return [
+        entry["name"]
+        for entry in data["checks"]
+        if isinstance(entry, dict)
+        and isinstance(entry.get("name"), str)
+        and entry.get("status") == "fail"
+    ]
+
+
+def _merge_results(previous: dict, rerun: dict) -> dict:
+    """Overlay re-run checks onto ``previous`` while keeping the original check order."""
+
+    latest = {
+        entry.get("name"): entry for entry in rerun.get("checks", []) if isinstance(entry, dict)
+    }
+    checks = [latest.pop(entry.get("name"), entry) for entry in previous.get("checks", [])]
+    merged = {**previous, **rerun, "checks": checks + list(latest.values())}
+    warnings = list(rerun.get("warnings", []))
+    if warnings:
+        merged["warnings"] = warnings
+    else:
+        merged.pop("warnings", None)
+    return merged
+
+
 def _run_verifier(
     verifier: Path,
     attempts: int,
@@ -204,11 +239,17 @@ def _run_verifier(
     last_stderr = ""
     last_data: Optional[dict] = None
     exit_code = 1
+    rerun: list[str] = []
 
     for attempt in range(1, attempts + 1):
-        _log(f"running verifier attempt {attempt}/{attempts}")
+        command = [str(verifier), "--json", "--no-log"]
+        if rerun:
+            _log(f"re-running failed checks {', '.join(rerun)} (attempt {attempt}/{attempts})")
+            command.extend(["--only", ",".join(rerun)])
+        else:
+            _log(f"running verifier attempt {attempt}/{attempts}")
         process = subprocess.run(
-            [str(verifier), "--json", "--no-log"],
+            command,
             capture_output=True,
             text=True,
             check=False,
@@ -217,20 +258,27 @@ def _run_verifier(
         last_stderr = process.stderr.strip()
         exit_code = process.returncode
 
+        data: Optional[dict] = None
         if last_stdout:
             try:
-                last_data = json.loads(last_stdout)
+                data = json.loads(last_stdout)
             except json.JSONDecodeError as exc:
                 _warn(f"failed to parse verifier JSON output: {exc}")
-                last_data = None
-        else:
-            last_data = None
-
-        if exit_code == 0 and last_data is not None:
+        if data is not None and rerun and last_data is not None:
+            data = _merge_results(last_data, data)
+        last_data = data
+
+        # pi_node_verifier exits 0 even when checks fail, so the JSON decides what to retry.
+        # Checks that passed stay passed; a run without usable JSON repeats the whole suite.
+        rerun = _failed_checks(last_data)
+        if exit_code == 0 and last_data is not None and not rerun:
             return VerifierResult(last_data, exit_code, last_stdout, last_stderr, attempt)
 
         if attempt < attempts:
-            _warn("verifier did not succeed (exit %s); retrying after %ss" % (exit_code, delay))
+            if rerun:
+                _warn(f"{len(rerun)} verifier check(s) failed; retrying after {delay}s")
+            else:
+                _warn(f"verifier did not succeed (exit {exit_code}); retrying after {delay}s")
             time.sleep(delay)
 
     if last_data is None:
@@ -239,17 +287,57 @@ def _run_verifier(
     return VerifierResult(last_data, exit_code, last_stdout, last_stderr, attempts)
 
 
-def _invoke_verifier_log(verifier: Path, log_path: Path) -> int:
+def _append_verifier_log(
+    log_path: Path, result: VerifierResult, cloud_init_text: Optional[str]
+) -> None:
+    """Append the ``pi_node_verifier --log`` Markdown section rendered from ``result``."""
+
     _log("appending verifier report to %s" % log_path)
-    process = subprocess.run(
-        [str(verifier), "--log", str(log_path)],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    if process.stderr.strip():
-        _warn(f"verifier --log stderr: {process.stderr.strip()}")
-    return process.returncode
+    lines = [f"## {datetime.now().astimezone().isoformat(timespec='seconds')}", ""]
+    uname = platform.uname()
+    lines.append(f"* Hostname: `{socket.gethostname()}`")
+    lines.append(f"* Kernel: `{uname.system} {uname.release}`")
+    try:
+        model = Path("/proc/device-tree/model").read_text().replace("\0", "").strip()
+    except OSError:
+        model = ""
+    if model:
+        lines.append(f"* Hardware: `{model}`")
+    lines += ["", "### Verifier Checks", "", "| Check | Status |", "| --- | --- |"]
+    for entry in result.data.get("checks", []):
+        if isinstance(entry, dict):
+            lines.append(f"| {entry.get('name', '')} | {entry.get('status', 'unknown')} |")
+
+    lines += ["", "### Migration Steps", ""]
+    migration_log = Path(os.environ.get("MIGRATION_LOG", "/var/log/sugarkube/migrations.log"))
+    try:
+        steps = migration_log.read_text().splitlines()
+    except OSError:
+        steps = []
+    lines += [f"* {step}" for step in steps] or ["_No migration steps recorded yet._"]
+
+    if cloud_init_text is not None:
+        lines += ["", "### cloud-init Status", ""]
+        lines += [f"    {line}" for line in cloud_init_text.splitlines()]
+
+    lsblk = shutil.which("lsblk")
+    if lsblk:
+        snapshot = subprocess.run(
+            [lsblk, "-o", "NAME,SIZE,MODEL,SERIAL"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        lines += ["", "### Storage Snapshot", ""]
+        output = snapshot.stdout.rstrip().splitlines() if snapshot.returncode == 0 else []
+        lines += [f"    {line}" for line in output] or ["    (lsblk output unavailable)"]
+
+    try:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with log_path.open("a", encoding="utf-8") as handle:
+            handle.write("\n".join(lines) + "\n\n")
+    except OSError as exc:
+        _warn(f"failed to append verifier report to {log_path}: {exc}")
 
 
 def _render_summary(result: VerifierResult, metadata: dict, cloud_init_text: Optional[str]) -> dict:
@@ -487,7 +575,9 @@ def main() -> int:
     report_dir = Path(os.environ.get("FIRST_BOOT_REPORT_DIR", "/boot/first-boot-report"))
     log_path = Path(os.environ.get("FIRST_BOOT_LOG_PATH", "/boot/first-boot-report.txt"))
     state_dir = Path(os.environ.get("FIRST_BOOT_STATE_DIR", "/var/log/sugarkube"))
-    verifier = Path(os.environ.get("FIRST_BOOT_VERIFIER", "/usr/local/sbin/pi_node_verifier.sh"))
+    engine = os.environ.get("SUGARKUBE_VERIFIER_ENGINE", "").strip().lower()
+    default_verifier = "/usr/local/sbin/pi_node_verifier" + (".py" if engine == "python" else ".sh")
+    verifier = Path(os.environ.get("FIRST_BOOT_VERIFIER", default_verifier))
     attempts = int(os.environ.get("FIRST_BOOT_ATTEMPTS", "3"))
     delay = int(os.environ.get("FIRST_BOOT_RETRY_DELAY", "30"))
     skip_log = os.environ.get("FIRST_BOOT_SKIP_LOG", "0") == "1"
@@ -526,16 +616,18 @@ def main() -> int:
     result = _run_verifier(verifier, attempts, delay)
     _write_verifier_stderr(report_dir / "verifier.stderr", result.stderr)
 
-    log_exit = 0
     if not skip_log:
         _ensure_boot_writable(log_path)
-        log_exit = _invoke_verifier_log(verifier, log_path)
+        _append_verifier_log(log_path, result, cloud_init_text)
 
     payload = _render_summary(result, metadata, cloud_init_text)
+    verifier_json = report_dir / "verifier.json"
     summary_json = report_dir / "summary.json"
     summary_md = report_dir / "summary.md"
     summary_html = report_dir / "summary.html"
 
+    _ensure_boot_writable(verifier_json)
+    _write_json(verifier_json, result.data)
     _ensure_boot_writable(summary_json)
     _write_json(summary_json, payload)
     _ensure_boot_writable(summary_md)
@@ -570,10 +662,9 @@ def main() -> int:
         f"Report directory: {report_dir}",
         f"Summary JSON: {report_dir / 'summary.json'}",
     ]
-    overall_exit = result.exit_code if result.exit_code != 0 else log_exit
+    overall_exit = result.exit_code
     if overall_exit != 0:
         report_lines.append(f"Verifier exit: {result.exit_code}")
-        report_lines.append(f"Log exit: {log_exit}")
 
     _notify_teams(
         "first-boot",
@@ -583,7 +674,7 @@ def main() -> int:
     )
 
     if overall_exit != 0:
-        fail_marker.write_text(f"verifier exit code {result.exit_code}; log exit code {log_exit}\n")
+        fail_marker.write_text(f"verifier exit code {result.exit_code}\n")
         if ok_marker.exists():
             ok_marker.unlink()
         return overall_exit or 1
@@ -19,6 +19,12 @@ Flash to an explicit device (non-interactive)::
     sudo python scripts/flash_pi_media.py --image ~/sugarkube/images/sugarkube.img.xz \
         --device /dev/sdX --assume-yes
 
+Fan the same image out to several devices at once (decompressed once, one writer
+thread per device)::
+
+    sudo python scripts/flash_pi_media.py --image ~/sugarkube/images/sugarkube.img.xz \
+        --device /dev/sdX --device /dev/sdY --device /dev/sdZ --assume-yes
+
 Regular files are accepted as ``--device`` targets which makes automated
 testing and dry-runs possible without touching real hardware.
 
@@ -30,25 +36,54 @@ from __future__ import annotations
 
 import argparse
 import contextlib
+import errno
 import hashlib
 import io
 import json
+import mmap
 import os
 import platform
+import queue
+import random
 import re
 import shutil
 import stat
+import struct
 import subprocess
 import sys
 import tempfile
 import textwrap
+import threading
 import time
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Iterator, List, Optional, Sequence
+from typing import Iterable, Iterator, List, Mapping, Optional, Sequence
 
 CHUNK_SIZE = 4 * 1024 * 1024  # 4 MiB to balance throughput and memory usage.
+MIN_CHUNK_SIZE = 1 * 1024 * 1024
+MAX_CHUNK_SIZE = 16 * 1024 * 1024  # caps the pipeline at PIPELINE_DEPTH x 16 MiB of buffers.
+PIPELINE_DEPTH = 4  # preallocated buffers shared by the read/hash/write stages.
+ADAPT_FAST_WRITE = 0.05  # seconds; grow the chunk size when writes finish faster.
+ADAPT_SLOW_WRITE = 0.5  # seconds; shrink the chunk size when writes take longer.
+DIRECT_IO_ALIGNMENT = 4096
+SPARSE_BLOCK_SIZE = 256 * 1024  # granularity for detecting all-zero runs in sparse mode.
+SPARSE_SECTOR_SIZE = 512  # BLKDISCARD/BLKZEROOUT ranges must be sector aligned.
+BLKDISCARD = 0x1277  # _IO(0x12, 119) from <linux/fs.h>
+BLKZEROOUT = 0x127F  # _IO(0x12, 127) from <linux/fs.h>
+SPARSE_METHODS = ("zeroout", "discard")
+MANIFEST_BLOCK_SIZE = 4 * 1024 * 1024  # granularity of the per-block hash manifest.
+MANIFEST_SUFFIX = ".blocks.json"
+MANIFEST_VERSION = 1
+VERIFY_MODES = ("full", "sample")
+VERIFY_WORKERS = 4  # concurrent reader threads during verification.
+VERIFY_SAMPLE_BLOCKS = 32  # blocks read back by --verify sample (plus the first and last).
+CACHE_MAX_GB = 20.0  # default disk budget for --cache-dir.
+CACHE_IMAGE_NAME = "image.img"
 PROGRESS_INTERVAL = 1.0  # seconds
+FANOUT_QUEUE_DEPTH = 8  # chunks buffered per device (32 MiB) to absorb write jitter.
+FANOUT_STALL_TIMEOUT = 120.0  # seconds a single device may block the shared reader.
 LINUX_BY_ID_ROOT = Path("/dev/disk/by-id")
 LINUX_SYS_BLOCK_ROOT = Path("/sys/block")
 
@@ -132,6 +167,26 @@ class Device:
         return _format_size(self.size)
 
 
+@dataclass
+class FanOutResult:
+    """Outcome of writing the shared image stream to one device."""
+
+    path: str
+    bytes_written: int = 0
+    sha256: str = ""
+    # Image SHA-256 that every device block was read back and matched against
+    # (full verification only).
+    verified_sha256: str = ""
+    error: Optional[str] = None
+    # Ranges sparse mode skipped that are guaranteed to read back as zeros.
+    zero_ranges: List[tuple[int, int]] = field(default_factory=list)
+    verification: Optional[BlockVerification] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 @dataclass
 class BootPartition:
     """Metadata about a boot partition used for cloud-init overrides."""
@@ -691,7 +746,17 @@ def _check_not_root_device(path: str) -> None:
         )
 
 
-def _open_device(path: str, write: bool) -> io.BufferedIOBase:
+def _open_device(
+    path: str, write: bool, *, sync: bool = True, direct: bool = False
+) -> io.BufferedIOBase:
+    """Open ``path`` for raw image I/O.
+
+    ``sync`` keeps the historical ``O_SYNC`` behaviour; the pipelined writer
+    disables it and issues a single ``fsync`` instead. ``direct`` requests
+    ``O_DIRECT`` (Linux only) and returns an unbuffered file so every write
+    reaches the kernel with the caller's alignment intact.
+    """
+
     flags = os.O_RDONLY
     mode = "rb"
     if write:
@@ -699,8 +764,20 @@ def _open_device(path: str, write: bool) -> io.BufferedIOBase:
         mode = "wb"
     if hasattr(os, "O_BINARY"):
         flags |= os.O_BINARY
-    if write and hasattr(os, "O_SYNC"):
+    if write and sync and hasattr(os, "O_SYNC"):
         flags |= os.O_SYNC
+    if write and direct:
+        if not hasattr(os, "O_DIRECT"):
+            warn("O_DIRECT is not available on this platform; using buffered writes")
+        else:
+            try:
+                fd = os.open(path, flags | os.O_DIRECT)
+            except OSError as exc:
+                if exc.errno != errno.EINVAL:
+                    raise
+                warn(f"{path} does not support O_DIRECT; using buffered writes")
+            else:
+                return os.fdopen(fd, mode, buffering=0)
     fd = os.open(path, flags)
     return os.fdopen(fd, mode)
 
@@ -713,41 +790,1396 @@ def _open_image(path: Path) -> tuple[io.BufferedReader, bool]:
     return io.BufferedReader(open(path, "rb")), False
 
 
-def _stream_write(src: io.BufferedReader, dest: io.BufferedRandom) -> tuple[int, str]:
-    sha = hashlib.sha256()
-    total = 0
-    last_report = time.monotonic()
-    while True:
-        chunk = src.read(CHUNK_SIZE)
-        if not chunk:
+@dataclass
+class StageStats:
+    """Bytes moved and busy time spent by one pipeline stage."""
+
+    name: str
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        if self.seconds <= 0:
+            return 0.0
+        return self.bytes / self.seconds / 1_000_000
+
+
+@dataclass
+class PipelineStats:
+    """Per-stage and wall-clock throughput for one :func:`_stream_write` run."""
+
+    read: StageStats
+    hash: StageStats
+    write: StageStats
+    wall_seconds: float = 0.0
+    final_chunk_size: int = 0
+    skipped_bytes: int = 0
+    # Ranges skipped in sparse mode that are guaranteed to read back as zeros.
+    zero_ranges: List[tuple[int, int]] = field(default_factory=list)
+
+    @classmethod
+    def empty(cls) -> "PipelineStats":
+        return cls(read=StageStats("read"), hash=StageStats("hash"), write=StageStats("write"))
+
+    @property
+    def stages(self) -> tuple[StageStats, StageStats, StageStats]:
+        return (self.read, self.hash, self.write)
+
+    @property
+    def wall_mb_per_second(self) -> float:
+        if self.wall_seconds <= 0:
+            return 0.0
+        return self.write.bytes / self.wall_seconds / 1_000_000
+
+    def summary(self) -> str:
+        stages = ", ".join(
+            f"{stage.name} {stage.mb_per_second:.1f} MB/s" for stage in self.stages if stage.bytes
+        )
+        summary = f"{stages}; overall {self.wall_mb_per_second:.1f} MB/s"
+        if self.skipped_bytes:
+            summary += f"; skipped {_format_size(self.skipped_bytes)} of zeros"
+        return summary
+
+
+class _PipelineAborted(Exception):
+    """Raised inside a pipeline stage once another stage has failed."""
+
+
+class _AdaptiveChunkSize:
+    """Grow the chunk size while writes are fast and shrink it when they stall."""
+
+    def __init__(self, initial: int) -> None:
+        self.size = min(max(initial, MIN_CHUNK_SIZE), MAX_CHUNK_SIZE)
+
+    def observe(self, nbytes: int, seconds: float) -> None:
+        if nbytes < self.size:
+            return
+        if seconds < ADAPT_FAST_WRITE and self.size < MAX_CHUNK_SIZE:
+            self.size *= 2
+        elif seconds > ADAPT_SLOW_WRITE and self.size > MIN_CHUNK_SIZE:
+            self.size //= 2
+
+
+def _readinto_full(src: io.BufferedIOBase, view: memoryview) -> int:
+    """Fill ``view`` from ``src`` unless EOF arrives first; return bytes read."""
+
+    filled = 0
+    while filled < len(view):
+        count = src.readinto(view[filled:])
+        if not count:
             break
-        dest.write(chunk)
-        total += len(chunk)
-        sha.update(chunk)
-        now = time.monotonic()
-        if now - last_report >= PROGRESS_INTERVAL:
-            info(f"Wrote {_format_size(total)} so far")
-            last_report = now
-    dest.flush()
-    os.fsync(dest.fileno())
+        filled += count
+    return filled
+
+
+def _write_all(dest: io.IOBase, view: memoryview) -> None:
+    written = 0
+    while written < len(view):
+        count = dest.write(view[written:])
+        if count is None:  # pragma: no cover - non-blocking raw files only
+            continue
+        written += count
+
+
+def _disable_direct_io(dest: io.IOBase) -> None:
+    if not hasattr(os, "O_DIRECT"):
+        return
+    import fcntl
+
+    fd = dest.fileno()
+    flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+    if flags & os.O_DIRECT:
+        fcntl.fcntl(fd, fcntl.F_SETFL, flags & ~os.O_DIRECT)
+
+
+_ZERO_CHUNK: mmap.mmap | None = None
+_ZERO_BLOCK = bytes(SPARSE_BLOCK_SIZE)
+
+
+def _zeros(size: int) -> memoryview:
+    """Return a read-only view of ``size`` zero bytes without reallocating.
+
+    The zeros live in an anonymous mapping, so the view is page-aligned and safe
+    to hand to an ``O_DIRECT`` descriptor.
+    """
+
+    global _ZERO_CHUNK
+    if _ZERO_CHUNK is None or len(_ZERO_CHUNK) < size:
+        _ZERO_CHUNK = mmap.mmap(-1, max(size, MAX_CHUNK_SIZE))
+    return memoryview(_ZERO_CHUNK).toreadonly()[:size]
+
+
+def _is_hole(src: io.BufferedReader, offset: int, size: int) -> bool:
+    """Return True when ``[offset, offset + size)`` of a raw image is a filesystem hole."""
+
+    if not hasattr(os, "SEEK_DATA"):
+        return False
+    fd = src.fileno()
+    try:
+        data = os.lseek(fd, offset, os.SEEK_DATA)
+    except OSError as exc:
+        # ENXIO: no data past ``offset``; anything else means holes are unsupported.
+        is_hole = exc.errno == errno.ENXIO
+    else:
+        is_hole = data >= offset + size
+    finally:
+        src.seek(offset)  # resynchronise the buffered reader with the raw descriptor.
+    return is_hole
+
+
+def _is_zero_block(buf: mmap.mmap, start: int, end: int) -> bool:
+    # Checking the edge bytes first avoids copying data blocks just to compare them;
+    # bytes-to-bytes equality is a memcmp, unlike comparisons against memoryviews.
+    if buf[start] or buf[end - 1]:
+        return False
+    return buf[start:end] == _ZERO_BLOCK[: end - start]
+
+
+class _SparseTarget:
+    """Skip all-zero runs on the destination instead of writing them.
+
+    ``seek`` leaves holes in a truncated regular file. ``zeroout`` and
+    ``discard`` ask a Linux block device to clear the range itself via
+    ``BLKZEROOUT``/``BLKDISCARD``. Ranges cleared by ``seek`` or ``zeroout``
+    are guaranteed to read back as zeros, so verification can skip them.
+    """
+
+    def __init__(self, dest: io.IOBase, method: str, stats: PipelineStats) -> None:
+        self.dest = dest
+        self.method = method
+        self.stats = stats
+
+    @property
+    def trusted(self) -> bool:
+        return self.method in {"seek", "zeroout"}
+
+    def begin(self) -> None:
+        if self.method == "seek":
+            self.dest.seek(0)
+            self.dest.truncate(0)
+
+    def finish(self, total: int) -> None:
+        if self.method == "seek":
+            self.dest.truncate(total)
+
+    def write(self, buf: mmap.mmap | None, count: int, offset: int) -> None:
+        view = memoryview(buf)[:count] if buf is not None else None
+        run_start = 0
+        run_zero: bool | None = None
+        for start in range(0, count, SPARSE_BLOCK_SIZE):
+            end = min(start + SPARSE_BLOCK_SIZE, count)
+            is_zero = buf is None or _is_zero_block(buf, start, end)
+            if run_zero is None:
+                run_zero = is_zero
+            elif is_zero != run_zero:
+                self._emit(view, run_start, start, run_zero, offset)
+                run_start, run_zero = start, is_zero
+        if run_zero is not None:
+            self._emit(view, run_start, count, run_zero, offset)
+
+    def _emit(self, view: memoryview | None, start: int, end: int, zero: bool, offset: int) -> None:
+        length = end - start
+        if zero and self._skip(offset + start, length):
+            self.stats.skipped_bytes += length
+            if self.trusted:
+                ranges = self.stats.zero_ranges
+                if ranges and ranges[-1][0] + ranges[-1][1] == offset + start:
+                    ranges[-1] = (ranges[-1][0], ranges[-1][1] + length)
+                else:
+                    ranges.append((offset + start, length))
+            return
+        _write_all(self.dest, view[start:end] if view is not None else _zeros(length))
+
+    def _skip(self, position: int, length: int) -> bool:
+        if self.method == "seek":
+            self.dest.seek(position + length)
+            return True
+        if self.method == "write":
+            return False
+        if position % SPARSE_SECTOR_SIZE or length % SPARSE_SECTOR_SIZE:
+            return False
+        import fcntl
+
+        request = BLKZEROOUT if self.method == "zeroout" else BLKDISCARD
+        self.dest.flush()
+        try:
+            fcntl.ioctl(self.dest.fileno(), request, struct.pack("QQ", position, length))
+        except OSError as exc:
+            warn(f"{self.method} is not supported by the target ({exc}); writing zeros instead")
+            self.method = "write"
+            return False
+        self.dest.seek(position + length)
+        return True
+
+
+def _sparse_method(path: str, requested: str) -> str | None:
+    """Pick how sparse mode skips zero runs for ``path``, or ``None`` to disable it."""
+
+    if not _is_block_device(path):
+        return "seek"
+    if platform.system() != "Linux":
+        warn("Sparse mode on block devices requires Linux; writing every byte instead")
+        return None
+    return requested
+
+
+@dataclass
+class _Chunk:
+    """A filled pipeline buffer shared by every writer until each one releases it."""
+
+    buf: mmap.mmap | None  # ``None`` marks a source hole that reads back as zeros.
+    count: int
+    refs: int = 0
+
+
+class _PipelineWriter(threading.Thread):
+    """Write the shared chunk stream to one destination on its own thread.
+
+    ``dest`` is written as-is; without it ``path`` is opened on the writer thread
+    so a device that cannot be opened only fails its own result. A writer that
+    :meth:`catch_up` detaches from the stream finishes from its own read of the
+    raw image instead.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        dest: io.IOBase | None = None,
+        direct: bool = False,
+        sparse: str | None = None,
+        stats: PipelineStats | None = None,
+        progress: bool = False,
+    ) -> None:
+        super().__init__(name=f"flash-write-{path}", daemon=True)
+        self.dest = dest
+        self.direct = direct
+        self.sparse = sparse
+        self.stats = stats if stats is not None else PipelineStats.empty()
+        self.progress = progress
+        self.result = FanOutResult(path=path)
+        self.chunks: "queue.Queue[_Chunk | None]" = queue.Queue()
+        self.failed = threading.Event()
+        self.detached = threading.Event()
+        self.catch_up_path: Path | None = None
+        self.position = 0
+        self.consumed = 0  # shared chunks written, used to spot a writer falling behind.
+        self.pipeline: _FlashPipeline | None = None
+
+    def run(self) -> None:
+        assert self.pipeline is not None
+        try:
+            if self.dest is not None:
+                self._drain(self.dest)
+            else:
+                with _open_device(
+                    self.result.path, write=True, sync=False, direct=self.direct
+                ) as dest:
+                    self._drain(dest)
+        except _PipelineAborted:
+            return
+        except BaseException as exc:  # noqa: BLE001 - reported through the pipeline
+            self.pipeline.writer_failed(self, exc)
+
+    def fail(self, message: str) -> None:
+        if self.result.error is None:
+            self.result.error = message
+        self.failed.set()
+        self.release_pending()
+
+    def catch_up(self, source: Path) -> None:
+        """Leave the shared stream and finish by reading ``source`` from our own offset."""
+
+        self.catch_up_path = source
+        self.detached.set()
+        self.release_pending()
+
+    def release_pending(self) -> None:
+        """Hand queued buffers back to the pipeline so a dead writer never pins them."""
+
+        assert self.pipeline is not None
+        with contextlib.suppress(queue.Empty):
+            while True:
+                self.pipeline.release(self.chunks.get_nowait())
+
+    def _next(self) -> _Chunk | None:
+        assert self.pipeline is not None
+        while True:
+            if self.pipeline.abort.is_set() or self.failed.is_set():
+                raise _PipelineAborted
+            if self.detached.is_set():
+                return None
+            try:
+                chunk = self.chunks.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if self.failed.is_set():
+                self.pipeline.release(chunk)
+                raise _PipelineAborted
+            if self.detached.is_set():
+                self.pipeline.release(chunk)
+                return None
+            return chunk
+
+    def _drain(self, dest: io.IOBase) -> None:
+        assert self.pipeline is not None
+        target = _SparseTarget(dest, self.sparse, self.stats) if self.sparse else None
+        if target is not None:
+            target.begin()
+        last_report = time.monotonic()
+        while True:
+            chunk = self._next()
+            if chunk is None:
+                if self.detached.is_set():
+                    self._catch_up(dest, target)
+                break
+            try:
+                self._write(dest, target, chunk)
+            finally:
+                self.pipeline.release(chunk)
+            self.consumed += 1
+            now = time.monotonic()
+            if self.progress and now - last_report >= PROGRESS_INTERVAL:
+                info(f"Wrote {_format_size(self.position)} so far")
+                last_report = now
+        if target is not None:
+            target.finish(self.position)
+        dest.flush()
+        started = time.perf_counter()
+        os.fsync(dest.fileno())
+        self.stats.write.seconds += time.perf_counter() - started
+
+    def _catch_up(self, dest: io.IOBase, target: _SparseTarget | None) -> None:
+        assert self.pipeline is not None and self.catch_up_path is not None
+        buf = mmap.mmap(-1, MAX_CHUNK_SIZE)
+        with open(self.catch_up_path, "rb") as src:
+            src.seek(self.position)
+            while True:
+                if self.pipeline.abort.is_set() or self.failed.is_set():
+                    raise _PipelineAborted
+                count = _readinto_full(src, memoryview(buf)[: self.pipeline.chunk.size])
+                if not count:
+                    return
+                self._write(dest, target, _Chunk(buf, count))
+
+    def _write(self, dest: io.IOBase, target: _SparseTarget | None, chunk: _Chunk) -> None:
+        assert self.pipeline is not None
+        buf, count = chunk.buf, chunk.count
+        if self.direct and count % DIRECT_IO_ALIGNMENT:
+            _disable_direct_io(dest)
+        started = time.perf_counter()
+        if target is not None:
+            target.write(buf, count, self.position)
+        elif buf is None:
+            _write_all(dest, _zeros(count))
+        else:
+            _write_all(dest, memoryview(buf)[:count])
+        elapsed = time.perf_counter() - started
+        self.stats.write.seconds += elapsed
+        self.stats.write.bytes += count
+        if buf is not None and not self.detached.is_set():
+            self.pipeline.chunk.observe(count, elapsed)
+        self.position += count
+
+
+class _FlashPipeline:
+    """Shared read → hash stages feeding one :class:`_PipelineWriter` per destination.
+
+    Chunks travel through a small pool of preallocated, page-aligned buffers so
+    decompression, hashing, and device writes overlap instead of running back
+    to back. Every writer gets each chunk; a buffer returns to the pool once all
+    writers have released it.
+
+    With ``isolate`` a failing writer only fails its own result, and a reader
+    that waits longer than ``stall_timeout`` for a free buffer detaches the
+    writer furthest behind. Without it the first writer error aborts the whole
+    pipeline.
+
+    ``spare_buffers`` lets a slower writer fall that many chunks behind the
+    fastest one. Past that, a ``source_path`` (the raw image behind ``src``)
+    lets the laggard :meth:`~_PipelineWriter.catch_up` on its own, so one slow
+    card never paces the rest. Compressed sources have nothing to re-read, so
+    there the stream waits for the laggard up to ``stall_timeout``.
+    """
+
+    def __init__(
+        self,
+        src: io.BufferedIOBase,
+        writers: Sequence[_PipelineWriter],
+        *,
+        stats: PipelineStats,
+        raw_source: bool = False,
+        blocks: _BlockHasher | None = None,
+        known_sha256: str | None = None,
+        isolate: bool = False,
+        spare_buffers: int = 0,
+        stall_timeout: float | None = None,
+        source_path: Path | None = None,
+    ) -> None:
+        self.src = src
+        self.writers = list(writers)
+        self.stats = stats
+        self.blocks = blocks
+        self.known_sha256 = known_sha256
+        self.isolate = isolate
+        self.stall_timeout = stall_timeout
+        self.source_path = source_path
+        self.lag_budget = max(spare_buffers, 1)
+        self.chunk = _AdaptiveChunkSize(CHUNK_SIZE)
+        self.free: "queue.Queue[mmap.mmap]" = queue.Queue()
+        for _ in range(PIPELINE_DEPTH + spare_buffers):
+            self.free.put(mmap.mmap(-1, MAX_CHUNK_SIZE))
+        self.to_hash: "queue.Queue[_Chunk | None]" = queue.Queue()
+        self.abort = threading.Event()
+        self.errors: list[BaseException] = []
+        self.sha = hashlib.sha256()
+        self.total = 0
+        self._lock = threading.Lock()
+        self.probe_holes = raw_source and any(writer.sparse for writer in self.writers)
+        self.image_size = 0
+        if self.probe_holes:
+            try:
+                self.image_size = os.fstat(src.fileno()).st_size
+            except (OSError, io.UnsupportedOperation):
+                self.probe_holes = False
+        for writer in self.writers:
+            writer.pipeline = self
+
+    def release(self, chunk: _Chunk | None) -> None:
+        if chunk is None or chunk.buf is None:
+            return
+        with self._lock:
+            chunk.refs -= 1
+            done = chunk.refs == 0
+        if done:
+            self.free.put(chunk.buf)
+
+    def writer_failed(self, writer: _PipelineWriter, exc: BaseException) -> None:
+        if self.isolate:
+            writer.fail(f"write failed: {exc}")
+            if all(other.failed.is_set() for other in self.writers):
+                self.abort.set()
+            return
+        self.errors.append(exc)
+        self.abort.set()
+
+    def _take(self, source: queue.Queue):
+        while True:
+            if self.abort.is_set():
+                raise _PipelineAborted
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def _take_free(self) -> mmap.mmap:
+        waited_since = time.monotonic()
+        while True:
+            if self.abort.is_set():
+                raise _PipelineAborted
+            try:
+                return self.free.get(timeout=0.1)
+            except queue.Empty:
+                pass
+            if self.source_path is not None and self._release_laggard():
+                continue
+            if self.stall_timeout is None:
+                continue
+            if time.monotonic() - waited_since >= self.stall_timeout:
+                self._detach_laggard()
+                waited_since = time.monotonic()
+
+    def _streaming(self) -> list[_PipelineWriter]:
+        return [
+            writer
+            for writer in self.writers
+            if not writer.failed.is_set() and not writer.detached.is_set()
+        ]
+
+    def _release_laggard(self) -> bool:
+        """Send a writer that fell ``lag_budget`` chunks behind off to catch up alone."""
+
+        streaming = self._streaming()
+        if len(streaming) < 2:
+            return False
+        leader = max(streaming, key=lambda writer: writer.consumed)
+        laggard = min(streaming, key=lambda writer: writer.consumed)
+        if leader.consumed - laggard.consumed < self.lag_budget:
+            return False
+        assert self.source_path is not None
+        info(
+            f"{laggard.result.path} fell {leader.consumed - laggard.consumed} chunks behind; "
+            f"it continues from its own read of {self.source_path.name}"
+        )
+        laggard.catch_up(self.source_path)
+        return True
+
+    def _detach_laggard(self) -> None:
+        active = self._streaming()
+        if not active:
+            return
+        # The writer furthest behind holds the oldest buffers the reader is waiting for.
+        laggard = min(active, key=lambda writer: writer.position)
+        laggard.fail(f"stalled for more than {self.stall_timeout:.0f}s; detached from the fan-out")
+
+    def _dispatch(self, chunk: _Chunk | None) -> None:
+        if all(writer.failed.is_set() for writer in self.writers):
+            self.abort.set()
+            raise _PipelineAborted
+        # Catching-up writers read the image themselves; the stream still feeds the hash.
+        streaming = self._streaming()
+        if chunk is not None:
+            chunk.refs = len(streaming)
+            if not streaming and chunk.buf is not None:
+                self.free.put(chunk.buf)
+        for writer in streaming:
+            writer.chunks.put(chunk)
+            if writer.failed.is_set() or writer.detached.is_set():
+                # The writer left the stream while we were handing it the chunk.
+                writer.release_pending()
+
+    def _stage(self, func):
+        def runner() -> None:
+            try:
+                func()
+            except _PipelineAborted:
+                return
+            except BaseException as exc:  # noqa: BLE001 - re-raised on the caller thread
+                self.errors.append(exc)
+                self.abort.set()
+
+        return runner
+
+    def _read_stage(self) -> None:
+        stats = self.stats
+        offset = 0
+        while True:
+            if self.probe_holes and offset < self.image_size:
+                size = min(self.chunk.size, self.image_size - offset)
+                if _is_hole(self.src, offset, size):
+                    self.src.seek(offset + size)
+                    offset += size
+                    stats.read.bytes += size
+                    self.to_hash.put(_Chunk(None, size))
+                    continue
+            buf = self._take_free()
+            started = time.perf_counter()
+            count = _readinto_full(self.src, memoryview(buf)[: self.chunk.size])
+            stats.read.seconds += time.perf_counter() - started
+            if not count:
+                self.free.put(buf)
+                self.to_hash.put(None)
+                return
+            offset += count
+            stats.read.bytes += count
+            self.to_hash.put(_Chunk(buf, count))
+
+    def _hash_stage(self) -> None:
+        stats = self.stats
+        last_report = time.monotonic()
+        while True:
+            chunk = self._take(self.to_hash)
+            if chunk is None:
+                self._dispatch(None)
+                return
+            if self.known_sha256 is None:
+                started = time.perf_counter()
+                buf, count = chunk.buf, chunk.count
+                view = memoryview(buf)[:count] if buf is not None else _zeros(count)
+                self.sha.update(view)
+                if self.blocks is not None:
+                    if buf is None:
+                        self.blocks.update_zeros(count)
+                    else:
+                        self.blocks.update(view)
+                stats.hash.seconds += time.perf_counter() - started
+                stats.hash.bytes += count
+            self.total += chunk.count
+            self._dispatch(chunk)
+            now = time.monotonic()
+            if len(self.writers) > 1 and now - last_report >= PROGRESS_INTERVAL:
+                active = sum(1 for writer in self.writers if not writer.failed.is_set())
+                info(
+                    f"Wrote {_format_size(self.total)} so far to "
+                    f"{active}/{len(self.writers)} devices"
+                )
+                last_report = now
+
+    def run(self) -> tuple[int, str]:
+        wall_start = time.perf_counter()
+        stages = [
+            threading.Thread(target=self._stage(func), name=f"flash-{name}", daemon=True)
+            for name, func in (("read", self._read_stage), ("hash", self._hash_stage))
+        ]
+        for thread in (*stages, *self.writers):
+            thread.start()
+        for thread in stages:
+            thread.join()
+        for writer in self.writers:
+            while True:
+                position = writer.position
+                writer.join(self.stall_timeout if self.isolate else None)
+                if not writer.is_alive():
+                    break
+                if writer.position == position:
+                    writer.fail(f"did not finish flushing within {self.stall_timeout:.0f}s")
+                    break
+        if self.errors:
+            raise self.errors[0]
+        self.stats.wall_seconds = time.perf_counter() - wall_start
+        self.stats.final_chunk_size = self.chunk.size
+        for writer in self.writers:
+            writer.stats.wall_seconds = self.stats.wall_seconds
+            writer.stats.final_chunk_size = self.chunk.size
+        digest = self.known_sha256 if self.known_sha256 is not None else self.sha.hexdigest()
+        return self.total, digest
+
+
+def _stream_write(
+    src: io.BufferedReader,
+    dest: io.BufferedRandom,
+    *,
+    direct: bool = False,
+    sparse: str | None = None,
+    raw_source: bool = False,
+    stats: PipelineStats | None = None,
+    blocks: _BlockHasher | None = None,
+    known_sha256: str | None = None,
+) -> tuple[int, str]:
+    """Copy ``src`` to ``dest`` through a read → hash → write thread pipeline.
+
+    See :class:`_FlashPipeline`. The chunk size adapts to observed write latency
+    and the device is flushed with a single ``fsync`` at the end.
+
+    ``sparse`` (see :func:`_sparse_method`) skips all-zero runs on the target;
+    with ``raw_source`` (an uncompressed ``.img``) filesystem holes found via
+    ``SEEK_DATA`` are not even read. The returned SHA-256 always covers every
+    byte of the image.
+
+    ``blocks`` collects per-block digests for a :class:`BlockManifest` in the
+    same pass. When ``known_sha256`` comes from a reused manifest the hash stage
+    is skipped entirely and that digest is returned instead.
+    """
+
+    stats = stats if stats is not None else PipelineStats.empty()
+    writer = _PipelineWriter(
+        str(getattr(dest, "name", "device")),
+        dest=dest,
+        direct=direct,
+        sparse=sparse,
+        stats=stats,
+        progress=True,
+    )
+    pipeline = _FlashPipeline(
+        src,
+        [writer],
+        stats=stats,
+        raw_source=raw_source,
+        blocks=blocks,
+        known_sha256=known_sha256,
+    )
+    total, digest = pipeline.run()
     info(f"Finished writing {_format_size(total)}")
-    return total, sha.hexdigest()
+    info(f"Pipeline throughput: {stats.summary()}")
+    return total, digest
+
 
+def _read_and_hash(
+    device: io.BufferedRandom,
+    size: int,
+    *,
+    zero_ranges: Sequence[tuple[int, int]] = (),
+) -> str:
+    """Hash the first ``size`` bytes of ``device``.
+
+    ``zero_ranges`` lists ``(offset, length)`` spans that sparse mode already
+    guaranteed to be zero; they are hashed as zeros without being read back.
+    """
 
-def _read_and_hash(device: io.BufferedRandom, size: int) -> str:
     sha = hashlib.sha256()
-    remaining = size
-    while remaining > 0:
-        chunk = device.read(min(CHUNK_SIZE, remaining))
+    position = 0
+    pending = sorted(zero_ranges)
+    while position < size:
+        if pending and position >= pending[0][0]:
+            start, length = pending.pop(0)
+            end = min(start + length, size)
+            while position < end:
+                step = min(CHUNK_SIZE, end - position)
+                sha.update(_zeros(step))
+                position += step
+            device.seek(position)
+            continue
+        limit = size - position
+        if pending:
+            limit = min(limit, pending[0][0] - position)
+        chunk = device.read(min(CHUNK_SIZE, limit))
         if not chunk:
             break
         sha.update(chunk)
-        remaining -= len(chunk)
-    if remaining != 0:
+        position += len(chunk)
+    if position != size:
         die("Device read was shorter than expected during verification")
     return sha.hexdigest()
 
 
+@lru_cache(maxsize=4)
+def _zero_block_digest(size: int) -> str:
+    return hashlib.sha256(_zeros(size)).hexdigest()
+
+
+def _merkle_root(digests: Sequence[str]) -> str:
+    """Fold hex block digests pairwise into a single SHA-256 root.
+
+    An odd digest at the end of a level is carried up unchanged so the root of a
+    single-block image is that block's digest.
+    """
+
+    level = [bytes.fromhex(digest) for digest in digests]
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+    while len(level) > 1:
+        paired = [
+            hashlib.sha256(level[index] + level[index + 1]).digest()
+            for index in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0].hex()
+
+
+def _source_identity(path: Path) -> dict[str, object]:
+    details = path.stat()
+    return {"name": path.name, "size": details.st_size, "mtime_ns": details.st_mtime_ns}
+
+
+@dataclass
+class BlockManifest:
+    """Per-block SHA-256 digests of an expanded image plus their Merkle root."""
+
+    size: int
+    sha256: str
+    blocks: List[str]
+    block_size: int = MANIFEST_BLOCK_SIZE
+    source: dict[str, object] = field(default_factory=dict)
+
+    @property
+    def merkle_root(self) -> str:
+        return _merkle_root(self.blocks)
+
+    def block_range(self, index: int) -> tuple[int, int]:
+        start = index * self.block_size
+        return start, min(self.block_size, self.size - start)
+
+    def matches_source(self, source: Path) -> bool:
+        try:
+            return self.source == _source_identity(source)
+        except OSError:
+            return False
+
+    def to_json(self) -> dict[str, object]:
+        return {
+            "version": MANIFEST_VERSION,
+            "size": self.size,
+            "sha256": self.sha256,
+            "block_size": self.block_size,
+            "merkle_root": self.merkle_root,
+            "source": self.source,
+            "blocks": self.blocks,
+        }
+
+    @classmethod
+    def from_json(cls, payload: object) -> "BlockManifest":
+        if not isinstance(payload, dict) or payload.get("version") != MANIFEST_VERSION:
+            raise ValueError("unsupported manifest version")
+        manifest = cls(
+            size=int(payload["size"]),
+            sha256=str(payload["sha256"]),
+            blocks=[str(digest) for digest in payload["blocks"]],
+            block_size=int(payload["block_size"]),
+            source=dict(payload.get("source") or {}),
+        )
+        if manifest.block_size <= 0 or len(manifest.blocks) != -(
+            -manifest.size // manifest.block_size
+        ):
+            raise ValueError("block count does not match the recorded size")
+        if manifest.merkle_root != payload.get("merkle_root"):
+            raise ValueError("Merkle root does not match the block digests")
+        return manifest
+
+
+def manifest_path_for(image: Path, directory: Path | None = None) -> Path:
+    """Return the block manifest path for ``image`` in ``directory`` (default: beside it).
+
+    Cached expansions keep their manifest beside them; flashes of a user's image
+    default to the working directory so runs under sudo leave no root-owned files
+    next to the download.
+    """
+
+    return (directory or image.parent) / (image.name + MANIFEST_SUFFIX)
+
+
+def load_manifest(path: Path, source: Path) -> BlockManifest | None:
+    """Load ``path`` if it exists, is intact, and still describes ``source``."""
+
+    if not path.exists():
+        return None
+    try:
+        manifest = BlockManifest.from_json(json.loads(path.read_text()))
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        warn(f"Ignoring unreadable block manifest {path}: {exc}")
+        return None
+    if not manifest.matches_source(source):
+        info(f"Block manifest {path} is stale for {source.name}; re-hashing the image")
+        return None
+    return manifest
+
+
+def save_manifest(manifest: BlockManifest, path: Path) -> bool:
+    """Atomically write ``manifest`` to ``path``; failures only warn."""
+
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(manifest.to_json(), indent=2))
+        os.replace(tmp, path)
+    except OSError as exc:
+        warn(f"Unable to save block manifest {path}: {exc}")
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+        return False
+    return True
+
+
+def _load_block_manifest(path: Path, source: Path) -> BlockManifest | None:
+    manifest = load_manifest(path, source)
+    if manifest is not None:
+        info(f"Reusing block manifest {path} (Merkle root {manifest.merkle_root})")
+    return manifest
+
+
+def _settle_manifest(
+    manifest: BlockManifest | None,
+    blocks: _BlockHasher | None,
+    *,
+    total: int,
+    sha256: str,
+    path: Path,
+    source: Path,
+) -> BlockManifest:
+    """Save the manifest hashed while writing, or check a reused one against the stream."""
+
+    if manifest is None:
+        assert blocks is not None
+        manifest = BlockManifest(
+            size=total,
+            sha256=sha256,
+            blocks=blocks.finish(),
+            source=_source_identity(source),
+        )
+        if save_manifest(manifest, path):
+            info(f"Saved block manifest to {path}")
+    elif manifest.size != total:
+        die(
+            f"Block manifest {path} records {manifest.size} bytes but the image "
+            f"produced {total}; delete the manifest and flash again."
+        )
+    return manifest
+
+
+class _BlockHasher:
+    """Split a byte stream into fixed-size blocks and hash each one."""
+
+    def __init__(self, block_size: int = MANIFEST_BLOCK_SIZE) -> None:
+        self.block_size = block_size
+        self.digests: List[str] = []
+        self._current = hashlib.sha256()
+        self._filled = 0
+
+    def update(self, view: memoryview) -> None:
+        while view:
+            take = min(len(view), self.block_size - self._filled)
+            self._current.update(view[:take])
+            self._filled += take
+            view = view[take:]
+            if self._filled == self.block_size:
+                self._close()
+
+    def update_zeros(self, count: int) -> None:
+        while count:
+            if not self._filled and count >= self.block_size:
+                self.digests.append(_zero_block_digest(self.block_size))
+                count -= self.block_size
+                continue
+            step = min(count, self.block_size - self._filled)
+            self.update(_zeros(step))
+            count -= step
+
+    def finish(self) -> List[str]:
+        if self._filled:
+            self._close()
+        return self.digests
+
+    def _close(self) -> None:
+        self.digests.append(self._current.hexdigest())
+        self._current = hashlib.sha256()
+        self._filled = 0
+
+
+@dataclass
+class BlockVerification:
+    mode: str
+    total_blocks: int
+    checked: int = 0
+    skipped: int = 0
+    mismatch: int | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.mismatch is None
+
+
+def _select_blocks(count: int, mode: str, sample: int, rng: random.Random) -> List[int]:
+    if mode == "full" or count <= sample + 2:
+        return list(range(count))
+    chosen = {0, count - 1}
+    chosen.update(rng.sample(range(1, count - 1), sample))
+    return sorted(chosen)
+
+
+def _covered_by(ranges: Sequence[tuple[int, int]], start: int, length: int) -> bool:
+    return any(offset <= start and start + length <= offset + size for offset, size in ranges)
+
+
+def verify_blocks(
+    path: str,
+    manifest: BlockManifest,
+    *,
+    mode: str = "full",
+    workers: int = VERIFY_WORKERS,
+    sample: int = VERIFY_SAMPLE_BLOCKS,
+    zero_ranges: Sequence[tuple[int, int]] = (),
+    rng: random.Random | None = None,
+) -> BlockVerification:
+    """Compare ``path`` against ``manifest`` block by block.
+
+    ``workers`` reader threads each open their own handle and pull block indices
+    from a shared cursor, so reads stay roughly sequential while hashing runs
+    in parallel. The first mismatch stops every reader. ``mode="sample"`` reads
+    the first and last blocks plus ``sample`` random ones. Blocks that sparse
+    mode already guaranteed to be zero (``zero_ranges``) are not read back.
+    """
+
+    indices = _select_blocks(len(manifest.blocks), mode, sample, rng or random.Random())
+    result = BlockVerification(mode=mode, total_blocks=len(manifest.blocks))
+    pending: List[int] = []
+    for index in indices:
+        start, length = manifest.block_range(index)
+        if manifest.blocks[index] == _zero_block_digest(length) and _covered_by(
+            zero_ranges, start, length
+        ):
+            result.skipped += 1
+        else:
+            pending.append(index)
+
+    cursor = iter(pending)
+    lock = threading.Lock()
+    stop = threading.Event()
+    mismatches: List[int] = []
+
+    def reader_loop() -> None:
+        with _open_device(path, write=False) as reader:
+            while not stop.is_set():
+                with lock:
+                    index = next(cursor, None)
+                if index is None:
+                    return
+                start, length = manifest.block_range(index)
+                reader.seek(start)
+                data = reader.read(length)
+                while len(data) < length:
+                    more = reader.read(length - len(data))
+                    if not more:
+                        break
+                    data += more
+                matched = (
+                    len(data) == length
+                    and hashlib.sha256(data).hexdigest() == manifest.blocks[index]
+                )
+                with lock:
+                    if not matched:
+                        mismatches.append(index)
+                        stop.set()
+                        return
+                    result.checked += 1
+
+    threads = max(1, min(workers, len(pending)))
+    if pending:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            for future in [executor.submit(reader_loop) for _ in range(threads)]:
+                future.result()
+    if mismatches:
+        result.mismatch = min(mismatches)
+    return result
+
+
+def _sha256_path(path: Path) -> str:
+    sha = hashlib.sha256()
+    with path.open("rb") as src:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class ImageCache:
+    """Content-addressed store of expanded images and their block manifests.
+
+    Entries live under ``root/<sha256 of the compressed image>/`` and hold the
+    expanded ``image.img`` (written sparse) plus its ``.blocks.json`` manifest.
+    ``index.json`` maps ``path|size|mtime_ns`` to that digest so unchanged
+    archives are not re-hashed. Entries are evicted least recently used first
+    once their on-disk size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def _index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def _read_index(self) -> dict[str, str]:
+        try:
+            payload = json.loads(self._index_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return payload if isinstance(payload, dict) else {}
+
+    def _write_index(self, index: Mapping[str, str]) -> None:
+        tmp = self._index_path.with_name(f"index.json.{os.getpid()}")
+        try:
+            tmp.write_text(json.dumps(dict(index), indent=2, sort_keys=True))
+            os.replace(tmp, self._index_path)
+        except OSError as exc:
+            warn(f"Unable to update image cache index: {exc}")
+
+    def key_for(self, image: Path) -> str:
+        details = image.stat()
+        fast = f"{image.resolve()}|{details.st_size}|{details.st_mtime_ns}"
+        index = self._read_index()
+        digest = index.get(fast)
+        if digest is None:
+            info(f"Hashing {image.name} for the image cache")
+            digest = _sha256_path(image)
+            index[fast] = digest
+            self._write_index(index)
+        return digest
+
+    def entry_image(self, key: str) -> Path:
+        return self.root / key / CACHE_IMAGE_NAME
+
+    def lookup(self, key: str) -> Path | None:
+        image = self.entry_image(key)
+        if not image.exists():
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(image.parent)
+        return image
+
+    def begin(self, key: str, src: io.BufferedIOBase) -> "_CacheFill":
+        return _CacheFill(self, key, src)
+
+    def entries(self) -> List[tuple[float, int, Path]]:
+        found: List[tuple[float, int, Path]] = []
+        for entry in self.root.iterdir():
+            if not entry.is_dir() or ".partial-" in entry.name:
+                continue
+            size = 0
+            for child in entry.iterdir():
+                with contextlib.suppress(OSError):
+                    size += child.stat().st_blocks * 512
+            found.append((entry.stat().st_mtime, size, entry))
+        return sorted(found)
+
+    def evict(self, keep: str | None = None) -> List[str]:
+        """Drop least recently used entries until the cache fits ``max_bytes``."""
+
+        entries = self.entries()
+        usage = sum(size for _, size, _ in entries)
+        removed: List[str] = []
+        for _, size, entry in entries:
+            if usage <= self.max_bytes:
+                break
+            if entry.name == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            usage -= size
+            removed.append(entry.name)
+            info(f"Evicted cached image {entry.name} ({_format_size(size)})")
+        return removed
+
+
+class _CacheFill(io.RawIOBase):
+    """Tee bytes read from ``src`` into a staging cache entry.
+
+    All-zero blocks become holes so cached images only use as much disk as
+    their data. :meth:`commit` publishes the entry atomically; :meth:`abort`
+    discards it.
+    """
+
+    def __init__(self, cache: ImageCache, key: str, src: io.BufferedIOBase) -> None:
+        super().__init__()
+        self.cache = cache
+        self.key = key
+        self._src = src
+        self._staging = cache.root / f"{key}.partial-{os.getpid()}"
+        self._staging.mkdir(parents=True, exist_ok=True)
+        self._dest = (self._staging / CACHE_IMAGE_NAME).open("wb")
+        self._offset = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._src.readinto(buffer)
+        if count:
+            self._store(memoryview(buffer).cast("B")[:count])
+        return count or 0
+
+    def _store(self, view: memoryview) -> None:
+        for start in range(0, len(view), SPARSE_BLOCK_SIZE):
+            end = min(start + SPARSE_BLOCK_SIZE, len(view))
+            segment = view[start:end]
+            if (
+                not segment[0]
+                and not segment[-1]
+                and segment.tobytes() == _ZERO_BLOCK[: end - start]
+            ):
+                self._dest.seek(end - start, os.SEEK_CUR)
+            else:
+                self._dest.write(segment)
+        self._offset += len(view)
+
+    def commit(self) -> Path:
+        self._dest.truncate(self._offset)
+        self._dest.close()
+        final = self.cache.root / self.key
+        try:
+            os.rename(self._staging, final)
+        except OSError:
+            # Another flash published the same image first; keep theirs.
+            shutil.rmtree(self._staging, ignore_errors=True)
+        return self.cache.entry_image(self.key)
+
+    def abort(self) -> None:
+        self._dest.close()
+        shutil.rmtree(self._staging, ignore_errors=True)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._src.close()
+        super().close()
+
+
+def _open_cache(args: argparse.Namespace) -> ImageCache | None:
+    root = args.cache_dir or os.environ.get("SUGARKUBE_FLASH_CACHE_DIR")
+    if not root:
+        return None
+    try:
+        return ImageCache(Path(root).expanduser().resolve(), int(args.cache_max_gb * 1024**3))
+    except OSError as exc:
+        warn(f"Image cache disabled: {exc}")
+        return None
+
+
+def _fan_out_write(
+    src: io.BufferedReader,
+    paths: Sequence[str],
+    *,
+    queue_depth: int = FANOUT_QUEUE_DEPTH,
+    stall_timeout: float = FANOUT_STALL_TIMEOUT,
+    direct: bool = False,
+    sparse: str | None = None,
+    raw_source: bool = False,
+    blocks: _BlockHasher | None = None,
+    known_sha256: str | None = None,
+    source_path: Path | None = None,
+) -> tuple[int, str, List[FanOutResult]]:
+    """Read ``src`` once and stream every chunk to all ``paths`` concurrently.
+
+    The read and hash stages of :class:`_FlashPipeline` are shared and each
+    device gets its own writer thread. ``queue_depth`` extra buffers let a
+    slower device fall that many chunks behind. Past that, a device finishes
+    from its own read of ``source_path`` (the raw image, when there is one)
+    instead of pacing the others. A device that errors, or holds up the reader
+    for ``stall_timeout`` seconds without a ``source_path``, is detached and
+    reported as failed while the remaining devices keep going.
+
+    ``sparse`` is the requested :func:`_sparse_method`, resolved per device, and
+    each result records the zero ranges its device skipped. ``blocks`` and
+    ``known_sha256`` behave as in :func:`_stream_write`.
+    """
+
+    stats = PipelineStats.empty()
+    writers = [
+        _PipelineWriter(
+            path,
+            direct=direct,
+            sparse=_sparse_method(path, sparse) if sparse else None,
+            stats=PipelineStats(read=stats.read, hash=stats.hash, write=StageStats("write")),
+        )
+        for path in paths
+    ]
+    pipeline = _FlashPipeline(
+        src,
+        writers,
+        stats=stats,
+        raw_source=raw_source,
+        blocks=blocks,
+        known_sha256=known_sha256,
+        isolate=True,
+        spare_buffers=max(queue_depth, 1),
+        stall_timeout=stall_timeout,
+        source_path=source_path,
+    )
+    total, expected = pipeline.run()
+    for writer in writers:
+        result = writer.result
+        if not result.ok:
+            continue
+        if writer.position != total:
+            result.error = "written bytes do not match the image stream"
+            continue
+        result.bytes_written = writer.position
+        result.sha256 = expected
+        result.zero_ranges = writer.stats.zero_ranges
+        info(f"{result.path}: {writer.stats.summary()}")
+    info(f"Finished writing {_format_size(total)} to {len(writers)} devices")
+    return total, expected, [writer.result for writer in writers]
+
+
+def _verify_fan_out_result(
+    result: FanOutResult, manifest: BlockManifest, *, mode: str, workers: int, sample: int
+) -> None:
+    try:
+        verification = verify_blocks(
+            result.path,
+            manifest,
+            mode=mode,
+            workers=workers,
+            sample=sample,
+            zero_ranges=result.zero_ranges,
+        )
+    except OSError as exc:
+        result.error = f"verification read failed: {exc}"
+        return
+    result.verification = verification
+    if not verification.ok:
+        assert verification.mismatch is not None
+        offset, _ = manifest.block_range(verification.mismatch)
+        result.error = (
+            f"verification failed: block {verification.mismatch} at offset {offset} does not "
+            f"match the image (expected SHA-256 {manifest.sha256})"
+        )
+    elif mode == "full":
+        result.verified_sha256 = manifest.sha256
+
+
+def flash_many(
+    image_path: Path,
+    devices: Sequence[Device],
+    *,
+    cloud_init: Mapping[str, Path] | None = None,
+    eject: bool = True,
+    direct: bool = False,
+    sparse: str | None = None,
+    verify: str = "full",
+    verify_workers: int = VERIFY_WORKERS,
+    verify_sample: int = VERIFY_SAMPLE_BLOCKS,
+    manifest_path: Path | None = None,
+    manifest_source: Path | None = None,
+) -> tuple[str, List[FanOutResult]]:
+    """Flash ``image_path`` to every device, decompressing the image only once.
+
+    The block manifest (``manifest_path``, by default next to the image) is
+    reused or built during that single read, and every device is then checked
+    with :func:`verify_blocks`. Returns the expected SHA-256 of the image stream
+    and one result per device. Failures are isolated per device: a bad card is
+    reported in its result and the remaining devices are still verified,
+    customised, and ejected.
+    """
+
+    manifest_source = manifest_source or image_path
+    manifest_path = manifest_path or manifest_path_for(image_path)
+    manifest = _load_block_manifest(manifest_path, manifest_source)
+    blocks = _BlockHasher() if manifest is None else None
+
+    src, compressed = _open_image(image_path)
+    info(f"Opening {'compressed ' if compressed else ''}image {image_path}")
+    with src:
+        total, expected, results = _fan_out_write(
+            src,
+            [dev.path for dev in devices],
+            direct=direct,
+            sparse=sparse,
+            raw_source=not compressed,
+            blocks=blocks,
+            known_sha256=manifest.sha256 if manifest is not None else None,
+            source_path=None if compressed else image_path,
+        )
+    info(f"Expected SHA-256 for written bytes: {expected}")
+
+    pending = [result for result in results if result.ok]
+    if pending:
+        # At least one device took the whole stream, so the manifest covers the image.
+        settled = _settle_manifest(
+            manifest,
+            blocks,
+            total=total,
+            sha256=expected,
+            path=manifest_path,
+            source=manifest_source,
+        )
+        with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+            list(
+                pool.map(
+                    lambda result: _verify_fan_out_result(
+                        result, settled, mode=verify, workers=verify_workers, sample=verify_sample
+                    ),
+                    pending,
+                )
+            )
+
+    overrides = cloud_init or {}
+    for device, result in zip(devices, results):
+        if not result.ok:
+            err(f"{device.path}: {result.error}")
+            continue
+        verification = result.verification
+        assert verification is not None
+        if verification.mode == "full":
+            info(f"{device.path}: device blocks match image SHA-256: {result.verified_sha256}")
+        else:
+            info(
+                f"{device.path}: sample verification passed: "
+                f"{verification.checked + verification.skipped}/{verification.total_blocks} "
+                "blocks match the image manifest"
+            )
+        override = overrides.get(device.path)
+        if override is not None:
+            try:
+                _apply_cloud_init_override(device, override)
+            except SystemExit:
+                result.error = "failed to apply the cloud-init override"
+                continue
+        if eject:
+            _auto_eject(device)
+    return expected, results
+
+
 def _auto_eject(device: Device) -> None:
     system = platform.system()
     if system == "Linux":
@@ -799,7 +2231,11 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     )
     parser.add_argument(
         "--device",
-        help=("Target device (e.g. /dev/sdX or \\.\\PhysicalDrive1). Prompts when omitted."),
+        action="append",
+        help=(
+            "Target device (e.g. /dev/sdX or \\.\\PhysicalDrive1). Prompts when omitted. "
+            "Repeat to flash several devices concurrently from a single image read."
+        ),
     )
     parser.add_argument(
         "--assume-yes",
@@ -830,6 +2266,78 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         "--cloud-init",
         help="Path to a cloud-init user-data file to copy onto the boot partition after flashing.",
     )
+    parser.add_argument(
+        "--sparse",
+        action="store_true",
+        help=(
+            "Skip all-zero regions instead of writing them (holes in regular files, "
+            "BLKZEROOUT/BLKDISCARD on Linux block devices). The SHA-256 still covers the "
+            "full image."
+        ),
+    )
+    parser.add_argument(
+        "--sparse-method",
+        choices=SPARSE_METHODS,
+        default="zeroout",
+        help=(
+            "How block devices clear skipped regions: 'zeroout' (guaranteed zeros, default) "
+            "or 'discard' (TRIM; only safe on media that reads discarded blocks as zeros)."
+        ),
+    )
+    parser.add_argument(
+        "--direct-io",
+        action="store_true",
+        help="Bypass the page cache with O_DIRECT aligned writes (Linux block devices).",
+    )
+    parser.add_argument(
+        "--verify",
+        choices=VERIFY_MODES,
+        default="full",
+        help=(
+            "Read-back check after writing: 'full' compares every block against the image "
+            "manifest and stops at the first mismatch (default); 'sample' reads the first, "
+            "last, and --verify-sample random blocks for a quick check."
+        ),
+    )
+    parser.add_argument(
+        "--verify-workers",
+        type=int,
+        default=VERIFY_WORKERS,
+        help=f"Reader threads used during verification (default: {VERIFY_WORKERS}).",
+    )
+    parser.add_argument(
+        "--verify-sample",
+        type=int,
+        default=VERIFY_SAMPLE_BLOCKS,
+        help=f"Random blocks checked by --verify sample (default: {VERIFY_SAMPLE_BLOCKS}).",
+    )
+    parser.add_argument(
+        "--manifest",
+        help=(
+            "Block hash manifest to reuse or create. Defaults to "
+            f"<image>{MANIFEST_SUFFIX} in the working directory."
+        ),
+    )
+    parser.add_argument(
+        "--manifest-source",
+        help=argparse.SUPPRESS,
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help=(
+            "Keep expanded .img.xz images and their block manifests in this content-addressed "
+            "cache so repeat flashes skip decompression (or set SUGARKUBE_FLASH_CACHE_DIR)."
+        ),
+    )
+    parser.add_argument(
+        "--cache-max-gb",
+        type=float,
+        default=CACHE_MAX_GB,
+        help=(
+            "Disk budget for --cache-dir; least recently used images are evicted beyond it "
+            f"(default: {CACHE_MAX_GB:g})."
+        ),
+    )
     parser.add_argument(
         "--bytes",
         type=int,
@@ -849,6 +2357,33 @@ def _default_image_path() -> Optional[Path]:
     return None
 
 
+def _resolve_target(path: str, candidates: Sequence[Device], size_hint: int) -> Device:
+    for dev in candidates:
+        if dev.path == path:
+            return dev
+    return Device(
+        path=path,
+        description="(custom device)",
+        size=size_hint or 0,
+        is_removable=True,
+    )
+
+
+def _ensure_target_ready(device: Device, args: argparse.Namespace) -> None:
+    if not args.dry_run and not _device_exists(device.path):
+        die(f"Device not found: {device.path}")
+
+    if not args.dry_run:
+        _check_not_root_device(device.path)
+
+    if device.mountpoints and not args.keep_mounted and not args.dry_run:
+        mounts = ", ".join(device.mountpoints)
+        die(
+            f"{device.path} has mounted partitions ({mounts}). Unmount them before flashing "
+            "or pass --keep-mounted to override."
+        )
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
     args = parse_args(argv)
     devices = discover_devices()
@@ -891,35 +2426,15 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             die("Expected a numeric selection.")
         if index < 0 or index >= len(candidates):
             die("Selection out of range")
-        target_device = candidates[index]
+        target_devices = [candidates[index]]
     else:
-        target_path = args.device
-        matching = [dev for dev in candidates if dev.path == target_path]
-        if matching:
-            target_device = matching[0]
-        else:
-            size_hint = 0
-            if args.bytes:
-                size_hint = args.bytes
-            target_device = Device(
-                path=target_path,
-                description="(custom device)",
-                size=size_hint,
-                is_removable=True,
-            )
+        target_devices = [_resolve_target(path, candidates, args.bytes) for path in args.device]
+        paths = [dev.path for dev in target_devices]
+        if len(set(paths)) != len(paths):
+            die("Each --device may only be supplied once.")
 
-    if not args.dry_run and not _device_exists(target_device.path):
-        die(f"Device not found: {target_device.path}")
-
-    if not args.dry_run:
-        _check_not_root_device(target_device.path)
-
-    if target_device.mountpoints and not args.keep_mounted and not args.dry_run:
-        mounts = ", ".join(target_device.mountpoints)
-        die(
-            f"{target_device.path} has mounted partitions ({mounts}). Unmount them before flashing "
-            "or pass --keep-mounted to override."
-        )
+    for target_device in target_devices:
+        _ensure_target_ready(target_device, args)
 
     allow_nonroot = args.dry_run or os.environ.get("SUGARKUBE_FLASH_ALLOW_NONROOT") == "1"
     effective_uid = _effective_uid()
@@ -941,33 +2456,140 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             die("Image appears to be empty; aborting dry-run")
         info(
             "Dry-run complete. Read %s from image without writing to %s"
-            % (_format_size(len(sample)), target_device.path)
+            % (_format_size(len(sample)), ", ".join(dev.path for dev in target_devices))
         )
         return 0
 
     if not _confirm(
-        f"About to erase and flash {target_device.path} with {image_path.name}. Continue?",
+        "About to erase and flash %s with %s. Continue?"
+        % (", ".join(dev.path for dev in target_devices), image_path.name),
         args.assume_yes,
     ):
         info("Aborted by user")
         return 0
 
+    cache = _open_cache(args) if image_path.suffix == ".xz" else None
+    cache_key = ""
+    from_cache = False
+    if cache is not None:
+        cache_key = cache.key_for(image_path)
+        cached = cache.lookup(cache_key)
+        if cached is not None:
+            info(f"Using cached expansion of {image_path.name} from {cached.parent}")
+            image_path = cached
+            cache = None
+            from_cache = True
+
+    manifest_path = manifest_path_for(image_path, None if from_cache else Path.cwd())
+    if args.manifest:
+        manifest_path = Path(args.manifest).expanduser().resolve()
+    manifest_source = (
+        Path(args.manifest_source).expanduser().resolve() if args.manifest_source else image_path
+    )
+
+    if len(target_devices) > 1:
+        overrides = {dev.path: cloud_init_path for dev in target_devices if cloud_init_path}
+        _, results = flash_many(
+            image_path,
+            target_devices,
+            cloud_init=overrides,
+            eject=not args.no_eject,
+            direct=args.direct_io,
+            sparse=args.sparse_method if args.sparse else None,
+            verify=args.verify,
+            verify_workers=args.verify_workers,
+            verify_sample=args.verify_sample,
+            manifest_path=manifest_path,
+            manifest_source=manifest_source,
+        )
+        failed = [result for result in results if not result.ok]
+        info(f"Flashed {len(results) - len(failed)}/{len(results)} devices")
+        if failed:
+            die("Fan-out flash failed for: " + ", ".join(result.path for result in failed))
+        info("Flash complete")
+        return 0
+
+    target_device = target_devices[0]
+    manifest = _load_block_manifest(manifest_path, manifest_source)
+
     src, compressed = _open_image(image_path)
     info(f"Opening {'compressed ' if compressed else ''}image {image_path}")
-    with src:
-        with _open_device(target_device.path, write=True) as dest:
-            total_bytes, expected_hash = _stream_write(src, dest)
+    fill = cache.begin(cache_key, src) if cache is not None else None
+    source: io.IOBase = fill if fill is not None else src
+    sparse = _sparse_method(target_device.path, args.sparse_method) if args.sparse else None
+    stats = PipelineStats.empty()
+    blocks = _BlockHasher() if manifest is None else None
+    try:
+        with source:
+            with _open_device(
+                target_device.path, write=True, sync=False, direct=args.direct_io
+            ) as dest:
+                total_bytes, expected_hash = _stream_write(
+                    source,
+                    dest,
+                    direct=args.direct_io,
+                    sparse=sparse,
+                    raw_source=not compressed,
+                    stats=stats,
+                    blocks=blocks,
+                    known_sha256=manifest.sha256 if manifest is not None else None,
+                )
+    except BaseException:
+        if fill is not None:
+            fill.abort()
+        raise
+
+    try:
+        manifest = _settle_manifest(
+            manifest,
+            blocks,
+            total=total_bytes,
+            sha256=expected_hash,
+            path=manifest_path,
+            source=manifest_source,
+        )
+    except SystemExit:
+        if fill is not None:
+            fill.abort()
+        raise
+
+    if fill is not None and cache is not None:
+        cached = fill.commit()
+        save_manifest(replace(manifest, source=_source_identity(cached)), manifest_path_for(cached))
+        info(f"Cached expanded image as {cached.parent.name}")
+        cache.evict(keep=cache_key)
 
     info(f"Expected SHA-256 for written bytes: {expected_hash}")
 
-    with _open_device(target_device.path, write=False) as reader:
-        actual_hash = _read_and_hash(reader, total_bytes)
-    if actual_hash != expected_hash:
+    verification = verify_blocks(
+        target_device.path,
+        manifest,
+        mode=args.verify,
+        workers=args.verify_workers,
+        sample=args.verify_sample,
+        zero_ranges=stats.zero_ranges,
+    )
+    if not verification.ok:
+        assert verification.mismatch is not None
+        offset, _ = manifest.block_range(verification.mismatch)
+        hint = ""
+        if sparse == "discard":
+            hint = " The media may not read discarded blocks as zeros; retry with zeroout."
         die(
-            "Verification failed: device SHA-256 does not match the image. "
-            f"Expected {expected_hash}, got {actual_hash}."
+            f"Verification failed: block {verification.mismatch} at offset {offset} does not "
+            f"match the image (expected SHA-256 {expected_hash}).{hint}"
+        )
+    if verification.mode == "full":
+        info(
+            f"Verified {verification.checked + verification.skipped}/"
+            f"{verification.total_blocks} blocks against Merkle root {manifest.merkle_root}"
+        )
+        info(f"Device blocks match image SHA-256: {expected_hash}")
+    else:
+        info(
+            f"Sample verification passed: {verification.checked + verification.skipped}/"
+            f"{verification.total_blocks} blocks match the image manifest"
         )
-    info(f"Verified device SHA-256: {actual_hash}")
 
     if cloud_init_path is not None:
         _apply_cloud_init_override(target_device, cloud_init_path)
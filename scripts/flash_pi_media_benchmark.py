@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Benchmark the flash_pi_media write path against a regular file target.
+
+The harness compares the original single-threaded loop (read → hash → write
+with ``O_SYNC`` on every chunk) with the pipelined ``_stream_write`` and prints
+MB/s for each stage so throughput changes can be proven on real image builds.
+
+Examples
+--------
+
+Benchmark a synthetic 512 MiB image (half zeros, half random data)::
+
+    python scripts/flash_pi_media_benchmark.py --size-mib 512
+
+Benchmark a release image and keep the JSON results::
+
+    python scripts/flash_pi_media_benchmark.py --image ~/sugarkube/images/sugarkube.img.xz \
+        --runs 3 --json bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import lzma
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Sequence
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+import flash_pi_media as flash  # noqa: E402
+
+
+def build_synthetic_image(directory: Path, size_mib: int) -> Path:
+    """Write a compressible ``.img.xz`` that mimics a mostly-empty Pi image."""
+
+    image = directory / "synthetic.img.xz"
+    block = 1024 * 1024
+    with lzma.open(image, "wb", preset=0) as dest:
+        for index in range(size_mib):
+            dest.write(os.urandom(block) if index % 2 else bytes(block))
+    return image
+
+
+def run_serial(image: Path, target: Path) -> flash.PipelineStats:
+    """Replay the pre-pipeline loop: one thread, fixed chunks, ``O_SYNC`` writes."""
+
+    stats = flash.PipelineStats.empty()
+    sha = hashlib.sha256()
+    src, _ = flash._open_image(image)
+    wall_start = time.perf_counter()
+    with src, flash._open_device(str(target), write=True) as dest:
+        while True:
+            started = time.perf_counter()
+            chunk = src.read(flash.CHUNK_SIZE)
+            stats.read.seconds += time.perf_counter() - started
+            if not chunk:
+                break
+            stats.read.bytes += len(chunk)
+            started = time.perf_counter()
+            sha.update(chunk)
+            stats.hash.seconds += time.perf_counter() - started
+            stats.hash.bytes += len(chunk)
+            started = time.perf_counter()
+            dest.write(chunk)
+            stats.write.seconds += time.perf_counter() - started
+            stats.write.bytes += len(chunk)
+        dest.flush()
+        os.fsync(dest.fileno())
+    stats.wall_seconds = time.perf_counter() - wall_start
+    stats.final_chunk_size = flash.CHUNK_SIZE
+    return stats
+
+
+def run_pipeline(
+    image: Path, target: Path, *, direct: bool = False, sparse: bool = False
+) -> flash.PipelineStats:
+    stats = flash.PipelineStats.empty()
+    src, compressed = flash._open_image(image)
+    with src, flash._open_device(str(target), write=True, sync=False, direct=direct) as dest:
+        flash._stream_write(
+            src,
+            dest,
+            direct=direct,
+            sparse="seek" if sparse else None,
+            raw_source=not compressed,
+            stats=stats,
+        )
+    return stats
+
+
+def _stats_payload(mode: str, run: int, stats: flash.PipelineStats) -> dict:
+    return {
+        "mode": mode,
+        "run": run,
+        "bytes": stats.write.bytes,
+        "wall_seconds": round(stats.wall_seconds, 4),
+        "overall_mb_s": round(stats.wall_mb_per_second, 2),
+        "final_chunk_size": stats.final_chunk_size,
+        "skipped_bytes": stats.skipped_bytes,
+        "stages": {
+            stage.name: {
+                "seconds": round(stage.seconds, 4),
+                "mb_s": round(stage.mb_per_second, 2),
+            }
+            for stage in stats.stages
+        },
+    }
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--image", help="Image to benchmark (.img or .img.xz).")
+    parser.add_argument(
+        "--size-mib",
+        type=int,
+        default=256,
+        help="Size of the synthetic image generated when --image is omitted (default: 256).",
+    )
+    parser.add_argument(
+        "--target",
+        help="Regular file to write to (defaults to a temporary file removed afterwards).",
+    )
+    parser.add_argument("--runs", type=int, default=1, help="Repetitions per mode (default: 1).")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=("serial", "pipeline", "pipeline-direct", "pipeline-sparse"),
+        default=["serial", "pipeline"],
+        help="Write paths to compare (default: serial pipeline).",
+    )
+    parser.add_argument("--json", type=Path, help="Write machine-readable results here.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="sugarkube-flash-bench-") as tmpdir:
+        workdir = Path(tmpdir)
+        if args.image:
+            image = Path(args.image).expanduser().resolve()
+            if not image.exists():
+                print(f"error: image not found: {image}", file=sys.stderr)
+                return 1
+        else:
+            image = build_synthetic_image(workdir, args.size_mib)
+        target = Path(args.target).expanduser() if args.target else workdir / "target.img"
+
+        results: list[dict] = []
+        for mode in args.modes:
+            for run in range(1, max(args.runs, 1) + 1):
+                target.write_bytes(b"")
+                if mode == "serial":
+                    stats = run_serial(image, target)
+                else:
+                    stats = run_pipeline(
+                        image,
+                        target,
+                        direct=mode == "pipeline-direct",
+                        sparse=mode == "pipeline-sparse",
+                    )
+                payload = _stats_payload(mode, run, stats)
+                results.append(payload)
+                print(f"{mode} run {run}: {stats.summary()}")
+
+    if args.json:
+        args.json.write_text(json.dumps({"image": str(image), "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    raise SystemExit(main())
@@ -53,29 +53,63 @@ def _sha256_file(path: Path) -> str:
     return sha.hexdigest()
 
 
+def _copy_and_hash(src, dest, sha) -> int:
+    total = 0
+    while True:
+        chunk = src.read(CHUNK_SIZE)
+        if not chunk:
+            return total
+        if dest is not None:
+            dest.write(chunk)
+        if sha is not None:
+            sha.update(chunk)
+        total += len(chunk)
+
+
 def _expand_image(
     image_path: Path,
+    cache: flash.ImageCache | None = None,
 ) -> Tuple[Path, bool, int, float, str, tempfile.TemporaryDirectory[str] | None]:
+    """Expand ``image_path`` once, returning its path, size, and SHA-256.
+
+    With ``cache`` the expansion is served from (or stored in) the image cache
+    and no temporary directory is returned.
+    """
+
     start = time.time()
+    # A block manifest left by an earlier flash already records the expanded digest.
+    manifest = flash.load_manifest(flash.manifest_path_for(image_path), image_path)
     if image_path.suffix != ".xz":
         size = image_path.stat().st_size
-        digest = _sha256_file(image_path)
+        digest = manifest.sha256 if manifest is not None else _sha256_file(image_path)
         return image_path, False, size, time.time() - start, digest, None
 
-    tempdir = tempfile.TemporaryDirectory(prefix="sugarkube-flash-")
-    expanded = Path(tempdir.name) / image_path.stem
-    sha = hashlib.sha256()
-    total = 0
-    with lzma.open(image_path, "rb") as src, expanded.open("wb") as dest:
-        while True:
-            chunk = src.read(CHUNK_SIZE)
-            if not chunk:
-                break
-            dest.write(chunk)
-            sha.update(chunk)
-            total += len(chunk)
+    sha = hashlib.sha256() if manifest is None else None
+    if cache is not None:
+        key = cache.key_for(image_path)
+        expanded = cache.lookup(key)
+        if expanded is not None:
+            print(f"Using cached expansion of {image_path.name} from {expanded.parent}")
+            manifest = flash.load_manifest(flash.manifest_path_for(expanded), expanded) or manifest
+            digest = manifest.sha256 if manifest is not None else _sha256_file(expanded)
+            return expanded, True, expanded.stat().st_size, time.time() - start, digest, None
+        fill = cache.begin(key, lzma.open(image_path, "rb"))
+        try:
+            with fill:
+                total = _copy_and_hash(fill, None, sha)
+        except BaseException:
+            fill.abort()
+            raise
+        expanded = fill.commit()
+        cache.evict(keep=key)
+        tempdir = None
+    else:
+        tempdir = tempfile.TemporaryDirectory(prefix="sugarkube-flash-")
+        expanded = Path(tempdir.name) / image_path.stem
+        with lzma.open(image_path, "rb") as src, expanded.open("wb") as dest:
+            total = _copy_and_hash(src, dest, sha)
     duration = time.time() - start
-    digest = sha.hexdigest()
+    digest = manifest.sha256 if manifest is not None else sha.hexdigest()
     return expanded, True, total, duration, digest, tempdir
 
 
@@ -121,7 +155,12 @@ def _ensure_device_ready(device: flash.Device, *, keep_mounted: bool, dry_run: b
 
 
 def _run_flash(
-    expanded_path: Path, args: argparse.Namespace, device: flash.Device
+    expanded_path: Path,
+    args: argparse.Namespace,
+    device: flash.Device,
+    *,
+    source_image: Path | None = None,
+    manifest_dir: Path | None = None,
 ) -> tuple[str, str, str, str]:
     argv = [
         "--image",
@@ -130,6 +169,18 @@ def _run_flash(
         device.path,
         "--assume-yes",
     ]
+    if source_image is not None:
+        # Key the block manifest to the release image rather than the temp expansion.
+        argv.extend(
+            [
+                "--manifest",
+                str(flash.manifest_path_for(source_image, manifest_dir)),
+                "--manifest-source",
+                str(source_image),
+            ]
+        )
+    if getattr(args, "verify", None):
+        argv.extend(["--verify", args.verify])
     if args.no_eject:
         argv.append("--no-eject")
     if args.keep_mounted:
@@ -162,10 +213,17 @@ def _run_flash(
         ).strip()
         raise FlashReportError(message)
     expected = _extract_hash(stdout, r"Expected SHA-256 for written bytes: (\w+)")
-    verified = _extract_hash(stdout, r"Verified device SHA-256: (\w+)")
+    verified = _extract_hash(stdout, r"Device blocks match image SHA-256: (\w+)")
+    sampled = re.search(r"Sample verification passed: (\d+)/(\d+) blocks", stdout)
+    if not verified and sampled:
+        verified = _sampled(int(sampled.group(1)), int(sampled.group(2)))
     return stdout, stderr, expected, verified
 
 
+def _sampled(checked: int, total: int) -> str:
+    return f"sampled ({checked}/{total} blocks matched)"
+
+
 def _extract_hash(payload: str, pattern: str) -> str:
     match = re.search(pattern, payload)
     return match.group(1) if match else ""
@@ -247,8 +305,9 @@ def _build_markdown(metadata: dict) -> str:
 
         ## Verification
 
+        - Mode: {metadata['verification'].get('mode', 'full')}
         - Expected SHA-256: `{metadata['verification']['expected']}`
-        - Verified SHA-256: `{metadata['verification']['verified']}`
+        - Block-verified SHA-256: `{metadata['verification']['verified']}`
 
         ## Cloud-init
 
@@ -287,8 +346,9 @@ def _build_html(metadata: dict, markdown_body: str) -> str:
     verification_html = "".join(
         f"<li><code>{html.escape(label)}</code>: <code>{html.escape(value)}</code></li>"
         for label, value in [
+            ("Mode", metadata["verification"].get("mode", "full")),
             ("Expected SHA-256", metadata["verification"]["expected"]),
-            ("Verified SHA-256", metadata["verification"]["verified"]),
+            ("Block-verified SHA-256", metadata["verification"]["verified"]),
         ]
     )
     escaped_stdout = html.escape(metadata["flash_log"].strip())
@@ -364,6 +424,196 @@ def _write_report(metadata: dict, report_dir: Path) -> None:
     (report_dir / "flash.stderr").write_text(metadata["flash_stderr"])
 
 
+def _build_metadata(
+    args: argparse.Namespace,
+    *,
+    timestamp: str,
+    report_path: Path,
+    image: dict,
+    device: flash.Device,
+    flash_duration: float,
+    expected_hash: str,
+    verified_hash: str,
+    stdout: str,
+    stderr: str,
+) -> dict:
+    cloud_summary, cloud_diff = _cloud_init_diff(args)
+    metadata = {
+        "timestamp": timestamp,
+        "host": f"{platform.node()} ({platform.system()} {platform.release()})",
+        "report_dir": str(report_path),
+        "image": image,
+        "device": {
+            "path": device.path,
+            "description": device.description or "(unknown)",
+            "size": device.size,
+            "bus": device.bus,
+            "system_id": device.system_id,
+        },
+        "flash_duration": flash_duration,
+        "verification": {
+            "mode": getattr(args, "verify", "full"),
+            "expected": expected_hash,
+            "verified": verified_hash,
+        },
+        "cloud_init": {
+            "summary": cloud_summary,
+        },
+        "flash_log": stdout,
+        "flash_stderr": stderr,
+    }
+    if cloud_diff:
+        metadata["cloud_init"]["diff"] = cloud_diff
+    return metadata
+
+
+def _report_slug(device: flash.Device) -> str:
+    return device.path.replace("/", "-").replace("\\", "-").strip("-") or "device"
+
+
+def _load_fanout_plan(path: Path) -> list[dict]:
+    """Load ``[{"device": ..., "cloud_init": ..., "output_dir": ...}, ...]`` targets."""
+
+    try:
+        payload = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError) as exc:
+        raise FlashReportError(f"Unable to read fan-out plan {path}: {exc}") from exc
+    targets = payload.get("targets") if isinstance(payload, dict) else payload
+    if not isinstance(targets, list) or not targets:
+        raise FlashReportError(f"Fan-out plan {path} must list at least one target.")
+    plan: list[dict] = []
+    seen: set[str] = set()
+    for entry in targets:
+        if not isinstance(entry, dict) or not entry.get("device"):
+            raise FlashReportError(f"Every fan-out target in {path} requires a device path.")
+        # Two writers on one card would interleave, so aliases of a device count too.
+        device = os.path.realpath(str(entry["device"]))
+        if device in seen:
+            raise FlashReportError(f"Fan-out plan {path} lists {entry['device']} more than once.")
+        seen.add(device)
+        plan.append(entry)
+    return plan
+
+
+def _ensure_privileges() -> None:
+    """Mirror flash_pi_media's root check, which only runs for single-device flashes."""
+
+    if os.environ.get("SUGARKUBE_FLASH_ALLOW_NONROOT") == "1":
+        return
+    effective_uid = flash._effective_uid()  # type: ignore[attr-defined]
+    if effective_uid is None:
+        flash.warn(
+            "Cannot determine effective user ID on this platform; "
+            "ensure you have permissions to write the device."
+        )
+    elif effective_uid != 0:
+        raise FlashReportError("Run as root or with sudo to flash a fan-out plan.")
+
+
+def _verified_hash(result: flash.FanOutResult) -> str:
+    verification = result.verification
+    if verification is not None and verification.mode == "sample":
+        return _sampled(verification.checked + verification.skipped, verification.total_blocks)
+    return result.verified_sha256
+
+
+def _run_fanout(args: argparse.Namespace, source_image: Path) -> int:
+    if args.dry_run:
+        raise FlashReportError("--dry-run is not supported together with --fanout-plan.")
+    plan = _load_fanout_plan(Path(args.fanout_plan).expanduser().resolve())
+    candidates = flash.filter_candidates(flash.discover_devices())
+    devices = [
+        flash._resolve_target(str(entry["device"]), candidates, 0)  # type: ignore[attr-defined]
+        for entry in plan
+    ]
+    for device in devices:
+        _ensure_device_ready(device, keep_mounted=args.keep_mounted, dry_run=False)
+    _ensure_privileges()
+
+    if not args.assume_yes:
+        targets = ", ".join(device.path for device in devices)
+        reply = (
+            input(f"About to expand {source_image.name} and flash {targets}. Continue? [y/N]: ")
+            .strip()
+            .lower()
+        )
+        if reply not in {"y", "yes"}:
+            print("Aborted by user.")
+            return 0
+
+    expanded_path, was_compressed, expanded_bytes, expand_duration, expanded_sha, tempdir = (
+        _expand_image(source_image, flash._open_cache(args))  # type: ignore[attr-defined]
+    )
+    # Cached expansions carry their own manifest and must stay inside the cache.
+    cached = was_compressed and tempdir is None
+    manifest_dir = args.output_dir.expanduser().resolve()
+    overrides = {
+        device.path: Path(entry["cloud_init"]).expanduser().resolve()
+        for device, entry in zip(devices, plan)
+        if entry.get("cloud_init")
+    }
+    stdout_buffer = io.StringIO()
+    stderr_buffer = io.StringIO()
+    try:
+        flash_start = time.time()
+        with contextlib.redirect_stdout(stdout_buffer), contextlib.redirect_stderr(stderr_buffer):
+            expected_hash, results = flash.flash_many(
+                expanded_path,
+                devices,
+                cloud_init=overrides,
+                eject=not args.no_eject,
+                verify=args.verify,
+                # Key the block manifest to the release image rather than the temp expansion.
+                manifest_path=(
+                    None if cached else flash.manifest_path_for(source_image, manifest_dir)
+                ),
+                manifest_source=None if cached else source_image,
+            )
+        flash_duration = time.time() - flash_start
+    finally:
+        if tempdir:
+            tempdir.cleanup()
+
+    expanded_display = str(expanded_path)
+    if tempdir:
+        expanded_display += " (removed after flash)"
+    now = dt.datetime.now(dt.timezone.utc).astimezone()
+    image = {
+        "source": str(source_image),
+        "expanded": expanded_display,
+        "bytes": expanded_bytes,
+        "sha256": expanded_sha,
+        "expanded_duration": expand_duration,
+    }
+    failures: list[str] = []
+    for device, entry, result in zip(devices, plan, results):
+        output_dir = entry.get("output_dir") or args.output_dir
+        report_dir = Path(output_dir).expanduser().resolve()
+        report_path = report_dir / f"flash-{now.strftime('%Y%m%d-%H%M%S')}-{_report_slug(device)}"
+        device_args = argparse.Namespace(**{**vars(args), "cloud_init": entry.get("cloud_init")})
+        metadata = _build_metadata(
+            device_args,
+            timestamp=now.isoformat(),
+            report_path=report_path,
+            image=image,
+            device=device,
+            flash_duration=flash_duration,
+            expected_hash=expected_hash,
+            verified_hash=_verified_hash(result),
+            stdout=stdout_buffer.getvalue(),
+            stderr=stderr_buffer.getvalue(),
+        )
+        if not result.ok:
+            metadata["error"] = result.error
+            failures.append(f"{device.path}: {result.error}")
+        _write_report(metadata, report_path)
+        print(f"Flash report written to {report_path}")
+
+    if failures:
+        raise FlashReportError("Fan-out flash failed for " + "; ".join(failures))
+    return 0
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--image", help="Path to the compressed or expanded image.")
@@ -409,6 +659,32 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser.add_argument(
         "--list-devices", action="store_true", help="List removable devices and exit."
     )
+    parser.add_argument(
+        "--fanout-plan",
+        help=(
+            "JSON list of {device, cloud_init, output_dir} targets to flash concurrently from a "
+            "single expanded image. Replaces --device."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help=(
+            "Reuse expanded images from this content-addressed cache instead of a temporary "
+            "expansion (or set SUGARKUBE_FLASH_CACHE_DIR)."
+        ),
+    )
+    parser.add_argument(
+        "--cache-max-gb",
+        type=float,
+        default=flash.CACHE_MAX_GB,
+        help=f"Disk budget for --cache-dir (default: {flash.CACHE_MAX_GB:g}).",
+    )
+    parser.add_argument(
+        "--verify",
+        choices=flash.VERIFY_MODES,
+        default="full",
+        help="Read-back check forwarded to flash_pi_media.py (full or sample; default: full).",
+    )
     parser.add_argument("--bytes", type=int, default=0, help=argparse.SUPPRESS)
     return parser.parse_args(argv)
 
@@ -430,6 +706,9 @@ def main(argv: list[str] | None = None) -> int:
     if not source_image.exists():
         raise FlashReportError(f"Image not found: {source_image}")
 
+    if args.fanout_plan:
+        return _run_fanout(args, source_image)
+
     # Regression coverage:
     # tests/flash_pi_media_report_test.py::test_list_devices_without_image_exits_cleanly
     device = _select_device(args, devices)
@@ -446,18 +725,25 @@ def main(argv: list[str] | None = None) -> int:
             return 0
 
     expanded_path, was_compressed, expanded_bytes, expand_duration, expanded_sha, tempdir = (
-        _expand_image(source_image)
+        _expand_image(source_image, flash._open_cache(args))  # type: ignore[attr-defined]
     )
+    # Cached expansions carry their own manifest and must stay inside the cache.
+    cached = was_compressed and tempdir is None
 
     report_dir = args.output_dir.expanduser().resolve()
     now = dt.datetime.now(dt.timezone.utc).astimezone()
     timestamp = now.isoformat()
-    slug = device.path.replace("/", "-").replace("\\", "-").strip("-") or "device"
-    report_path = report_dir / f"flash-{now.strftime('%Y%m%d-%H%M%S')}-{slug}"
+    report_path = report_dir / f"flash-{now.strftime('%Y%m%d-%H%M%S')}-{_report_slug(device)}"
 
     try:
         flash_start = time.time()
-        stdout, stderr, expected_hash, verified_hash = _run_flash(expanded_path, args, device)
+        stdout, stderr, expected_hash, verified_hash = _run_flash(
+            expanded_path,
+            args,
+            device,
+            source_image=None if cached else source_image,
+            manifest_dir=report_dir,
+        )
         flash_duration = time.time() - flash_start
     finally:
         if tempdir and not args.keep_expanded:
@@ -465,7 +751,9 @@ def main(argv: list[str] | None = None) -> int:
 
     report_path.mkdir(parents=True, exist_ok=True)
 
-    if args.keep_expanded and was_compressed:
+    if cached:
+        expanded_display = f"{expanded_path} (cached)"
+    elif args.keep_expanded and was_compressed:
         destination = report_path / expanded_path.name
         if destination.exists():
             destination.unlink()
@@ -479,39 +767,24 @@ def main(argv: list[str] | None = None) -> int:
         if was_compressed and not args.keep_expanded:
             expanded_display += " (removed after flash)"
 
-    cloud_summary, cloud_diff = _cloud_init_diff(args)
-
-    metadata = {
-        "timestamp": timestamp,
-        "host": f"{platform.node()} ({platform.system()} {platform.release()})",
-        "report_dir": str(report_path),
-        "image": {
+    metadata = _build_metadata(
+        args,
+        timestamp=timestamp,
+        report_path=report_path,
+        image={
             "source": str(source_image),
             "expanded": expanded_display,
             "bytes": expanded_bytes,
             "sha256": expanded_sha,
             "expanded_duration": expand_duration,
         },
-        "device": {
-            "path": device.path,
-            "description": device.description or "(unknown)",
-            "size": device.size,
-            "bus": device.bus,
-            "system_id": device.system_id,
-        },
-        "flash_duration": flash_duration,
-        "verification": {
-            "expected": expected_hash,
-            "verified": verified_hash,
-        },
-        "cloud_init": {
-            "summary": cloud_summary,
-        },
-        "flash_log": stdout,
-        "flash_stderr": stderr,
-    }
-    if cloud_diff:
-        metadata["cloud_init"]["diff"] = cloud_diff
+        device=device,
+        flash_duration=flash_duration,
+        expected_hash=expected_hash,
+        verified_hash=verified_hash,
+        stdout=stdout,
+        stderr=stderr,
+    )
 
     _write_report(metadata, report_path)
     print(f"Flash report written to {report_path}")
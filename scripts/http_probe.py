@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""Probe public HTTP endpoints concurrently over reused connections.
+
+``ProbeEngine`` keeps a keep-alive connection pool per origin, so repeated checks
+against one host share a single TCP connection and TLS handshake. It fans URLs out
+over a thread pool and records the same timings ``curl --write-out`` reports:
+
+* ``connect_seconds``: TCP connect time (``0`` when a pooled connection is reused);
+* ``start_transfer_seconds``: time until the response headers arrived;
+* ``total_seconds``: time until the body was read.
+
+Each URL can be sampled repeatedly; ``summarize`` reduces the samples to
+medians plus tail percentiles. ``storage_benchmark`` reuses ``percentile``.
+
+Environment variables
+---------------------
+
+``SUGARKUBE_PROBE_ENGINE``
+    Set to ``http`` to use this engine instead of ``curl``/urllib in the audit
+    and the app verifiers.
+``SUGARKUBE_PROBE_SAMPLES``
+    Requests per URL when the engine is enabled (default: 1).
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import http.client
+import math
+import os
+import socket
+import ssl
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+ENGINE_ENV = "SUGARKUBE_PROBE_ENGINE"
+SAMPLES_ENV = "SUGARKUBE_PROBE_SAMPLES"
+DEFAULT_CONNECT_TIMEOUT = 3.0
+DEFAULT_MAX_TIME = 8.0
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_REDIRECTS = 10
+DEFAULT_BODY_LIMIT = 1024 * 1024 + 1
+USER_AGENT = "sugarkube-http-probe/1.0"
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+Origin = Tuple[str, str, int]
+
+
+@dataclass
+class Sample:
+    """One request/response exchange, including any redirects it followed."""
+
+    url: str
+    status: int = 0
+    error: str = "none"
+    detail: str = ""
+    connect_seconds: float = 0.0
+    start_transfer_seconds: float = 0.0
+    total_seconds: float = 0.0
+    headers: Dict[str, List[str]] = field(default_factory=dict)
+    body: bytes = b""
+
+    @property
+    def ok(self) -> bool:
+        return self.error == "none"
+
+
+class _Redirect(Exception):
+    pass
+
+
+def enabled() -> bool:
+    return os.environ.get(ENGINE_ENV, "").strip().lower() == "http"
+
+
+def configured_samples(default: int = 1) -> int:
+    raw = os.environ.get(SAMPLES_ENV, "").strip()
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError as exc:
+        raise ValueError(f"{SAMPLES_ENV} must be a positive integer") from exc
+    if value < 1:
+        raise ValueError(f"{SAMPLES_ENV} must be a positive integer")
+    return value
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Return the nearest-rank percentile of ``values`` (``0.0`` when empty)."""
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(samples: Sequence[Sample]) -> Dict[str, Any]:
+    """Reduce samples to the audit's timing fields plus tail percentiles.
+
+    Timings are medians over the successful samples; status and error come from
+    the first failed sample so a single failure still marks the URL unhealthy.
+    """
+
+    failed = next((sample for sample in samples if not sample.ok), None)
+    reference = failed or (samples[-1] if samples else Sample(url=""))
+    timed = [sample for sample in samples if sample.ok] or list(samples)
+    totals = [sample.total_seconds for sample in timed]
+    return {
+        "status": reference.status,
+        "error": reference.error,
+        "samples": len(samples),
+        "connectSeconds": percentile([s.connect_seconds for s in timed], 50),
+        "startTransferSeconds": percentile([s.start_transfer_seconds for s in timed], 50),
+        "totalSeconds": percentile(totals, 50),
+        "totalP90Seconds": percentile(totals, 90),
+        "totalP95Seconds": percentile(totals, 95),
+        "totalMaxSeconds": max(totals, default=0.0),
+    }
+
+
+def _origin(url: str) -> Tuple[Origin, str]:
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError(f"unsupported probe URL: {url}")
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    target = parsed.path or "/"
+    if parsed.query:
+        target += f"?{parsed.query}"
+    return (parsed.scheme, parsed.hostname, port), target
+
+
+_RETRYABLE = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class ProbeEngine:
+    """Issue bounded HTTP requests over per-origin keep-alive connection pools.
+
+    ``allowed_schemes`` mirrors ``curl --proto``: redirects to other schemes are
+    reported as ``transport`` errors. ``same_origin`` additionally rejects
+    redirects that leave the origin of the first request with ``redirect``.
+    """
+
+    def __init__(
+        self,
+        *,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        max_time: float = DEFAULT_MAX_TIME,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_redirects: int = DEFAULT_MAX_REDIRECTS,
+        follow_redirects: bool = True,
+        same_origin: bool = False,
+        allowed_schemes: Iterable[str] = ("https",),
+        body_limit: int = DEFAULT_BODY_LIMIT,
+        user_agent: str = USER_AGENT,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        clock=time.perf_counter,
+    ) -> None:
+        self.connect_timeout = connect_timeout
+        self.max_time = max_time
+        self.max_workers = max_workers
+        self.max_redirects = max_redirects
+        self.follow_redirects = follow_redirects
+        self.same_origin = same_origin
+        self.allowed_schemes = frozenset(allowed_schemes)
+        self.body_limit = body_limit
+        self.user_agent = user_agent
+        self._ssl = ssl_context or ssl.create_default_context()
+        self._clock = clock
+        self._idle: Dict[Origin, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ProbeEngine":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def _acquire(self, origin: Origin) -> Optional[http.client.HTTPConnection]:
+        with self._lock:
+            idle = self._idle.get(origin)
+            return idle.pop() if idle else None
+
+    def _release(self, origin: Origin, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(origin, [])
+            if len(idle) < self.max_workers:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _connect(self, origin: Origin, timeout: float) -> Tuple[http.client.HTTPConnection, float]:
+        scheme, host, port = origin
+        started = self._clock()
+        sock = socket.create_connection((host, port), timeout=min(timeout, self.connect_timeout))
+        connected = self._clock() - started
+        sock.settimeout(timeout)
+        if scheme == "https":
+            conn: http.client.HTTPConnection = http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=self._ssl
+            )
+            sock = self._ssl.wrap_socket(sock, server_hostname=host)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        conn.sock = sock
+        return conn, connected
+
+    def _exchange(
+        self,
+        sample: Sample,
+        origin: Origin,
+        method: str,
+        target: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes],
+        deadline: float,
+        started: float,
+    ) -> http.client.HTTPResponse:
+        for attempt in (0, 1):
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                raise socket.timeout("max time elapsed")
+            conn = self._acquire(origin) if attempt == 0 else None
+            reused = conn is not None
+            if conn is None:
+                conn, connected = self._connect(origin, remaining)
+                sample.connect_seconds += connected
+            else:
+                conn.sock.settimeout(remaining)
+            try:
+                conn.request(method, target, body=body, headers=dict(headers))
+                response = conn.getresponse()
+            except _RETRYABLE:
+                conn.close()
+                if reused:
+                    continue  # the server closed an idle keep-alive connection
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            sample.start_transfer_seconds = self._clock() - started
+            try:
+                sample.body = response.read(self.body_limit)
+                drained = response.isclosed() or not response.read(1)
+            except BaseException:
+                conn.close()
+                raise
+            if drained and not response.will_close:
+                self._release(origin, conn)
+            else:
+                conn.close()
+            return response
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def request(
+        self,
+        url: str,
+        *,
+        method: str = "GET",
+        headers: Optional[Mapping[str, str]] = None,
+        body: Optional[bytes] = None,
+        same_origin: Optional[bool] = None,
+    ) -> Sample:
+        """Send one request (following redirects) and return its ``Sample``."""
+
+        sample = Sample(url=url)
+        started = self._clock()
+        deadline = started + self.max_time
+        request_headers = {"User-Agent": self.user_agent, **(headers or {})}
+        current = url
+        first_origin = None
+        same_origin = self.same_origin if same_origin is None else same_origin
+        try:
+            for _hop in range(self.max_redirects + 1):
+                origin, target = _origin(current)
+                if origin[0] not in self.allowed_schemes:
+                    raise ValueError(f"scheme {origin[0]} is not allowed")
+                if first_origin is None:
+                    first_origin = origin
+                elif same_origin and origin != first_origin:
+                    raise _Redirect(current)
+                response = self._exchange(
+                    sample, origin, method, target, request_headers, body, deadline, started
+                )
+                sample.status = response.status
+                sample.headers = {}
+                for name, value in response.getheaders():
+                    sample.headers.setdefault(name.lower(), []).append(value)
+                location = response.getheader("Location")
+                if not (
+                    self.follow_redirects and response.status in REDIRECT_STATUSES and location
+                ):
+                    break
+                current = urllib.parse.urljoin(current, location)
+                if response.status == 303 or (response.status in (301, 302) and method == "POST"):
+                    method, body = "GET", None
+            else:
+                raise ValueError("too many redirects")
+        except _Redirect:
+            sample.error, sample.detail = "redirect", "redirect left the original origin"
+        except socket.timeout as exc:
+            sample.error, sample.detail = "timeout", str(exc) or "timed out"
+        except (OSError, http.client.HTTPException, ValueError) as exc:
+            sample.error, sample.detail = "transport", f"{type(exc).__name__}: {exc}"
+        sample.total_seconds = self._clock() - started
+        return sample
+
+    def sample(self, url: str, samples: int = 1, **kwargs: Any) -> List[Sample]:
+        """Request ``url`` ``samples`` times in sequence so later samples reuse the connection."""
+
+        return [self.request(url, **kwargs) for _ in range(max(samples, 1))]
+
+    def probe_all(
+        self, urls: Sequence[str], *, samples: int = 1, **kwargs: Any
+    ) -> Dict[str, List[Sample]]:
+        """Sample every URL concurrently and return results keyed in input order."""
+
+        if not urls:
+            return {}
+        workers = max(1, min(self.max_workers, len(urls)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self.sample, url, samples, **kwargs) for url in urls]
+            return {url: future.result() for url, future in zip(urls, futures)}
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._idle = list(self._idle.values()), {}
+        for idle in pools:
+            for conn in idle:
+                conn.close()
+
+
+__all__ = [
+    "ENGINE_ENV",
+    "SAMPLES_ENV",
+    "ProbeEngine",
+    "Sample",
+    "configured_samples",
+    "enabled",
+    "percentile",
+    "summarize",
+]
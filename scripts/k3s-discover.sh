@@ -1887,22 +1887,28 @@ if scripts_dir and scripts_dir not in sys.path:
 
 from k3s_mdns_parser import parse_mdns_records
 from k3s_mdns_query import _normalize_record_lines
+from mdns_discovery_daemon import query_daemon
 from mdns_helpers import _norm_host
 
 service_type, cluster, environment, target = sys.argv[1:5]
-command = [
-    "avahi-browse",
-    "-rptk",
-    service_type,
-]
 
-try:
-    proc = subprocess.run(command, capture_output=True, text=True, check=False)
-except FileNotFoundError:
-    sys.exit(2)
+# The discovery daemon sees goodbye packets as they arrive, so prefer its table
+# over starting another browse when it is running.
+records = query_daemon(cluster, environment)
+if records is None:
+    command = [
+        "avahi-browse",
+        "-rptk",
+        service_type,
+    ]
+
+    try:
+        proc = subprocess.run(command, capture_output=True, text=True, check=False)
+    except FileNotFoundError:
+        sys.exit(2)
 
-lines = _normalize_record_lines(proc.stdout.splitlines())
-records = parse_mdns_records(lines, cluster, environment)
+    lines = _normalize_record_lines(proc.stdout.splitlines())
+    records = parse_mdns_records(lines, cluster, environment)
 target_norm = _norm_host(target)
 
 for record in records:
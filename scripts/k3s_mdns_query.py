@@ -27,6 +27,8 @@ Environment Variables:
     ALLOW_IFACE: Pin avahi-browse to specific interface (e.g., "eth0")
     SUGARKUBE_DEBUG: Enable detailed debug logging
     SUGARKUBE_MDNS_FIXTURE_FILE: Use fixture file instead of live avahi-browse
+    SUGARKUBE_MDNS_DAEMON_SOCKET: Discovery daemon socket consulted before avahi-browse
+    SUGARKUBE_MDNS_DAEMON: Set to "0" to always browse directly
 
 See Also:
     - outages/2025-11-15-mdns-terminate-flag-prevented-discovery.json
@@ -38,13 +40,16 @@ from __future__ import annotations
 
 import errno
 import os
+import signal
 import subprocess
+import threading
 import time
 from pathlib import Path
-from typing import Callable, Iterable, List, Optional, Tuple
+from typing import Callable, Iterable, List, Optional, Set, Tuple
 
 from k3s_mdns_parser import MdnsRecord, parse_mdns_records
-from mdns_helpers import _norm_host
+from mdns_discovery_daemon import query_daemon
+from mdns_helpers import _browse_concurrently, _norm_host
 
 DebugFn = Optional[Callable[[str], None]]
 
@@ -53,6 +58,8 @@ _TIMEOUT_ENV = "SUGARKUBE_MDNS_QUERY_TIMEOUT"
 _DEFAULT_TIMEOUT = 10.0
 _RETRY_DELAY = 1.5  # Delay between retry attempts in seconds
 _NO_TERMINATE_ENV = "SUGARKUBE_MDNS_NO_TERMINATE"  # Skip --terminate to wait for network responses
+# Modes whose answer cannot change once a matching record has been seen.
+_EARLY_RETURN_MODES = {"server-first", "server-select"}
 
 
 def _resolve_timeout(value: Optional[str]) -> Optional[float]:
@@ -227,6 +234,55 @@ def _try_dbus_browser(
     return (1, "", "D-Bus browser not available")
 
 
+class _CancellableRunner:
+    """``subprocess.run`` stand-in whose outstanding browses can be killed.
+
+    Without ``--terminate`` every browse runs until its timeout, so returning
+    early from a concurrent scan must also stop the browses still in flight.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._processes: Set[subprocess.Popen[str]] = set()
+        self.cancelled = False
+
+    def __call__(
+        self,
+        command: List[str],
+        *,
+        capture_output: bool = True,
+        text: bool = True,
+        check: bool = False,
+        timeout: Optional[float] = None,
+        env: Optional[dict] = None,
+    ) -> subprocess.CompletedProcess[str]:
+        pipe = subprocess.PIPE if capture_output else None
+        with self._lock:
+            if self.cancelled:
+                return subprocess.CompletedProcess(command, -signal.SIGKILL, "", "")
+            process = subprocess.Popen(command, stdout=pipe, stderr=pipe, text=text, env=env)
+            self._processes.add(process)
+        try:
+            try:
+                stdout, stderr = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                stdout, stderr = process.communicate()
+                raise subprocess.TimeoutExpired(command, timeout, output=stdout, stderr=stderr)
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+        return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            processes = list(self._processes)
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+
+
 def _invoke_avahi(
     mode: str,
     service_type: str,
@@ -251,7 +307,7 @@ def _invoke_avahi(
     # an explicit env parameter, it may not inherit all environment variables correctly,
     # particularly PATH modifications from test fixtures. We now ALWAYS pass env explicitly.
     # For test mocks that don't accept env parameter, we rely on them not being subprocess.run.
-    if runner is subprocess.run:
+    if runner is subprocess.run or isinstance(runner, _CancellableRunner):
         # Build env dict explicitly to work around Python 3.14 subprocess.run issues
         run_kwargs["env"] = dict(os.environ)
     if timeout is not None:
@@ -275,8 +331,8 @@ def _invoke_avahi(
                     for i, line in enumerate(result.stdout.splitlines()[:10]):
                         debug(f"avahi-browse stdout[{i}]: {line}")
 
-            # If successful or has output, break
-            if result.returncode == 0 or result.stdout:
+            # If successful, has output, or the scan no longer needs this browse, break
+            if result.returncode == 0 or result.stdout or getattr(runner, "cancelled", False):
                 break
 
             # If first attempt failed with non-zero exit and no output, retry
@@ -317,6 +373,8 @@ def _invoke_avahi(
                     for i, line in enumerate(stdout.splitlines()[:10]):
                         debug(f"avahi-browse stdout[{i}]: {line}")
 
+            if getattr(runner, "cancelled", False):
+                break
             if attempt == 1:
                 if debug is not None:
                     debug(f"Retrying after timeout (attempt {attempt})...")
@@ -343,7 +401,8 @@ def _invoke_avahi(
                 raise
 
     # If all avahi-browse attempts failed, try D-Bus browser as fallback
-    if result is not None and result.returncode != 0 and not result.stdout:
+    cancelled = getattr(runner, "cancelled", False)
+    if result is not None and result.returncode != 0 and not result.stdout and not cancelled:
         if debug is not None:
             debug(
                 f"avahi-browse failed after retries (exit {result.returncode}), "
@@ -414,15 +473,25 @@ def _load_lines_from_avahi(
     timeout: Optional[float],
     *,
     resolve: bool = True,
+    done: Optional[Callable[[List[str]], bool]] = None,
 ) -> Iterable[str]:
-    lines: List[str] = []
-    for service_type in _service_types(cluster, environment):
+    """Browse every service type concurrently and merge the normalized lines.
+
+    ``done`` enables early return: it is called with the lines merged so far
+    each time a browse finishes, and once it returns true the remaining
+    browses are abandoned (and killed when using the default runner).
+    """
+
+    cancellable = _CancellableRunner() if runner is subprocess.run else None
+    browse_runner = cancellable if cancellable is not None else runner
+
+    def _browse(service_type: str) -> List[str]:
         if debug is not None:
             debug(f"_load_lines_from_avahi: browsing service_type={service_type}, resolve={resolve}")
         result = _invoke_avahi(
             mode,
             service_type,
-            runner,
+            browse_runner,
             debug,
             timeout,
             resolve=resolve,
@@ -436,8 +505,18 @@ def _load_lines_from_avahi(
                 debug(f"Wrote browse dump to {_DUMP_PATH}")
             except OSError:
                 debug("Unable to write browse dump to /tmp")
-        lines.extend(new_lines)
-    return lines
+        return new_lines
+
+    service_types = _service_types(cluster, environment)
+    try:
+        collected = _browse_concurrently(service_types, _browse, done=done)
+    finally:
+        if cancellable is not None:
+            cancellable.cancel()
+    if debug is not None and len(collected) < len(service_types):
+        skipped = [name for name in service_types if name not in collected]
+        debug(f"_load_lines_from_avahi: returned early without waiting for {skipped}")
+    return [line for lines in collected.values() for line in lines]
 
 
 def _render_mode(mode: str, records: Iterable[MdnsRecord]) -> List[str]:
@@ -528,12 +607,34 @@ def query_mdns(
     fixture_path: Optional[str] = None,
     debug: DebugFn = None,
     runner: Optional[Callable[..., subprocess.CompletedProcess[str]]] = None,
+    early_return: Optional[bool] = None,
 ) -> List[str]:
-    """Run an mDNS browse for sugarkube k3s advertisements."""
+    """Run an mDNS browse for sugarkube k3s advertisements.
+
+    When a discovery daemon is serving its cached table (see
+    ``mdns_discovery_daemon.py``) and no custom ``runner`` was injected, the
+    records come from the daemon and no ``avahi-browse`` is started.
 
+    Service types are browsed concurrently. For ``server-first`` and
+    ``server-select`` the scan returns as soon as a matching server has been
+    seen when ``early_return`` is enabled, which is the default unless a custom
+    ``runner`` is injected (its outstanding calls cannot be cancelled).
+    """
+
+    use_daemon = runner is None and not fixture_path
+    if early_return is None:
+        early_return = runner is None
     if runner is None:
         runner = subprocess.run  # type: ignore[assignment]
 
+    done: Optional[Callable[[List[str]], bool]] = None
+    if early_return and mode in _EARLY_RETURN_MODES:
+
+        def _found(lines: List[str]) -> bool:
+            return bool(_render_mode(mode, parse_mdns_records(lines, cluster, environment)))
+
+        done = _found
+
     timeout = _resolve_timeout(os.environ.get(_TIMEOUT_ENV))
 
     if debug is not None:
@@ -543,9 +644,16 @@ def query_mdns(
         debug(f"query_mdns: timeout={timeout}s")
         debug(f"query_mdns: no_terminate={os.environ.get(_NO_TERMINATE_ENV, '0')}")
 
+    cached = query_daemon(cluster, environment, debug=debug) if use_daemon else None
+
     if fixture_path:
         lines = _load_lines_from_fixture(fixture_path)
         records = parse_mdns_records(lines, cluster, environment)
+    elif cached is not None:
+        # An empty table is the daemon's answer, not a miss: only an unreachable or
+        # warming-up daemon (None) falls through to the resolved and unresolved browses.
+        records = cached
+        lines = [record.raw for record in records]
     else:
         lines = _load_lines_from_avahi(
             mode,
@@ -554,6 +662,7 @@ def query_mdns(
             runner,
             debug,
             timeout,
+            done=done,
         )
         records = parse_mdns_records(lines, cluster, environment)
 
@@ -571,6 +680,7 @@ def query_mdns(
                 debug,
                 timeout,
                 resolve=False,
+                done=done,
             )
             if fallback_lines:
                 lines = fallback_lines
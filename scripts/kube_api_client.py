@@ -0,0 +1,665 @@
+#!/usr/bin/env python3
+"""Serve read-only ``kubectl get`` calls from one in-process Kubernetes API client.
+
+Every ``kubectl`` invocation re-reads kubeconfig, renegotiates TLS and rediscovers
+the API before it can answer, which costs 150-300 ms per read on a workstation and
+noticeably more on a Pi. Tools that fan out dozens of reads can opt into this
+module instead: kubeconfig is parsed once per path, and requests share a small
+pool of keep-alive HTTPS connections (including the ``services/.../proxy`` path
+used for Prometheus queries).
+
+``run(argv)`` accepts the same argv the tools already build and returns a
+``subprocess.CompletedProcess`` shaped like kubectl's, so callers only need to
+fall back to ``subprocess.run`` when it returns ``None``. It does so whenever
+the client is disabled, the argv is not a plain JSON ``get`` it can translate,
+or the kubeconfig relies on something it does not implement (exec plugins, auth
+providers, proxies, merged ``KUBECONFIG`` lists).
+
+Environment variables
+---------------------
+
+``SUGARKUBE_KUBE_API_CLIENT``
+    Set to ``1`` to route supported reads through the in-process client.
+"""
+
+from __future__ import annotations
+
+import base64
+import http.client
+import json
+import math
+import os
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import urllib.parse
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+ENABLE_ENV = "SUGARKUBE_KUBE_API_CLIENT"
+DEFAULT_TIMEOUT = 30
+DEFAULT_POOL_SIZE = 8
+# Extra socket slack past a watch's server-side timeoutSeconds before giving up on it.
+WATCH_GRACE_SECONDS = 5
+USER_AGENT = "sugarkube-kube-api-client/1.0"
+
+
+class KubeApiError(RuntimeError):
+    """Raised when the API server cannot be reached or rejects a request."""
+
+    def __init__(self, message: str, *, status: Optional[int] = None, reason: str = "") -> None:
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+
+    def kubectl_stderr(self) -> str:
+        if self.status is None:
+            return f"Unable to connect to the server: {self}\n"
+        return f"Error from server ({self.reason or self.status}): {self}\n"
+
+
+class Unsupported(ValueError):
+    """Raised when an argv or kubeconfig needs kubectl itself."""
+
+
+@dataclass(frozen=True)
+class Resource:
+    group_version: str
+    plural: str
+    kind: str
+    namespaced: bool = True
+
+    @property
+    def prefix(self) -> str:
+        if "/" in self.group_version:
+            return f"/apis/{self.group_version}"
+        return f"/api/{self.group_version}"
+
+    @property
+    def group(self) -> str:
+        return self.group_version.rpartition("/")[0]
+
+
+_CORE = (
+    (("node", "nodes", "no"), Resource("v1", "nodes", "Node", namespaced=False)),
+    (("namespace", "namespaces", "ns"), Resource("v1", "namespaces", "Namespace", False)),
+    (("pod", "pods", "po"), Resource("v1", "pods", "Pod")),
+    (("service", "services", "svc"), Resource("v1", "services", "Service")),
+    (("endpoints", "ep"), Resource("v1", "endpoints", "Endpoints")),
+    (("configmap", "configmaps", "cm"), Resource("v1", "configmaps", "ConfigMap")),
+    (("deployment", "deployments", "deploy"), Resource("apps/v1", "deployments", "Deployment")),
+    (("statefulset", "statefulsets", "sts"), Resource("apps/v1", "statefulsets", "StatefulSet")),
+    (("daemonset", "daemonsets", "ds"), Resource("apps/v1", "daemonsets", "DaemonSet")),
+    (("replicaset", "replicasets", "rs"), Resource("apps/v1", "replicasets", "ReplicaSet")),
+    (("job", "jobs"), Resource("batch/v1", "jobs", "Job")),
+    (("cronjob", "cronjobs", "cj"), Resource("batch/v1", "cronjobs", "CronJob")),
+    (
+        ("pdb", "poddisruptionbudget", "poddisruptionbudgets"),
+        Resource("policy/v1", "poddisruptionbudgets", "PodDisruptionBudget"),
+    ),
+    (
+        ("endpointslice", "endpointslices"),
+        Resource("discovery.k8s.io/v1", "endpointslices", "EndpointSlice"),
+    ),
+    (("ingress", "ingresses", "ing"), Resource("networking.k8s.io/v1", "ingresses", "Ingress")),
+    (
+        ("servicemonitor", "servicemonitors"),
+        Resource("monitoring.coreos.com/v1", "servicemonitors", "ServiceMonitor"),
+    ),
+    (
+        ("prometheusrule", "prometheusrules"),
+        Resource("monitoring.coreos.com/v1", "prometheusrules", "PrometheusRule"),
+    ),
+    (
+        ("helmchartconfig", "helmchartconfigs"),
+        Resource("helm.cattle.io/v1", "helmchartconfigs", "HelmChartConfig"),
+    ),
+)
+# Secrets are deliberately absent: their reads stay in kubectl so callers that
+# evaluate them with templates never receive Secret data in-process.
+RESOURCES: Dict[str, Resource] = {name: res for names, res in _CORE for name in names}
+
+
+def resource(name: str) -> Resource:
+    """Resolve a kubectl resource name, short name or ``plural.group`` form."""
+
+    found = RESOURCES.get(name)
+    if found is not None:
+        return found
+    base, _, group = name.partition(".")
+    found = RESOURCES.get(base)
+    if found is None or not group or found.group != group:
+        raise Unsupported(f"resource {name!r} is not served in-process")
+    return found
+
+
+@dataclass(frozen=True)
+class Read:
+    """One translated ``kubectl get``: either a raw path or typed resource reads."""
+
+    raw: Optional[str] = None
+    resources: Tuple[Resource, ...] = ()
+    name: Optional[str] = None
+    namespace: Optional[str] = None
+    all_namespaces: bool = False
+    selector: Optional[str] = None
+
+    def path(self, res: Resource) -> str:
+        parts = [res.prefix]
+        if res.namespaced and not self.all_namespaces:
+            parts.append(f"namespaces/{urllib.parse.quote(self.namespace or 'default', safe='')}")
+        parts.append(res.plural)
+        if self.name:
+            parts.append(urllib.parse.quote(self.name, safe=""))
+        path = "/".join(parts)
+        if self.selector:
+            path += "?" + urllib.parse.urlencode({"labelSelector": self.selector})
+        return path
+
+
+def split_kubeconfig(args: Sequence[str]) -> Tuple[Optional[str], List[str]]:
+    """Strip ``--kubeconfig`` from kubectl arguments and return it separately."""
+
+    kubeconfig: Optional[str] = None
+    rest: List[str] = []
+    items = iter(args)
+    for arg in items:
+        if arg == "--kubeconfig":
+            kubeconfig = next(items, None)
+            if kubeconfig is None:
+                raise Unsupported("--kubeconfig requires a value")
+        elif arg.startswith("--kubeconfig="):
+            kubeconfig = arg.partition("=")[2]
+        else:
+            rest.append(arg)
+    return kubeconfig, rest
+
+
+def translate(args: Sequence[str]) -> Read:
+    """Translate ``kubectl`` arguments (without argv[0]) into an API read.
+
+    Only ``get --raw PATH`` and ``get KIND[,KIND] [NAME] [-n NS|-A] [-l SEL] -o json``
+    are accepted; anything else raises ``Unsupported`` so the caller runs kubectl.
+    """
+
+    positional: List[str] = []
+    namespace = None
+    output = None
+    raw = None
+    selector = None
+    all_namespaces = False
+    value_flags = {
+        "-n": "namespace",
+        "--namespace": "namespace",
+        "-l": "selector",
+        "--selector": "selector",
+        "-o": "output",
+        "--output": "output",
+        "--raw": "raw",
+    }
+    items = iter(args)
+    for arg in items:
+        flag, eq, inline = arg.partition("=")
+        if arg in ("-A", "--all-namespaces"):
+            all_namespaces = True
+            continue
+        if flag in value_flags and (eq or arg in value_flags):
+            value = inline if eq else next(items, None)
+            if value is None:
+                raise Unsupported(f"{flag} requires a value")
+            target = value_flags[flag]
+            if target == "namespace":
+                namespace = value
+            elif target == "selector":
+                selector = value
+            elif target == "output":
+                output = value
+            else:
+                raw = value
+            continue
+        if arg.startswith("-"):
+            raise Unsupported(f"flag {arg!r} is not served in-process")
+        positional.append(arg)
+
+    if not positional or positional[0] != "get":
+        raise Unsupported("only kubectl get is served in-process")
+    if raw is not None:
+        if len(positional) != 1 or output or selector or all_namespaces or not raw.startswith("/"):
+            raise Unsupported("kubectl get --raw takes exactly one absolute path")
+        return Read(raw=raw)
+    if output != "json" or len(positional) not in (2, 3):
+        raise Unsupported("only JSON output is served in-process")
+    kinds = positional[1].split(",")
+    name = positional[2] if len(positional) == 3 else None
+    if name and (len(kinds) > 1 or all_namespaces or selector):
+        raise Unsupported("named reads take a single resource kind")
+    return Read(
+        resources=tuple(resource(kind) for kind in kinds),
+        name=name,
+        namespace=namespace,
+        all_namespaces=all_namespaces,
+        selector=selector,
+    )
+
+
+@dataclass
+class KubeConfig:
+    """The parts of one kubeconfig context needed to reach its API server."""
+
+    server: str
+    context: str = ""
+    namespace: str = "default"
+    ca_data: Optional[bytes] = None
+    ca_file: Optional[str] = None
+    cert_data: Optional[bytes] = None
+    key_data: Optional[bytes] = None
+    cert_file: Optional[str] = None
+    key_file: Optional[str] = None
+    token: Optional[str] = None
+    basic_auth: Optional[str] = None
+    insecure: bool = False
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def _named(entries: Any, name: str, key: str) -> Dict[str, Any]:
+    for entry in entries or []:
+        if isinstance(entry, dict) and entry.get("name") == name:
+            value = entry.get(key)
+            return value if isinstance(value, dict) else {}
+    raise Unsupported(f"kubeconfig has no {key} named {name!r}")
+
+
+def _read_kubeconfig(path: Path) -> Dict[str, Any]:
+    text = path.read_text(encoding="utf-8")
+    try:
+        doc = json.loads(text)
+    except json.JSONDecodeError:
+        # kubeconfig is normally YAML; let kubectl convert it once rather than
+        # shipping a YAML parser.
+        proc = subprocess.run(
+            ["kubectl", "--kubeconfig", str(path), "config", "view", "--raw", "-o", "json"],
+            text=True,
+            capture_output=True,
+            check=False,
+            timeout=DEFAULT_TIMEOUT,
+        )
+        if proc.returncode:
+            raise Unsupported("kubectl could not render kubeconfig as JSON")
+        doc = json.loads(proc.stdout)
+    if not isinstance(doc, dict):
+        raise Unsupported("kubeconfig must be a mapping")
+    return doc
+
+
+def _relative(base: Path, value: Any) -> Optional[str]:
+    if not value:
+        return None
+    candidate = Path(str(value)).expanduser()
+    return str(candidate if candidate.is_absolute() else base / candidate)
+
+
+def load_kubeconfig(path: str | os.PathLike[str]) -> KubeConfig:
+    """Parse the current context of ``path`` into a ``KubeConfig``."""
+
+    source = Path(path).expanduser()
+    doc = _read_kubeconfig(source)
+    context_name = str(doc.get("current-context") or "")
+    if not context_name:
+        raise Unsupported("kubeconfig has no current context")
+    context = _named(doc.get("contexts"), context_name, "context")
+    cluster = _named(doc.get("clusters"), str(context.get("cluster") or ""), "cluster")
+    user = _named(doc.get("users"), str(context.get("user") or ""), "user")
+    if cluster.get("proxy-url") or cluster.get("tls-server-name"):
+        raise Unsupported("kubeconfig cluster options need kubectl")
+    if user.get("exec") or user.get("auth-provider") or user.get("impersonate"):
+        raise Unsupported("kubeconfig credentials need kubectl")
+    server = str(cluster.get("server") or "")
+    if urllib.parse.urlsplit(server).scheme not in ("http", "https"):
+        raise Unsupported("kubeconfig server must be an http(s) URL")
+
+    def data(key: str) -> Optional[bytes]:
+        value = cluster.get(key) if key.startswith("certificate-authority") else user.get(key)
+        return base64.b64decode(value) if value else None
+
+    base = source.parent
+    config = KubeConfig(
+        server=server.rstrip("/"),
+        context=context_name,
+        namespace=str(context.get("namespace") or "default"),
+        ca_data=data("certificate-authority-data"),
+        ca_file=_relative(base, cluster.get("certificate-authority")),
+        cert_data=data("client-certificate-data"),
+        key_data=data("client-key-data"),
+        cert_file=_relative(base, user.get("client-certificate")),
+        key_file=_relative(base, user.get("client-key")),
+        insecure=bool(cluster.get("insecure-skip-tls-verify")),
+    )
+    token = user.get("token")
+    if not token and user.get("tokenFile"):
+        token = Path(_relative(base, user["tokenFile"]) or "").read_text().strip()
+    config.token = str(token) if token else None
+    if user.get("username") and user.get("password"):
+        credentials = f"{user['username']}:{user['password']}".encode()
+        config.basic_auth = base64.b64encode(credentials).decode()
+    return config
+
+
+def ssl_context(config: KubeConfig) -> ssl.SSLContext:
+    """Build a TLS context trusting the kubeconfig CA and presenting its client cert."""
+
+    context = ssl.create_default_context()
+    if config.insecure:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if config.ca_data:
+        context.load_verify_locations(cadata=config.ca_data.decode())
+    elif config.ca_file:
+        context.load_verify_locations(cafile=config.ca_file)
+    if config.cert_data and config.key_data:
+        # load_cert_chain only accepts paths; keep the PEMs on disk just long
+        # enough to load them into the context.
+        with tempfile.TemporaryDirectory(prefix="sugarkube-kube-api-") as tmpdir:
+            cert, key = Path(tmpdir) / "client.crt", Path(tmpdir) / "client.key"
+            for target, payload in ((cert, config.cert_data), (key, config.key_data)):
+                fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(payload)
+            context.load_cert_chain(str(cert), str(key))
+    elif config.cert_file and config.key_file:
+        context.load_cert_chain(config.cert_file, config.key_file)
+    return context
+
+
+def _status_error(status: int, reason: str, body: bytes) -> KubeApiError:
+    message = "the server could not find the requested resource"
+    try:
+        doc = json.loads(body)
+        if isinstance(doc, dict):
+            message = str(doc.get("message") or message)
+            reason = str(doc.get("reason") or reason)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        pass
+    return KubeApiError(message, status=status, reason=reason)
+
+
+_RETRYABLE = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class KubeApiClient:
+    """A thread-safe pool of keep-alive connections to one API server."""
+
+    def __init__(
+        self,
+        config: KubeConfig,
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ) -> None:
+        self.config = config
+        self.timeout = timeout
+        self._pool_size = pool_size
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        parsed = urllib.parse.urlsplit(config.server)
+        self._https = parsed.scheme == "https"
+        self._netloc = parsed.netloc
+        self._base_path = parsed.path.rstrip("/")
+        self._ssl = ssl_context(config) if self._https else None
+        self._headers = {"Accept": "application/json", "User-Agent": USER_AGENT}
+        if config.token:
+            self._headers["Authorization"] = f"Bearer {config.token}"
+        elif config.basic_auth:
+            self._headers["Authorization"] = f"Basic {config.basic_auth}"
+
+    @classmethod
+    def from_kubeconfig(cls, path: str | os.PathLike[str], **kwargs: Any) -> "KubeApiClient":
+        return cls(load_kubeconfig(path), **kwargs)
+
+    def _connect(self, timeout: float) -> http.client.HTTPConnection:
+        if self._https:
+            return http.client.HTTPSConnection(self._netloc, timeout=timeout, context=self._ssl)
+        return http.client.HTTPConnection(self._netloc, timeout=timeout)
+
+    def _acquire(self, timeout: float) -> http.client.HTTPConnection:
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._connect(timeout)
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self._pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, path: str, *, timeout: Optional[float] = None) -> Tuple[int, str, bytes]:
+        """GET ``path`` and return ``(status, reason, body)``.
+
+        A reused connection that the server already closed is retried once on a
+        fresh one; socket timeouts propagate as ``socket.timeout``.
+        """
+
+        timeout = self.timeout if timeout is None else timeout
+        for attempt in (0, 1):
+            conn = self._acquire(timeout)
+            reused = conn.sock is not None
+            try:
+                conn.request("GET", self._base_path + path, headers=self._headers)
+                response = conn.getresponse()
+                body = response.read()
+            except _RETRYABLE as exc:
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise KubeApiError("connection closed by the API server") from exc
+            except socket.timeout:
+                conn.close()
+                raise
+            except (OSError, http.client.HTTPException) as exc:
+                conn.close()
+                raise KubeApiError(type(exc).__name__) from exc
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return response.status, response.reason, body
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def get_raw(self, path: str, *, timeout: Optional[float] = None) -> str:
+        status, reason, body = self.request(path, timeout=timeout)
+        if not 200 <= status < 300:
+            raise _status_error(status, reason, body)
+        return body.decode("utf-8")
+
+    def get_json(self, path: str, *, timeout: Optional[float] = None) -> Any:
+        return json.loads(self.get_raw(path, timeout=timeout))
+
+    def watch(
+        self, path: str, *, resource_version: str = "", timeout: float = DEFAULT_TIMEOUT
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield watch events for the collection at ``path`` until the server ends the stream.
+
+        The API server closes the watch after ``timeout`` seconds. The stream runs on its
+        own connection so it never holds one of the pooled keep-alive connections.
+        """
+
+        params = {
+            "watch": "1",
+            "allowWatchBookmarks": "true",
+            "timeoutSeconds": str(max(1, math.ceil(timeout))),
+        }
+        if resource_version:
+            params["resourceVersion"] = resource_version
+        separator = "&" if "?" in path else "?"
+        target = self._base_path + path + separator + urllib.parse.urlencode(params)
+        conn = self._connect(timeout + WATCH_GRACE_SECONDS)
+        try:
+            conn.request("GET", target, headers=self._headers)
+            response = conn.getresponse()
+            if not 200 <= response.status < 300:
+                raise _status_error(response.status, response.reason, response.read())
+            while True:
+                line = response.readline()
+                if not line:
+                    return
+                if line.strip():
+                    event = json.loads(line)
+                    if isinstance(event, dict):
+                        yield event
+        except socket.timeout:
+            return
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+            raise KubeApiError("malformed watch event") from exc
+        except (OSError, http.client.HTTPException) as exc:
+            raise KubeApiError(type(exc).__name__) from exc
+        finally:
+            conn.close()
+
+    def resolve(self, read: Read) -> Read:
+        """Fill in the kubeconfig namespace for reads that did not name one."""
+
+        if read.raw is not None or read.namespace is not None:
+            return read
+        return Read(
+            resources=read.resources,
+            name=read.name,
+            namespace=self.config.namespace,
+            all_namespaces=read.all_namespaces,
+            selector=read.selector,
+        )
+
+    def read(self, read: Read, *, timeout: Optional[float] = None) -> str:
+        """Return kubectl-equivalent stdout for a translated read."""
+
+        if read.raw is not None:
+            return self.get_raw(read.raw, timeout=timeout)
+        read = self.resolve(read)
+        if read.name:
+            doc = self.get_json(read.path(read.resources[0]), timeout=timeout)
+            return json.dumps(doc, indent=4) + "\n"
+        items: List[Any] = []
+        for res in read.resources:
+            doc = self.get_json(read.path(res), timeout=timeout)
+            listed = doc.get("items") if isinstance(doc, dict) else None
+            for item in listed if isinstance(listed, list) else []:
+                if isinstance(item, dict):
+                    # List responses omit per-item type information; kubectl adds it.
+                    item.setdefault("apiVersion", res.group_version)
+                    item.setdefault("kind", res.kind)
+                items.append(item)
+        listing = {"apiVersion": "v1", "items": items, "kind": "List"}
+        listing["metadata"] = {"resourceVersion": ""}
+        return json.dumps(listing, indent=4) + "\n"
+
+    def run(
+        self, argv: Sequence[str], *, timeout: Optional[float] = None
+    ) -> subprocess.CompletedProcess[str]:
+        """Answer a kubectl argv like ``subprocess.run(..., capture_output=True)`` would."""
+
+        _, args = split_kubeconfig(argv[1:])
+        if args == ["config", "current-context"]:
+            return subprocess.CompletedProcess(list(argv), 0, self.config.context + "\n", "")
+        read = translate(args)
+        try:
+            stdout = self.read(read, timeout=timeout)
+        except socket.timeout as exc:
+            raise subprocess.TimeoutExpired(list(argv), timeout or self.timeout) from exc
+        except (KubeApiError, json.JSONDecodeError, UnicodeDecodeError) as exc:
+            if not isinstance(exc, KubeApiError):
+                exc = KubeApiError("malformed response", status=0, reason="InternalError")
+            return subprocess.CompletedProcess(list(argv), 1, "", exc.kubectl_stderr())
+        return subprocess.CompletedProcess(list(argv), 0, stdout, "")
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_CLIENTS: Dict[str, Optional[KubeApiClient]] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def enabled() -> bool:
+    return os.environ.get(ENABLE_ENV, "").strip() == "1"
+
+
+def kubeconfig_path(explicit: Optional[str] = None) -> Optional[str]:
+    if explicit:
+        return explicit
+    configured = os.environ.get("KUBECONFIG", "")
+    if os.pathsep in configured:
+        return None  # kubectl merges lists; leave that to kubectl.
+    return configured or str(Path.home() / ".kube" / "config")
+
+
+def client_for(kubeconfig: Optional[str] = None) -> Optional[KubeApiClient]:
+    """Return the shared client for ``kubeconfig``, or ``None`` when kubectl is needed."""
+
+    path = kubeconfig_path(kubeconfig)
+    if path is None:
+        return None
+    with _CLIENTS_LOCK:
+        if path not in _CLIENTS:
+            try:
+                _CLIENTS[path] = KubeApiClient.from_kubeconfig(path)
+            except (Unsupported, OSError, ValueError, ssl.SSLError, subprocess.SubprocessError):
+                _CLIENTS[path] = None
+        return _CLIENTS[path]
+
+
+def reset() -> None:
+    """Close and forget every cached client (tests and long-lived callers)."""
+
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        if client is not None:
+            client.close()
+
+
+def run(
+    argv: Sequence[str], *, timeout: Optional[float] = None
+) -> Optional[subprocess.CompletedProcess[str]]:
+    """Serve ``argv`` in-process when enabled and supported; ``None`` means run kubectl."""
+
+    if not enabled() or not argv or argv[0] != "kubectl":
+        return None
+    try:
+        kubeconfig, args = split_kubeconfig(argv[1:])
+        if args != ["config", "current-context"]:
+            translate(args)
+    except Unsupported:
+        return None
+    client = client_for(kubeconfig)
+    if client is None:
+        return None
+    return client.run(argv, timeout=timeout)
+
+
+__all__ = [
+    "ENABLE_ENV",
+    "KubeApiClient",
+    "KubeApiError",
+    "KubeConfig",
+    "Read",
+    "Resource",
+    "Unsupported",
+    "client_for",
+    "enabled",
+    "load_kubeconfig",
+    "reset",
+    "run",
+    "split_kubeconfig",
+    "translate",
+]
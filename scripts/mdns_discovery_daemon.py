@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+"""Long-lived mDNS discovery service that caches k3s advertisements.
+
+``k3s_mdns_query.query_mdns`` and ``mdns_helpers._collect_mdns_records`` start a
+fresh ``avahi-browse`` for every service type on every call, and
+``k3s-discover.sh`` calls them repeatedly while electing a bootstrap node or
+joining a cluster. Each call therefore costs a full browse timeout and hits
+avahi-daemon with another burst of browse requests.
+
+This daemon subscribes to Avahi once per service type and keeps an in-memory,
+TTL-aware table of the advertisements it has seen. Clients query the table
+over a local UNIX socket with one JSON line and receive parsed
+:class:`~k3s_mdns_parser.MdnsRecord` values back immediately. When the socket
+is missing, still warming up, or unreachable the clients fall back to running
+``avahi-browse`` themselves, so the daemon is an optimisation rather than a
+dependency.
+
+Environment Variables:
+    SUGARKUBE_MDNS_DAEMON_SOCKET: Socket path (default: /run/sugarkube/mdns-discovery.sock)
+    SUGARKUBE_MDNS_DAEMON: Set to "0" to stop clients from consulting the daemon
+    SUGARKUBE_CLUSTER / SUGARKUBE_ENV: Service type browsed from start-up
+    ALLOW_IFACE: Pin the long-lived browsers to a specific interface (e.g. "eth0")
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import grp
+import json
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from k3s_mdns_parser import MdnsRecord, parse_mdns_records  # noqa: E402
+
+DEFAULT_SOCKET = "/run/sugarkube/mdns-discovery.sock"
+SOCKET_ENV = "SUGARKUBE_MDNS_DAEMON_SOCKET"
+ENABLE_ENV = "SUGARKUBE_MDNS_DAEMON"
+# RFC 6762 recommends a 120 second TTL for SRV/TXT records; entries that are not
+# re-announced within that window are treated as gone.
+DEFAULT_TTL = 120.0
+DEFAULT_WARMUP = 2.0
+CLIENT_TIMEOUT = 0.5
+RESTART_BACKOFF = 5.0
+MAX_REQUEST_BYTES = 4096
+# Only the daemon's user and the socket's group may query the table.
+SOCKET_MODE = 0o660
+
+DebugFn = Optional[Callable[[str], None]]
+Clock = Callable[[], float]
+RecordKey = Tuple[str, str, str, str, str]
+
+
+def service_types(cluster: str, environment: str) -> List[str]:
+    types = [f"_k3s-{cluster}-{environment}._tcp"]
+    legacy = "_https._tcp"
+    if legacy not in types:
+        types.append(legacy)
+    return types
+
+
+def browse_command(service_type: str) -> List[str]:
+    """Return a long-running ``avahi-browse`` that streams add/remove events.
+
+    Without ``--terminate`` avahi-browse keeps its D-Bus ServiceBrowser and
+    ServiceResolver subscriptions open and prints one parsable line per
+    ``ItemNew``/``ItemRemove`` signal, which is exactly the event feed the table
+    needs.
+    """
+
+    command = ["avahi-browse", "--parsable", "--resolve", "--no-db-lookup"]
+    allow_iface = os.environ.get("ALLOW_IFACE", "").strip()
+    if allow_iface:
+        command.append(f"--interface={allow_iface}")
+    command.append(service_type)
+    return command
+
+
+def _record_key(line: str) -> Optional[Tuple[str, RecordKey]]:
+    parts = line.split(";")
+    if len(parts) < 6 or parts[0] not in {"+", "=", "-"}:
+        return None
+    return parts[0], (parts[1], parts[2], parts[3], parts[4], parts[5])
+
+
+@dataclasses.dataclass
+class _Entry:
+    line: str
+    resolved: bool
+    expires_at: float
+
+
+class ServiceTable:
+    """TTL-aware view of the Avahi browse events seen so far.
+
+    Entries are keyed by interface, protocol, instance, type and domain, the
+    same tuple Avahi uses to identify a service. Resolved (``=``) lines replace
+    browse-only (``+``) lines for the same key, removals (``-``) drop the key,
+    and every sighting pushes the expiry out by ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, *, clock: Clock = time.monotonic) -> None:
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[RecordKey, _Entry] = {}
+        self._generation = 0
+        self._parsed: Dict[Tuple[str, str], Tuple[int, List[MdnsRecord]]] = {}
+
+    def apply(self, line: str) -> bool:
+        """Fold one ``avahi-browse --parsable`` line into the table."""
+
+        line = line.strip()
+        parsed = _record_key(line)
+        if parsed is None:
+            return False
+        kind, key = parsed
+        with self._lock:
+            if kind == "-":
+                if self._entries.pop(key, None) is None:
+                    return False
+            else:
+                expires_at = self._clock() + self.ttl
+                existing = self._entries.get(key)
+                if existing is not None and existing.resolved and kind == "+":
+                    existing.expires_at = expires_at
+                    return False
+                self._entries[key] = _Entry(line, kind == "=", expires_at)
+            self._generation += 1
+        return True
+
+    def _expire_locked(self) -> None:
+        now = self._clock()
+        stale = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self._generation += 1
+
+    def lines(self, types: Optional[Iterable[str]] = None) -> List[str]:
+        wanted = set(types) if types is not None else None
+        with self._lock:
+            self._expire_locked()
+            return [
+                entry.line
+                for key, entry in self._entries.items()
+                if wanted is None or key[3] in wanted
+            ]
+
+    def records(self, cluster: str, environment: str) -> List[MdnsRecord]:
+        """Return parsed records for ``cluster``/``environment``.
+
+        Parsing is cached per generation so repeated queries between Avahi
+        events cost a dictionary lookup.
+        """
+
+        cache_key = (cluster, environment)
+        wanted = set(service_types(cluster, environment))
+        with self._lock:
+            self._expire_locked()
+            cached = self._parsed.get(cache_key)
+            if cached is not None and cached[0] == self._generation:
+                return list(cached[1])
+            generation = self._generation
+            lines = [entry.line for key, entry in self._entries.items() if key[3] in wanted]
+            records = parse_mdns_records(lines, cluster, environment)
+            self._parsed[cache_key] = (generation, records)
+        return list(records)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire_locked()
+            return len(self._entries)
+
+
+class ServiceBrowser(threading.Thread):
+    """Feed one service type's Avahi events into a :class:`ServiceTable`.
+
+    The browser is restarted every ``refresh`` seconds (half the TTL by
+    default). Avahi replays its cache to a new subscriber, which re-stamps live
+    entries and lets anything that vanished without a goodbye packet expire.
+    """
+
+    def __init__(
+        self,
+        service_type: str,
+        table: ServiceTable,
+        *,
+        refresh: Optional[float] = None,
+        warmup: float = DEFAULT_WARMUP,
+        command: Optional[Sequence[str]] = None,
+        debug: DebugFn = None,
+    ) -> None:
+        super().__init__(name=f"mdns-browse {service_type}", daemon=True)
+        self.service_type = service_type
+        self.table = table
+        self.refresh = refresh if refresh is not None else table.ttl / 2
+        self.warmup = warmup
+        self.command = list(command) if command is not None else browse_command(service_type)
+        self.debug = debug
+        self.ready = threading.Event()
+        self._stop_event = threading.Event()
+        self._process: Optional[subprocess.Popen[str]] = None
+        self._lock = threading.Lock()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        with self._lock:
+            process = self._process
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+    def _log(self, message: str) -> None:
+        if self.debug is not None:
+            self.debug(f"{self.service_type}: {message}")
+
+    def _run_once(self) -> bool:
+        try:
+            process = subprocess.Popen(
+                self.command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        except OSError as exc:
+            self._log(f"unable to start {self.command[0]}: {exc}")
+            return False
+        with self._lock:
+            self._process = process
+        if self._stop_event.is_set():
+            process.terminate()
+
+        # Mark the table usable once the first subscription has had time to hear
+        # the network, and recycle the subscription to refresh TTLs.
+        recycled = threading.Event()
+
+        def _recycle() -> None:
+            recycled.set()
+            process.terminate()
+
+        warm = threading.Timer(self.warmup, self.ready.set)
+        recycle = threading.Timer(self.refresh, _recycle)
+        warm.daemon = recycle.daemon = True
+        warm.start()
+        recycle.start()
+        changes = 0
+        try:
+            assert process.stdout is not None
+            for line in process.stdout:
+                if self.table.apply(line):
+                    changes += 1
+        finally:
+            recycle.cancel()
+            warm.cancel()
+            if process.poll() is None:
+                process.terminate()
+            process.wait()
+        self._log(f"browse cycle ended (exit {process.returncode}, {changes} changes)")
+        return process.returncode == 0 or recycled.is_set() or self._stop_event.is_set()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            healthy = self._run_once()
+            if self._stop_event.is_set():
+                break
+            if healthy:
+                self.ready.set()
+            else:
+                # Let clients fall back to their own browse instead of trusting
+                # a table that is no longer being refreshed.
+                self.ready.clear()
+            # Back off when avahi-browse is missing or exits immediately so a
+            # broken avahi-daemon is not hammered with restarts.
+            if not healthy or time.monotonic() - started < 1.0:
+                self._stop_event.wait(RESTART_BACKOFF)
+
+
+class DiscoveryService:
+    """Own the table and one :class:`ServiceBrowser` per service type."""
+
+    def __init__(
+        self,
+        *,
+        ttl: float = DEFAULT_TTL,
+        warmup: float = DEFAULT_WARMUP,
+        refresh: Optional[float] = None,
+        command_factory: Callable[[str], Sequence[str]] = browse_command,
+        debug: DebugFn = None,
+    ) -> None:
+        self.table = ServiceTable(ttl)
+        self.warmup = warmup
+        self.refresh = refresh
+        self.command_factory = command_factory
+        self.debug = debug
+        self.started = time.monotonic()
+        self._browsers: Dict[str, ServiceBrowser] = {}
+        self._lock = threading.Lock()
+
+    def ensure(self, types: Iterable[str]) -> List[ServiceBrowser]:
+        """Start browsers for any of ``types`` that are not subscribed yet."""
+
+        browsers: List[ServiceBrowser] = []
+        with self._lock:
+            for service_type in types:
+                browser = self._browsers.get(service_type)
+                if browser is None:
+                    browser = ServiceBrowser(
+                        service_type,
+                        self.table,
+                        refresh=self.refresh,
+                        warmup=self.warmup,
+                        command=self.command_factory(service_type),
+                        debug=self.debug,
+                    )
+                    self._browsers[service_type] = browser
+                    browser.start()
+                browsers.append(browser)
+        return browsers
+
+    def query(self, cluster: str, environment: str) -> Dict[str, object]:
+        browsers = self.ensure(service_types(cluster, environment))
+        if not all(browser.ready.is_set() for browser in browsers):
+            return {"ok": False, "error": "warming up"}
+        records = self.table.records(cluster, environment)
+        return {"ok": True, "records": [dataclasses.asdict(record) for record in records]}
+
+    def status(self) -> Dict[str, object]:
+        with self._lock:
+            browsers = dict(self._browsers)
+        return {
+            "ok": True,
+            "entries": len(self.table),
+            "uptime_seconds": round(time.monotonic() - self.started, 3),
+            "browsers": {name: browser.ready.is_set() for name, browser in browsers.items()},
+        }
+
+    def handle(self, request: Dict[str, object]) -> Dict[str, object]:
+        op = request.get("op", "query")
+        if op == "status":
+            return self.status()
+        if op != "query":
+            return {"ok": False, "error": f"unsupported op: {op}"}
+        cluster = request.get("cluster")
+        environment = request.get("environment")
+        if not isinstance(cluster, str) or not isinstance(environment, str):
+            return {"ok": False, "error": "cluster and environment are required"}
+        return self.query(cluster, environment)
+
+    def stop(self) -> None:
+        with self._lock:
+            browsers = list(self._browsers.values())
+        for browser in browsers:
+            browser.stop()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        raw = self.rfile.readline(MAX_REQUEST_BYTES)
+        try:
+            request = json.loads(raw.decode("utf-8") or "{}")
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            response = self.server.service.handle(request)  # type: ignore[attr-defined]
+        except ValueError as exc:
+            response = {"ok": False, "error": f"invalid request: {exc}"}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class DiscoveryServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(
+        self, socket_path: str, service: DiscoveryService, *, group: Optional[str] = None
+    ) -> None:
+        self.service = service
+        path = Path(socket_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.is_socket():
+            path.unlink()
+        # Bind under a umask that already yields SOCKET_MODE so the socket is never
+        # reachable by other users, even briefly.
+        previous = os.umask(0o777 & ~SOCKET_MODE)
+        try:
+            super().__init__(str(path), _RequestHandler)
+        finally:
+            os.umask(previous)
+        if group:
+            os.chown(str(path), -1, grp.getgrnam(group).gr_gid)
+        os.chmod(str(path), SOCKET_MODE)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.server_address)  # type: ignore[arg-type]
+        except OSError:
+            pass
+
+
+def socket_path_from_env() -> str:
+    return os.environ.get(SOCKET_ENV, "").strip() or DEFAULT_SOCKET
+
+
+def query_daemon(
+    cluster: str,
+    environment: str,
+    *,
+    socket_path: Optional[str] = None,
+    timeout: float = CLIENT_TIMEOUT,
+    debug: DebugFn = None,
+) -> Optional[List[MdnsRecord]]:
+    """Return cached records from a running daemon, or ``None`` to fall back."""
+
+    if os.environ.get(ENABLE_ENV, "").strip() == "0":
+        return None
+    path = socket_path or socket_path_from_env()
+    if not os.path.exists(path):
+        return None
+
+    request = json.dumps({"op": "query", "cluster": cluster, "environment": environment})
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(path)
+            client.sendall(request.encode("utf-8") + b"\n")
+            chunks: List[bytes] = []
+            while True:
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if chunk.endswith(b"\n"):
+                    break
+        response = json.loads(b"".join(chunks).decode("utf-8"))
+        if not response.get("ok"):
+            if debug is not None:
+                debug(f"mdns daemon at {path} declined query: {response.get('error')}")
+            return None
+        records = [MdnsRecord(**item) for item in response["records"]]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+        if debug is not None:
+            debug(f"mdns daemon at {path} unavailable: {exc}")
+        return None
+
+    if debug is not None:
+        debug(f"mdns daemon at {path} returned {len(records)} cached records")
+    return records
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve cached k3s mDNS advertisements.")
+    parser.add_argument("--socket", default=socket_path_from_env(), help="UNIX socket to serve.")
+    parser.add_argument(
+        "--socket-group",
+        help="Group allowed to query the socket (default: the daemon's own group).",
+    )
+    parser.add_argument(
+        "--cluster",
+        default=os.environ.get("SUGARKUBE_CLUSTER", "sugar"),
+        help="Cluster to subscribe to at start-up (default: $SUGARKUBE_CLUSTER or sugar).",
+    )
+    parser.add_argument(
+        "--environment",
+        default=os.environ.get("SUGARKUBE_ENV", "dev"),
+        help="Environment to subscribe to at start-up (default: $SUGARKUBE_ENV or dev).",
+    )
+    parser.add_argument(
+        "--ttl",
+        type=float,
+        default=DEFAULT_TTL,
+        help=f"Seconds an unseen advertisement stays cached (default: {DEFAULT_TTL:g}).",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=float,
+        default=DEFAULT_WARMUP,
+        help=(
+            "Seconds a new subscription listens before answering queries "
+            f"(default: {DEFAULT_WARMUP:g})."
+        ),
+    )
+    parser.add_argument("--debug", action="store_true", help="Log browse activity to stderr.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+
+    def debug(message: str) -> None:
+        print(f"[mdns-discovery-daemon] {message}", file=sys.stderr, flush=True)
+
+    service = DiscoveryService(
+        ttl=args.ttl,
+        warmup=args.warmup,
+        debug=debug if args.debug else None,
+    )
+    service.ensure(service_types(args.cluster, args.environment))
+    server = DiscoveryServer(args.socket, service, group=args.socket_group)
+
+    def _shutdown(signum: int, _frame: object) -> None:
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+    try:
+        server.serve_forever()
+    finally:
+        service.stop()
+        server.server_close()
+    return 0
+
+
+__all__ = [
+    "DiscoveryServer",
+    "DiscoveryService",
+    "ServiceBrowser",
+    "ServiceTable",
+    "query_daemon",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entrypoint
+    raise SystemExit(main())
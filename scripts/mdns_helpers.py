@@ -5,10 +5,24 @@ from __future__ import annotations
 import argparse
 import ipaddress
 import os
+import queue
 import subprocess
 import sys
+import threading
 import time
-from typing import TYPE_CHECKING, Callable, Final, Iterable, List, Mapping, Optional, TextIO
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
 
 if TYPE_CHECKING:  # pragma: no cover - imported for type checking only
     from k3s_mdns_parser import MdnsRecord
@@ -164,6 +178,55 @@ def _service_types(cluster: str, environment: str) -> List[str]:
     return types
 
 
+def _browse_concurrently(
+    service_types: Sequence[str],
+    browse: Callable[[str], Iterable[str]],
+    *,
+    done: Optional[Callable[[List[str]], bool]] = None,
+) -> Dict[str, List[str]]:
+    """Run ``browse`` for every service type at once and collect the lines.
+
+    Each browse is bounded by its own timeout, so the slowest single browse
+    bounds the whole call instead of the sum of them. Results are returned in
+    ``service_types`` order regardless of completion order so record parsing
+    sees the same sequence as a serial scan. When ``done`` accepts the lines
+    merged so far, the call returns without waiting for the remaining browses.
+    """
+
+    if len(service_types) <= 1:
+        return {service_type: list(browse(service_type)) for service_type in service_types}
+
+    finished: "queue.Queue[Tuple[str, List[str], Optional[BaseException]]]" = queue.Queue()
+
+    def _worker(service_type: str) -> None:
+        try:
+            lines = list(browse(service_type))
+        except BaseException as exc:  # re-raised on the calling thread
+            finished.put((service_type, [], exc))
+        else:
+            finished.put((service_type, lines, None))
+
+    for service_type in service_types:
+        threading.Thread(
+            target=_worker,
+            args=(service_type,),
+            name=f"avahi-browse {service_type}",
+            daemon=True,
+        ).start()
+
+    collected: Dict[str, List[str]] = {}
+    for remaining in range(len(service_types) - 1, -1, -1):
+        service_type, lines, error = finished.get()
+        if error is not None:
+            raise error
+        collected[service_type] = lines
+        if remaining and done is not None:
+            merged = [line for name in service_types for line in collected.get(name, [])]
+            if done(merged):
+                break
+    return {name: collected[name] for name in service_types if name in collected}
+
+
 def _categorise_addresses(addresses: Iterable[str]) -> List[str]:
     categories: List[str] = []
     for candidate in addresses:
@@ -263,44 +326,37 @@ def _collect_mdns_records(
 ) -> List["MdnsRecord"]:
     from k3s_mdns_parser import parse_mdns_records
 
+    if runner is subprocess.run:
+        from mdns_discovery_daemon import query_daemon
+
+        cached = query_daemon(cluster, environment)
+        # Trust an empty answer too; browsing is only for when the daemon is unreachable.
+        if cached is not None:
+            return cached
+
     service_types = _service_types(cluster, environment)
 
-    resolved_lines: List[str] = []
-    for service_type in service_types:
-        lines = list(
-            _browse_service_type(
+    def _browse(resolve: bool) -> Dict[str, List[str]]:
+        return _browse_concurrently(
+            service_types,
+            lambda service_type: _browse_service_type(
                 service_type,
                 runner,
-                resolve=True,
+                resolve=resolve,
                 timeout=_DEFAULT_BROWSE_TIMEOUT,
-            )
+            ),
         )
-        if not lines:
-            continue
-        resolved_lines.extend(lines)
+
+    resolved_lines = [line for lines in _browse(True).values() for line in lines]
 
     if resolved_lines:
         records = parse_mdns_records(resolved_lines, cluster, environment)
         if records:
             return records
 
-    fallback_lines: List[str] = []
-    for service_type in service_types:
-        lines = list(
-            _browse_service_type(
-                service_type,
-                runner,
-                resolve=False,
-                timeout=_DEFAULT_BROWSE_TIMEOUT,
-            )
-        )
-        if not lines:
-            continue
-        fallback_lines.extend(lines)
-        # Match previous behaviour by returning as soon as unresolved records are
-        # observed for any service type. This preserves call expectations in the
-        # tests and avoids unnecessary avahi-browse invocations.
-        break
+    # Match previous behaviour by only using the first service type (in priority
+    # order) that produced unresolved records.
+    fallback_lines = next((lines for lines in _browse(False).values() if lines), [])
 
     if fallback_lines:
         records = parse_mdns_records(fallback_lines, cluster, environment)
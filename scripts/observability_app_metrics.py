@@ -20,6 +20,12 @@ from pathlib import Path
 from typing import Any
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts import kube_api_client  # noqa: E402
+from scripts import safe_yaml  # noqa: E402
+
 CONFIG = ROOT / "platform/observability/app-metrics.json"
 PROM = "/api/v1/namespaces/monitoring/services/http:kube-prometheus-stack-prometheus:9090/proxy"
 KUBECTL_TIMEOUT_SECONDS = 30
@@ -574,6 +580,10 @@ def normalize_application_argument(app: str) -> str:
 
 def run(args):
     try:
+        proc = kube_api_client.run(args, timeout=KUBECTL_TIMEOUT_SECONDS)
+        if proc is not None:
+            proc.check_returncode()
+            return proc.stdout
         return subprocess.run(
             args,
             check=True,
@@ -1153,39 +1163,9 @@ def load_rendered_docs(input_path: str) -> list[dict[str, Any]]:
         raw = (
             sys.stdin.read() if input_path == "-" else Path(input_path).read_text(encoding="utf-8")
         )
-        ruby = r"""
-require "psych"
-require "json"
-scanner = Psych::ScalarScanner.new(Psych::ClassLoader::Restricted.new([], []))
-def convert(node, scanner)
-  case node
-  when Psych::Nodes::Stream then node.children.map { |child| convert(child, scanner) }
-  when Psych::Nodes::Document then convert(node.root, scanner)
-  when Psych::Nodes::Mapping
-    Hash[*node.children.map { |child| convert(child, scanner) }]
-  when Psych::Nodes::Sequence then node.children.map { |child| convert(child, scanner) }
-  when Psych::Nodes::Scalar
-    raise "unsafe YAML tag #{node.tag}" if node.tag && !node.tag.start_with?("tag:yaml.org,2002:")
-    node.quoted ? node.value : scanner.tokenize(node.value)
-  when Psych::Nodes::Alias then raise "YAML aliases are not allowed"
-  else raise "unsupported YAML node #{node.class}"
-  end
-end
-puts JSON.generate(convert(Psych.parse_stream(STDIN.read), scanner))
-"""
-        converted = subprocess.run(
-            [
-                "ruby",
-                "-e",
-                ruby,
-            ],
-            input=raw,
-            text=True,
-            capture_output=True,
-            check=True,
-        ).stdout
-        return [d for d in json.loads(converted) if isinstance(d, dict)]
-    except (OSError, UnicodeError, subprocess.CalledProcessError, json.JSONDecodeError):
+        documents = safe_yaml.safe_yaml_documents(raw)
+        return [d for d in documents if isinstance(d, dict)]
+    except (OSError, UnicodeError, ValueError):
         fail("rendered manifests are malformed (details redacted)")
 
 
@@ -14,6 +14,7 @@ NodeConfig = core.NodeConfig
 NodeDefaults = core.NodeDefaults
 WifiConfig = core.WifiConfig
 WorkflowConfig = core.WorkflowConfig
+build_fanout_command = core.build_fanout_command
 build_flash_command = core.build_flash_command
 build_install_command = core.build_install_command
 build_join_command = core.build_join_command
@@ -30,6 +31,7 @@ __all__ = [
     "NodeDefaults",
     "WifiConfig",
     "WorkflowConfig",
+    "build_fanout_command",
     "build_flash_command",
     "build_install_command",
     "build_join_command",
@@ -64,12 +66,23 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Skip the k3s join rehearsal/apply step.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=core.DEFAULT_JOBS,
+        help=(
+            "Maximum bootstrap stages to run at once, e.g. separate flash groups "
+            f"(default: {core.DEFAULT_JOBS}; 1 runs every stage in sequence)."
+        ),
+    )
     return parser.parse_args(list(argv) if argv is not None else None)
 
 
 def main(argv: Sequence[str] | None = None) -> int:
     try:
         args = parse_args(argv)
+        if args.jobs < 1:
+            raise BootstrapError("--jobs must be at least 1.")
         config_path = Path(args.config).expanduser()
         if not config_path.is_absolute():
             config_path = (Path.cwd() / config_path).resolve()
@@ -79,6 +92,7 @@ def main(argv: Sequence[str] | None = None) -> int:
             dry_run=bool(args.dry_run),
             skip_download=bool(args.skip_download),
             skip_join=bool(args.skip_join),
+            jobs=args.jobs,
         )
     except BootstrapError as exc:
         print(f"error: {exc}", file=sys.stderr)
@@ -6,21 +6,32 @@ from __future__ import annotations
 import argparse
 import json
 import shlex
+import shutil
 import subprocess
 import sys
+import tempfile
 import textwrap
-import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Sequence
 from urllib.parse import urlparse
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import readiness_wait  # noqa: E402
+
 DEFAULT_SSH_PORT = 22
 DEFAULT_CONNECT_TIMEOUT = 10
 DEFAULT_API_PORT = 6443
 DEFAULT_API_TIMEOUT = 5
 DEFAULT_USER = "pi"
 DEFAULT_SECRET_PATH = "/boot/sugarkube-node-token"
+DEFAULT_PARALLEL = 1
+DEFAULT_MAX_INFLIGHT_JOINS = 2
+SSH_CONTROL_PERSIST = 60
 
 
 class RehearsalError(RuntimeError):
@@ -157,6 +168,35 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         metavar="SECONDS",
         help=("Connection timeout (seconds) for SSH. " f"Defaults to {DEFAULT_CONNECT_TIMEOUT}."),
     )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=DEFAULT_PARALLEL,
+        metavar="N",
+        help=(
+            "Preflight and join up to N agents at once. Summaries still print in --agents "
+            f"order. Defaults to {DEFAULT_PARALLEL} (one agent at a time)."
+        ),
+    )
+    parser.add_argument(
+        "--max-inflight-joins",
+        type=int,
+        default=DEFAULT_MAX_INFLIGHT_JOINS,
+        metavar="N",
+        help=(
+            "Cap concurrent k3s agent installs under --parallel so joins do not overload the "
+            f"control-plane. Defaults to {DEFAULT_MAX_INFLIGHT_JOINS}."
+        ),
+    )
+    parser.add_argument(
+        "--ssh-multiplex",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help=(
+            "Reuse one SSH connection per host (ControlMaster) across preflight, join, and "
+            "readiness checks. Defaults to on when --parallel is greater than 1."
+        ),
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -195,8 +235,8 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         default=10,
         metavar="SECONDS",
         help=(
-            "Polling interval while waiting for Ready nodes when --apply-wait is set. "
-            "Defaults to 10 seconds."
+            "Longest polling interval while waiting for Ready nodes when --apply-wait is set; "
+            "checks start one second apart and back off to it. Defaults to 10 seconds."
         ),
     )
     parser.add_argument(
@@ -262,6 +302,37 @@ def run_ssh(command: List[str]) -> subprocess.CompletedProcess:
     return subprocess.run(command, capture_output=True, text=True)
 
 
+def ssh_multiplex_options(control_dir: str) -> List[str]:
+    """Return ``-o`` options that share one master connection per user@host:port."""
+
+    return [
+        "ControlMaster=auto",
+        f"ControlPath={control_dir}/%C",
+        f"ControlPersist={SSH_CONTROL_PERSIST}",
+    ]
+
+
+def close_ssh_masters(args: argparse.Namespace, control_dir: str) -> None:
+    """Ask every master connection opened under ``control_dir`` to exit."""
+
+    targets = [(args.server, args.server_user, args.server_port)]
+    targets.extend((host, args.agent_user, args.agent_port) for host in args.agents or [])
+    for host, user, port in targets:
+        destination = f"{user}@{host}" if user else host
+        run_ssh(
+            [
+                "ssh",
+                "-o",
+                f"ControlPath={control_dir}/%C",
+                "-p",
+                str(port),
+                "-O",
+                "exit",
+                destination,
+            ]
+        )
+
+
 def fetch_join_secret(args: argparse.Namespace) -> str:
     sudo_prefix = "" if args.server_no_sudo else "sudo -n "
     remote_command = f"{sudo_prefix}cat {shlex.quote(args.secret_path)}"
@@ -608,16 +679,19 @@ def wait_for_nodes_ready(
     timeout: int,
     interval: int,
 ) -> tuple[bool, List[str]]:
-    deadline = time.time() + timeout
-    while True:
-        nodes = fetch_node_inventory(args)
-        summaries = summarise_node_conditions(nodes)
+    """Wait for ``expected_total`` Ready nodes, backing off to ``interval`` between checks."""
+
+    def all_ready(nodes: List[Dict[str, object]]) -> bool:
         ready_count = sum(1 for node in nodes if node_condition_is_ready(node))
-        if len(nodes) >= expected_total and ready_count >= expected_total:
-            return True, summaries
-        if time.time() >= deadline:
-            return False, summaries
-        time.sleep(max(1, interval))
+        return len(nodes) >= expected_total and ready_count >= expected_total
+
+    result = readiness_wait.poll_until(
+        lambda: fetch_node_inventory(args),
+        all_ready,
+        timeout=timeout,
+        backoff=readiness_wait.Backoff(initial=1.0, maximum=max(1, interval)),
+    )
+    return result.ok, summarise_node_conditions(result.value)
 
 
 def main(argv: Sequence[str] | None = None) -> int:
@@ -629,7 +703,26 @@ def main(argv: Sequence[str] | None = None) -> int:
     if args.apply_wait and not args.apply:
         print("ERROR: --apply-wait is only valid when --apply is set.", file=sys.stderr)
         return 2
+    if args.parallel < 1 or args.max_inflight_joins < 1:
+        print("ERROR: --parallel and --max-inflight-joins must be at least 1.", file=sys.stderr)
+        return 2
+
+    multiplex = args.ssh_multiplex if args.ssh_multiplex is not None else args.parallel > 1
+    if not multiplex:
+        return run_rehearsal(args)
+    # Keep the control sockets in a private directory; %C hashes keep the paths short.
+    control_dir = tempfile.mkdtemp(prefix="sugarkube-ssh-")
+    options = ssh_multiplex_options(control_dir)
+    args.server_ssh_option = [*args.server_ssh_option, *options]
+    args.agent_ssh_option = [*args.agent_ssh_option, *options]
+    try:
+        return run_rehearsal(args)
+    finally:
+        close_ssh_masters(args, control_dir)
+        shutil.rmtree(control_dir, ignore_errors=True)
 
+
+def run_rehearsal(args: argparse.Namespace) -> int:
     try:
         server = collect_server_status(args)
     except RehearsalError as exc:
@@ -666,10 +759,14 @@ def main(argv: Sequence[str] | None = None) -> int:
     agent_reports: List[AgentStatus] = []
     if args.agents:
         print("\nAgent preflight:")
-        for host in args.agents:
-            report = collect_agent_status(host, args, api_host)
-            agent_reports.append(report)
-            print(format_agent_summary(report))
+        with ThreadPoolExecutor(max_workers=args.parallel) as pool:
+            # map() yields in --agents order, so each summary prints as soon as it and
+            # every agent before it have finished.
+            for report in pool.map(
+                lambda host: collect_agent_status(host, args, api_host), args.agents
+            ):
+                agent_reports.append(report)
+                print(format_agent_summary(report), flush=True)
 
     warnings = [report for report in agent_reports if not report.success]
 
@@ -685,11 +782,19 @@ def main(argv: Sequence[str] | None = None) -> int:
             )
             return 1
         print("\nApplying join commands:")
-        for index, host in enumerate(args.agents, start=1):
-            apply_status = apply_join_to_agent(host, index, args, server)
-            apply_reports.append(apply_status)
-            prefix = "PASS" if apply_status.success else "FAIL"
-            print(f"  [{host}] {prefix}: node={apply_status.node_name} {apply_status.message}")
+        join_workers = min(args.parallel, args.max_inflight_joins)
+        with ThreadPoolExecutor(max_workers=join_workers) as pool:
+            statuses = pool.map(
+                lambda item: apply_join_to_agent(item[1], item[0], args, server),
+                enumerate(args.agents, start=1),
+            )
+            for host, apply_status in zip(args.agents, statuses):
+                apply_reports.append(apply_status)
+                prefix = "PASS" if apply_status.success else "FAIL"
+                print(
+                    f"  [{host}] {prefix}: node={apply_status.node_name} {apply_status.message}",
+                    flush=True,
+                )
         apply_failures = [status for status in apply_reports if not status.success]
         if args.apply_wait and not apply_failures:
             expected_total = max(len(server.nodes), 1) + len(args.agents)
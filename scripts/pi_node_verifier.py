@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""Run the ``pi_node_verifier.sh`` checks concurrently and time each one.
+
+The shell verifier runs its checks one after another, so slow network probes (kubectl,
+HTTP health) hold up cheap local ones. This engine declares the same checks with
+dependencies and timeouts. It starts every check whose dependencies have finished on a
+thread pool, and records how long each check took.
+
+The command line matches the shell verifier for ``--json``, ``--full``, ``--no-log``,
+``--only`` and ``--skip-compose``, so callers can point their verifier path at this
+script. Its JSON output is the same document with a ``duration_ms`` field added to each
+check and to the top level, and ``publish_telemetry.parse_verifier_output`` still accepts
+it. The Markdown ``--log`` report stays with the shell verifier and ``first_boot_service.py``.
+
+Environment variables
+---------------------
+
+``SUGARKUBE_VERIFIER_ENGINE``
+    Set to ``python`` to make ``first_boot_service.py`` and ``publish_telemetry.py`` run
+    this engine instead of ``pi_node_verifier.sh``.
+``TOKEN_PLACE_HEALTH_URL``, ``DSPACE_HEALTH_URL``, ``*_HEALTH_INSECURE``,
+``HEALTH_TIMEOUT``, ``PI_HOME_DIR``, ``SKIP_COMPOSE``
+    Same meaning as for the shell verifier.
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import dataclasses
+import json
+import os
+import re
+import shutil
+import ssl
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+ENGINE_ENV = "SUGARKUBE_VERIFIER_ENGINE"
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_CHECK_TIMEOUT = 60.0
+CLOUD_INIT_TIMEOUT = 900.0
+KUBE_PROXY_CONFIG_DIR = Path("/etc/rancher/k3s/config.yaml.d")
+KUBECONFIG_CANDIDATES = (
+    "/etc/rancher/k3s/k3s.yaml",
+    "/root/.kube/config",
+    "/home/pi/.kube/config",
+)
+
+PASS = "pass"
+FAIL = "fail"
+SKIP = "skip"
+
+
+def env_flag(value: Optional[str]) -> bool:
+    return (value or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True)
+class VerifierConfig:
+    """Inputs shared by every check, read from the same variables as the shell verifier."""
+
+    token_place_url: str = "http://127.0.0.1:5000/"
+    token_place_insecure: bool = False
+    dspace_url: str = "http://127.0.0.1:3000/"
+    dspace_insecure: bool = False
+    health_timeout: float = 5.0
+    pi_home: Path = Path("/home/pi")
+    skip_compose: bool = False
+    kube_proxy_config_dir: Path = KUBE_PROXY_CONFIG_DIR
+
+    @classmethod
+    def from_env(cls, environ: Optional[Dict[str, str]] = None) -> "VerifierConfig":
+        env = os.environ if environ is None else environ
+        return cls(
+            token_place_url=env.get("TOKEN_PLACE_HEALTH_URL", cls.token_place_url),
+            token_place_insecure=env_flag(env.get("TOKEN_PLACE_HEALTH_INSECURE")),
+            dspace_url=env.get("DSPACE_HEALTH_URL", cls.dspace_url),
+            dspace_insecure=env_flag(env.get("DSPACE_HEALTH_INSECURE")),
+            health_timeout=float(env.get("HEALTH_TIMEOUT", cls.health_timeout)),
+            pi_home=Path(env.get("PI_HOME_DIR", str(cls.pi_home))),
+            skip_compose=env_flag(env.get("SKIP_COMPOSE")),
+        )
+
+
+class CheckTimeout(Exception):
+    """Raised inside a check once its time budget is spent."""
+
+
+class CheckContext:
+    """Per-check helpers: deadline-bounded commands and buffered warnings."""
+
+    def __init__(self, config: VerifierConfig, timeout: float) -> None:
+        self.config = config
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout
+        self.warnings: List[str] = []
+
+    def warn(self, message: str) -> None:
+        self.warnings.append(message)
+
+    def remaining(self) -> float:
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise CheckTimeout()
+        return remaining
+
+    def run(self, *command: str) -> Optional[subprocess.CompletedProcess[str]]:
+        """Run ``command`` within the remaining budget; ``None`` when it is not installed."""
+
+        if shutil.which(command[0]) is None:
+            return None
+        try:
+            return subprocess.run(
+                list(command),
+                capture_output=True,
+                text=True,
+                check=False,
+                timeout=self.remaining(),
+            )
+        except subprocess.TimeoutExpired as exc:
+            raise CheckTimeout() from exc
+
+
+@dataclass(frozen=True)
+class Check:
+    """A named check, the checks it must run after, and its time budget."""
+
+    name: str
+    run: Callable[[CheckContext], str]
+    after: Tuple[str, ...] = ()
+    timeout: float = DEFAULT_CHECK_TIMEOUT
+
+
+@dataclass
+class CheckResult:
+    name: str
+    status: str
+    duration_ms: int
+    warnings: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {"name": self.name, "status": self.status, "duration_ms": self.duration_ms}
+
+
+@dataclass
+class VerifierReport:
+    results: List[CheckResult]
+    duration_ms: int
+
+    @property
+    def warnings(self) -> List[str]:
+        return [warning for result in self.results for warning in result.warnings]
+
+    def as_dict(self) -> Dict[str, object]:
+        payload: Dict[str, object] = {}
+        if self.warnings:
+            payload["warnings"] = self.warnings
+        payload["checks"] = [result.as_dict() for result in self.results]
+        payload["duration_ms"] = self.duration_ms
+        return payload
+
+
+def check_cgroup_memory(ctx: CheckContext) -> str:
+    try:
+        cmdline = Path("/proc/cmdline").read_text().split()
+    except OSError:
+        return FAIL
+    enabled = "cgroup_memory=1" in cmdline and "cgroup_enable=memory" in cmdline
+    return PASS if Path("/sys/fs/cgroup/cgroup.controllers").is_file() and enabled else FAIL
+
+
+def check_cloud_init(ctx: CheckContext) -> str:
+    result = ctx.run("cloud-init", "status", "--wait")
+    if result is None:
+        return SKIP
+    return PASS if result.returncode == 0 else FAIL
+
+
+def check_time_sync(ctx: CheckContext) -> str:
+    result = ctx.run("timedatectl", "show", "-p", "NTPSynchronized", "--value")
+    if result is None:
+        return SKIP
+    return PASS if "yes" in result.stdout else FAIL
+
+
+def detect_kube_proxy_mode(config_dir: Path) -> str:
+    """Mirror ``kube_proxy::detect_mode``: the first config file naming a mode wins."""
+
+    for path in sorted(config_dir.glob("*.yaml")) if config_dir.is_dir() else []:
+        try:
+            text = path.read_text()
+        except OSError:
+            continue
+        if re.search(r"proxy-mode=(nftables|nft)", text):
+            return "nftables"
+        if "proxy-mode=iptables" in text:
+            return "iptables"
+    return "unknown"
+
+
+def check_kube_proxy_dataplane(ctx: CheckContext) -> str:
+    mode = detect_kube_proxy_mode(ctx.config.kube_proxy_config_dir)
+    has_nft = shutil.which("nft") is not None
+    if mode == "nftables":
+        if has_nft:
+            return PASS
+        ctx.warn("nftables mode configured but nft binary not found")
+        return FAIL
+    iptables = ctx.run("iptables", "--version")
+    if mode == "iptables":
+        if iptables is None:
+            ctx.warn("iptables mode configured but iptables binary not found")
+            return FAIL
+        if "legacy" not in iptables.stdout.lower():
+            ctx.warn("iptables mode configured but binary appears to use nf_tables backend")
+        return PASS
+    if has_nft:
+        return PASS
+    if iptables is None:
+        return SKIP
+    return PASS if "nf_tables" in iptables.stdout.lower() else FAIL
+
+
+def check_k3s_config(ctx: CheckContext) -> str:
+    result = ctx.run("k3s", "check-config")
+    if result is None:
+        return SKIP
+    return PASS if result.returncode == 0 else FAIL
+
+
+def find_kubeconfig() -> Optional[str]:
+    candidates = [item for item in os.environ.get("KUBECONFIG", "").split(":") if item]
+    for candidate in [*candidates, *KUBECONFIG_CANDIDATES]:
+        if os.access(candidate, os.R_OK):
+            return candidate
+    return None
+
+
+def check_k3s_node_ready(ctx: CheckContext) -> str:
+    kubeconfig = find_kubeconfig()
+    if kubeconfig is None:
+        return SKIP
+    args = ("--kubeconfig", kubeconfig, "get", "nodes", "--no-headers")
+    result = ctx.run("kubectl", *args)
+    if result is None:
+        result = ctx.run("k3s", "kubectl", *args)
+    if result is None:
+        return SKIP
+    if result.returncode != 0:
+        return FAIL
+    for line in result.stdout.splitlines():
+        fields = line.split()
+        if len(fields) > 1 and fields[1].startswith("Ready"):
+            return PASS
+    return FAIL
+
+
+def check_projects_compose(ctx: CheckContext) -> str:
+    if ctx.config.skip_compose:
+        return SKIP
+    result = ctx.run("systemctl", "is-active", "projects-compose.service")
+    if result is None:
+        return SKIP
+    if result.returncode == 0:
+        return PASS
+    output = result.stdout + result.stderr
+    if result.returncode in (3, 4):
+        return FAIL
+    if "System has not been booted" in output or "Failed to connect to bus" in output:
+        return SKIP
+    return FAIL
+
+
+def check_pi_home_repos(ctx: CheckContext) -> str:
+    base = ctx.config.pi_home
+    if not base.is_dir():
+        ctx.warn(f"{base} missing")
+        return FAIL
+    repos = ("sugarkube", "token.place", "dspace")
+    missing = [repo for repo in repos if not (base / repo / ".git").is_dir()]
+    if missing:
+        ctx.warn(f"missing repositories under {base}: {' '.join(missing)}")
+        return FAIL
+    return PASS
+
+
+def http_health(url: str, insecure: bool) -> Callable[[CheckContext], str]:
+    def check(ctx: CheckContext) -> str:
+        if not url or url == "skip":
+            return SKIP
+        context = ssl._create_unverified_context() if insecure else None  # noqa: SLF001
+        timeout = min(ctx.config.health_timeout, ctx.remaining())
+        try:
+            with urllib.request.urlopen(url, timeout=timeout, context=context) as response:
+                response.read(1)
+                return PASS if response.status < 400 else FAIL
+        except (urllib.error.URLError, OSError, ValueError):
+            return FAIL
+
+    return check
+
+
+def default_checks(config: VerifierConfig) -> List[Check]:
+    """Return the shell verifier's checks in its report order.
+
+    Checks that need cloud-init's output (k3s, compose, cloned repos, app health) run after
+    ``cloud_init``. The local kernel, clock and dataplane checks start right away.
+    """
+
+    after_cloud_init = ("cloud_init",)
+    health = config.health_timeout + 1
+    return [
+        Check("cgroup_memory", check_cgroup_memory, timeout=5),
+        Check("cloud_init", check_cloud_init, timeout=CLOUD_INIT_TIMEOUT),
+        Check("time_sync", check_time_sync, timeout=10),
+        Check("kube_proxy_dataplane", check_kube_proxy_dataplane, timeout=10),
+        Check("k3s_check_config", check_k3s_config),
+        Check("k3s_node_ready", check_k3s_node_ready, after_cloud_init, timeout=30),
+        Check("projects_compose_active", check_projects_compose, after_cloud_init, timeout=10),
+        Check("pi_home_repos", check_pi_home_repos, after_cloud_init, timeout=5),
+        Check(
+            "token_place_http",
+            http_health(config.token_place_url, config.token_place_insecure),
+            after_cloud_init,
+            timeout=health,
+        ),
+        Check(
+            "dspace_http",
+            http_health(config.dspace_url, config.dspace_insecure),
+            after_cloud_init,
+            timeout=health,
+        ),
+    ]
+
+
+def execute(check: Check, config: VerifierConfig) -> CheckResult:
+    started = time.monotonic()
+    ctx = CheckContext(config, check.timeout)
+    try:
+        status = check.run(ctx)
+    except CheckTimeout:
+        ctx.warn(f"{check.name} timed out after {check.timeout:g}s")
+        status = FAIL
+    except Exception as exc:  # pylint: disable=broad-except
+        ctx.warn(f"{check.name} raised {type(exc).__name__}: {exc}")
+        status = FAIL
+    duration_ms = round((time.monotonic() - started) * 1000)
+    return CheckResult(check.name, status, duration_ms, ctx.warnings)
+
+
+def run_checks(
+    checks: Sequence[Check],
+    config: VerifierConfig,
+    only: Optional[Iterable[str]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> VerifierReport:
+    """Run ``checks`` concurrently, honoring ``after``, and report them in declared order.
+
+    With ``only``, unselected checks are dropped and dependencies on them are ignored.
+    """
+
+    started = time.monotonic()
+    wanted = set(only) if only else None
+    selected = [check for check in checks if wanted is None or check.name in wanted]
+    by_name = {check.name: check for check in selected}
+    waiting = {check.name: {dep for dep in check.after if dep in by_name} for check in selected}
+    results: Dict[str, CheckResult] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        running: Dict[concurrent.futures.Future[CheckResult], str] = {}
+        while True:
+            for name in [name for name, deps in waiting.items() if not deps]:
+                del waiting[name]
+                running[pool.submit(execute, by_name[name], config)] = name
+            if not running:
+                break
+            done, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                for deps in waiting.values():
+                    deps.discard(name)
+    if waiting:
+        raise ValueError(f"check dependency cycle: {', '.join(sorted(waiting))}")
+    duration_ms = round((time.monotonic() - started) * 1000)
+    return VerifierReport([results[check.name] for check in selected], duration_ms)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON.")
+    parser.add_argument("--full", action="store_true", help="Print text output and a JSON summary.")
+    parser.add_argument(
+        "--no-log",
+        action="store_true",
+        help="Accepted for compatibility; this engine never writes the Markdown log.",
+    )
+    parser.add_argument(
+        "--only",
+        help="Comma-separated checks to run (e.g. k3s_node_ready,dspace_http).",
+    )
+    parser.add_argument(
+        "--skip-compose",
+        nargs="?",
+        const="true",
+        help="Skip the projects-compose.service check (optionally =BOOL).",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="Checks run at the same time (default: %(default)s).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    config = VerifierConfig.from_env()
+    if args.skip_compose is not None:
+        config = dataclasses.replace(config, skip_compose=env_flag(args.skip_compose))
+    only = [name for name in (args.only or "").split(",") if name]
+    report = run_checks(default_checks(config), config, only or None, args.max_workers)
+    as_json = args.json or args.full
+    if not as_json or args.full:
+        for warning in report.warnings:
+            print(f"warning: {warning}", file=sys.stderr)
+        for result in report.results:
+            print(f"{result.name}: {result.status}")
+    if as_json:
+        print(json.dumps(report.as_dict(), separators=(",", ":")))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual script execution
+    sys.exit(main())
@@ -31,6 +31,7 @@ REPORT_PATH=""
 ENABLE_LOG=true
 SKIP_COMPOSE=${SKIP_COMPOSE:-false}
 FULL=false
+ONLY_CHECKS=""
 DEFAULT_REPORT="/boot/first-boot-report.txt"
 MIGRATION_LOG=${MIGRATION_LOG:-/var/log/sugarkube/migrations.log}
 TOKEN_PLACE_HEALTH_URL=${TOKEN_PLACE_HEALTH_URL:-http://127.0.0.1:5000/}
@@ -91,9 +92,21 @@ while [[ $# -gt 0 ]]; do
     --no-log)
       ENABLE_LOG=false
       ;;
+    --only)
+      if [[ $# -lt 2 ]]; then
+        echo "--only requires a comma-separated list of checks" >&2
+        exit 1
+      fi
+      ONLY_CHECKS="$2"
+      shift
+      ;;
+    --only=*)
+      ONLY_CHECKS="${1#*=}"
+      ;;
     --help)
       cat <<'EOF'
 Usage: pi_node_verifier.sh [--json] [--log PATH] [--no-log] [--skip-compose[=BOOL]] [--full]
+                           [--only NAME[,NAME...]]
 
 Options:
   --json       Emit machine-readable JSON results.
@@ -101,6 +114,9 @@ Options:
                Defaults to /boot/first-boot-report.txt when writable.
   --no-log     Disable report generation entirely.
   --full       Print text output and a JSON summary (implies --json).
+  --only NAME[,NAME...]
+               Run only the named checks (e.g. k3s_node_ready,dspace_http). Used to
+               retry failed checks without repeating the whole suite.
   --skip-compose[=BOOL]
                Skip the projects-compose.service health check. Defaults to false.
   --help       Show this message.
@@ -127,6 +143,11 @@ if $ENABLE_LOG && [[ -z "$REPORT_PATH" ]] && [[ -d /boot ]]; then
   fi
 fi
 
+# Return success when the named check is selected by --only (or no filter is set).
+should_run() {
+  [[ -z "$ONLY_CHECKS" || ",${ONLY_CHECKS}," == *",$1,"* ]]
+}
+
 json_parts=()
 check_names=()
 check_statuses=()
@@ -386,7 +407,9 @@ check_projects_compose_active() {
 }
 
 # cgroup memory
-if [[ -f /sys/fs/cgroup/cgroup.controllers ]] && \
+if ! should_run "cgroup_memory"; then
+  :
+elif [[ -f /sys/fs/cgroup/cgroup.controllers ]] && \
    grep -qw 'cgroup_memory=1' /proc/cmdline && \
    grep -qw 'cgroup_enable=memory' /proc/cmdline; then
   print_result "cgroup_memory" "pass"
@@ -395,7 +418,9 @@ else
 fi
 
 # cloud-init status
-if command -v cloud-init >/dev/null 2>&1; then
+if ! should_run "cloud_init"; then
+  :
+elif command -v cloud-init >/dev/null 2>&1; then
   if cloud-init status --wait >/dev/null 2>&1; then
     print_result "cloud_init" "pass"
   else
@@ -406,7 +431,9 @@ else
 fi
 
 # time synchronization
-if command -v timedatectl >/dev/null 2>&1; then
+if ! should_run "time_sync"; then
+  :
+elif command -v timedatectl >/dev/null 2>&1; then
   if timedatectl show -p NTPSynchronized --value 2>/dev/null | grep -q yes; then
     print_result "time_sync" "pass"
   else
@@ -460,10 +487,14 @@ check_kube_proxy_dataplane() {
   fi
 }
 
-check_kube_proxy_dataplane
+if should_run "kube_proxy_dataplane"; then
+  check_kube_proxy_dataplane
+fi
 
 # optional k3s check-config
-if command -v k3s >/dev/null 2>&1; then
+if ! should_run "k3s_check_config"; then
+  :
+elif command -v k3s >/dev/null 2>&1; then
   if k3s check-config >/dev/null 2>&1; then
     print_result "k3s_check_config" "pass"
   else
@@ -473,19 +504,29 @@ else
   print_result "k3s_check_config" "skip"
 fi
 
-check_k3s_node_ready
-check_projects_compose_active
+if should_run "k3s_node_ready"; then
+  check_k3s_node_ready
+fi
+if should_run "projects_compose_active"; then
+  check_projects_compose_active
+fi
 
-check_pi_home_repos
+if should_run "pi_home_repos"; then
+  check_pi_home_repos
+fi
 
-if [[ -n "$TOKEN_PLACE_HEALTH_URL" && "$TOKEN_PLACE_HEALTH_URL" != "skip" ]]; then
+if ! should_run "token_place_http"; then
+  :
+elif [[ -n "$TOKEN_PLACE_HEALTH_URL" && "$TOKEN_PLACE_HEALTH_URL" != "skip" ]]; then
   http_health_check "token_place_http" "$TOKEN_PLACE_HEALTH_URL" \
     "$TOKEN_PLACE_HEALTH_INSECURE" "$HEALTH_TIMEOUT"
 else
   print_result "token_place_http" "skip"
 fi
 
-if [[ -n "$DSPACE_HEALTH_URL" && "$DSPACE_HEALTH_URL" != "skip" ]]; then
+if ! should_run "dspace_http"; then
+  :
+elif [[ -n "$DSPACE_HEALTH_URL" && "$DSPACE_HEALTH_URL" != "skip" ]]; then
   http_health_check "dspace_http" "$DSPACE_HEALTH_URL" \
     "$DSPACE_HEALTH_INSECURE" "$HEALTH_TIMEOUT"
 else
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import argparse
 import concurrent.futures
+import contextlib
 import datetime as dt
 import hashlib
 import json
@@ -15,10 +16,17 @@ import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts import http_probe  # noqa: E402
+from scripts import kube_api_client  # noqa: E402
+
 EXPECTED_NODES = {"sugarkube0", "sugarkube1", "sugarkube2"}
 EXPECTED_IMAGE = (
     "cloudflare/cloudflared:2026.7.3@sha256:"
@@ -26,10 +34,31 @@ EXPECTED_IMAGE = (
 )
 TARGETS = ROOT / "config/prod-resilience-audit-targets.json"
 MAX_PROBE_WORKERS = 8
+MAX_READ_WORKERS = 8
+# Tunnel-namespace lists fetched with one multi-resource `kubectl get`, keyed by
+# resource name with the `kind` each returned item carries.
+COALESCED_KINDS = {
+    "pdb": "PodDisruptionBudget",
+    "service": "Service",
+    "servicemonitor": "ServiceMonitor",
+}
 PROMETHEUS_ALERT_RULES_PATH = (
     "/api/v1/namespaces/monitoring/services/"
     "http:kube-prometheus-stack-prometheus:9090/proxy/api/v1/rules?type=alert"
 )
+TUNNEL_DEPLOYMENTS_ARGS = (
+    "get",
+    "deployment",
+    "-A",
+    "-l",
+    "app.kubernetes.io/name=cloudflare-tunnel",
+    "-o",
+    "json",
+)
+FIRING_ALERTS_QUERY = (
+    'count(ALERTS{alertname=~"CloudflareTunnel(NoHealthyConnections|'
+    'ConnectionsDegraded|MetricsTargetsDown)",alertstate="firing"})'
+)
 EXPECTED_CLOUDFLARE_ALERT_RULES = (
     "CloudflareTunnelConnectionsDegraded",
     "CloudflareTunnelMetricsTargetsDown",
@@ -119,6 +148,7 @@ def operation(argv: list[str]) -> str:
             ["get", "pdb", "-o", "json"],
             ["get", "service", "-o", "json"],
             ["get", "servicemonitor", "-o", "json"],
+            ["get", ",".join(COALESCED_KINDS), "-o", "json"],
         ):
             return "kubectl/get"
         if (
@@ -184,17 +214,82 @@ def operation(argv: list[str]) -> str:
     raise HardFailure("internal safety policy rejected a non-allowlisted operation")
 
 
-def run(argv: list[str], *, ok=(0,), timeout=30) -> subprocess.CompletedProcess[str]:
-    op = operation(argv)
-    proc = subprocess.run(argv, text=True, capture_output=True, timeout=timeout, check=False)
+def _execute(argv: list[str], op: str, ok, timeout) -> subprocess.CompletedProcess[str]:
+    proc = kube_api_client.run(argv, timeout=timeout)
+    if proc is None:
+        proc = subprocess.run(argv, text=True, capture_output=True, timeout=timeout, check=False)
     if proc.returncode not in ok:
         # Raw argv and stderr can expose credentials, connector IDs, labels, or bodies.
         raise HardFailure(f"read-only {op} failed (exit {proc.returncode}; external-error)")
     return proc
 
 
+class ReadSnapshot:
+    """Run allowlisted reads concurrently and memoize identical calls for one audit.
+
+    Every argv still passes through `operation()` on the caller's thread before
+    anything is scheduled, so the allowlist rejects a command exactly as the
+    sequential runner did. Results (including failures) are only observed when
+    the collector asks for them, which keeps error precedence unchanged.
+    """
+
+    def __init__(self, workers: int = MAX_READ_WORKERS) -> None:
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self._reads: dict[tuple[Any, ...], concurrent.futures.Future] = {}
+
+    def submit(self, argv: list[str], *, ok=(0,), timeout=30) -> concurrent.futures.Future:
+        op = operation(argv)
+        key = (tuple(argv), tuple(ok), timeout)
+        with self._lock:
+            future = self._reads.get(key)
+            if future is None:
+                future = self._pool.submit(_execute, argv, op, ok, timeout)
+                self._reads[key] = future
+        return future
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+_SNAPSHOT: ReadSnapshot | None = None
+
+
+@contextlib.contextmanager
+def read_snapshot(workers: int = MAX_READ_WORKERS) -> Iterator[ReadSnapshot]:
+    """Route `run()` through a shared `ReadSnapshot` for the duration of the block."""
+    global _SNAPSHOT
+    previous, snapshot = _SNAPSHOT, ReadSnapshot(workers)
+    _SNAPSHOT = snapshot
+    try:
+        yield snapshot
+    finally:
+        _SNAPSHOT = previous
+        snapshot.close()
+
+
+def run(argv: list[str], *, ok=(0,), timeout=30) -> subprocess.CompletedProcess[str]:
+    if _SNAPSHOT is not None:
+        return _SNAPSHOT.submit(argv, ok=ok, timeout=timeout).result()
+    return _execute(argv, operation(argv), ok, timeout)
+
+
+def prefetch(argv: list[str], *, ok=(0,), timeout=30) -> None:
+    """Start a read in the background when a snapshot is active; a no-op otherwise."""
+    if _SNAPSHOT is not None:
+        _SNAPSHOT.submit(argv, ok=ok, timeout=timeout)
+
+
+def _kubectl_ok(allow_missing: bool) -> tuple[int, ...]:
+    return (0, 1) if allow_missing else (0,)
+
+
+def prefetch_kubectl(*args: str, allow_missing=False) -> None:
+    prefetch(["kubectl", *args], ok=_kubectl_ok(allow_missing))
+
+
 def kubectl(*args: str, allow_missing=False) -> dict[str, Any]:
-    proc = run(["kubectl", *args], ok=(0, 1) if allow_missing else (0,))
+    proc = run(["kubectl", *args], ok=_kubectl_ok(allow_missing))
     if proc.returncode:
         if allow_missing and ("NotFound" in proc.stderr or "not found" in proc.stderr.lower()):
             return {}
@@ -547,15 +642,31 @@ def list_items(*args: str) -> list[dict[str, Any]]:
     return items
 
 
-def prom_count(query: str) -> int:
+def namespace_lists(namespace: str) -> dict[str, list[dict[str, Any]]]:
+    """Fetch the coalesced resource lists for one namespace, grouped by resource."""
+    items = list_items("-n", namespace, "get", ",".join(COALESCED_KINDS), "-o", "json")
+    resources = {kind: resource for resource, kind in COALESCED_KINDS.items()}
+    grouped: dict[str, list[dict[str, Any]]] = {resource: [] for resource in COALESCED_KINDS}
+    for item in items:
+        resource = resources.get(item.get("kind"))
+        if resource is None:
+            raise HardFailure("Kubernetes list contains an unexpected resource kind")
+        grouped[resource].append(item)
+    return grouped
+
+
+def prom_query_path(query: str) -> str:
     from urllib.parse import quote
 
-    path = (
+    return (
         "/api/v1/namespaces/monitoring/services/"
         "http:kube-prometheus-stack-prometheus:9090/proxy/api/v1/query?query="
         + quote(query, safe="")
     )
-    document = kubectl("get", "--raw", path)
+
+
+def prom_count(query: str) -> int:
+    document = kubectl("get", "--raw", prom_query_path(query))
     data = document.get("data")
     if document.get("status") != "success" or not isinstance(data, dict):
         raise HardFailure("Prometheus returned an invalid aggregate")
@@ -627,29 +738,48 @@ def prometheus_alert_rules() -> dict[str, Any]:
     }
 
 
+PROBE_OK = tuple(range(0, 100))
+PROBE_TIMEOUT = 10
+
+
+# (endpoints.tsv column, probe row key); the engine's extra columns are appended.
+ENDPOINT_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("url", "url"),
+    ("status", "status"),
+    ("connect_seconds", "connectSeconds"),
+    ("start_transfer_seconds", "startTransferSeconds"),
+    ("total_seconds", "totalSeconds"),
+    ("error", "error"),
+)
+ENGINE_ENDPOINT_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("total_p95_seconds", "totalP95Seconds"),
+    ("samples", "samples"),
+)
+
+
+def probe_argv(url: str) -> list[str]:
+    return [
+        "curl",
+        "--silent",
+        "--show-error",
+        "--output",
+        "/dev/null",
+        "--max-time",
+        "8",
+        "--connect-timeout",
+        "3",
+        "--write-out",
+        "%{http_code}\t%{time_connect}\t%{time_starttransfer}\t%{time_total}",
+        "--proto",
+        "=https",
+        "--location",
+        url,
+    ]
+
+
 def probe(url: str) -> dict[str, Any]:
     try:
-        proc = run(
-            [
-                "curl",
-                "--silent",
-                "--show-error",
-                "--output",
-                "/dev/null",
-                "--max-time",
-                "8",
-                "--connect-timeout",
-                "3",
-                "--write-out",
-                "%{http_code}\t%{time_connect}\t%{time_starttransfer}\t%{time_total}",
-                "--proto",
-                "=https",
-                "--location",
-                url,
-            ],
-            ok=tuple(range(0, 100)),
-            timeout=10,
-        )
+        proc = run(probe_argv(url), ok=PROBE_OK, timeout=PROBE_TIMEOUT)
     except subprocess.TimeoutExpired:
         return {"url": url, "status": 0, "error": "timeout"}
     fields = proc.stdout.strip().split("\t")
@@ -662,12 +792,98 @@ def probe(url: str) -> dict[str, Any]:
     return row
 
 
+def engine_probe_rows(urls: list[str]) -> list[dict[str, Any]]:
+    """Probe with the in-process engine using curl's bounds, sampling each URL N times.
+
+    Timing fields are per-URL medians formatted like curl's `--write-out`; the
+    first failed sample decides status and error. Error details are dropped
+    because they can echo response or TLS data.
+    """
+    try:
+        samples = http_probe.configured_samples()
+    except ValueError as exc:
+        raise HardFailure(f"{http_probe.SAMPLES_ENV} must be a positive integer") from exc
+    with http_probe.ProbeEngine(
+        connect_timeout=3, max_time=8, max_workers=MAX_PROBE_WORKERS
+    ) as engine:
+        results = engine.probe_all(urls, samples=samples)
+    rows = []
+    for url, url_samples in results.items():
+        summary = http_probe.summarize(url_samples)
+        row: dict[str, Any] = {
+            "url": url,
+            "status": summary["status"],
+            "error": summary["error"],
+            "samples": summary["samples"],
+        }
+        for key in ("connectSeconds", "startTransferSeconds", "totalSeconds", "totalP95Seconds"):
+            row[key] = f"{summary[key]:.6f}"
+        rows.append(row)
+    return rows
+
+
+def endpoint_slice_args(service: str) -> tuple[str, ...]:
+    return (
+        "-n",
+        "kube-system",
+        "get",
+        "endpointslices.discovery.k8s.io",
+        "-l",
+        f"kubernetes.io/service-name={service}",
+        "-o",
+        "json",
+    )
+
+
+def deployment_selector(dep: dict[str, Any]) -> str:
+    return ",".join(
+        f"{k}={v}"
+        for k, v in sorted(dep.get("spec", {}).get("selector", {}).get("matchLabels", {}).items())
+    )
+
+
+def prefetch_inventory() -> None:
+    """Start every read whose arguments do not depend on an earlier result."""
+    prefetch_kubectl("get", "nodes", "-o", "json")
+    prefetch(["kubectl", "get", "--raw", "/readyz?verbose"])
+    for name in ("coredns", "coredns-ha", "traefik"):
+        prefetch_kubectl(
+            "-n", "kube-system", "get", "deployment", name, "-o", "json", allow_missing=True
+        )
+    prefetch_kubectl("-n", "kube-system", "get", "pdb", "-o", "json")
+    for service in ("kube-dns", "traefik"):
+        prefetch_kubectl(*endpoint_slice_args(service))
+    prefetch_kubectl("-n", "kube-system", "get", "service", "traefik", "-o", "json")
+    prefetch_kubectl(
+        "-n", "kube-system", "get", "helmchartconfig", "traefik", "-o", "json", allow_missing=True
+    )
+    prefetch_kubectl(*TUNNEL_DEPLOYMENTS_ARGS)
+    prefetch(["helm", "list", "-A", "-o", "json"])
+    prefetch_kubectl("get", "--raw", prom_query_path(FIRING_ALERTS_QUERY))
+    prefetch_kubectl("get", "--raw", PROMETHEUS_ALERT_RULES_PATH)
+    prefetch(["git", "rev-parse", "HEAD"])
+    if http_probe.enabled():
+        return  # engine probes run together once the collector reaches them
+    try:
+        urls = probe_urls(json.loads(TARGETS.read_text()))
+    except (HardFailure, ValueError):
+        return  # the collector reports a bad manifest at its usual point
+    for url in urls:
+        prefetch(probe_argv(url), ok=PROBE_OK, timeout=PROBE_TIMEOUT)
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("env")
     parser.add_argument("--evidence-dir", required=True, type=Path)
     parser.add_argument("--require-parity", action="store_true")
     args = parser.parse_args(argv)
+    with read_snapshot():
+        return collect(args)
+
+
+def collect(args: argparse.Namespace) -> int:
+    """Collect the inventory and write evidence; reads run through the active snapshot."""
     if args.env.removeprefix("env=") != "prod":
         raise HardFailure("env must normalize exactly to prod")
     for tool in ("kubectl", "helm", "curl", "git"):
@@ -691,6 +907,7 @@ def main(argv: list[str] | None = None) -> int:
     if identity.stdout.strip() != "prod":
         raise HardFailure("repository cluster identity did not report prod")
 
+    prefetch_inventory()
     gaps: set[str] = set()
     nodes_doc = kubectl("get", "nodes", "-o", "json")
     node_items = list_shape(nodes_doc.get("items"), "malformed Kubernetes node list")
@@ -723,21 +940,24 @@ def main(argv: list[str] | None = None) -> int:
     add_gap(gaps, "API_OR_ETCD_NOT_READY", not all(readyz_summary.values()))
 
     components: dict[str, Any] = {}
-    for name in ("coredns", "coredns-ha", "traefik"):
-        dep = kubectl(
+    component_deps = {
+        name: kubectl(
             "-n", "kube-system", "get", "deployment", name, "-o", "json", allow_missing=True
         )
+        for name in ("coredns", "coredns-ha", "traefik")
+    }
+    for dep in component_deps.values():
+        if dep:
+            prefetch_kubectl(
+                "-n", "kube-system", "get", "pods", "-l", deployment_selector(dep), "-o", "json"
+            )
+    for name, dep in component_deps.items():
         if not dep:
             if name != "coredns-ha":
                 gaps.add(f"{name.upper()}_MISSING")
             continue
         snap = deployment_snapshot(dep)
-        selector = ",".join(
-            f"{k}={v}"
-            for k, v in sorted(
-                dep.get("spec", {}).get("selector", {}).get("matchLabels", {}).items()
-            )
-        )
+        selector = deployment_selector(dep)
         pod_doc = kubectl("-n", "kube-system", "get", "pods", "-l", selector, "-o", "json")
         snap["pods"] = pods_snapshot(pod_doc)
         components[name] = snap
@@ -761,16 +981,7 @@ def main(argv: list[str] | None = None) -> int:
     ]
     endpoint_data = {}
     for service in ("kube-dns", "traefik"):
-        doc = kubectl(
-            "-n",
-            "kube-system",
-            "get",
-            "endpointslices.discovery.k8s.io",
-            "-l",
-            f"kubernetes.io/service-name={service}",
-            "-o",
-            "json",
-        )
+        doc = kubectl(*endpoint_slice_args(service))
         endpoint_data[service] = endpoints(doc, service)
         add_gap(
             gaps,
@@ -821,9 +1032,7 @@ def main(argv: list[str] | None = None) -> int:
     )
     add_gap(gaps, "COREDNS_HA_MISSING", not lifecycle["deployment/coredns-ha"]["present"])
 
-    deployments = list_items(
-        "get", "deployment", "-A", "-l", "app.kubernetes.io/name=cloudflare-tunnel", "-o", "json"
-    )
+    deployments = list_items(*TUNNEL_DEPLOYMENTS_ARGS)
     releases = list_shape(
         json.loads(run(["helm", "list", "-A", "-o", "json"]).stdout),
         "malformed Helm release list",
@@ -882,6 +1091,8 @@ def main(argv: list[str] | None = None) -> int:
     ns, release_name = tunnel_meta.get("namespace"), release.get("name")
     if not isinstance(ns, str) or not isinstance(release_name, str):
         raise HardFailure("malformed Cloudflare release identity")
+    prefetch(["helm", "-n", ns, "history", release_name, "-o", "json"])
+    prefetch_kubectl("-n", ns, "get", ",".join(COALESCED_KINDS), "-o", "json")
     history_raw = list_shape(
         json.loads(run(["helm", "-n", ns, "history", release_name, "-o", "json"]).stdout),
         "malformed Helm release history",
@@ -968,9 +1179,8 @@ def main(argv: list[str] | None = None) -> int:
         or not int_or_string_equals(probe_spec.get("port"), 2000)
         or bool(container.get("livenessProbe")),
     )
-    pdbs = list_items("-n", ns, "get", "pdb", "-o", "json")
-    services = list_items("-n", ns, "get", "service", "-o", "json")
-    monitors = list_items("-n", ns, "get", "servicemonitor", "-o", "json")
+    namespaced = namespace_lists(ns)
+    pdbs, services, monitors = (namespaced[kind] for kind in ("pdb", "service", "servicemonitor"))
     tunnel["pdb"] = [
         {
             "name": x["metadata"]["name"],
@@ -1056,18 +1266,17 @@ def main(argv: list[str] | None = None) -> int:
     metrics_service = (
         matching_services[0]["metadata"]["name"] if len(matching_services) == 1 else ""
     )
+    target_query = f'count(up{{namespace="{ns}",service="{metrics_service}"}} == 1)'
+    ha_query = (
+        "count(cloudflared_tunnel_ha_connections"
+        f'{{namespace="{ns}",service="{metrics_service}"}} >= 4)'
+    )
+    for query in (target_query, ha_query):
+        prefetch_kubectl("get", "--raw", prom_query_path(query))
     metrics = {
-        "healthyTargets": prom_count(
-            f'count(up{{namespace="{ns}",service="{metrics_service}"}} == 1)'
-        ),
-        "connectorsWithFourHAConnections": prom_count(
-            "count(cloudflared_tunnel_ha_connections"
-            f'{{namespace="{ns}",service="{metrics_service}"}} >= 4)'
-        ),
-        "firingRelevantAlerts": prom_count(
-            'count(ALERTS{alertname=~"CloudflareTunnel(NoHealthyConnections|'
-            'ConnectionsDegraded|MetricsTargetsDown)",alertstate="firing"})'
-        ),
+        "healthyTargets": prom_count(target_query),
+        "connectorsWithFourHAConnections": prom_count(ha_query),
+        "firingRelevantAlerts": prom_count(FIRING_ALERTS_QUERY),
     }
     metrics["alertRules"] = prometheus_alert_rules()
     add_gap(gaps, "CF_METRICS_TARGETS_UNHEALTHY", metrics["healthyTargets"] < len(ready_tunnel))
@@ -1090,10 +1299,16 @@ def main(argv: list[str] | None = None) -> int:
 
     target_map = json.loads(TARGETS.read_text())
     urls = probe_urls(target_map)
-    with concurrent.futures.ThreadPoolExecutor(
-        max_workers=min(MAX_PROBE_WORKERS, len(urls))
-    ) as pool:
-        probe_rows = sorted(pool.map(probe, urls), key=lambda row: row["url"])
+    endpoint_columns = ENDPOINT_COLUMNS
+    if http_probe.enabled():
+        # Engine-only columns go after `error` so curl-path consumers keep their layout.
+        endpoint_columns += ENGINE_ENDPOINT_COLUMNS
+        probe_rows = sorted(engine_probe_rows(urls), key=lambda row: row["url"])
+    else:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(MAX_PROBE_WORKERS, len(urls))
+        ) as pool:
+            probe_rows = sorted(pool.map(probe, urls), key=lambda row: row["url"])
     add_gap(
         gaps,
         "PUBLIC_ENDPOINT_UNHEALTHY",
@@ -1130,24 +1345,9 @@ def main(argv: list[str] | None = None) -> int:
     try:
         (tmp / "audit.json").write_text(json.dumps(audit, indent=2, sort_keys=True) + "\n")
         with (tmp / "endpoints.tsv").open("w") as stream:
-            stream.write(
-                "url\tstatus\tconnect_seconds\tstart_transfer_seconds\ttotal_seconds\terror\n"
-            )
+            stream.write("\t".join(column for column, _ in endpoint_columns) + "\n")
             for row in probe_rows:
-                stream.write(
-                    "\t".join(
-                        str(row.get(k, ""))
-                        for k in (
-                            "url",
-                            "status",
-                            "connectSeconds",
-                            "startTransferSeconds",
-                            "totalSeconds",
-                            "error",
-                        )
-                    )
-                    + "\n"
-                )
+                stream.write("\t".join(str(row.get(k, "")) for _, k in endpoint_columns) + "\n")
         lines = [
             "# Production resilience parity audit",
             "",
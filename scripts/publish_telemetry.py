@@ -11,6 +11,7 @@ import os
 import shutil
 import subprocess
 import sys
+import time
 import urllib.error
 import urllib.request
 import uuid
@@ -20,6 +21,7 @@ from typing import Iterable, List, Mapping, MutableMapping, Sequence
 TELEMETRY_SCHEMA = "https://sugarkube.dev/telemetry/v1"
 DEFAULT_TIMEOUT = 10.0
 DEFAULT_VERIFIER_TIMEOUT = 180.0
+DEFAULT_VERIFIER_RESULT_MAX_AGE = 900.0
 DEFAULT_MARKDOWN_DIR_ENV = "SUGARKUBE_TELEMETRY_MARKDOWN_DIR"
 
 
@@ -443,15 +445,20 @@ def discover_verifier_path(explicit: str | None) -> str | None:
     if env_value:
         candidates.append(env_value)
     script_dir = Path(__file__).resolve().parent
-    candidates.extend(
-        [
-            str(script_dir / "pi_node_verifier.sh"),
-            "/usr/local/sbin/pi_node_verifier.sh",
-            "/usr/local/bin/pi_node_verifier.sh",
-            "/opt/sugarkube/pi_node_verifier.sh",
-            "pi_node_verifier.sh",
-        ]
-    )
+    names = ["pi_node_verifier.sh"]
+    if os.environ.get("SUGARKUBE_VERIFIER_ENGINE", "").strip().lower() == "python":
+        # The concurrent engine wins when installed; the shell verifier stays the fallback.
+        names.insert(0, "pi_node_verifier.py")
+    for name in names:
+        candidates.extend(
+            [
+                str(script_dir / name),
+                f"/usr/local/sbin/{name}",
+                f"/usr/local/bin/{name}",
+                f"/opt/sugarkube/{name}",
+                name,
+            ]
+        )
     for candidate in candidates:
         if not candidate:
             continue
@@ -497,6 +504,26 @@ def run_verifier(verifier_path: str, timeout: float) -> tuple[List[Mapping[str,
     return checks, errors
 
 
+def load_verifier_result(
+    path: Path, max_age: float
+) -> tuple[List[Mapping[str, str]], List[str]] | None:
+    """Reuse a recent ``pi_node_verifier --json`` result instead of running the checks again.
+
+    Returns ``None`` when the file is missing or older than ``max_age`` seconds.
+    """
+
+    try:
+        if time.time() - path.stat().st_mtime > max_age:
+            return None
+        raw = path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    try:
+        return parse_verifier_output(raw), []
+    except TelemetryError as exc:
+        return [], [str(exc)]
+
+
 def send_payload(
     payload: Mapping[str, object],
     *,
@@ -558,6 +585,19 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         help="Path to pi_node_verifier.sh (auto-detected when omitted)",
         default=None,
     )
+    parser.add_argument(
+        "--verifier-result",
+        help=(
+            "Verifier JSON already produced this boot (e.g. first-boot-report/verifier.json);"
+            " used instead of re-running the verifier when fresh"
+        ),
+        default=os.environ.get("SUGARKUBE_TELEMETRY_VERIFIER_RESULT", ""),
+    )
+    parser.add_argument(
+        "--verifier-result-max-age",
+        default=os.environ.get("SUGARKUBE_TELEMETRY_VERIFIER_RESULT_MAX_AGE"),
+        help="Maximum age in seconds of --verifier-result before the verifier is re-run",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -597,6 +637,12 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         env_var="SUGARKUBE_TELEMETRY_VERIFIER_TIMEOUT",
         flag="--verifier-timeout",
     )
+    args.verifier_result_max_age = coerce_timeout(
+        args.verifier_result_max_age,
+        default=DEFAULT_VERIFIER_RESULT_MAX_AGE,
+        env_var="SUGARKUBE_TELEMETRY_VERIFIER_RESULT_MAX_AGE",
+        flag="--verifier-result-max-age",
+    )
     return args
 
 
@@ -608,10 +654,17 @@ def main(argv: Sequence[str] | None = None) -> int:
     if not (args.force or args.dry_run or enabled or snapshot_requested):
         log("telemetry disabled (set SUGARKUBE_TELEMETRY_ENABLE=true to enable)")
         return 0
-    verifier_path = discover_verifier_path(args.verifier)
-    if not verifier_path:
-        raise TelemetryError("pi_node_verifier.sh could not be located")
-    checks, errors = run_verifier(verifier_path, args.verifier_timeout)
+    result_raw = getattr(args, "verifier_result", "")
+    reused = None
+    if isinstance(result_raw, str) and result_raw.strip():
+        reused = load_verifier_result(Path(result_raw.strip()), args.verifier_result_max_age)
+    if reused is not None:
+        checks, errors = reused
+    else:
+        verifier_path = discover_verifier_path(args.verifier)
+        if not verifier_path:
+            raise TelemetryError("pi_node_verifier.sh could not be located")
+        checks, errors = run_verifier(verifier_path, args.verifier_timeout)
     identifier = hashed_identifier(salt=args.salt)
     env_snapshot = collect_environment()
     tags = parse_tags(args.tags)
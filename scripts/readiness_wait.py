@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Deadline-aware waits that return as soon as a condition holds.
+
+Readiness loops across the tooling used to re-run a probe and then sleep a fixed
+interval. Every wait therefore overshot by up to one interval, and a slow interval
+was slow from the very first retry. ``poll_until`` retries with exponential backoff
+and jitter instead. Early retries come quickly, later ones back off to the caller's
+interval, and no sleep runs past the deadline.
+
+``watch_until`` waits on a Kubernetes collection through a watch stream
+(``?watch=1&resourceVersion=``). It re-evaluates the condition on every event, so
+it returns as soon as the API server reports the change. It falls back to
+``poll_until`` when the server refuses the watch. ``kubectl_watch`` decides whether a
+``kubectl get`` argv can be watched in-process (see ``kube_api_client``).
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import kube_api_client  # noqa: E402
+
+T = TypeVar("T")
+
+DEFAULT_INITIAL_DELAY = 0.25
+DEFAULT_MAX_DELAY = 2.0
+# Server-side lifetime of one watch stream when the wait has no deadline.
+DEFAULT_WATCH_SECONDS = 300.0
+
+
+@dataclass(frozen=True)
+class Backoff:
+    """Exponential retry delays; ``jitter`` is the fraction of each delay randomised away."""
+
+    initial: float = DEFAULT_INITIAL_DELAY
+    maximum: float = DEFAULT_MAX_DELAY
+    factor: float = 2.0
+    jitter: float = 0.5
+
+    def delays(self, rng: Optional[Callable[[], float]] = None) -> Iterator[float]:
+        rng = random.random if rng is None else rng
+        delay = min(self.initial, self.maximum)
+        while True:
+            yield delay * (1.0 - self.jitter * rng())
+            delay = min(self.maximum, delay * self.factor)
+
+
+class Deadline:
+    """A point on ``clock`` after which waits give up; ``timeout=None`` never expires."""
+
+    def __init__(
+        self, timeout: Optional[float], clock: Optional[Callable[[], float]] = None
+    ) -> None:
+        self._clock = time.monotonic if clock is None else clock
+        self._end = None if timeout is None else self._clock() + timeout
+
+    def remaining(self) -> Optional[float]:
+        if self._end is None:
+            return None
+        return max(0.0, self._end - self._clock())
+
+    def expired(self) -> bool:
+        return self.remaining() == 0.0
+
+
+@dataclass(frozen=True)
+class WaitResult(Generic[T]):
+    """Outcome of a wait: whether the condition held and the last value it saw."""
+
+    ok: bool
+    value: T
+    attempts: int
+
+
+def _pause(
+    delays: Iterator[float], remaining: Optional[float], sleeper: Callable[[float], Any]
+) -> None:
+    delay = next(delays)
+    sleeper(delay if remaining is None else min(delay, remaining))
+
+
+def poll_until(
+    probe: Callable[[], T],
+    done: Callable[[T], bool],
+    *,
+    timeout: Optional[float],
+    backoff: Backoff = Backoff(),
+    clock: Optional[Callable[[], float]] = None,
+    sleeper: Optional[Callable[[float], Any]] = None,
+    rng: Optional[Callable[[], float]] = None,
+) -> WaitResult[T]:
+    """Call ``probe`` until ``done`` accepts its value or the deadline passes.
+
+    The probe always runs at least once, and the deadline is checked after every probe.
+    Exceptions from ``probe`` propagate to the caller unchanged.
+    """
+
+    sleeper = time.sleep if sleeper is None else sleeper
+    deadline = Deadline(timeout, clock)
+    delays = backoff.delays(rng)
+    attempts = 0
+    while True:
+        value = probe()
+        attempts += 1
+        if done(value):
+            return WaitResult(True, value, attempts)
+        remaining = deadline.remaining()
+        if remaining == 0.0:
+            return WaitResult(False, value, attempts)
+        _pause(delays, remaining, sleeper)
+
+
+def _object_key(item: Dict[str, Any]) -> Tuple[str, str]:
+    metadata = item.get("metadata")
+    metadata = metadata if isinstance(metadata, dict) else {}
+    return str(metadata.get("namespace") or ""), str(metadata.get("name") or "")
+
+
+def _resource_version(doc: Dict[str, Any]) -> str:
+    metadata = doc.get("metadata")
+    return str(metadata.get("resourceVersion") or "") if isinstance(metadata, dict) else ""
+
+
+def watch_until(
+    client: kube_api_client.KubeApiClient,
+    read: kube_api_client.Read,
+    done: Callable[[List[Dict[str, Any]]], bool],
+    *,
+    timeout: Optional[float],
+    backoff: Backoff = Backoff(),
+    clock: Optional[Callable[[], float]] = None,
+    sleeper: Optional[Callable[[float], Any]] = None,
+    rng: Optional[Callable[[], float]] = None,
+) -> WaitResult[List[Dict[str, Any]]]:
+    """Wait until ``done`` accepts the items of a single-kind collection ``read``.
+
+    The collection is listed once and then kept current from watch events. An expired
+    resource version triggers a relist. A refused watch switches to ``poll_until`` on the
+    list for whatever time remains. List failures raise ``KubeApiError``.
+    """
+
+    read = client.resolve(read)
+    if read.raw is not None or read.name or len(read.resources) != 1:
+        raise ValueError("watch_until needs a single-kind collection read")
+    res = read.resources[0]
+    path = read.path(res)
+    sleeper = time.sleep if sleeper is None else sleeper
+    deadline = Deadline(timeout, clock)
+    delays = backoff.delays(rng)
+
+    def typed(item: Dict[str, Any]) -> Dict[str, Any]:
+        # Match kubectl's list output, which adds per-item type information.
+        item.setdefault("apiVersion", res.group_version)
+        item.setdefault("kind", res.kind)
+        return item
+
+    def snapshot() -> Tuple[Dict[Tuple[str, str], Dict[str, Any]], str]:
+        doc = client.get_json(path)
+        listed = doc.get("items") if isinstance(doc, dict) else None
+        items = [typed(item) for item in listed or [] if isinstance(item, dict)]
+        return {_object_key(item): item for item in items}, _resource_version(doc)
+
+    objects, version = snapshot()
+    attempts = 1
+    while True:
+        items = list(objects.values())
+        if done(items):
+            return WaitResult(True, items, attempts)
+        remaining = deadline.remaining()
+        if remaining == 0.0:
+            return WaitResult(False, items, attempts)
+        events = 0
+        relist = False
+        stream = client.watch(
+            path,
+            resource_version=version,
+            timeout=DEFAULT_WATCH_SECONDS if remaining is None else remaining,
+        )
+        try:
+            for event in stream:
+                obj = event.get("object")
+                if event.get("type") == "ERROR" or not isinstance(obj, dict):
+                    # Usually 410 Gone: our resource version fell out of the watch cache.
+                    relist = True
+                    break
+                events += 1
+                version = _resource_version(obj) or version
+                if event.get("type") == "BOOKMARK":
+                    continue
+                if event.get("type") == "DELETED":
+                    objects.pop(_object_key(obj), None)
+                else:
+                    objects[_object_key(obj)] = typed(obj)
+                attempts += 1
+                items = list(objects.values())
+                if done(items):
+                    return WaitResult(True, items, attempts)
+                if deadline.expired():
+                    return WaitResult(False, items, attempts)
+        except kube_api_client.KubeApiError:
+            # The list just ran, so wait one backoff step before polling it again.
+            _pause(delays, deadline.remaining(), sleeper)
+            polled = poll_until(
+                lambda: list(snapshot()[0].values()),
+                done,
+                timeout=deadline.remaining(),
+                backoff=backoff,
+                clock=clock,
+                sleeper=sleeper,
+                rng=rng,
+            )
+            return WaitResult(polled.ok, polled.value, attempts + polled.attempts)
+        finally:
+            stream.close()
+        if not events:
+            # A stream that closes without events would otherwise spin; back off first.
+            _pause(delays, deadline.remaining(), sleeper)
+            relist = True
+        if relist:
+            objects, version = snapshot()
+            attempts += 1
+
+
+def kubectl_watch(
+    argv: Sequence[str],
+) -> Optional[Tuple[kube_api_client.KubeApiClient, kube_api_client.Read]]:
+    """Return the client and read that can watch a ``kubectl get`` argv, or ``None`` to poll.
+
+    Only single-kind ``-o json`` collection reads qualify, and only while the in-process
+    client is enabled (``SUGARKUBE_KUBE_API_CLIENT=1``) and supports the kubeconfig.
+    """
+
+    if not kube_api_client.enabled() or not argv or argv[0] != "kubectl":
+        return None
+    try:
+        kubeconfig, args = kube_api_client.split_kubeconfig(argv[1:])
+        read = kube_api_client.translate(args)
+    except kube_api_client.Unsupported:
+        return None
+    if read.raw is not None or read.name or len(read.resources) != 1:
+        return None
+    client = kube_api_client.client_for(kubeconfig)
+    return None if client is None else (client, read)
+
+
+__all__ = [
+    "Backoff",
+    "Deadline",
+    "WaitResult",
+    "kubectl_watch",
+    "poll_until",
+    "watch_until",
+]
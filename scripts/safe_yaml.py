@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Parse JSON-compatible YAML through one long-lived Ruby Psych worker.
+
+The parser walks Psych's AST instead of loading objects. Non-core tags and
+aliases are rejected, and plain scalars are resolved by the restricted
+``ScalarScanner``. Starting Ruby costs far more than parsing a rendered chart,
+so each process keeps one worker and feeds it length-prefixed documents over
+a pipe. Results are memoized by content hash, so a manifest that several
+guardrails inspect in one run is parsed once.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import subprocess
+import threading
+from collections import OrderedDict
+from typing import IO, Optional
+
+MEMO_LIMIT = 256
+
+WORKER_SCRIPT = r"""
+require "psych"
+require "json"
+scanner = Psych::ScalarScanner.new(Psych::ClassLoader::Restricted.new([], []))
+def convert(node, scanner)
+  case node
+  when Psych::Nodes::Stream then node.children.map { |child| convert(child, scanner) }
+  when Psych::Nodes::Document then convert(node.root, scanner)
+  when Psych::Nodes::Mapping
+    Hash[*node.children.map { |child| convert(child, scanner) }]
+  when Psych::Nodes::Sequence then node.children.map { |child| convert(child, scanner) }
+  when Psych::Nodes::Scalar
+    raise "unsafe YAML tag #{node.tag}" if node.tag && !node.tag.start_with?("tag:yaml.org,2002:")
+    node.quoted ? node.value : scanner.tokenize(node.value)
+  when Psych::Nodes::Alias then raise "YAML aliases are not allowed"
+  else raise "unsupported YAML node #{node.class}"
+  end
+end
+STDIN.binmode
+STDOUT.sync = true
+while (header = STDIN.gets)
+  text = STDIN.read(Integer(header)).force_encoding(Encoding::UTF_8)
+  begin
+    reply = { "documents" => convert(Psych.parse_stream(text), scanner) }
+    STDOUT.puts JSON.generate(reply)
+  rescue StandardError => error
+    STDOUT.puts JSON.generate({ "error" => error.message })
+  end
+end
+"""
+
+
+class SafeYamlParser:
+    """A restartable Psych worker plus a bounded content-hash memo."""
+
+    def __init__(self, command: Optional[list[str]] = None, memo_limit: int = MEMO_LIMIT) -> None:
+        self.command = command or ["ruby", "-e", WORKER_SCRIPT]
+        self.memo_limit = memo_limit
+        self._memo: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen[bytes]] = None
+
+    def _start(self) -> subprocess.Popen[bytes]:
+        try:
+            return subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as error:
+            raise ValueError(f"YAML parser launch failed: {error}") from error
+
+    def _exchange(self, payload: bytes) -> bytes:
+        for attempt in (0, 1):
+            if self._process is None or self._process.poll() is not None:
+                self._process = self._start()
+            stdin: IO[bytes] = self._process.stdin  # type: ignore[assignment]
+            stdout: IO[bytes] = self._process.stdout  # type: ignore[assignment]
+            try:
+                stdin.write(b"%d\n" % len(payload) + payload)
+                stdin.flush()
+                line = stdout.readline()
+            except (BrokenPipeError, OSError):
+                line = b""
+            if line:
+                return line
+            self.close()
+            if attempt:
+                raise ValueError("YAML parser worker exited unexpectedly")
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def parse_json(self, text: str) -> str:
+        """Return the parsed documents as a JSON array string."""
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            cached = self._memo.get(key)
+            if cached is not None:
+                self._memo.move_to_end(key)
+                return cached
+            reply = json.loads(self._exchange(text.encode("utf-8")))
+            if "error" in reply:
+                raise ValueError(str(reply["error"]) or "invalid YAML")
+            documents = json.dumps(reply.get("documents"))
+            self._memo[key] = documents
+            if len(self._memo) > self.memo_limit:
+                self._memo.popitem(last=False)
+            return documents
+
+    def documents(self, text: str) -> list[object]:
+        """Parse ``text`` into a fresh list of JSON-compatible documents."""
+        value = json.loads(self.parse_json(text))
+        return value if isinstance(value, list) else []
+
+    def close(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        for stream in (process.stdin, process.stdout):
+            if stream is not None:
+                stream.close()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+_PARSER = SafeYamlParser()
+atexit.register(lambda: _PARSER.close())
+
+
+def safe_yaml_documents(text: str) -> list[object]:
+    """Parse JSON-compatible YAML via Psych's AST, rejecting tags and aliases."""
+    return _PARSER.documents(text)
+
+
+def reset() -> None:
+    """Stop the shared worker and forget memoized documents."""
+    global _PARSER
+    _PARSER.close()
+    _PARSER = SafeYamlParser()
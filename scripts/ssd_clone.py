@@ -4,13 +4,18 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import json
 import os
+import queue
 import re
 import secrets
 import shlex
+import stat
+import struct
 import subprocess
 import sys
+import threading
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -30,6 +35,27 @@ DEFAULT_WAIT_SECS = 900
 DEFAULT_POLL_SECS = 10
 FAT_LABEL_MAX = 11
 EXT_LABEL_MAX = 16
+DEFAULT_ROOT_SHARDS = 4
+ROOT_EXCLUDES = (
+    "dev/*",
+    "proc/*",
+    "sys/*",
+    "tmp/*",
+    "var/tmp/*",
+    "run/*",
+    "mnt/ssd-clone/*",
+)
+ROOT_ENGINES = ("rsync", "block")
+BLOCK_COPY_CHUNK = 4 * 1024 * 1024
+BLOCK_COPY_QUEUE_DEPTH = 8
+EXT_SUPER_MAGIC = 0xEF53
+EXT_COMPAT_RESIZE_INODE = 0x10
+EXT_INCOMPAT_META_BG = 0x10
+EXT_INCOMPAT_64BIT = 0x80
+EXT_INCOMPAT_FLEX_BG = 0x200
+EXT_RO_COMPAT_SPARSE_SUPER = 0x1
+EXT_RO_COMPAT_BIGALLOC = 0x200
+EXT_BG_BLOCK_UNINIT = 0x2
 
 STEP_ORDER = [
     "partition",
@@ -45,6 +71,10 @@ class CommandError(RuntimeError):
     """Raised when an external command fails."""
 
 
+class UnsupportedFilesystem(ValueError):
+    """Raised when the block engine cannot read a filesystem's allocation maps."""
+
+
 @dataclass
 class CloneContext:
     """Context shared across clone steps."""
@@ -59,6 +89,9 @@ class CloneContext:
     skip_to: Optional[str] = None
     preserve_labels: bool = False
     refresh_uuid: bool = False
+    parallel: bool = False
+    root_shards: int = 1
+    engine: str = "rsync"
     boot_label: Optional[str] = None
     root_label: Optional[str] = None
     boot_mount: str = "/boot"
@@ -71,6 +104,7 @@ class CloneContext:
     mount_root: Optional[Path] = None
     mounted_paths: List[Path] = field(default_factory=list)
     start_time: float = field(default_factory=time.monotonic)
+    state_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
     def log(self, message: str) -> None:
         prefix = "[DRY-RUN] " if self.dry_run else ""
@@ -83,9 +117,24 @@ class CloneContext:
     def mark_step_completed(self, name: str) -> None:
         if self.dry_run:
             return
-        completed = self.state.setdefault("completed", {})
-        completed[name] = True
-        save_state(self)
+        with self.state_lock:
+            completed = self.state.setdefault("completed", {})
+            completed[name] = True
+            save_state(self)
+
+    def completed_root_shards(self) -> Set[int]:
+        shards = self.state.get("sync_root_shards", {})
+        return {int(index) for index in shards.get("completed", [])}
+
+    def mark_root_shard_completed(self, index: int) -> None:
+        if self.dry_run:
+            return
+        with self.state_lock:
+            shards = self.state.setdefault("sync_root_shards", {})
+            completed = set(shards.get("completed", []))
+            completed.add(index)
+            shards["completed"] = sorted(completed)
+            save_state(self)
 
     def register_mount(self, mountpoint: Path) -> None:
         if self.dry_run:
@@ -156,7 +205,11 @@ def should_skip_step(ctx: CloneContext, step_name: str) -> bool:
 
 
 def run_command(
-    ctx: CloneContext, command: List[str], *, input_text: Optional[str] = None
+    ctx: CloneContext,
+    command: List[str],
+    *,
+    input_text: Optional[str] = None,
+    accept: Sequence[int] = (0,),
 ) -> subprocess.CompletedProcess[str]:
     """Run an external command unless dry-run is active."""
 
@@ -170,7 +223,7 @@ def run_command(
         capture_output=True,
         input=input_text,
     )
-    if result.returncode != 0:
+    if result.returncode not in accept:
         raise CommandError(
             f"Command failed ({result.returncode}): {shlex.join(command)}\n"
             f"stdout: {result.stdout}\n"
@@ -266,6 +319,29 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Generate new disk identifiers and PARTUUIDs on the target device.",
     )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help=(
+            "Sync boot and root concurrently and split the root rsync into shards by "
+            "top-level directory."
+        ),
+    )
+    parser.add_argument(
+        "--root-shards",
+        type=int,
+        default=min(DEFAULT_ROOT_SHARDS, os.cpu_count() or 1),
+        help="Maximum concurrent root rsync shards with --parallel (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ROOT_ENGINES,
+        default="rsync",
+        help=(
+            "Root copy engine. 'block' copies only allocated ext2/3/4 blocks of a read-only "
+            "root and falls back to rsync otherwise (default: %(default)s)."
+        ),
+    )
     parser.add_argument(
         "--assume-yes",
         action="store_true",
@@ -946,42 +1022,470 @@ def sync_boot(ctx: CloneContext) -> None:
         unmount_partition(ctx, target_mount)
 
 
+def root_rsync_args(
+    ctx: CloneContext, target_mount: Path, filters: Sequence[str] = ()
+) -> List[str]:
+    rsync_args = [
+        "rsync",
+        "-aHAX",
+        "--numeric-ids",
+        "--partial",
+        "--inplace",
+        "--delete",
+        "--info=progress2",
+        "--stats",
+    ]
+    for pattern in ROOT_EXCLUDES:
+        rsync_args += ["--exclude", pattern]
+    rsync_args += [*filters, "/", f"{target_mount}/"]
+    if ctx.dry_run:
+        rsync_args.insert(1, "--dry-run")
+    return rsync_args
+
+
+def run_concurrently(jobs: Sequence[Callable[[], None]]) -> None:
+    """Run ``jobs`` on worker threads, wait for all of them, then re-raise the first failure."""
+
+    if not jobs:
+        return
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        futures = [pool.submit(job) for job in jobs]
+    for future in futures:
+        error = future.exception()
+        if error is not None:
+            raise error
+
+
+def scan_root_entry(path: str) -> Tuple[int, Set[Tuple[int, int]]]:
+    """Return the apparent size of ``path`` and the inodes of its hard-linked files.
+
+    Subtrees whose contents ``ROOT_EXCLUDES`` skips are not walked.
+    """
+
+    skipped = {"/" + pattern[: -len("/*")] for pattern in ROOT_EXCLUDES}
+    size = 0
+    linked: Set[Tuple[int, int]] = set()
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return 0, linked
+    if not stat.S_ISDIR(info.st_mode):
+        if info.st_nlink > 1:
+            linked.add((info.st_dev, info.st_ino))
+        return info.st_size, linked
+    pending = [] if path in skipped else [path]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        entry_info = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if stat.S_ISDIR(entry_info.st_mode):
+                        if entry.path not in skipped:
+                            pending.append(entry.path)
+                        continue
+                    size += entry_info.st_size
+                    if entry_info.st_nlink > 1:
+                        linked.add((entry_info.st_dev, entry_info.st_ino))
+        except OSError:
+            continue
+    return size, linked
+
+
+def plan_root_shards(
+    entries: Dict[str, Tuple[int, Set[Tuple[int, int]]]], shards: int
+) -> List[List[str]]:
+    """Group top-level entries into at most ``shards`` balanced rsync shards.
+
+    rsync only preserves hard links within one transfer, so entries that share an
+    inode are kept in the same shard. Groups are placed largest first on the
+    lightest shard.
+    """
+
+    parent = {name: name for name in entries}
+
+    def find(name: str) -> str:
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    owners: Dict[Tuple[int, int], str] = {}
+    for name in sorted(entries):
+        for inode in entries[name][1]:
+            owner = owners.setdefault(inode, name)
+            if owner != name:
+                parent[find(name)] = find(owner)
+    groups: Dict[str, List[str]] = {}
+    for name in sorted(entries):
+        groups.setdefault(find(name), []).append(name)
+    ordered = sorted(
+        groups.values(),
+        key=lambda group: (-sum(entries[name][0] for name in group), group),
+    )
+    bins: List[List[str]] = [[] for _ in range(max(1, min(shards, len(ordered))))]
+    loads = [0] * len(bins)
+    for group in ordered:
+        index = loads.index(min(loads))
+        bins[index].extend(group)
+        loads[index] += sum(entries[name][0] for name in group)
+    return [sorted(names) for names in bins if names]
+
+
+def root_shard_filters(shards: List[List[str]], index: int) -> List[str]:
+    """Return rsync filters that limit a transfer of ``/`` to one shard.
+
+    The first shard excludes the other shards' entries instead of including its
+    own, so it also picks up new top-level entries and deletes stale ones.
+    """
+
+    def anchored(name: str) -> str:
+        return "/" + re.sub(r"([\\*?\[])", r"\\\1", name)
+
+    filters: List[str] = []
+    if index == 0:
+        for other in shards[1:]:
+            for name in other:
+                filters += ["--exclude", anchored(name)]
+        return filters
+    for name in shards[index]:
+        filters += ["--include", anchored(name)]
+    return filters + ["--exclude", "/*"]
+
+
+def load_root_shard_plan(ctx: CloneContext) -> List[List[str]]:
+    saved = ctx.state.get("sync_root_shards", {}).get("shards")
+    if saved:
+        ctx.log(f"Resuming sharded root sync with {len(saved)} saved shard(s).")
+        return [list(names) for names in saved]
+    names = sorted(os.listdir("/"))
+    workers = max(1, min(len(names), (os.cpu_count() or 1) * 2))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        scanned = dict(zip(names, pool.map(lambda name: scan_root_entry("/" + name), names)))
+    shards = plan_root_shards(scanned, ctx.root_shards)
+    with ctx.state_lock:
+        ctx.state["sync_root_shards"] = {"shards": shards, "completed": []}
+        save_state(ctx)
+    return shards
+
+
+def sync_root_sharded(ctx: CloneContext, target_mount: Path) -> int:
+    shards = load_root_shard_plan(ctx)
+    completed = ctx.completed_root_shards()
+
+    transferred: List[int] = []
+
+    def job(index: int) -> Callable[[], None]:
+        def run_shard() -> None:
+            result = run_command(
+                ctx, root_rsync_args(ctx, target_mount, root_shard_filters(shards, index))
+            )
+            transferred.append(rsync_transferred_bytes(result.stdout))
+            ctx.mark_root_shard_completed(index)
+
+        return run_shard
+
+    pending = [index for index in range(len(shards)) if index not in completed]
+    if len(pending) < len(shards):
+        ctx.log(f"Skipping {len(shards) - len(pending)} completed root shard(s).")
+    run_concurrently([job(index) for index in pending])
+    return sum(transferred)
+
+
+def rsync_transferred_bytes(output: str) -> int:
+    match = re.search(r"Total transferred file size: ([\d,.]+)", output or "")
+    return int(re.sub(r"\D", "", match.group(1))) if match else 0
+
+
+@dataclass
+class ExtLayout:
+    """The ext2/3/4 superblock fields needed to locate block bitmaps."""
+
+    block_size: int
+    blocks_count: int
+    first_data_block: int
+    blocks_per_group: int
+    desc_size: int
+    flex_bg: bool
+    sparse_super: bool
+    reserved_gdt_blocks: int
+
+    @property
+    def group_count(self) -> int:
+        data_blocks = self.blocks_count - self.first_data_block
+        return -(-data_blocks // self.blocks_per_group)
+
+    @property
+    def gdt_blocks(self) -> int:
+        return -(-(self.group_count * self.desc_size) // self.block_size)
+
+    @property
+    def size_bytes(self) -> int:
+        return self.blocks_count * self.block_size
+
+    def has_super_backup(self, group: int) -> bool:
+        if group <= 1 or not self.sparse_super:
+            return True
+        for base in (3, 5, 7):
+            power = base
+            while power < group:
+                power *= base
+            if power == group:
+                return True
+        return False
+
+
+def read_ext_layout(fd: int) -> ExtLayout:
+    """Parse the primary superblock of the ext filesystem open on ``fd``."""
+
+    raw = os.pread(fd, 1024, 1024)
+    if len(raw) < 1024 or struct.unpack_from("<H", raw, 0x38)[0] != EXT_SUPER_MAGIC:
+        raise UnsupportedFilesystem("no ext2/3/4 superblock found")
+    compat, incompat, ro_compat = struct.unpack_from("<III", raw, 0x5C)
+    if incompat & EXT_INCOMPAT_META_BG:
+        raise UnsupportedFilesystem("meta_bg block group layouts are not supported")
+    if ro_compat & EXT_RO_COMPAT_BIGALLOC:
+        raise UnsupportedFilesystem("bigalloc cluster bitmaps are not supported")
+    (blocks_lo,) = struct.unpack_from("<I", raw, 0x4)
+    first_data_block, log_block_size = struct.unpack_from("<II", raw, 0x14)
+    (blocks_per_group,) = struct.unpack_from("<I", raw, 0x20)
+    wide = bool(incompat & EXT_INCOMPAT_64BIT)
+    blocks_hi = struct.unpack_from("<I", raw, 0x150)[0] if wide else 0
+    desc_size = struct.unpack_from("<H", raw, 0xFE)[0] if wide else 32
+    reserved_gdt = struct.unpack_from("<H", raw, 0xCE)[0]
+    return ExtLayout(
+        block_size=1024 << log_block_size,
+        blocks_count=(blocks_hi << 32) | blocks_lo,
+        first_data_block=first_data_block,
+        blocks_per_group=blocks_per_group,
+        desc_size=desc_size or 32,
+        flex_bg=bool(incompat & EXT_INCOMPAT_FLEX_BG),
+        sparse_super=bool(ro_compat & EXT_RO_COMPAT_SPARSE_SUPER),
+        reserved_gdt_blocks=reserved_gdt if compat & EXT_COMPAT_RESIZE_INODE else 0,
+    )
+
+
+def bitmap_runs(bitmap: bytes, count: int) -> List[Tuple[int, int]]:
+    """Return ``(start, length)`` runs of set bits among the first ``count`` bits."""
+
+    runs: List[Tuple[int, int]] = []
+    start = -1
+    for index in range(0, count, 8):
+        byte = bitmap[index >> 3]
+        width = min(8, count - index)
+        if width == 8 and byte in (0x00, 0xFF):
+            if byte and start < 0:
+                start = index
+            elif not byte and start >= 0:
+                runs.append((start, index - start))
+                start = -1
+            continue
+        for bit in range(width):
+            if byte >> bit & 1:
+                if start < 0:
+                    start = index + bit
+            elif start >= 0:
+                runs.append((start, index + bit - start))
+                start = -1
+    if start >= 0:
+        runs.append((start, count - start))
+    return runs
+
+
+def used_block_extents(fd: int, layout: ExtLayout) -> List[Tuple[int, int]]:
+    """Return merged ``(first_block, count)`` extents of allocated blocks.
+
+    Groups whose bitmap was never initialised hold no data. With flex_bg their
+    metadata lives in other groups, so only a superblock backup is copied;
+    without it the whole group is copied conservatively.
+    """
+
+    extents: List[Tuple[int, int]] = []
+
+    def add(first: int, count: int) -> None:
+        if count <= 0:
+            return
+        if extents and extents[-1][0] + extents[-1][1] == first:
+            extents[-1] = (extents[-1][0], extents[-1][1] + count)
+        else:
+            extents.append((first, count))
+
+    add(0, layout.first_data_block)
+    table_offset = (layout.first_data_block + 1) * layout.block_size
+    table = os.pread(fd, layout.gdt_blocks * layout.block_size, table_offset)
+    for group in range(layout.group_count):
+        first = layout.first_data_block + group * layout.blocks_per_group
+        count = min(layout.blocks_per_group, layout.blocks_count - first)
+        offset = group * layout.desc_size
+        (bitmap_lo,) = struct.unpack_from("<I", table, offset)
+        (flags,) = struct.unpack_from("<H", table, offset + 0x12)
+        bitmap_hi = (
+            struct.unpack_from("<I", table, offset + 0x20)[0] if layout.desc_size >= 64 else 0
+        )
+        if flags & EXT_BG_BLOCK_UNINIT:
+            if not layout.flex_bg:
+                add(first, count)
+            elif layout.has_super_backup(group):
+                add(first, 1 + layout.gdt_blocks + layout.reserved_gdt_blocks)
+            continue
+        bitmap_block = (bitmap_hi << 32) | bitmap_lo
+        bitmap = os.pread(fd, layout.block_size, bitmap_block * layout.block_size)
+        for start, length in bitmap_runs(bitmap, count):
+            add(first + start, length)
+    return extents
+
+
+def copy_block_extents(
+    source_fd: int,
+    target_fd: int,
+    extents: Sequence[Tuple[int, int]],
+    block_size: int,
+    *,
+    chunk_size: int = BLOCK_COPY_CHUNK,
+    depth: int = BLOCK_COPY_QUEUE_DEPTH,
+) -> int:
+    """Copy ``extents`` with a reader thread feeding a bounded queue to the writer."""
+
+    chunks: "queue.Queue[Optional[Tuple[int, bytes]]]" = queue.Queue(maxsize=depth)
+    failures: List[BaseException] = []
+    stop = threading.Event()
+
+    def reader() -> None:
+        try:
+            for first, count in extents:
+                offset, end = first * block_size, (first + count) * block_size
+                while offset < end and not stop.is_set():
+                    data = os.pread(source_fd, min(chunk_size, end - offset), offset)
+                    if not data:
+                        raise OSError(f"short read at byte {offset}")
+                    chunks.put((offset, data))
+                    offset += len(data)
+        except BaseException as error:  # surfaced by the writer below
+            failures.append(error)
+        finally:
+            chunks.put(None)
+
+    thread = threading.Thread(target=reader, name="ssd-clone-block-reader", daemon=True)
+    thread.start()
+    copied = 0
+    try:
+        while True:
+            item = chunks.get()
+            if item is None:
+                break
+            offset, data = item
+            view = memoryview(data)
+            while view:
+                written = os.pwrite(target_fd, view, offset)
+                view, offset, copied = view[written:], offset + written, copied + written
+    finally:
+        stop.set()
+        while thread.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        thread.join()
+    if failures:
+        raise failures[0]
+    os.fsync(target_fd)
+    return copied
+
+
+def source_is_read_only(path: str = "/") -> bool:
+    return bool(os.statvfs(path).f_flag & os.ST_RDONLY)
+
+
+def block_copy_root(ctx: CloneContext, root_partition: str) -> Optional[int]:
+    """Copy the allocated blocks of the source root, or return ``None`` to fall back."""
+
+    if canonical_fs(ctx.state.get("source_root_fs", "")) not in {"ext2", "ext3", "ext4"}:
+        ctx.log("Block engine supports ext2/3/4 only; falling back to rsync.")
+        return None
+    if not source_is_read_only():
+        # A block copy of a read-write filesystem can pair new metadata with stale data
+        # blocks, and rsync's size+mtime check cannot spot the torn files afterwards.
+        ctx.log("Block engine needs a read-only root mount; falling back to rsync.")
+        return None
+    source = ctx.source_root or resolve_mount_device("/")
+    try:
+        source_fd = os.open(source, os.O_RDONLY)
+    except OSError as error:
+        ctx.log(f"Block engine cannot open {source} ({error}); falling back to rsync.")
+        return None
+    try:
+        try:
+            layout = read_ext_layout(source_fd)
+            extents = used_block_extents(source_fd, layout)
+        except (UnsupportedFilesystem, OSError, struct.error) as error:
+            ctx.log(f"Block engine unavailable ({error}); falling back to rsync.")
+            return None
+        used = sum(count for _first, count in extents) * layout.block_size
+        ctx.log(
+            f"Copying {used} allocated bytes of {layout.size_bytes} from {source} "
+            f"to {root_partition}"
+        )
+        if ctx.dry_run:
+            return used
+        if device_size_bytes(root_partition) < layout.size_bytes:
+            ctx.log(
+                f"Target root partition {root_partition} is smaller than the source "
+                "filesystem; falling back to rsync."
+            )
+            return None
+        os.sync()
+        target_fd = os.open(root_partition, os.O_WRONLY)
+        try:
+            copied = copy_block_extents(source_fd, target_fd, extents, layout.block_size)
+        finally:
+            os.close(target_fd)
+    finally:
+        os.close(source_fd)
+    run_command(ctx, ["e2fsck", "-f", "-y", root_partition], accept=(0, 1))
+    tune = ["tune2fs", "-U", "random"]
+    if not ctx.preserve_labels:
+        tune += ["-L", ctx.state.get("target_root_label") or ctx.root_label or "sugarkube-root"]
+    run_command(ctx, [*tune, root_partition])
+    run_command(ctx, ["resize2fs", root_partition])
+    return copied
+
+
+def record_root_sync(ctx: CloneContext, engine: str, copied: int, started: float) -> None:
+    elapsed = time.monotonic() - started
+    with ctx.state_lock:
+        ctx.state["root_sync"] = {
+            "engine": engine,
+            "bytes": copied,
+            "seconds": round(elapsed, 3),
+        }
+
+
 def sync_root(ctx: CloneContext) -> None:
     _, root_partition = resolve_target_partitions(ctx)
+    started = time.monotonic()
+    engine, copied = "rsync", 0
+    if ctx.engine == "block":
+        block_copied = block_copy_root(ctx, root_partition)
+        if block_copied is not None:
+            engine, copied = "block", block_copied
+    if engine == "block":
+        record_root_sync(ctx, engine, copied, started)
+        return
     target_mount = ctx.mount_root / "root"
     ensure_mount_point(target_mount)
     mount_partition(ctx, root_partition, target_mount)
     try:
-        rsync_args = [
-            "rsync",
-            "-aHAX",
-            "--numeric-ids",
-            "--partial",
-            "--inplace",
-            "--delete",
-            "--info=progress2",
-            "--exclude",
-            "dev/*",
-            "--exclude",
-            "proc/*",
-            "--exclude",
-            "sys/*",
-            "--exclude",
-            "tmp/*",
-            "--exclude",
-            "var/tmp/*",
-            "--exclude",
-            "run/*",
-            "--exclude",
-            "mnt/ssd-clone/*",
-            "/",
-            f"{target_mount}/",
-        ]
-        if ctx.dry_run:
-            rsync_args.insert(1, "--dry-run")
-        run_command(ctx, rsync_args)
+        if ctx.parallel and ctx.root_shards > 1:
+            transferred = sync_root_sharded(ctx, target_mount)
+        else:
+            result = run_command(ctx, root_rsync_args(ctx, target_mount))
+            transferred = rsync_transferred_bytes(result.stdout)
     finally:
         unmount_partition(ctx, target_mount)
+    record_root_sync(ctx, engine, transferred, started)
 
 
 def update_configs(ctx: CloneContext) -> None:
@@ -1131,6 +1635,18 @@ def emit_summary(ctx: CloneContext) -> None:
     ctx.log(f"  Target mount root: {ctx.mount_root}")
     ctx.log(f"  Copied size: {size_str}")
     ctx.log(f"  Elapsed time: {elapsed:.1f} seconds")
+    if ctx.parallel:
+        shards = ctx.state.get("sync_root_shards", {}).get("shards") or [[]]
+        ctx.log(f"  Sync mode: parallel ({len(shards)} root shard(s))")
+    root_sync = ctx.state.get("root_sync")
+    if root_sync:
+        seconds = root_sync.get("seconds") or 0
+        rate = root_sync.get("bytes", 0) / seconds / (1024**2) if seconds else 0.0
+        ctx.log(f"  Root sync engine: {root_sync.get('engine')}")
+        ctx.log(
+            f"  Root sync throughput: {rate:.1f} MiB/s "
+            f"({root_sync.get('bytes', 0)} bytes in {seconds:.1f} seconds)"
+        )
     boot_uuid = ctx.state.get("target_boot_partuuid")
     root_uuid = ctx.state.get("target_root_partuuid")
     if boot_uuid:
@@ -1182,6 +1698,9 @@ def main() -> None:
         skip_to=normalize_skip_to(args.skip_to),
         preserve_labels=args.preserve_labels,
         refresh_uuid=args.refresh_uuid,
+        parallel=args.parallel,
+        root_shards=max(1, args.root_shards),
+        engine=args.engine,
         boot_label=args.boot_label,
         root_label=args.root_label,
         boot_mount=boot_mount,
@@ -1207,15 +1726,24 @@ def main() -> None:
         "update_configs": update_configs,
         "finalize": finalize,
     }
+    sync_steps = [
+        Step("sync_boot", "Synchronizing boot partition"),
+        Step("sync_root", "Synchronizing root filesystem"),
+    ]
     try:
         for step in [
             Step("partition", "Replicating partition table", validators.get("partition")),
             Step("format", "Formatting target partitions", validators.get("format")),
-            Step("sync_boot", "Synchronizing boot partition"),
-            Step("sync_root", "Synchronizing root filesystem"),
+            *sync_steps,
             Step("update_configs", "Updating cmdline.txt and fstab"),
             Step("finalize", "Writing completion marker"),
         ]:
+            if ctx.parallel and step in sync_steps:
+                if step is sync_steps[0]:
+                    run_concurrently(
+                        [lambda item=item: item.run(ctx, steps[item.name]) for item in sync_steps]
+                    )
+                continue
             step.run(ctx, steps[step.name])
         ctx.log("All steps complete. Reboot once validation succeeds.")
     except Exception as error:
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""Append-only SSD health history with trend-based wear projections.
+
+``ssd_health_monitor.py`` runs on a timer. Every run appends one fixed-size binary record to
+a per-device history file, so years of samples cost only a few hundred kilobytes. Appends
+refuse samples older than the last record, so the file stays in time order. Reading a window
+therefore binary-searches the timestamp column and reads only the records that are needed,
+instead of reparsing old reports.
+
+Each record holds the sample time and the wear signals smartctl exposes: NVMe
+``percentage_used``, available spare, media errors, data units written, power-on hours,
+unsafe shutdowns and critical warning flags, the ATA lifetime-remaining percentage, and
+temperature. Missing values are stored as ``-1`` (or NaN for temperature).
+
+``analyze`` fits a least-squares line to the window. It extrapolates ``percentage_used``
+toward 100 (or the ATA lifetime remaining toward 0), and projects the write rate against
+the endurance implied by the wear level. It also flags growing media error counts.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import math
+import os
+import re
+import struct
+import time
+from dataclasses import astuple, dataclass, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+MAGIC = b"SKSH"
+VERSION = 1
+HEADER = struct.Struct("<4sHH8x")
+RECORD = struct.Struct("<dhhhhfqqqq")
+MISSING = -1
+SECONDS_PER_DAY = 86400.0
+NVME_DATA_UNIT_BYTES = 512000
+
+
+@dataclass(frozen=True)
+class HealthSample:
+    """One SMART sample; integer fields use ``MISSING`` when smartctl omits them."""
+
+    timestamp: float
+    percentage_used: int = MISSING
+    available_spare: int = MISSING
+    life_left: int = MISSING
+    critical_warning: int = MISSING
+    temperature_c: float = math.nan
+    media_errors: int = MISSING
+    data_units_written: int = MISSING
+    power_on_hours: int = MISSING
+    unsafe_shutdowns: int = MISSING
+
+    def pack(self) -> bytes:
+        return RECORD.pack(*astuple(self))
+
+    @classmethod
+    def unpack(cls, raw: bytes) -> "HealthSample":
+        return cls(*RECORD.unpack(raw))
+
+    def as_dict(self) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        for item in fields(self):
+            value = getattr(self, item.name)
+            if item.name == "temperature_c":
+                values[item.name] = None if math.isnan(value) else value
+            elif item.name == "timestamp":
+                values[item.name] = value
+            else:
+                values[item.name] = None if value == MISSING else value
+        return values
+
+
+def _int(value: Any) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return MISSING
+    return int(value)
+
+
+def sample_from_smartctl(
+    payload: Dict[str, Any], timestamp: Optional[float] = None
+) -> HealthSample:
+    """Extract a ``HealthSample`` from ``smartctl -a -j`` output."""
+
+    nvme = payload.get("nvme_smart_health_information_log")
+    nvme = nvme if isinstance(nvme, dict) else {}
+    life_left = MISSING
+    ata = payload.get("ata_smart_attributes")
+    table = ata.get("table") if isinstance(ata, dict) else None
+    for row in table if isinstance(table, list) else []:
+        name = str(row.get("name", "")).lower() if isinstance(row, dict) else ""
+        if "percent" in name and "remain" in name:
+            life_left = _int(row.get("value"))
+            break
+    temperature = payload.get("temperature")
+    current = temperature.get("current") if isinstance(temperature, dict) else None
+    if not isinstance(current, (int, float)):
+        current = nvme.get("temperature")
+    power_on = payload.get("power_on_time")
+    hours = power_on.get("hours") if isinstance(power_on, dict) else nvme.get("power_on_hours")
+    return HealthSample(
+        timestamp=time.time() if timestamp is None else timestamp,
+        percentage_used=_int(nvme.get("percentage_used")),
+        available_spare=_int(nvme.get("available_spare")),
+        life_left=life_left,
+        critical_warning=_int(nvme.get("critical_warning")),
+        temperature_c=float(current) if isinstance(current, (int, float)) else math.nan,
+        media_errors=_int(nvme.get("media_errors")),
+        data_units_written=_int(nvme.get("data_units_written")),
+        power_on_hours=_int(hours),
+        unsafe_shutdowns=_int(nvme.get("unsafe_shutdowns")),
+    )
+
+
+def history_path(directory: Path, device: str, payload: Optional[Dict[str, Any]] = None) -> Path:
+    """Return the history file for a drive, keyed by serial number when known."""
+
+    serial = (payload or {}).get("serial_number")
+    key = str(serial) if serial else Path(device).name or "device"
+    return directory / f"{re.sub(r'[^A-Za-z0-9._-]', '-', key)}.bin"
+
+
+class HealthHistory:
+    """A fixed-record history file that supports appends and time-window reads."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _check_header(self, handle) -> None:
+        raw = handle.read(HEADER.size)
+        if len(raw) < HEADER.size:
+            raise ValueError(f"{self.path} is truncated")
+        magic, version, record_size = HEADER.unpack(raw)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise ValueError(f"{self.path} is not a version {VERSION} SSD health history")
+
+    def append(self, sample: HealthSample) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as handle:
+            if handle.tell() == 0:
+                handle.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            else:
+                total = self.count()
+                with self.path.open("rb") as existing:
+                    self._check_header(existing)
+                    if total:
+                        existing.seek(HEADER.size + (total - 1) * RECORD.size)
+                        last = struct.unpack("<d", existing.read(8))[0]
+                        # read() binary-searches the timestamps, so they must never go backwards.
+                        if sample.timestamp < last:
+                            raise ValueError(
+                                f"sample at {sample.timestamp:.0f} is older than the last record "
+                                f"in {self.path} ({last:.0f}); was the clock stepped back?"
+                            )
+                # Drop a partial record left behind by an interrupted write.
+                handle.truncate(HEADER.size + total * RECORD.size)
+            handle.write(sample.pack())
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def count(self) -> int:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+        return max(0, size - HEADER.size) // RECORD.size
+
+    def read(
+        self, since: Optional[float] = None, until: Optional[float] = None
+    ) -> List[HealthSample]:
+        """Return samples with ``since <= timestamp <= until``, reading only that window."""
+
+        total = self.count()
+        if not total:
+            return []
+        with self.path.open("rb") as handle:
+            self._check_header(handle)
+
+            def timestamp_at(index: int) -> float:
+                handle.seek(HEADER.size + index * RECORD.size)
+                return struct.unpack("<d", handle.read(8))[0]
+
+            low, high = 0, total
+            while since is not None and low < high:
+                middle = (low + high) // 2
+                if timestamp_at(middle) < since:
+                    low = middle + 1
+                else:
+                    high = middle
+            handle.seek(HEADER.size + low * RECORD.size)
+            raw = handle.read((total - low) * RECORD.size)
+        samples = []
+        for offset in range(0, len(raw) - RECORD.size + 1, RECORD.size):
+            sample = HealthSample.unpack(raw[offset : offset + RECORD.size])
+            if until is not None and sample.timestamp > until:
+                break
+            samples.append(sample)
+        return samples
+
+
+def linear_fit(points: Sequence[Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+    """Return ``(slope, intercept)`` of the least-squares line, or ``None`` when flat in x."""
+
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+    return slope, mean_y - slope * mean_x
+
+
+def _series(samples: Sequence[HealthSample], name: str) -> List[Tuple[float, float]]:
+    return [
+        (sample.timestamp / SECONDS_PER_DAY, float(getattr(sample, name)))
+        for sample in samples
+        if getattr(sample, name) != MISSING
+    ]
+
+
+def _projection(
+    points: List[Tuple[float, float]], limit: float, now_days: float
+) -> Optional[Dict[str, Any]]:
+    fit = linear_fit(points)
+    if fit is None:
+        return None
+    slope, intercept = fit
+    current = points[-1][1]
+    result: Dict[str, Any] = {"current": current, "per_day": round(slope, 6)}
+    heading_to_limit = slope > 0 if limit > current else slope < 0
+    if heading_to_limit:
+        days = max(0.0, (limit - (slope * now_days + intercept)) / slope)
+        result["days_remaining"] = round(days, 1)
+        result["projected_date"] = _date(now_days + days)
+    return result
+
+
+def _date(days: float) -> str:
+    return dt.datetime.fromtimestamp(days * SECONDS_PER_DAY, dt.timezone.utc).date().isoformat()
+
+
+def analyze(samples: Sequence[HealthSample], now: Optional[float] = None) -> Dict[str, Any]:
+    """Summarize wear trends over ``samples`` and project an end-of-life date."""
+
+    samples = sorted(samples, key=lambda sample: sample.timestamp)
+    result: Dict[str, Any] = {"samples": len(samples)}
+    if not samples:
+        return result
+    now_days = (samples[-1].timestamp if now is None else now) / SECONDS_PER_DAY
+    result["first_sample"] = _date(samples[0].timestamp / SECONDS_PER_DAY)
+    result["last_sample"] = _date(samples[-1].timestamp / SECONDS_PER_DAY)
+    projections: Dict[str, Any] = {}
+    wear = _projection(_series(samples, "percentage_used"), 100.0, now_days)
+    if wear:
+        projections["percentage_used"] = wear
+    life = _projection(_series(samples, "life_left"), 0.0, now_days)
+    if life:
+        projections["life_left"] = life
+    writes = _series(samples, "data_units_written")
+    write_fit = linear_fit(writes)
+    latest_wear = samples[-1].percentage_used
+    if write_fit and write_fit[0] > 0:
+        rate_units, _ = write_fit
+        entry: Dict[str, Any] = {
+            "current": writes[-1][1],
+            "bytes_per_day": round(rate_units * NVME_DATA_UNIT_BYTES),
+        }
+        if latest_wear > 0:
+            # percentage_used tracks consumed rated endurance, so it implies the total budget.
+            budget = writes[-1][1] * 100.0 / latest_wear
+            days = max(0.0, (budget - writes[-1][1]) / rate_units)
+            entry["days_remaining"] = round(days, 1)
+            entry["projected_date"] = _date(now_days + days)
+        projections["data_units_written"] = entry
+    errors = _series(samples, "media_errors")
+    if errors:
+        result["media_errors"] = {
+            "current": int(errors[-1][1]),
+            "growth": int(errors[-1][1] - errors[0][1]),
+        }
+    result["projections"] = projections
+    remaining = [
+        projection["days_remaining"]
+        for projection in projections.values()
+        if "days_remaining" in projection
+    ]
+    if remaining:
+        days = min(remaining)
+        result["days_remaining"] = days
+        result["projected_end_of_life"] = _date(now_days + days)
+    return result
@@ -6,17 +6,31 @@ from __future__ import annotations
 import argparse
 import dataclasses
 import datetime as dt
+import fcntl
 import json
 import os
 import re
 import shutil
+import stat
 import subprocess
 import sys
+import tempfile
+import time
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import ssd_health_history  # noqa: E402
+
 DEFAULT_REPORT_DIR = Path.home() / "sugarkube" / "reports"
 DEFAULT_REPORT_PREFIX = "ssd-health"
+DEFAULT_TEXTFILE_DIR = Path("/var/lib/node_exporter/textfile_collector")
+TEXTFILE_NAME = "sugarkube_ssd_health.prom"
+DEFAULT_CACHE_DIR = Path("/run/sugarkube/ssd-health")
+DEFAULT_CACHE_SECONDS = 60.0
 
 
 class MonitorStatus:
@@ -33,6 +47,12 @@ STATUS_EMOJI = {
     MonitorStatus.FAIL: "❌",
 }
 
+STATUS_VALUES = {
+    MonitorStatus.PASS: 0,
+    MonitorStatus.WARN: 1,
+    MonitorStatus.FAIL: 2,
+}
+
 
 @dataclasses.dataclass
 class MonitorCheck:
@@ -52,6 +72,7 @@ class SmartctlResult:
     return_code: int
     stdout: str
     stderr: str
+    cached: bool = False
 
 
 def parse_args() -> argparse.Namespace:
@@ -131,7 +152,71 @@ def parse_args() -> argparse.Namespace:
             " (default: %(default)s)."
         ),
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--history-dir",
+        type=Path,
+        help=(
+            "Directory holding the per-drive SMART history files"
+            " (default: <report-dir>/<report-prefix>/history)."
+        ),
+    )
+    parser.add_argument(
+        "--history-window-days",
+        type=float,
+        default=90.0,
+        help="Days of history used for the wear trend (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--warn-eol-days",
+        type=float,
+        default=180.0,
+        help=(
+            "Warn when the wear trend projects end of life within this many days"
+            " (default: %(default)s)."
+        ),
+    )
+    parser.add_argument(
+        "--skip-history",
+        action="store_true",
+        help="Do not record this sample or evaluate the wear trend.",
+    )
+    parser.add_argument(
+        "--exporter",
+        action="store_true",
+        help=(
+            "Exporter mode: write node-exporter textfile metrics and skip the Markdown/JSON"
+            " reports. Suitable for a frequent systemd timer."
+        ),
+    )
+    parser.add_argument(
+        "--textfile-dir",
+        type=Path,
+        help=(
+            f"Write {TEXTFILE_NAME} to this node-exporter textfile directory"
+            f" (default with --exporter: {DEFAULT_TEXTFILE_DIR})."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Directory for the short-lived smartctl JSON cache (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--cache-seconds",
+        type=float,
+        default=DEFAULT_CACHE_SECONDS,
+        help=(
+            "Reuse smartctl output younger than this many seconds so concurrent consumers"
+            " do not each wake the drive; 0 disables the cache (default: %(default)s)."
+        ),
+    )
+    args = parser.parse_args()
+    if args.exporter:
+        args.skip_markdown = args.skip_json = True
+        if args.textfile_dir is None:
+            args.textfile_dir = DEFAULT_TEXTFILE_DIR
+    return args
 
 
 def run_command(command: List[str]) -> subprocess.CompletedProcess[str]:
@@ -258,9 +343,105 @@ def resolve_device(user_device: Optional[str]) -> Tuple[MonitorCheck, Optional[s
     )
 
 
-def run_smartctl(device: str) -> SmartctlResult:
-    """Invoke smartctl and capture JSON output."""
+def write_atomic(path: Path, content: str, mode: int = 0o644) -> None:
+    """Replace ``path`` with ``content`` so readers never observe a partial file."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as stream:
+            os.fchmod(stream.fileno(), mode)
+            stream.write(content)
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+
+
+def smartctl_cache_path(cache_dir: Path, device: str) -> Path:
+    return cache_dir / f"{re.sub(r'[^A-Za-z0-9._-]', '-', device.strip('/'))}.json"
+
+
+def ensure_private_dir(path: Path) -> Path:
+    """Create ``path`` as a 0700 directory and refuse one this user does not own.
+
+    The smartctl cache is trusted when read back, so a directory another user
+    could have created or swapped for a symlink must not be used.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        path.mkdir(mode=0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise NotADirectoryError(f"{path} is not a directory")
+    if info.st_uid != os.geteuid():
+        raise PermissionError(f"{path} is not owned by uid {os.geteuid()}")
+    if stat.S_IMODE(info.st_mode) != 0o700:
+        os.chmod(path, 0o700)
+    return path
+
+
+def read_smartctl_cache(path: Path, device: str, max_age: float) -> Optional[SmartctlResult]:
+    """Return a cached smartctl result for ``device`` when it is younger than ``max_age``."""
+
+    try:
+        if time.time() - path.stat().st_mtime >= max_age:
+            return None
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        payload = json.loads(entry["stdout"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if entry.get("device") != device or not isinstance(payload, dict):
+        return None
+    return SmartctlResult(
+        payload=payload,
+        return_code=int(entry.get("return_code", 0)),
+        stdout=entry["stdout"],
+        stderr=str(entry.get("stderr", "")),
+        cached=True,
+    )
+
 
+def run_smartctl(
+    device: str, cache_dir: Optional[Path] = None, max_age: float = 0.0
+) -> SmartctlResult:
+    """Invoke smartctl, reusing a recent cached result when ``max_age`` allows."""
+
+    if cache_dir is None or max_age <= 0:
+        return _run_smartctl(device)
+    try:
+        path = smartctl_cache_path(ensure_private_dir(cache_dir.expanduser()), device)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_NOFOLLOW | os.O_CLOEXEC
+        lock = os.fdopen(os.open(path.with_suffix(".lock"), flags, 0o600), "a")
+    except OSError:
+        return _run_smartctl(device)
+    with lock:
+        # Serialize consumers that start in the same minute so only the first wakes the drive.
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        cached = read_smartctl_cache(path, device, max_age)
+        if cached is not None:
+            return cached
+        result = _run_smartctl(device)
+        if result.payload is not None:
+            entry = {
+                "device": device,
+                "return_code": result.return_code,
+                "stdout": result.stdout,
+                "stderr": result.stderr,
+            }
+            try:
+                write_atomic(path, json.dumps(entry), mode=0o600)
+            except OSError:
+                pass
+        return result
+
+
+def _run_smartctl(device: str) -> SmartctlResult:
     smartctl = shutil.which("smartctl")
     if not smartctl:
         return SmartctlResult(payload=None, return_code=127, stdout="", stderr="smartctl not found")
@@ -305,11 +486,13 @@ def summarize_smartctl(device: str, result: SmartctlResult) -> MonitorCheck:
     if result.return_code != 0 and result.return_code not in (0, 2):
         status = MonitorStatus.WARN
         summary = f"smartctl reported exit code {result.return_code}; check payload for warnings."
+    if result.cached:
+        summary += " Reused a cached smartctl result."
     return MonitorCheck(
         name="Run smartctl",
         status=status,
         summary=summary,
-        data={"device": device, "return_code": result.return_code},
+        data={"device": device, "return_code": result.return_code, "cached": result.cached},
     )
 
 
@@ -496,6 +679,163 @@ def evaluate_health(
     return checks, summary
 
 
+def record_history(
+    payload: Dict[str, Any],
+    device: str,
+    args: argparse.Namespace,
+    now: Optional[float] = None,
+    append: bool = True,
+) -> MonitorCheck:
+    """Append this sample to the drive's history and project wear from the recent window.
+
+    Pass ``append=False`` for a cached smartctl result that an earlier run already recorded.
+    """
+
+    directory = args.history_dir
+    if directory is None:
+        prefix = args.report_prefix.strip().strip("/") or DEFAULT_REPORT_PREFIX
+        directory = args.report_dir / prefix / "history"
+    path = ssd_health_history.history_path(directory.expanduser(), device, payload)
+    history = ssd_health_history.HealthHistory(path)
+    sample = ssd_health_history.sample_from_smartctl(payload, timestamp=now)
+    try:
+        if append:
+            history.append(sample)
+        since = sample.timestamp - args.history_window_days * ssd_health_history.SECONDS_PER_DAY
+        trend = ssd_health_history.analyze(history.read(since=since), now=sample.timestamp)
+    except (OSError, ValueError) as exc:
+        return MonitorCheck(
+            name="Wear trend",
+            status=MonitorStatus.WARN,
+            summary=f"Unable to update SMART history {path}: {exc}",
+            data={"history": str(path)},
+        )
+    data = {"history": str(path), "window_days": args.history_window_days, **trend}
+    days = trend.get("days_remaining")
+    status = MonitorStatus.PASS
+    if days is None:
+        summary = f"{trend['samples']} sample(s) in window; no wear trend toward end of life yet."
+    else:
+        summary = (
+            f"Projected end of life {trend['projected_end_of_life']} ({days:g} days) "
+            f"from {trend['samples']} sample(s)."
+        )
+    if days is not None and days <= args.warn_eol_days:
+        status = MonitorStatus.WARN
+        summary += f" Within the {args.warn_eol_days:g}-day warning window."
+    growth = trend.get("media_errors", {}).get("growth", 0)
+    if growth > 0:
+        status = MonitorStatus.WARN
+        summary += f" Media errors grew by {growth}."
+    return MonitorCheck("Wear trend", status, summary, data)
+
+
+def _label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _sample_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def build_textfile_metrics(
+    device: str,
+    checks: Iterable[MonitorCheck],
+    payload: Optional[Dict[str, Any]],
+    now: Optional[float] = None,
+) -> str:
+    """Render node-exporter textfile gauges for the drive and each check."""
+
+    payload = payload or {}
+    labels = 'device="{device}",model="{model}",serial="{serial}"'.format(
+        device=_label_value(device),
+        model=_label_value(payload.get("model_name", "")),
+        serial=_label_value(payload.get("serial_number", "")),
+    )
+    gauges: List[Tuple[str, str, float]] = [
+        ("smartctl_up", "Whether smartctl returned a parseable payload.", int(bool(payload))),
+        (
+            "last_run_timestamp_seconds",
+            "Unix time of the last monitor run.",
+            int(time.time() if now is None else now),
+        ),
+    ]
+    if payload:
+        sample = ssd_health_history.sample_from_smartctl(payload, timestamp=now)
+        values = sample.as_dict()
+        smart_status = payload.get("smart_status")
+        passed = smart_status.get("passed") if isinstance(smart_status, dict) else None
+        if isinstance(passed, bool):
+            gauges.append(("smart_passed", "SMART overall health assessment.", int(passed)))
+        for field, name, help_text in (
+            ("temperature_c", "temperature_celsius", "Current drive temperature."),
+            ("percentage_used", "percentage_used", "NVMe estimate of rated endurance used."),
+            ("life_left", "life_left_percent", "ATA lifetime remaining attribute."),
+            ("available_spare", "available_spare_percent", "NVMe available spare capacity."),
+            ("critical_warning", "critical_warning", "NVMe critical warning bit field."),
+            ("media_errors", "media_errors", "NVMe unrecovered media and data integrity errors."),
+            ("power_on_hours", "power_on_hours", "Drive power-on hours."),
+            ("unsafe_shutdowns", "unsafe_shutdowns", "NVMe unsafe shutdown count."),
+        ):
+            if values[field] is not None:
+                gauges.append((name, help_text, values[field]))
+        for direction in ("written", "read"):
+            value = data_bytes(payload, direction)
+            if value is not None:
+                gauges.append(
+                    (
+                        f"data_{direction}_bytes",
+                        f"Total bytes {direction} by the host; use rate() for throughput.",
+                        value,
+                    )
+                )
+    for check in checks:
+        days = check.data.get("days_remaining") if check.name == "Wear trend" else None
+        if isinstance(days, (int, float)):
+            gauges.append(
+                ("projected_eol_days", "Days until the wear trend reaches end of life.", days)
+            )
+
+    lines: List[str] = []
+    for name, help_text, value in gauges:
+        metric = f"sugarkube_ssd_{name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric}{{{labels}}} {_sample_value(value)}")
+    lines.append(
+        "# HELP sugarkube_ssd_check_status Monitor check outcome (0 pass, 1 warn, 2 fail)."
+    )
+    lines.append("# TYPE sugarkube_ssd_check_status gauge")
+    for check in checks:
+        check_labels = f'{labels},check="{_label_value(check.name)}"'
+        lines.append(
+            f"sugarkube_ssd_check_status{{{check_labels}}} {STATUS_VALUES.get(check.status, 2)}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def data_bytes(payload: Dict[str, Any], direction: str) -> Optional[int]:
+    """Return lifetime host bytes ``written`` or ``read`` from NVMe or ATA counters."""
+
+    nvme = payload.get("nvme_smart_health_information_log")
+    if isinstance(nvme, dict):
+        units = nvme.get(f"data_units_{direction}")
+        if isinstance(units, int):
+            return units * ssd_health_history.NVME_DATA_UNIT_BYTES
+    attribute = "total_lbas_written" if direction == "written" else "total_lbas_read"
+    ata = payload.get("ata_smart_attributes")
+    table = ata.get("table") if isinstance(ata, dict) else None
+    for row in table if isinstance(table, list) else []:
+        if not isinstance(row, dict) or str(row.get("name", "")).lower() != attribute:
+            continue
+        raw = row.get("raw")
+        value = raw.get("value") if isinstance(raw, dict) else None
+        if isinstance(value, int):
+            block_size = payload.get("logical_block_size")
+            return value * (block_size if isinstance(block_size, int) else 512)
+    return None
+
+
 def build_markdown(
     timestamp: str,
     device: str,
@@ -588,6 +928,33 @@ def write_reports(
     return report_path
 
 
+def write_textfile(
+    args: argparse.Namespace,
+    device: str,
+    checks: List[MonitorCheck],
+    payload: Optional[Dict[str, Any]],
+) -> Optional[MonitorCheck]:
+    """Atomically refresh the node-exporter textfile when one is configured.
+
+    Returns a WARN check instead of raising when the collector directory cannot be written.
+    """
+
+    if args.textfile_dir is None:
+        return None
+    path = args.textfile_dir.expanduser() / TEXTFILE_NAME
+    try:
+        write_atomic(path, build_textfile_metrics(device, checks, payload))
+    except OSError as exc:
+        return MonitorCheck(
+            name="Metrics textfile",
+            status=MonitorStatus.WARN,
+            summary=f"Unable to write node-exporter metrics {path}: {exc}",
+            data={"textfile": str(path)},
+        )
+    print(f"Metrics written to: {path}")
+    return None
+
+
 def summarize_console(checks: Iterable[MonitorCheck]) -> None:
     """Print a human-readable summary to stdout."""
 
@@ -612,16 +979,24 @@ def main() -> int:
     detection_check, device = resolve_device(args.device)
     checks: List[MonitorCheck] = [detection_check]
     if not device:
+        textfile_check = write_textfile(args, "", checks, None)
+        if textfile_check is not None:
+            checks.append(textfile_check)
         summarize_console(checks)
         return exit_code(checks)
 
-    smart_result = run_smartctl(device)
+    smart_result = run_smartctl(device, args.cache_dir, args.cache_seconds)
     smart_check = summarize_smartctl(device, smart_result)
     checks.append(smart_check)
     payload = smart_result.payload
     if payload is not None:
         eval_checks, _ = evaluate_health(payload, args)
         checks.extend(eval_checks)
+        if not args.skip_history:
+            checks.append(record_history(payload, device, args, append=not smart_result.cached))
+    textfile_check = write_textfile(args, device, checks, payload)
+    if textfile_check is not None:
+        checks.append(textfile_check)
     summarize_console(checks)
 
     markdown: Optional[str] = None
@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import contextlib
 import dataclasses
 import datetime as dt
 import json
@@ -17,12 +16,20 @@ import textwrap
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import storage_benchmark  # noqa: E402
+
 DEFAULT_REPORT_DIR = Path.home() / "sugarkube" / "reports"
 DEFAULT_BOOT_MOUNT = Path("/boot")
 DEFAULT_CMDLINE = DEFAULT_BOOT_MOUNT / "cmdline.txt"
 DEFAULT_FSTAB = Path("/etc/fstab")
 DEFAULT_STRESS_PATH = Path("/var/log/sugarkube")
 DEFAULT_STRESS_MB = 128
+# A benchmark metric this much slower than the baseline run marks the drive as degraded.
+DEGRADED_CHANGE_PCT = -50.0
 
 
 class ValidationStatus:
@@ -57,7 +64,7 @@ def parse_args() -> argparse.Namespace:
         description=(
             "Validate a cloned SSD before switching the Raspberry Pi to boot from it. "
             "The script checks /boot/cmdline.txt, /etc/fstab, EEPROM boot order, and "
-            "performs a configurable read/write stress test."
+            "benchmarks sequential, 4K random, and fsync performance with direct I/O."
         )
     )
     parser.add_argument(
@@ -96,6 +103,29 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_STRESS_MB,
         help="Megabytes written/read during the stress test (default: %(default)s)",
     )
+    parser.add_argument(
+        "--stress-queue-depth",
+        type=int,
+        default=storage_benchmark.DEFAULT_QUEUE_DEPTH,
+        help="Concurrent 4K random requests in flight (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--stress-random-ops",
+        type=int,
+        default=storage_benchmark.DEFAULT_RANDOM_OPS,
+        help="4K random reads and writes issued per pass (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--stress-fsync-samples",
+        type=int,
+        default=storage_benchmark.DEFAULT_FSYNC_SAMPLES,
+        help="Write+fsync round trips timed for latency percentiles (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--stress-baseline",
+        type=Path,
+        help="Earlier report.json (or benchmark JSON) to compare the benchmark against",
+    )
     parser.add_argument(
         "--skip-stress",
         action="store_true",
@@ -239,8 +269,26 @@ def ensure_space(target: Path, required_mb: int) -> bool:
     return available_bytes >= required_mb * 1024 * 1024
 
 
-def stress_test(target: Path, size_mb: int) -> Dict[str, object]:
-    """Write and read a temporary file to verify SSD responsiveness."""
+def load_benchmark_baseline(path: Path) -> Dict[str, object]:
+    """Return the benchmark result stored in a report.json or a raw benchmark file."""
+
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    for check in payload.get("checks", []) if isinstance(payload, dict) else []:
+        benchmark = check.get("data", {}).get("benchmark") if isinstance(check, dict) else None
+        if isinstance(benchmark, dict):
+            return benchmark
+    if isinstance(payload, dict) and "tests" in payload:
+        return payload
+    raise ValueError(f"{path} does not contain a storage benchmark")
+
+
+def stress_test(
+    target: Path,
+    size_mb: int,
+    config: Optional[storage_benchmark.BenchmarkConfig] = None,
+    baseline: Optional[Path] = None,
+) -> Dict[str, object]:
+    """Benchmark the SSD with direct, incompressible I/O and flag obvious degradation."""
 
     target.mkdir(parents=True, exist_ok=True)
     if not ensure_space(target, size_mb + 8):
@@ -249,52 +297,54 @@ def stress_test(target: Path, size_mb: int) -> Dict[str, object]:
             "details": "Insufficient free space for stress test.",
         }
 
-    chunk_size = 1 * 1024 * 1024
-    chunk = b"\0" * chunk_size
-    iterations = max(1, size_mb)
-    test_file = target / f"ssd-validation-{os.getpid()}-{int(dt.datetime.now().timestamp())}.bin"
+    config = dataclasses.replace(
+        config or storage_benchmark.BenchmarkConfig(), size_mb=max(1, size_mb)
+    )
     try:
-        write_start = dt.datetime.now(dt.timezone.utc)
-        with open(test_file, "wb", buffering=chunk_size) as handle:
-            for _ in range(iterations):
-                handle.write(chunk)
-            handle.flush()
-            os.fsync(handle.fileno())
-        write_end = dt.datetime.now(dt.timezone.utc)
-
-        read_start = dt.datetime.now(dt.timezone.utc)
-        with open(test_file, "rb", buffering=chunk_size) as handle:
-            while handle.read(chunk_size):
-                pass
-        read_end = dt.datetime.now(dt.timezone.utc)
+        benchmark = storage_benchmark.run_benchmark(target, config)
     except OSError as exc:
         return {
             "status": ValidationStatus.FAIL,
             "details": f"Stress test failed: {exc}",
         }
-    finally:
-        with contextlib.suppress(FileNotFoundError):
-            test_file.unlink()
-
-    write_seconds = (write_end - write_start).total_seconds()
-    read_seconds = (read_end - read_start).total_seconds()
-    total_mb = iterations * (chunk_size / (1024 * 1024))
-    write_speed = total_mb / write_seconds if write_seconds > 0 else None
-    read_speed = total_mb / read_seconds if read_seconds > 0 else None
-    if write_speed is None or read_speed is None:
+
+    tests = benchmark["tests"]
+    write, read = tests["seq_write"], tests["seq_read"]
+    if not write["mb_s"] or not read["mb_s"]:
         return {
             "status": ValidationStatus.WARN,
             "details": "Unable to compute throughput during stress test.",
+            "benchmark": benchmark,
         }
-    return {
+    result: Dict[str, object] = {
         "status": ValidationStatus.PASS,
-        "details": "Stress test completed successfully.",
-        "size_mb": total_mb,
-        "write_seconds": write_seconds,
-        "read_seconds": read_seconds,
-        "write_mb_s": write_speed,
-        "read_mb_s": read_speed,
+        "details": "Stress test completed: " + storage_benchmark.format_summary(benchmark) + ".",
+        "size_mb": config.size_mb,
+        "write_seconds": write["seconds"],
+        "read_seconds": read["seconds"],
+        "write_mb_s": write["mb_s"],
+        "read_mb_s": read["mb_s"],
+        "benchmark": benchmark,
     }
+    if baseline is not None:
+        try:
+            comparison = storage_benchmark.compare(load_benchmark_baseline(baseline), benchmark)
+        except (OSError, ValueError) as exc:
+            result["status"] = ValidationStatus.WARN
+            result["details"] += f" Baseline unavailable: {exc}"
+            return result
+        result["baseline"] = {"path": str(baseline), **comparison}
+        degraded = sorted(
+            name
+            for name, values in comparison["metrics"].items()
+            if not name.endswith("_ms") and values["change_pct"] <= DEGRADED_CHANGE_PCT
+        )
+        if not comparison["comparable"]:
+            result["details"] += " Baseline used a different benchmark mode; not compared."
+        elif degraded:
+            result["status"] = ValidationStatus.WARN
+            result["details"] += " Slower than baseline: " + ", ".join(degraded) + "."
+    return result
 
 
 def collect_checks(args: argparse.Namespace) -> List[CheckResult]:
@@ -475,7 +525,16 @@ def collect_checks(args: argparse.Namespace) -> List[CheckResult]:
             )
         )
     else:
-        stress = stress_test(args.stress_path.expanduser(), args.stress_mb)
+        stress = stress_test(
+            args.stress_path.expanduser(),
+            args.stress_mb,
+            storage_benchmark.BenchmarkConfig(
+                queue_depth=max(1, args.stress_queue_depth),
+                random_ops=max(0, args.stress_random_ops),
+                fsync_samples=max(0, args.stress_fsync_samples),
+            ),
+            args.stress_baseline.expanduser() if args.stress_baseline else None,
+        )
         checks.append(
             CheckResult(
                 name="SSD stress test",
@@ -508,6 +567,10 @@ def build_markdown(timestamp: str, checks: Iterable[CheckResult]) -> str:
         lines.append("")
         lines.append(f"Status: {STATUS_EMOJI.get(check.status, '•')} {check.status}")
         lines.append("")
+        benchmark = check.data.get("benchmark") if check.data else None
+        if isinstance(benchmark, dict):
+            lines.extend(storage_benchmark.markdown_table(benchmark))
+            lines.append("")
         if check.data:
             lines.append("```json")
             lines.append(json.dumps(check.data, indent=2, sort_keys=True))
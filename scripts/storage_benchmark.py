@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""Benchmark a storage device through a scratch file in one of its directories.
+
+``run_benchmark`` measures raw device throughput and latency rather than the page cache:
+
+* ``seq_write`` / ``seq_read``: 1 MiB sequential transfers at queue depth 1;
+* ``rand_write_4k`` / ``rand_read_4k``: 4 KiB transfers at random aligned offsets, with
+  ``queue_depth`` worker threads keeping that many requests in flight;
+* ``fsync``: latency of a 4 KiB write followed by ``fsync``.
+
+Every transfer uses ``O_DIRECT`` with page-aligned buffers when the filesystem allows it.
+Otherwise the cache is flushed and dropped with ``posix_fadvise`` before each read pass,
+and the result records ``direct: false``. Buffers come from ``os.urandom``, so compressing
+or deduplicating controllers cannot shortcut the writes.
+
+Results use fixed metric names under ``SCHEMA_VERSION``. ``compare`` reports the
+percentage change of each metric against an earlier run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import mmap
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import http_probe  # noqa: E402
+
+SCHEMA_VERSION = 1
+MIB = 1024 * 1024
+SEQ_BLOCK = MIB
+RANDOM_BLOCK = 4096
+DEFAULT_SIZE_MB = 128
+DEFAULT_QUEUE_DEPTH = 4
+DEFAULT_RANDOM_OPS = 2048
+DEFAULT_FSYNC_SAMPLES = 64
+PATTERN_BYTES = 8 * MIB
+# Metrics where a larger value is better; every other compared metric is a latency.
+HIGHER_IS_BETTER = ("mb_s", "iops")
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    size_mb: int = DEFAULT_SIZE_MB
+    queue_depth: int = DEFAULT_QUEUE_DEPTH
+    random_ops: int = DEFAULT_RANDOM_OPS
+    fsync_samples: int = DEFAULT_FSYNC_SAMPLES
+    direct: bool = True
+
+
+def latency_summary(seconds: Sequence[float]) -> Dict[str, float]:
+    millis = [value * 1000 for value in seconds]
+    return {
+        "p50_ms": round(http_probe.percentile(millis, 50), 3),
+        "p95_ms": round(http_probe.percentile(millis, 95), 3),
+        "p99_ms": round(http_probe.percentile(millis, 99), 3),
+        "max_ms": round(max(millis, default=0.0), 3),
+    }
+
+
+def aligned_buffer(size: int) -> mmap.mmap:
+    """Return a page-aligned anonymous buffer, as ``O_DIRECT`` requires."""
+
+    return mmap.mmap(-1, size)
+
+
+class ScratchFile:
+    """A benchmark file opened for direct I/O when the filesystem supports it."""
+
+    def __init__(self, path: Path, size: int, *, direct: bool = True) -> None:
+        self.path = path
+        self.size = size
+        self.direct = False
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_CLOEXEC", 0)
+        o_direct = getattr(os, "O_DIRECT", 0)
+        if direct and o_direct:
+            with contextlib.suppress(OSError):
+                self.fd = os.open(path, flags | o_direct, 0o600)
+                self.direct = True
+                self._probe_direct()
+        if not self.direct:
+            self.fd = os.open(path, flags, 0o600)
+
+    def _probe_direct(self) -> None:
+        # Some filesystems accept O_DIRECT at open time but reject the first transfer.
+        probe = aligned_buffer(RANDOM_BLOCK)
+        try:
+            os.pwrite(self.fd, probe, 0)
+        except OSError:
+            os.close(self.fd)
+            self.direct = False
+        finally:
+            probe.close()
+
+    def drop_cache(self) -> None:
+        """Push written data to the device and evict it from the page cache."""
+
+        os.fsync(self.fd)
+        if not self.direct and hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(self.fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+    def close(self) -> None:
+        os.close(self.fd)
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
+
+
+class Pattern:
+    """Incompressible data served as aligned, rotating slices."""
+
+    def __init__(self, size: int = PATTERN_BYTES) -> None:
+        self.buffer = aligned_buffer(size)
+        self.buffer.write(os.urandom(size))
+        self.size = size
+
+    def block(self, index: int, length: int) -> memoryview:
+        slots = self.size // length
+        start = (index % slots) * length
+        return memoryview(self.buffer)[start : start + length]
+
+
+def _write_all(fd: int, data: memoryview, offset: int) -> None:
+    while data:
+        written = os.pwrite(fd, data, offset)
+        data, offset = data[written:], offset + written
+
+
+def _read_exact(fd: int, buffer: memoryview, offset: int) -> None:
+    while buffer:
+        received = os.preadv(fd, [buffer], offset)
+        if received <= 0:
+            raise OSError(f"short read at byte {offset}")
+        buffer, offset = buffer[received:], offset + received
+
+
+def _throughput(total_bytes: int, seconds: float) -> Dict[str, float]:
+    return {
+        "bytes": total_bytes,
+        "seconds": round(seconds, 6),
+        "mb_s": round(total_bytes / MIB / seconds, 2) if seconds > 0 else 0.0,
+    }
+
+
+def sequential_write(scratch: ScratchFile, pattern: Pattern, clock=time.perf_counter):
+    started = clock()
+    for index, offset in enumerate(range(0, scratch.size, SEQ_BLOCK)):
+        _write_all(scratch.fd, pattern.block(index, SEQ_BLOCK), offset)
+    os.fsync(scratch.fd)
+    return _throughput(scratch.size, clock() - started)
+
+
+def sequential_read(scratch: ScratchFile, clock=time.perf_counter):
+    scratch.drop_cache()
+    buffer = aligned_buffer(SEQ_BLOCK)
+    view = memoryview(buffer)
+    started = clock()
+    for offset in range(0, scratch.size, SEQ_BLOCK):
+        _read_exact(scratch.fd, view, offset)
+    elapsed = clock() - started
+    view.release()
+    buffer.close()
+    return _throughput(scratch.size, elapsed)
+
+
+def random_io(
+    scratch: ScratchFile,
+    operation: Callable[[int, int, memoryview], None],
+    ops: int,
+    queue_depth: int,
+    *,
+    seed: int = 0,
+    clock=time.perf_counter,
+) -> Dict[str, float]:
+    """Run ``ops`` 4 KiB operations spread over ``queue_depth`` threads."""
+
+    blocks = max(1, scratch.size // RANDOM_BLOCK)
+    workers = max(1, min(queue_depth, ops))
+    latencies: List[List[float]] = [[] for _ in range(workers)]
+    failures: List[BaseException] = []
+
+    def worker(slot: int) -> None:
+        rng = random.Random(seed * 1000 + slot)
+        buffer = aligned_buffer(RANDOM_BLOCK)
+        view = memoryview(buffer)
+        try:
+            for index in range(slot, ops, workers):
+                offset = rng.randrange(blocks) * RANDOM_BLOCK
+                started = clock()
+                operation(index, offset, view)
+                latencies[slot].append(clock() - started)
+        except BaseException as error:  # re-raised on the caller's thread
+            failures.append(error)
+        finally:
+            view.release()
+            buffer.close()
+
+    threads = [threading.Thread(target=worker, args=(slot,)) for slot in range(workers)]
+    started = clock()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = clock() - started
+    if failures:
+        raise failures[0]
+    samples = [value for slot in latencies for value in slot]
+    result = _throughput(len(samples) * RANDOM_BLOCK, elapsed)
+    result["iops"] = round(len(samples) / elapsed, 1) if elapsed > 0 else 0.0
+    result["queue_depth"] = workers
+    result.update(latency_summary(samples))
+    return result
+
+
+def fsync_latency(
+    scratch: ScratchFile, pattern: Pattern, samples: int, clock=time.perf_counter
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    blocks = max(1, scratch.size // RANDOM_BLOCK)
+    for index in range(samples):
+        offset = (index % blocks) * RANDOM_BLOCK
+        started = clock()
+        _write_all(scratch.fd, pattern.block(index, RANDOM_BLOCK), offset)
+        os.fsync(scratch.fd)
+        latencies.append(clock() - started)
+    summary: Dict[str, float] = {"samples": samples}
+    summary.update(latency_summary(latencies))
+    return summary
+
+
+def run_benchmark(target: Path, config: BenchmarkConfig = BenchmarkConfig()) -> Dict[str, object]:
+    """Benchmark the filesystem holding ``target`` and return a JSON-ready result."""
+
+    target.mkdir(parents=True, exist_ok=True)
+    size = max(1, config.size_mb) * MIB
+    scratch = ScratchFile(
+        target / f"storage-benchmark-{os.getpid()}.bin", size, direct=config.direct
+    )
+    try:
+        os.ftruncate(scratch.fd, size)
+        pattern = Pattern(min(PATTERN_BYTES, size))
+        tests: Dict[str, Dict[str, float]] = {}
+        tests["seq_write"] = sequential_write(scratch, pattern)
+        tests["seq_read"] = sequential_read(scratch)
+
+        def write_block(index: int, offset: int, _buffer: memoryview) -> None:
+            _write_all(scratch.fd, pattern.block(index, RANDOM_BLOCK), offset)
+
+        def read_block(_index: int, offset: int, buffer: memoryview) -> None:
+            _read_exact(scratch.fd, buffer, offset)
+
+        tests["rand_write_4k"] = random_io(
+            scratch, write_block, config.random_ops, config.queue_depth, seed=1
+        )
+        scratch.drop_cache()
+        tests["rand_read_4k"] = random_io(
+            scratch, read_block, config.random_ops, config.queue_depth, seed=2
+        )
+        tests["fsync"] = fsync_latency(scratch, pattern, config.fsync_samples)
+    finally:
+        scratch.close()
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "path": str(target),
+        "direct": scratch.direct,
+        "config": asdict(config),
+        "tests": tests,
+    }
+
+
+def compare(baseline: Dict[str, object], current: Dict[str, object]) -> Dict[str, object]:
+    """Return per-metric percentage changes of ``current`` relative to ``baseline``.
+
+    Positive ``change_pct`` always means faster: throughput and IOPS went up or latency
+    went down. Runs with a different schema or I/O mode are reported as not comparable.
+    """
+
+    if baseline.get("schema_version") != current.get("schema_version") or baseline.get(
+        "direct"
+    ) != current.get("direct"):
+        return {"comparable": False, "metrics": {}}
+    metrics: Dict[str, Dict[str, float]] = {}
+    base_tests = baseline.get("tests") or {}
+    for test, values in (current.get("tests") or {}).items():
+        previous = base_tests.get(test) if isinstance(base_tests, dict) else None
+        if not isinstance(previous, dict):
+            continue
+        for metric, value in values.items():
+            if not metric.endswith(("mb_s", "iops", "_ms")):
+                continue
+            before = previous.get(metric)
+            if not isinstance(before, (int, float)) or not before:
+                continue
+            change = (value - before) / before * 100
+            if not metric.endswith(HIGHER_IS_BETTER):
+                change = -change
+            metrics[f"{test}.{metric}"] = {
+                "baseline": before,
+                "current": value,
+                "change_pct": round(change, 1),
+            }
+    return {"comparable": True, "metrics": metrics}
+
+
+def format_summary(result: Dict[str, object]) -> str:
+    tests = result.get("tests") or {}
+
+    def metric(test: str, name: str) -> float:
+        values = tests.get(test) if isinstance(tests, dict) else None
+        return values.get(name, 0.0) if isinstance(values, dict) else 0.0
+
+    return (
+        f"seq write {metric('seq_write', 'mb_s'):.1f} MB/s, "
+        f"seq read {metric('seq_read', 'mb_s'):.1f} MB/s, "
+        f"4K random write {metric('rand_write_4k', 'iops'):.0f} IOPS, "
+        f"4K random read {metric('rand_read_4k', 'iops'):.0f} IOPS, "
+        f"fsync p99 {metric('fsync', 'p99_ms'):.2f} ms"
+        + ("" if result.get("direct") else " (buffered I/O)")
+    )
+
+
+def markdown_table(result: Dict[str, object]) -> List[str]:
+    """Render benchmark results as Markdown table lines."""
+
+    lines = [
+        "| Test | MB/s | IOPS | p50 ms | p99 ms |",
+        "| --- | ---: | ---: | ---: | ---: |",
+    ]
+    tests = result.get("tests") or {}
+    for test, values in tests.items() if isinstance(tests, dict) else []:
+        cells = [
+            str(values.get(name, "")) if name in values else "—"
+            for name in ("mb_s", "iops", "p50_ms", "p99_ms")
+        ]
+        lines.append(f"| {test} | " + " | ".join(cells) + " |")
+    return lines
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path, help="Directory on the device to benchmark")
+    parser.add_argument("--size-mb", type=int, default=DEFAULT_SIZE_MB)
+    parser.add_argument("--queue-depth", type=int, default=DEFAULT_QUEUE_DEPTH)
+    parser.add_argument("--random-ops", type=int, default=DEFAULT_RANDOM_OPS)
+    parser.add_argument("--fsync-samples", type=int, default=DEFAULT_FSYNC_SAMPLES)
+    parser.add_argument("--buffered", action="store_true", help="Do not request O_DIRECT")
+    parser.add_argument("--baseline", type=Path, help="Earlier JSON result to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    config = BenchmarkConfig(
+        size_mb=args.size_mb,
+        queue_depth=args.queue_depth,
+        random_ops=args.random_ops,
+        fsync_samples=args.fsync_samples,
+        direct=not args.buffered,
+    )
+    try:
+        result = run_benchmark(args.path, config)
+        if args.baseline:
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+            result["baseline"] = compare(baseline, result)
+    except (OSError, ValueError) as error:
+        print(f"storage benchmark failed: {error}", file=sys.stderr)
+        return 1
+    json.dump(result, sys.stdout, indent=2, sort_keys=True)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual execution script
+    sys.exit(main())
@@ -11,8 +11,15 @@ import sys
 import time
 import urllib.parse
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Callable, List, Mapping, Optional, Sequence
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import readiness_wait  # noqa: E402
+
 
 class WorkflowNotifierError(RuntimeError):
     """Raised when workflow notification encounters an unexpected failure."""
@@ -196,7 +203,10 @@ class GhClient:
 
 
 class WorkflowWatcher:
-    """Polls GitHub until a workflow run completes and exposes artifacts."""
+    """Polls GitHub until a workflow run completes and exposes artifacts.
+
+    Polls start a couple of seconds apart and back off to ``poll_interval``.
+    """
 
     def __init__(
         self,
@@ -212,16 +222,19 @@ class WorkflowWatcher:
         self._timeout = timeout
 
     def wait_for_artifacts(self) -> tuple[Mapping[str, object], Sequence[Mapping[str, object]]]:
-        start = time.monotonic()
-        while True:
-            run = self._client.fetch_run(self._reference)
-            status = run.get("status")
-            if status == "completed":
-                artifacts = self._client.fetch_artifacts(self._reference)
-                return run, artifacts
-            if self._timeout is not None and (time.monotonic() - start) > self._timeout:
-                raise WorkflowNotifierError("timed out waiting for workflow run to complete.")
-            time.sleep(self._poll_interval)
+        result = readiness_wait.poll_until(
+            lambda: self._client.fetch_run(self._reference),
+            lambda run: run.get("status") == "completed",
+            timeout=self._timeout,
+            backoff=readiness_wait.Backoff(
+                initial=min(2.0, self._poll_interval), maximum=self._poll_interval
+            ),
+            clock=time.monotonic,
+            sleeper=time.sleep,
+        )
+        if not result.ok:
+            raise WorkflowNotifierError("timed out waiting for workflow run to complete.")
+        return result.value, self._client.fetch_artifacts(self._reference)
 
 
 def _format_size(size_in_bytes: Optional[int]) -> str:
@@ -277,7 +290,7 @@ def _parse_arguments(argv: Optional[Sequence[str]]) -> argparse.Namespace:
         "--poll-interval",
         type=float,
         default=30.0,
-        help="Seconds between gh api calls",
+        help="Maximum seconds between gh api calls (early polls back off up to it)",
     )
     parser.add_argument(
         "--timeout",
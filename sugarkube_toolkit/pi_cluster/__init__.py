@@ -7,8 +7,12 @@ from .bootstrap import (
     JoinConfig,
     NodeConfig,
     NodeDefaults,
+    Stage,
+    StagePipeline,
+    StageTiming,
     WifiConfig,
     WorkflowConfig,
+    build_fanout_command,
     build_flash_command,
     build_install_command,
     build_join_command,
@@ -25,8 +29,12 @@ __all__ = [
     "JoinConfig",
     "NodeConfig",
     "NodeDefaults",
+    "Stage",
+    "StagePipeline",
+    "StageTiming",
     "WifiConfig",
     "WorkflowConfig",
+    "build_fanout_command",
     "build_flash_command",
     "build_install_command",
     "build_join_command",
@@ -5,6 +5,8 @@ import subprocess
 import sys
 import tempfile
 import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from pathlib import Path
 from shlex import quote as shlex_quote
@@ -27,6 +29,7 @@ DEFAULT_IMAGE_DIR = Path.home() / "sugarkube" / "images"
 DEFAULT_IMAGE_NAME = "sugarkube.img"
 DEFAULT_REPORT_ROOT = Path.home() / "sugarkube" / "reports" / "cluster"
 WORKFLOW_FILE = "pi-image.yml"
+DEFAULT_JOBS = 4
 
 
 class BootstrapError(RuntimeError):
@@ -55,6 +58,7 @@ class NodeDefaults:
     base_cloud_init: Path = DEFAULT_BASE_CLOUD_INIT
     report_root: Path = DEFAULT_REPORT_ROOT
     extra_flash_args: list[str] = field(default_factory=list)
+    fan_out: bool = True
 
 
 @dataclass(slots=True)
@@ -175,6 +179,96 @@ class CommandRunner:
             ) from exc
 
 
+@dataclass(slots=True)
+class Stage:
+    """One step of the bootstrap DAG; it starts once every stage in ``after`` succeeded."""
+
+    name: str
+    action: Callable[[], None]
+    after: tuple[str, ...] = ()
+
+
+@dataclass(slots=True)
+class StageTiming:
+    """When a stage started (relative to the pipeline) and how long it ran."""
+
+    name: str
+    status: str = "skipped"
+    start: float = 0.0
+    duration: float = 0.0
+
+
+class StagePipeline:
+    """Run stages on a bounded thread pool as soon as their dependencies finish.
+
+    After the first failure no new stages start. Stages already running are allowed to
+    finish, and then the failure is re-raised. ``timings`` is filled in either way.
+    """
+
+    def __init__(self, stages: Sequence[Stage], *, jobs: int = DEFAULT_JOBS):
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise BootstrapError("Bootstrap stage names must be unique.")
+        for stage in stages:
+            unknown = [dep for dep in stage.after if dep not in names]
+            if unknown:
+                raise BootstrapError(
+                    f"Stage {stage.name} depends on unknown stages: {', '.join(unknown)}"
+                )
+        self.stages = list(stages)
+        self.jobs = max(1, jobs)
+        self.timings = [StageTiming(name) for name in names]
+
+    def describe(self) -> list[str]:
+        return [
+            f"{stage.name} <- {', '.join(stage.after)}" if stage.after else stage.name
+            for stage in self.stages
+        ]
+
+    def run(self) -> None:
+        timings = {timing.name: timing for timing in self.timings}
+        pending = list(self.stages)
+        done: set[str] = set()
+        failure: BaseException | None = None
+        origin = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            running: dict[Future[None], Stage] = {}
+            while True:
+                ready = [stage for stage in pending if done.issuperset(stage.after)]
+                while failure is None and ready and len(running) < self.jobs:
+                    stage = ready.pop(0)
+                    pending.remove(stage)
+                    timings[stage.name].start = time.monotonic() - origin
+                    running[pool.submit(stage.action)] = stage
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    timing = timings[stage.name]
+                    timing.duration = time.monotonic() - origin - timing.start
+                    error = future.exception()
+                    if error is None:
+                        timing.status = "ok"
+                        done.add(stage.name)
+                    else:
+                        timing.status = "failed"
+                        failure = failure or error
+        if failure is not None:
+            raise failure
+        if pending:
+            names = ", ".join(stage.name for stage in pending)
+            raise BootstrapError(f"Bootstrap stages have circular dependencies: {names}")
+
+    def report(self) -> list[str]:
+        width = max((len(timing.name) for timing in self.timings), default=0)
+        return [
+            f"{timing.name:<{width}}  start +{timing.start:7.1f}s  took {timing.duration:7.1f}s  "
+            f"{timing.status}"
+            for timing in self.timings
+        ]
+
+
 def _execute(
     command: Sequence[str],
     *,
@@ -312,6 +406,7 @@ def load_cluster_config(path: Path) -> ClusterConfig:
         base_cloud_init=base_cloud_init,
         report_root=report_root,
         extra_flash_args=[str(part) for part in defaults_section.get("extra_flash_args", [])],
+        fan_out=bool(defaults_section.get("fan_out", True)),
     )
 
     raw_nodes = data.get("nodes")
@@ -528,6 +623,60 @@ def build_flash_command(
     return command
 
 
+def build_fanout_command(
+    nodes: Sequence[NodeConfig], image_path: Path, *, plan_path: Path
+) -> list[str]:
+    """Flash every node in ``nodes`` concurrently from a single image read.
+
+    All nodes must share the same sudo/eject/mount settings and extra flash
+    arguments; :func:`_group_fanout_nodes` takes care of that.
+    """
+
+    lead = nodes[0]
+    command: list[str] = []
+    if lead.use_sudo:
+        command.append("sudo")
+    command.extend(
+        [
+            sys.executable,
+            str(FLASH_REPORT_SCRIPT),
+            "--image",
+            str(image_path),
+            "--fanout-plan",
+            str(plan_path),
+            "--assume-yes",
+            "--base-cloud-init",
+            str(DEFAULT_BASE_CLOUD_INIT),
+        ]
+    )
+    if lead.no_eject:
+        command.append("--no-eject")
+    if lead.keep_mounted:
+        command.append("--keep-mounted")
+    command.extend(lead.extra_flash_args)
+    return command
+
+
+def _group_fanout_nodes(nodes: Sequence[NodeConfig]) -> list[list[NodeConfig]]:
+    groups: dict[tuple[object, ...], list[NodeConfig]] = {}
+    for node in nodes:
+        key = (node.use_sudo, node.no_eject, node.keep_mounted, tuple(node.extra_flash_args))
+        groups.setdefault(key, []).append(node)
+    return list(groups.values())
+
+
+def _write_fanout_plan(path: Path, targets: Sequence[tuple[NodeConfig, Path]]) -> None:
+    plan = [
+        {
+            "device": node.device,
+            "cloud_init": str(cloud_init),
+            "output_dir": str(node.report_dir),
+        }
+        for node, cloud_init in targets
+    ]
+    path.write_text(json.dumps(plan, indent=2))
+
+
 def build_join_command(config: JoinConfig) -> list[str]:
     command: list[str] = [sys.executable, str(JOIN_REHEARSAL_SCRIPT), config.server]
     if config.server_user:
@@ -652,56 +801,148 @@ def _dispatch_workflow(config: WorkflowConfig, runner: CommandRunner) -> str | N
     return run_id
 
 
-def run_bootstrap(
+def _build_stages(
     config: ClusterConfig,
+    runner: CommandRunner,
     *,
-    dry_run: bool,
     skip_download: bool,
     skip_join: bool,
-) -> None:
-    _ensure_scripts_exist()
-    runner = CommandRunner(repo_root=REPO_ROOT, dry_run=dry_run)
+    base_content: str,
+    tmpdir: Path,
+) -> list[Stage]:
+    state: dict[str, str | None] = {"workflow_run_id": None}
+    cloud_init_paths: dict[int, Path] = {}
+    stages: list[Stage] = []
 
-    workflow_run_id: str | None = None
-    if config.workflow and config.workflow.trigger:
-        if skip_download:
-            _log("Skipping workflow trigger because --skip-download was supplied.")
-        else:
-            workflow_run_id = _dispatch_workflow(config.workflow, runner)
+    if config.workflow and config.workflow.trigger and not skip_download:
+        workflow = config.workflow
 
-    if not skip_download:
-        install_command = build_install_command(config, workflow_run_id=workflow_run_id)
-        runner.run(install_command)
-    else:
-        _log("Skipping image download (--skip-download supplied).")
+        def dispatch() -> None:
+            state["workflow_run_id"] = _dispatch_workflow(workflow, runner)
 
-    if not config.image_path.exists() and not dry_run:
-        raise BootstrapError(
-            f"Expanded image not found at {config.image_path}. Run without --skip-download."
-        )
+        stages.append(Stage("workflow", dispatch))
 
-    base_cloud_init = config.defaults.base_cloud_init
-    if not base_cloud_init.exists():
-        raise BootstrapError(f"Base cloud-init template missing: {base_cloud_init}")
-    base_content = base_cloud_init.read_text()
+    def install_image() -> None:
+        if skip_download:
+            _log("Skipping image download (--skip-download supplied).")
+        else:
+            runner.run(build_install_command(config, workflow_run_id=state["workflow_run_id"]))
+        if not config.image_path.exists() and not runner.dry_run:
+            raise BootstrapError(
+                f"Expanded image not found at {config.image_path}. Run without --skip-download."
+            )
 
-    with tempfile.TemporaryDirectory(prefix="sugarkube-cluster-") as tmpdir:
+    stages.append(Stage("image", install_image, tuple(stage.name for stage in stages)))
+
+    def render_all() -> None:
         for node in config.nodes:
             _log(f"Preparing media for {node.identifier()} ({node.device})")
             cloud_init_path = node.cloud_init_path
             if cloud_init_path is None:
                 rendered = render_cloud_init(base_content, node, config.defaults)
-                node_file = Path(tmpdir) / f"{node.identifier()}-user-data.yaml"
+                node_file = tmpdir / f"{node.identifier()}-user-data.yaml"
                 node_file.write_text(rendered)
                 cloud_init_path = node_file
-            flash_command = build_flash_command(node, config.image_path, cloud_init=cloud_init_path)
-            runner.run(flash_command)
+            cloud_init_paths[id(node)] = cloud_init_path
+
+    stages.append(Stage("cloud-init", render_all))
+
+    def flash_group(index: int, group: list[NodeConfig]) -> Callable[[], None]:
+        def flash() -> None:
+            if len(group) == 1:
+                node = group[0]
+                runner.run(
+                    build_flash_command(
+                        node, config.image_path, cloud_init=cloud_init_paths[id(node)]
+                    )
+                )
+                return
+            names = ", ".join(node.identifier() for node in group)
+            _log(f"Flashing {len(group)} nodes concurrently: {names}")
+            plan_path = tmpdir / f"fanout-{index}.json"
+            _write_fanout_plan(plan_path, [(node, cloud_init_paths[id(node)]) for node in group])
+            runner.run(build_fanout_command(group, config.image_path, plan_path=plan_path))
+
+        return flash
+
+    fan_out = config.defaults.fan_out
+    groups = _group_fanout_nodes(config.nodes) if fan_out else [[node] for node in config.nodes]
+    flash_stages: list[str] = []
+    for index, group in enumerate(groups):
+        after = ("image", "cloud-init")
+        if not fan_out and flash_stages:
+            # fan_out = false asks for one card at a time, so chain the flashes.
+            after = (*after, flash_stages[-1])
+        name = f"flash[{','.join(node.identifier() for node in group)}]"
+        stages.append(Stage(name, flash_group(index, group), after))
+        flash_stages.append(name)
 
     if config.join and not skip_join:
-        join_command = build_join_command(config.join)
-        runner.run(join_command)
-    elif config.join and skip_join:
+        join_config = config.join
+        stages.append(
+            Stage(
+                "join",
+                lambda: runner.run(build_join_command(join_config)),
+                tuple(flash_stages),
+            )
+        )
+    return stages
+
+
+def run_bootstrap(
+    config: ClusterConfig,
+    *,
+    dry_run: bool,
+    skip_download: bool,
+    skip_join: bool,
+    jobs: int = DEFAULT_JOBS,
+) -> list[StageTiming]:
+    """Bootstrap the cluster as a DAG of stages and return per-stage timings.
+
+    The workflow run and image download overlap with rendering every node's cloud-init.
+    Flashing starts once both are done, and separate fan-out groups flash concurrently
+    (up to ``jobs`` stages at once). The join runs after the last flash. ``dry_run``
+    prints the DAG and runs the stages one at a time so the previewed commands stay in
+    order.
+    """
+
+    _ensure_scripts_exist()
+    runner = CommandRunner(repo_root=REPO_ROOT, dry_run=dry_run)
+
+    if config.workflow and config.workflow.trigger and skip_download:
+        _log("Skipping workflow trigger because --skip-download was supplied.")
+
+    # Check the template before any long-running stage starts, not after the image build.
+    base_cloud_init = config.defaults.base_cloud_init
+    if not base_cloud_init.exists():
+        raise BootstrapError(f"Base cloud-init template missing: {base_cloud_init}")
+    base_content = base_cloud_init.read_text()
+
+    with tempfile.TemporaryDirectory(prefix="sugarkube-cluster-") as tmpdir:
+        stages = _build_stages(
+            config,
+            runner,
+            skip_download=skip_download,
+            skip_join=skip_join,
+            base_content=base_content,
+            tmpdir=Path(tmpdir),
+        )
+        pipeline = StagePipeline(stages, jobs=1 if dry_run else jobs)
+        if dry_run:
+            _log("Bootstrap plan (each stage starts once the stages after '<-' finish):")
+            for line in pipeline.describe():
+                _log(f"  {line}")
+        try:
+            pipeline.run()
+        finally:
+            if not dry_run:
+                _log("Stage timings:")
+                for line in pipeline.report():
+                    _log(f"  {line}")
+
+    if config.join and skip_join:
         _log("Skipping cluster join (--skip-join supplied).")
+    return pipeline.timings
 
 
 __all__ = [
@@ -711,8 +952,12 @@ __all__ = [
     "JoinConfig",
     "NodeConfig",
     "NodeDefaults",
+    "Stage",
+    "StagePipeline",
+    "StageTiming",
     "WifiConfig",
     "WorkflowConfig",
+    "build_fanout_command",
     "build_flash_command",
     "build_install_command",
     "build_join_command",
@@ -548,6 +548,7 @@ def _run_build_script(tmp_path, env):
     verifier = script_dir / "pi_node_verifier.sh"
     verifier.write_text(verifier_src.read_text())
     verifier.chmod(0o755)
+    shutil.copy(repo_root / "scripts" / "pi_node_verifier.py", script_dir / "pi_node_verifier.py")
 
     ci_dir = script_dir / "cloud-init"
     ci_dir.mkdir(parents=True)
@@ -653,6 +654,10 @@ def _run_build_script(tmp_path, env):
         ("scripts/check_avahi_config_effective.sh", 0o755),
         ("scripts/configure_nsswitch_mdns.sh", 0o755),
         ("scripts/log.sh", 0o755),
+        ("scripts/mdns_discovery_daemon.py", 0o755),
+        ("scripts/k3s_mdns_parser.py", 0o755),
+        ("scripts/mdns_helpers.py", 0o755),
+        ("scripts/systemd/sugarkube-mdns-discovery.service", 0o644),
         ("systemd/first-boot-prepare.sh", 0o755),
         ("systemd/first-boot-prepare.service", 0o644),
         ("scripts/systemd/sugarkube-export-kubeconfig.service", 0o644),
@@ -904,6 +909,39 @@ def test_installs_path_units_for_kube_artifacts(tmp_path):
     assert not (tmp_path / "sugarkube.img.xz.xz").exists()
 
 
+def test_installs_and_enables_mdns_discovery_daemon(tmp_path):
+    env = _setup_build_env(tmp_path)
+    env["KEEP_WORK_DIR"] = "1"
+
+    result, _ = _run_build_script(tmp_path, env)
+    assert result.returncode == 0
+
+    match = re.search(r"leaving work dir: (?P<path>\S+)", result.stdout)
+    assert match, result.stdout
+    work_dir = Path(match.group("path"))
+    stage_root = work_dir / "pi-gen" / "stage2" / "01-sys-tweaks" / "files"
+
+    for module in ("mdns_discovery_daemon.py", "k3s_mdns_parser.py", "mdns_helpers.py"):
+        assert (stage_root / "opt" / "sugarkube" / module).exists(), f"missing {module}"
+    unit = stage_root / "etc" / "systemd" / "system" / "sugarkube-mdns-discovery.service"
+    content = unit.read_text()
+    assert "RuntimeDirectory=sugarkube\n" in content
+    assert "RuntimeDirectoryPreserve=yes" in content
+    assert "/opt/sugarkube/mdns_discovery_daemon.py" in content
+    wants_link = (
+        stage_root
+        / "etc"
+        / "systemd"
+        / "system"
+        / "multi-user.target.wants"
+        / "sugarkube-mdns-discovery.service"
+    )
+    assert wants_link.is_symlink()
+    assert os.readlink(wants_link) == "../sugarkube-mdns-discovery.service"
+
+    shutil.rmtree(work_dir)
+
+
 def test_configurable_mirror_failover(tmp_path):
     env = _setup_build_env(tmp_path)
     env["KEEP_WORK_DIR"] = "1"
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import atexit
 import errno
+import json
 import os
 import shutil
 import subprocess
@@ -407,3 +408,103 @@ def ensure_root_privileges() -> None:
         )
 
     _netns_probe_result = (True, None)
+
+
+class FakeKubeApi:
+    """A keep-alive HTTP stand-in for the Kubernetes API server.
+
+    ``routes`` maps request paths (including any query string) to ``(status, doc)``
+    pairs. ``watches`` maps a collection path (without query string) to the
+    ``(status, events)`` a ``?watch=1`` request on it streams back, one JSON event per
+    line. Every request is recorded with the client port it arrived on so tests
+    can assert that reads share pooled connections.
+    """
+
+    def __init__(self) -> None:
+        import http.server
+        import threading
+
+        self.routes: dict[str, tuple[int, object]] = {}
+        self.watches: dict[str, tuple[int, list[object]]] = {}
+        self.requests: list[dict[str, object]] = []
+        fake = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                fake.requests.append(
+                    {
+                        "path": self.path,
+                        "port": self.client_address[1],
+                        "authorization": self.headers.get("Authorization"),
+                    }
+                )
+                not_found = {"kind": "Status", "reason": "NotFound", "message": "not found"}
+                path, _, query = self.path.partition("?")
+                if "watch=1" in query.split("&"):
+                    status, events = fake.watches.get(path, (404, [not_found]))
+                    if status == 200:
+                        body = b"".join(json.dumps(event).encode() + b"\n" for event in events)
+                    else:
+                        body = json.dumps(events[0]).encode()
+                else:
+                    status, doc = fake.routes.get(self.path, (404, not_found))
+                    body = doc if isinstance(doc, bytes) else json.dumps(doc).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_args: object) -> None:
+                return
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def connections(self) -> set[object]:
+        return {request["port"] for request in self.requests}
+
+    def write_kubeconfig(self, path: Path, *, context: str = "sugar-prod") -> Path:
+        path.write_text(
+            json.dumps(
+                {
+                    "apiVersion": "v1",
+                    "kind": "Config",
+                    "current-context": context,
+                    "clusters": [{"name": "fake", "cluster": {"server": self.url}}],
+                    "contexts": [
+                        {"name": context, "context": {"cluster": "fake", "user": "fake"}}
+                    ],
+                    "users": [{"name": "fake", "user": {"token": "fake-token"}}],
+                }
+            )
+        )
+        return path
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_kube_api(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Serve in-process kubectl reads from a local fake API server."""
+
+    from scripts import kube_api_client
+
+    api = FakeKubeApi()
+    kubeconfig = api.write_kubeconfig(tmp_path / "fake-kubeconfig.json")
+    monkeypatch.setenv("KUBECONFIG", str(kubeconfig))
+    monkeypatch.setenv(kube_api_client.ENABLE_ENV, "1")
+    kube_api_client.reset()
+    try:
+        yield api
+    finally:
+        kube_api_client.reset()
+        api.close()
@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+
+from scripts import flash_pi_media_benchmark as bench
+
+
+def test_benchmark_reports_per_stage_throughput(tmp_path: Path) -> None:
+    output = tmp_path / "bench.json"
+
+    exit_code = bench.main(["--size-mib", "4", "--json", str(output)])
+
+    assert exit_code == 0
+    payload = json.loads(output.read_text())
+    modes = [result["mode"] for result in payload["results"]]
+    assert modes == ["serial", "pipeline"]
+    for result in payload["results"]:
+        assert result["bytes"] == 4 * 1024 * 1024
+        assert set(result["stages"]) == {"read", "hash", "write"}
+
+
+def test_benchmark_sparse_mode_reports_skipped_zeros(tmp_path: Path) -> None:
+    output = tmp_path / "bench.json"
+
+    exit_code = bench.main(["--size-mib", "4", "--modes", "pipeline-sparse", "--json", str(output)])
+
+    assert exit_code == 0
+    (result,) = json.loads(output.read_text())["results"]
+    assert result["skipped_bytes"] == 2 * 1024 * 1024
+
+
+def test_benchmark_rejects_missing_image(tmp_path: Path, capsys) -> None:
+    exit_code = bench.main(["--image", str(tmp_path / "missing.img")])
+
+    assert exit_code == 1
+    assert "image not found" in capsys.readouterr().err
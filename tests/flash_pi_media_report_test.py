@@ -1,3 +1,6 @@
+import hashlib
+import json
+import lzma
 import subprocess
 import sys
 from pathlib import Path
@@ -45,3 +48,142 @@ def test_run_flash_forwards_cloud_init(monkeypatch: pytest.MonkeyPatch) -> None:
 
     assert recorded["argv"].count("--cloud-init") == 1
     assert "override.yaml" in recorded["argv"]
+
+
+def test_run_flash_keys_manifest_to_source_image_in_report_dir(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    recorded: dict[str, list[str]] = {}
+
+    def fake_main(argv: list[str]) -> int:
+        recorded["argv"] = argv
+        print("Sample verification passed: 34/512 blocks match the image manifest")
+        return 0
+
+    monkeypatch.setattr(report.flash, "main", fake_main)
+    args = SimpleNamespace(
+        no_eject=False, keep_mounted=False, dry_run=False, cloud_init=None, verify="sample"
+    )
+    device = flash.Device(path="/dev/sdz", description="disk", size=0, is_removable=True)
+    source = Path("/images/sugarkube.img.xz")
+
+    reports = Path("/home/pi/sugarkube/reports")
+
+    _, _, _, verified = report._run_flash(
+        Path("/tmp/expanded/sugarkube.img"),
+        args,
+        device,
+        source_image=source,
+        manifest_dir=reports,
+    )
+
+    argv = recorded["argv"]
+    assert argv[argv.index("--manifest") + 1] == str(reports / "sugarkube.img.xz.blocks.json")
+    assert argv[argv.index("--manifest-source") + 1] == str(source)
+    assert argv[argv.index("--verify") + 1] == "sample"
+    assert verified == "sampled (34/512 blocks matched)"
+
+
+def test_fanout_plan_writes_per_device_reports(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    image = tmp_path / "sugarkube.img"
+    image.write_bytes(b"plan" * 4096)
+    devices = [tmp_path / "sdx.bin", tmp_path / "sdy.bin"]
+    for device in devices:
+        device.touch()
+    plan = tmp_path / "plan.json"
+    plan.write_text(
+        json.dumps(
+            [
+                {"device": str(device), "output_dir": str(tmp_path / f"report-{idx}")}
+                for idx, device in enumerate(devices)
+            ]
+        )
+    )
+    monkeypatch.setattr(report.flash, "discover_devices", lambda: [])
+    monkeypatch.setenv("SUGARKUBE_FLASH_ALLOW_NONROOT", "1")
+
+    reports = tmp_path / "reports"
+    exit_code = report.main(
+        [
+            "--image",
+            str(image),
+            "--fanout-plan",
+            str(plan),
+            "--output-dir",
+            str(reports),
+            "--assume-yes",
+            "--no-eject",
+        ]
+    )
+
+    assert exit_code == 0
+    for idx, device in enumerate(devices):
+        assert device.read_bytes() == image.read_bytes()
+        (report_json,) = (tmp_path / f"report-{idx}").glob("flash-*/flash-report.json")
+        metadata = json.loads(report_json.read_text())
+        assert metadata["device"]["path"] == str(device)
+        assert metadata["verification"]["verified"] == metadata["image"]["sha256"]
+    assert report.flash.manifest_path_for(image, reports).exists()
+    assert not report.flash.manifest_path_for(image).exists()
+
+    exit_code = report.main(
+        [
+            "--image",
+            str(image),
+            "--fanout-plan",
+            str(plan),
+            "--output-dir",
+            str(reports),
+            "--assume-yes",
+            "--no-eject",
+            "--verify",
+            "sample",
+        ]
+    )
+
+    assert exit_code == 0
+    latest = max((tmp_path / "report-0").glob("flash-*/flash-report.json"))
+    verified = json.loads(latest.read_text())["verification"]["verified"]
+    assert verified.startswith("sampled (") and verified.endswith(" blocks matched)")
+
+
+def test_fanout_plan_rejects_repeated_devices_and_non_root(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    image = tmp_path / "sugarkube.img"
+    image.write_bytes(b"plan" * 4096)
+    device = tmp_path / "sdx.bin"
+    device.touch()
+    alias = tmp_path / "by-id-sdx"
+    alias.symlink_to(device)
+    plan = tmp_path / "plan.json"
+    plan.write_text(json.dumps([{"device": str(device)}, {"device": str(alias)}]))
+    monkeypatch.setattr(report.flash, "discover_devices", lambda: [])
+    argv = ["--image", str(image), "--fanout-plan", str(plan), "--assume-yes", "--no-eject"]
+
+    with pytest.raises(report.FlashReportError, match="more than once"):
+        report.main(argv)
+
+    plan.write_text(json.dumps([{"device": str(device)}]))
+    monkeypatch.setenv("SUGARKUBE_FLASH_FAKE_EUID", "1000")
+    with pytest.raises(report.FlashReportError, match="Run as root"):
+        report.main(argv)
+    assert device.read_bytes() == b""
+
+
+def test_expand_image_reuses_cached_expansion(tmp_path: Path) -> None:
+    content = b"cached" * 8192
+    archive = tmp_path / "sugarkube.img.xz"
+    with lzma.open(archive, "wb") as fh:
+        fh.write(content)
+    cache = flash.ImageCache(tmp_path / "cache", max_bytes=1024**3)
+
+    first = report._expand_image(archive, cache)
+    second = report._expand_image(archive, cache)
+
+    assert first[0] == second[0]
+    assert first[0].read_bytes() == content
+    assert first[5] is None and second[5] is None
+    assert first[4] == second[4] == hashlib.sha256(content).hexdigest()
@@ -1,10 +1,18 @@
 import contextlib
+import hashlib
+import io
+import json
 import lzma
 import os
+import random
+import struct
 import subprocess
 import sys
+import threading
 from pathlib import Path
 
+import pytest
+
 from scripts import flash_pi_media as flash
 
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -51,7 +59,7 @@ def test_flash_imgxz_to_regular_file(tmp_path):
     assert result.returncode == 0, result.stderr
     assert device.read_bytes() == content
     assert "Finished writing" in result.stdout
-    assert "Verified device SHA-256" in result.stdout
+    assert "Device blocks match image SHA-256" in result.stdout
 
 
 def test_requires_root_without_override(tmp_path):
@@ -184,3 +192,543 @@ def test_cloud_init_missing_file_errors(tmp_path):
 
     assert result.returncode != 0
     assert "Cloud-init override not found" in result.stderr
+
+
+def test_fan_out_flashes_every_device_from_one_read(tmp_path):
+    content = b"fanout" * 4096
+    img, archive = make_image(tmp_path, content)
+    devices = [tmp_path / f"device-{idx}.bin" for idx in range(3)]
+    for device in devices:
+        device.touch()
+
+    env = os.environ.copy()
+    env["SUGARKUBE_FLASH_ALLOW_NONROOT"] = "1"
+
+    args = ["--image", str(archive), "--assume-yes", "--keep-mounted", "--no-eject"]
+    for device in devices:
+        args.extend(["--device", str(device)])
+    result = run_flash(args, env=env, cwd=tmp_path)
+
+    assert result.returncode == 0, result.stderr
+    for device in devices:
+        assert device.read_bytes() == content
+        assert f"{device}: device blocks match image SHA-256" in result.stdout
+    assert "Flashed 3/3 devices" in result.stdout
+
+
+def test_fan_out_isolates_failing_device(tmp_path):
+    content = b"isolate" * 4096
+    img, _archive = make_image(tmp_path, content)
+    good = tmp_path / "good.bin"
+    good.touch()
+    missing = tmp_path / "missing-dir" / "device.bin"
+
+    with flash._open_image(img)[0] as src:
+        total, expected, results = flash._fan_out_write(src, [str(good), str(missing)])
+
+    assert total == len(content)
+    good_result, bad_result = results
+    assert good_result.ok
+    assert good_result.sha256 == expected
+    assert good.read_bytes() == content
+    assert not bad_result.ok
+    assert "write failed" in (bad_result.error or "")
+
+
+def test_fan_out_detaches_stalled_device(tmp_path, monkeypatch):
+    content = b"stall" * 4096
+    img, _archive = make_image(tmp_path, content)
+    fast = tmp_path / "fast.bin"
+    slow = tmp_path / "slow.bin"
+    fast.touch()
+    slow.touch()
+
+    release = threading.Event()
+    real_open = flash._open_device
+
+    def fake_open(path, write, **kwargs):
+        if path == str(slow):
+            release.wait(5)
+        return real_open(path, write, **kwargs)
+
+    for name in ("CHUNK_SIZE", "MIN_CHUNK_SIZE", "MAX_CHUNK_SIZE"):
+        monkeypatch.setattr(flash, name, 1024)
+    monkeypatch.setattr(flash, "_open_device", fake_open)
+
+    with flash._open_image(img)[0] as src:
+        _total, expected, results = flash._fan_out_write(
+            src, [str(fast), str(slow)], queue_depth=1, stall_timeout=0.2
+        )
+    release.set()
+
+    assert results[0].ok
+    assert results[0].sha256 == expected
+    assert not results[1].ok
+    assert "stalled" in (results[1].error or "")
+
+
+def test_fan_out_slow_device_catches_up_from_the_raw_image(tmp_path, monkeypatch, capsys):
+    content = os.urandom(64 * 1024)
+    img, _archive = make_image(tmp_path, content)
+    fast = tmp_path / "fast.bin"
+    slow = tmp_path / "slow.bin"
+    fast.touch()
+    slow.touch()
+
+    fast_done = threading.Event()
+    real_open = flash._open_device
+
+    @contextlib.contextmanager
+    def fake_open(path, write, **kwargs):
+        if path == str(slow):
+            # The slow card only starts once the fast one has taken the whole stream.
+            assert fast_done.wait(5)
+        with real_open(path, write, **kwargs) as dest:
+            yield dest
+        if path == str(fast):
+            fast_done.set()
+
+    for name in ("CHUNK_SIZE", "MIN_CHUNK_SIZE", "MAX_CHUNK_SIZE"):
+        monkeypatch.setattr(flash, name, 1024)
+    monkeypatch.setattr(flash, "_open_device", fake_open)
+
+    with flash._open_image(img)[0] as src:
+        total, expected, results = flash._fan_out_write(
+            src, [str(fast), str(slow)], queue_depth=2, stall_timeout=5, source_path=img
+        )
+
+    assert total == len(content)
+    assert all(result.ok and result.sha256 == expected for result in results)
+    assert fast.read_bytes() == slow.read_bytes() == content
+    assert f"{slow} fell" in capsys.readouterr().out
+
+
+def test_fan_out_shares_the_pipeline_read_and_hash_stages(tmp_path, monkeypatch):
+    content = os.urandom(3 * 1024 * 1024 + 123)
+    _img, archive = make_image(tmp_path, content)
+    devices = [tmp_path / f"device-{idx}.bin" for idx in range(2)]
+    for device in devices:
+        device.touch()
+    monkeypatch.setattr(flash, "CHUNK_SIZE", flash.MIN_CHUNK_SIZE)
+    reads = []
+    real_readinto = flash._readinto_full
+
+    def counting_readinto(src, view):
+        count = real_readinto(src, view)
+        reads.append(count)
+        return count
+
+    monkeypatch.setattr(flash, "_readinto_full", counting_readinto)
+
+    with flash._open_image(archive)[0] as src:
+        total, expected, results = flash._fan_out_write(
+            src, [str(device) for device in devices], direct=True
+        )
+
+    assert total == sum(reads) == len(content)
+    assert expected == hashlib.sha256(content).hexdigest()
+    assert all(result.ok and result.sha256 == expected for result in results)
+    for device in devices:
+        assert device.read_bytes() == content
+
+
+def test_stream_write_pipeline_matches_serial_hash(tmp_path, monkeypatch):
+    content = os.urandom(3 * 1024 * 1024 + 123)
+    img, archive = make_image(tmp_path, content)
+    device = tmp_path / "pipeline.bin"
+    device.touch()
+    monkeypatch.setattr(flash, "CHUNK_SIZE", flash.MIN_CHUNK_SIZE)
+
+    stats = flash.PipelineStats.empty()
+    with flash._open_image(archive)[0] as src:
+        with flash._open_device(str(device), write=True, sync=False, direct=True) as dest:
+            total, digest = flash._stream_write(src, dest, direct=True, stats=stats)
+
+    assert total == len(content)
+    assert digest == hashlib.sha256(content).hexdigest()
+    assert device.read_bytes() == content
+    assert stats.read.bytes == stats.hash.bytes == stats.write.bytes == len(content)
+
+
+def test_stream_write_surfaces_writer_errors(tmp_path):
+    img, _archive = make_image(tmp_path, b"boom" * 4096)
+
+    class BrokenDevice(io.BytesIO):
+        def write(self, data):
+            raise OSError("device vanished")
+
+    with flash._open_image(img)[0] as src:
+        with pytest.raises(OSError, match="device vanished"):
+            flash._stream_write(src, BrokenDevice())
+
+
+def test_adaptive_chunk_size_tracks_write_latency():
+    chunk = flash._AdaptiveChunkSize(flash.CHUNK_SIZE)
+
+    chunk.observe(chunk.size, 0.001)
+    assert chunk.size == flash.CHUNK_SIZE * 2
+
+    chunk.observe(chunk.size, 5.0)
+    chunk.observe(chunk.size, 5.0)
+    assert chunk.size == flash.CHUNK_SIZE // 2
+
+    for _ in range(10):
+        chunk.observe(chunk.size, 0.0)
+    assert chunk.size == flash.MAX_CHUNK_SIZE
+
+
+def _sparse_payload() -> bytes:
+    block = flash.SPARSE_BLOCK_SIZE
+    return os.urandom(block) + bytes(6 * block) + os.urandom(block // 2) + bytes(block + 17)
+
+
+def test_sparse_flash_skips_zero_runs_and_keeps_full_hash(tmp_path):
+    content = _sparse_payload()
+    img, archive = make_image(tmp_path, content)
+    device = tmp_path / "sparse.bin"
+    device.write_bytes(b"\xff" * (len(content) + 4096))  # stale data must not survive
+
+    env = os.environ.copy()
+    env["SUGARKUBE_FLASH_ALLOW_NONROOT"] = "1"
+    result = run_flash(
+        [
+            "--image",
+            str(archive),
+            "--device",
+            str(device),
+            "--assume-yes",
+            "--no-eject",
+            "--sparse",
+        ],
+        env=env,
+        cwd=tmp_path,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert device.read_bytes() == content
+    assert "of zeros" in result.stdout
+    expected = hashlib.sha256(content).hexdigest()
+    assert f"Device blocks match image SHA-256: {expected}" in result.stdout
+
+
+def test_sparse_raw_image_skips_source_holes(tmp_path):
+    block = flash.MIN_CHUNK_SIZE
+    image = tmp_path / "holey.img"
+    with image.open("wb") as fh:
+        fh.write(b"\x01" * 1024)
+        fh.seek(4 * block)
+        fh.write(b"\x02" * 1024)
+        fh.truncate(8 * block)
+    content = image.read_bytes()
+    device = tmp_path / "device.bin"
+    device.touch()
+
+    stats = flash.PipelineStats.empty()
+    with flash._open_image(image)[0] as src:
+        with flash._open_device(str(device), write=True, sync=False) as dest:
+            total, digest = flash._stream_write(
+                src, dest, sparse="seek", raw_source=True, stats=stats
+            )
+
+    assert total == len(content)
+    assert digest == hashlib.sha256(content).hexdigest()
+    assert device.read_bytes() == content
+    assert stats.skipped_bytes >= 4 * block
+    with flash._open_device(str(device), write=False) as reader:
+        verified = flash._read_and_hash(reader, total, zero_ranges=stats.zero_ranges)
+    assert verified == digest
+
+
+def test_sparse_block_device_uses_zeroout_and_falls_back(tmp_path, monkeypatch):
+    import fcntl
+
+    block = flash.SPARSE_BLOCK_SIZE
+    content = os.urandom(block) + bytes(2 * block) + os.urandom(block)
+    device = tmp_path / "blockdev.bin"
+    device.write_bytes(bytes(len(content)))
+    calls = []
+
+    def fake_ioctl(fd, request, arg):
+        calls.append((request, struct.unpack("QQ", arg)))
+
+    monkeypatch.setattr(fcntl, "ioctl", fake_ioctl)
+    stats = flash.PipelineStats.empty()
+    with flash._open_device(str(device), write=True, sync=False) as dest:
+        flash._stream_write(io.BytesIO(content), dest, sparse="zeroout", stats=stats)
+
+    assert calls == [(flash.BLKZEROOUT, (block, 2 * block))]
+    assert stats.zero_ranges == [(block, 2 * block)]
+    assert device.read_bytes() == content
+
+    def unsupported_ioctl(fd, request, arg):
+        raise OSError(95, "Operation not supported")
+
+    monkeypatch.setattr(fcntl, "ioctl", unsupported_ioctl)
+    device.write_bytes(b"\xff" * len(content))
+    stats = flash.PipelineStats.empty()
+    with flash._open_device(str(device), write=True, sync=False) as dest:
+        flash._stream_write(io.BytesIO(content), dest, sparse="discard", stats=stats)
+
+    assert stats.skipped_bytes == 0
+    assert device.read_bytes() == content
+
+
+def test_sparse_zero_fallback_writes_page_aligned_buffers(tmp_path, monkeypatch):
+    import fcntl
+    import mmap
+
+    block = flash.SPARSE_BLOCK_SIZE
+    content = os.urandom(block) + bytes(block) + os.urandom(block) + bytes(2 * block)
+    device = tmp_path / "blockdev.bin"
+    device.write_bytes(b"\xff" * len(content))
+    calls = []
+
+    def unsupported_ioctl(fd, request, arg):
+        calls.append(request)
+        raise OSError(95, "Operation not supported")
+
+    class RecordingDevice:
+        def __init__(self, dest):
+            self.dest = dest
+            self.backing = []
+
+        def write(self, view):
+            self.backing.append(type(view.obj))
+            return self.dest.write(view)
+
+        def __getattr__(self, name):
+            return getattr(self.dest, name)
+
+    monkeypatch.setattr(fcntl, "ioctl", unsupported_ioctl)
+    with flash._open_device(str(device), write=True, sync=False) as dest:
+        recorder = RecordingDevice(dest)
+        flash._stream_write(io.BytesIO(content), recorder, sparse="zeroout")
+
+    # O_DIRECT needs aligned buffers, so zero fallbacks must come from a mapping too.
+    assert set(recorder.backing) == {mmap.mmap}
+    assert calls == [flash.BLKZEROOUT]
+    assert device.read_bytes() == content
+
+
+def test_fan_out_supports_sparse_mode(tmp_path):
+    content = _sparse_payload()
+    _img, archive = make_image(tmp_path, content)
+    devices = [tmp_path / f"device-{idx}.bin" for idx in range(2)]
+    for device in devices:
+        device.write_bytes(b"\xff" * (len(content) + 4096))
+
+    env = os.environ.copy()
+    env["SUGARKUBE_FLASH_ALLOW_NONROOT"] = "1"
+    args = ["--image", str(archive), "--assume-yes", "--no-eject", "--sparse"]
+    for device in devices:
+        args.extend(["--device", str(device)])
+    result = run_flash(args, env=env, cwd=tmp_path)
+
+    assert result.returncode == 0, result.stderr
+    for device in devices:
+        assert device.read_bytes() == content
+    assert result.stdout.count("of zeros") == len(devices)
+    assert "Flashed 2/2 devices" in result.stdout
+
+
+def test_block_manifest_saved_and_reused_on_repeat_flash(tmp_path):
+    content = os.urandom(flash.MANIFEST_BLOCK_SIZE * 2 + 1234)
+    _, archive = make_image(tmp_path, content)
+    device = tmp_path / "device.bin"
+    device.touch()
+    env = os.environ.copy()
+    env["SUGARKUBE_FLASH_ALLOW_NONROOT"] = "1"
+    args = ["--image", str(archive), "--device", str(device), "--assume-yes", "--no-eject"]
+
+    first = run_flash(args, env=env, cwd=tmp_path)
+
+    assert first.returncode == 0, first.stderr
+    manifest_path = flash.manifest_path_for(archive)
+    manifest = flash.load_manifest(manifest_path, archive)
+    assert manifest is not None
+    assert manifest.sha256 == hashlib.sha256(content).hexdigest()
+    assert len(manifest.blocks) == 3
+    tail = content[2 * flash.MANIFEST_BLOCK_SIZE :]
+    assert manifest.blocks[2] == hashlib.sha256(tail).hexdigest()
+
+    device.write_bytes(b"")
+    second = run_flash(args, env=env, cwd=tmp_path)
+
+    assert second.returncode == 0, second.stderr
+    assert "Reusing block manifest" in second.stdout
+    assert f"Device blocks match image SHA-256: {manifest.sha256}" in second.stdout
+    assert device.read_bytes() == content
+
+
+def test_block_manifest_defaults_to_the_working_directory(tmp_path):
+    content = os.urandom(flash.MANIFEST_BLOCK_SIZE + 99)
+    images = tmp_path / "images"
+    work = tmp_path / "work"
+    images.mkdir()
+    work.mkdir()
+    img, _archive = make_image(images, content)
+    device = tmp_path / "device.bin"
+    device.touch()
+    env = os.environ.copy()
+    env["SUGARKUBE_FLASH_ALLOW_NONROOT"] = "1"
+
+    result = run_flash(
+        ["--image", str(img), "--device", str(device), "--assume-yes", "--no-eject"],
+        env=env,
+        cwd=work,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert flash.load_manifest(flash.manifest_path_for(img, work), img) is not None
+    assert not flash.manifest_path_for(img).exists()
+
+
+def test_fan_out_builds_the_manifest_and_verifies_each_device_by_block(tmp_path, monkeypatch):
+    content = os.urandom(flash.MANIFEST_BLOCK_SIZE * 2 + 1234)
+    img, _archive = make_image(tmp_path, content)
+    paths = [tmp_path / f"device-{idx}.bin" for idx in range(2)]
+    devices = [flash.Device(str(path), "test", 0, True) for path in paths]
+    for path in paths:
+        path.touch()
+
+    expected, results = flash.flash_many(img, devices, eject=False)
+
+    manifest = flash.load_manifest(flash.manifest_path_for(img), img)
+    assert manifest is not None and manifest.sha256 == expected
+    assert [result.verified_sha256 for result in results] == [expected, expected]
+    assert all(result.verification.checked == 3 for result in results)
+
+    def no_rehash(*_args, **_kwargs):
+        raise AssertionError("the reused manifest should skip hashing the image")
+
+    monkeypatch.setattr(flash, "_BlockHasher", no_rehash)
+    _expected, results = flash.flash_many(img, devices, eject=False, verify="sample")
+    assert all(result.ok and result.verification.mode == "sample" for result in results)
+    assert results[0].verified_sha256 == ""
+
+    with paths[1].open("r+b") as fh:
+        fh.seek(flash.MANIFEST_BLOCK_SIZE + 10)
+        fh.write(b"corrupt")
+    result = flash.FanOutResult(path=str(paths[1]))
+    flash._verify_fan_out_result(result, manifest, mode="full", workers=2, sample=0)
+    assert "block 1 at offset" in (result.error or "")
+
+
+def test_block_manifest_rejects_tampered_or_stale_files(tmp_path):
+    image = tmp_path / "sugarkube.img"
+    image.write_bytes(b"abc")
+    digests = [hashlib.sha256(b"abc").hexdigest()]
+    manifest = flash.BlockManifest(
+        size=3,
+        sha256=digests[0],
+        blocks=digests,
+        source=flash._source_identity(image),
+    )
+    path = flash.manifest_path_for(image)
+    assert flash.save_manifest(manifest, path)
+    assert flash.load_manifest(path, image) == manifest
+    assert manifest.merkle_root == digests[0]
+
+    payload = manifest.to_json()
+    payload["blocks"] = [hashlib.sha256(b"abd").hexdigest()]
+    path.write_text(json.dumps(payload))
+    assert flash.load_manifest(path, image) is None
+
+    flash.save_manifest(manifest, path)
+    image.write_bytes(b"abcd")
+    assert flash.load_manifest(path, image) is None
+
+
+def test_verify_blocks_stops_at_first_mismatch_and_samples(tmp_path):
+    block = 4096
+    content = b"".join(bytes([index]) * block for index in range(64))
+    hasher = flash._BlockHasher(block)
+    hasher.update(memoryview(content))
+    manifest = flash.BlockManifest(
+        size=len(content),
+        sha256=hashlib.sha256(content).hexdigest(),
+        blocks=hasher.finish(),
+        block_size=block,
+    )
+    device = tmp_path / "device.bin"
+    device.write_bytes(content)
+
+    full = flash.verify_blocks(str(device), manifest, workers=4)
+    assert full.ok and full.checked == 64
+    sampled = flash.verify_blocks(
+        str(device), manifest, mode="sample", sample=4, rng=random.Random(1)
+    )
+    assert sampled.ok and sampled.checked == 6
+
+    corrupted = bytearray(content)
+    corrupted[10 * block] ^= 0xFF
+    corrupted[50 * block] ^= 0xFF
+    device.write_bytes(bytes(corrupted))
+    failed = flash.verify_blocks(str(device), manifest, workers=1)
+    assert failed.mismatch == 10
+    assert failed.checked == 10
+
+
+def test_block_hasher_reuses_zero_digest_for_holes():
+    block = 8192
+    hasher = flash._BlockHasher(block)
+    hasher.update(memoryview(b"\x01" * 100))
+    hasher.update_zeros(block * 2)
+    data = b"\x01" * 100 + bytes(block * 2)
+    expected = [
+        hashlib.sha256(data[offset : offset + block]).hexdigest()
+        for offset in range(0, len(data), block)
+    ]
+    assert hasher.finish() == expected
+
+
+def test_image_cache_serves_repeat_flashes_without_decompression(tmp_path):
+    content = os.urandom(1024 * 1024) + bytes(3 * 1024 * 1024) + b"tail"
+    _, archive = make_image(tmp_path, content)
+    cache_dir = tmp_path / "cache"
+    device = tmp_path / "device.bin"
+    device.touch()
+    env = os.environ.copy()
+    env["SUGARKUBE_FLASH_ALLOW_NONROOT"] = "1"
+    args = [
+        "--image",
+        str(archive),
+        "--device",
+        str(device),
+        "--assume-yes",
+        "--no-eject",
+        "--cache-dir",
+        str(cache_dir),
+    ]
+
+    first = run_flash(args, env=env, cwd=tmp_path)
+
+    assert first.returncode == 0, first.stderr
+    key = hashlib.sha256(archive.read_bytes()).hexdigest()
+    cached = cache_dir / key / flash.CACHE_IMAGE_NAME
+    assert cached.read_bytes() == content
+    assert flash.load_manifest(flash.manifest_path_for(cached), cached) is not None
+
+    device.write_bytes(b"")
+    second = run_flash(args, env=env, cwd=tmp_path)
+
+    assert second.returncode == 0, second.stderr
+    assert "Using cached expansion" in second.stdout
+    assert "Opening compressed image" not in second.stdout
+    assert device.read_bytes() == content
+
+
+def test_image_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = flash.ImageCache(tmp_path / "cache", max_bytes=3 * 1024 * 1024)
+    for age, key in enumerate(["newest", "middle", "oldest"]):
+        entry = cache.root / key
+        entry.mkdir()
+        (entry / flash.CACHE_IMAGE_NAME).write_bytes(os.urandom(1024 * 1024 + 1))
+        stamp = 1_000_000 - age * 1000
+        os.utime(entry, (stamp, stamp))
+    assert cache.lookup("middle") is not None  # refreshes "middle" as most recently used
+
+    removed = cache.evict(keep="oldest")
+
+    assert removed == ["newest"]
+    assert sorted(path.name for path in cache.root.iterdir()) == ["middle", "oldest"]
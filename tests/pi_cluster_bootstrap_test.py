@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import json
 import sys
+import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -355,11 +358,13 @@ def test_main_invokes_bootstrap_pipeline(monkeypatch: pytest.MonkeyPatch, tmp_pa
         dry_run: bool,
         skip_download: bool,
         skip_join: bool,
+        jobs: int,
     ) -> None:
         received["config"] = config
         received["dry_run"] = dry_run
         received["skip_download"] = skip_download
         received["skip_join"] = skip_join
+        received["jobs"] = jobs
 
     monkeypatch.setattr(bootstrap, "load_cluster_config", fake_load)
     monkeypatch.setattr(bootstrap, "run_bootstrap", fake_run)
@@ -372,6 +377,9 @@ def test_main_invokes_bootstrap_pipeline(monkeypatch: pytest.MonkeyPatch, tmp_pa
     assert received["dry_run"] is True
     assert received["skip_download"] is False
     assert received["skip_join"] is True
+    assert received["jobs"] == core.DEFAULT_JOBS
+
+    assert bootstrap.main(["--config", str(config_path), "--jobs", "0"]) == 1
 
 
 def test_main_surfaces_bootstrap_error(
@@ -566,3 +574,175 @@ def test_build_workflow_dispatch_command_sets_inputs() -> None:
     assert "--field" in command
     assert any("clone_sugarkube=true" in part for part in command)
     assert any("clone_token_place=false" in part for part in command)
+
+
+def test_run_bootstrap_fans_out_matching_nodes(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    image_dir = tmp_path / "images"
+    image_dir.mkdir()
+    image_path = image_dir / "sugarkube.img"
+    image_path.write_text("image")
+    base_cloud = tmp_path / "base.yaml"
+    base_cloud.write_text("#cloud-config\n")
+    report_root = tmp_path / "reports"
+
+    defaults = core.NodeDefaults(base_cloud_init=base_cloud, report_root=report_root)
+    nodes = [
+        core.NodeConfig(device="/dev/sdx", name="alpha", report_dir=report_root / "alpha"),
+        core.NodeConfig(device="/dev/sdy", name="beta", report_dir=report_root / "beta"),
+        core.NodeConfig(
+            device="/dev/sdz", name="gamma", report_dir=report_root / "gamma", use_sudo=False
+        ),
+    ]
+    config = core.ClusterConfig(
+        image_dir=image_dir,
+        image_name=image_path.name,
+        download_args=[],
+        nodes=nodes,
+        join=None,
+        defaults=defaults,
+    )
+
+    monkeypatch.setattr(core, "_ensure_scripts_exist", lambda: None)
+    created: list[_StubRunner] = []
+    plans: list[list[dict[str, str]]] = []
+
+    def make_runner(*, repo_root: Path, dry_run: bool) -> _StubRunner:
+        runner_obj = _StubRunner(dry_run=dry_run)
+        created.append(runner_obj)
+        return runner_obj
+
+    real_write_plan = core._write_fanout_plan
+
+    def record_plan(path: Path, targets) -> None:
+        real_write_plan(path, targets)
+        plans.append(json.loads(path.read_text()))
+
+    monkeypatch.setattr(core, "CommandRunner", make_runner)
+    monkeypatch.setattr(core, "_write_fanout_plan", record_plan)
+
+    core.run_bootstrap(config, dry_run=False, skip_download=True, skip_join=True)
+
+    run_calls = created[0].run_calls
+    assert len(run_calls) == 2
+    # The fan-out group and gamma flash concurrently, so either may be recorded first.
+    fanout, single = sorted(run_calls, key=lambda cmd: "--fanout-plan" not in cmd)
+    assert fanout[0] == "sudo"
+    assert "--fanout-plan" in fanout
+    assert [entry["device"] for entry in plans[0]] == ["/dev/sdx", "/dev/sdy"]
+    assert plans[0][1]["output_dir"] == str(report_root / "beta")
+    assert "--device" in single and "/dev/sdz" in single
+
+
+def test_stage_pipeline_overlaps_independent_stages_and_reports_timings() -> None:
+    started: dict[str, float] = {}
+    lock = threading.Lock()
+
+    def stage(name: str, seconds: float = 0.0):
+        def action() -> None:
+            with lock:
+                started[name] = time.monotonic()
+            time.sleep(seconds)
+
+        return action
+
+    pipeline = core.StagePipeline(
+        [
+            core.Stage("image", stage("image", 0.3)),
+            core.Stage("cloud-init", stage("cloud-init", 0.3)),
+            core.Stage("flash[a]", stage("flash[a]"), ("image", "cloud-init")),
+            core.Stage("join", stage("join"), ("flash[a]",)),
+        ],
+        jobs=4,
+    )
+    begin = time.monotonic()
+    pipeline.run()
+
+    assert time.monotonic() - begin < 0.55
+    assert started["flash[a]"] >= max(started["image"], started["cloud-init"]) + 0.25
+    assert started["join"] >= started["flash[a]"]
+    assert [(timing.name, timing.status) for timing in pipeline.timings] == [
+        ("image", "ok"),
+        ("cloud-init", "ok"),
+        ("flash[a]", "ok"),
+        ("join", "ok"),
+    ]
+    assert pipeline.timings[0].duration >= 0.25
+    assert pipeline.report()[2].startswith("flash[a]    start +")
+
+
+def test_stage_pipeline_stops_scheduling_after_a_failure() -> None:
+    ran: list[str] = []
+
+    def fail() -> None:
+        raise core.BootstrapError("image download failed")
+
+    pipeline = core.StagePipeline(
+        [
+            core.Stage("image", fail),
+            core.Stage("cloud-init", lambda: ran.append("cloud-init")),
+            core.Stage("flash[a]", lambda: ran.append("flash[a]"), ("image", "cloud-init")),
+        ],
+        jobs=1,
+    )
+    with pytest.raises(core.BootstrapError, match="image download failed"):
+        pipeline.run()
+
+    assert ran == []
+    assert [timing.status for timing in pipeline.timings] == ["failed", "skipped", "skipped"]
+
+    with pytest.raises(core.BootstrapError, match="circular"):
+        core.StagePipeline(
+            [core.Stage("a", lambda: None, ("b",)), core.Stage("b", lambda: None, ("a",))]
+        ).run()
+    with pytest.raises(core.BootstrapError, match="unknown"):
+        core.StagePipeline([core.Stage("a", lambda: None, ("missing",))])
+
+
+def test_run_bootstrap_dry_run_prints_the_stage_graph(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    base_cloud = tmp_path / "base.yaml"
+    base_cloud.write_text("#cloud-config\n")
+    report_root = tmp_path / "reports"
+    defaults = core.NodeDefaults(base_cloud_init=base_cloud, report_root=report_root, fan_out=False)
+    config = core.ClusterConfig(
+        image_dir=tmp_path,
+        image_name="missing.img",
+        download_args=[],
+        nodes=[
+            core.NodeConfig(device="/dev/sdx", name="alpha", report_dir=report_root / "alpha"),
+            core.NodeConfig(device="/dev/sdy", name="beta", report_dir=report_root / "beta"),
+        ],
+        join=core.JoinConfig(server="controller"),
+        defaults=defaults,
+    )
+    monkeypatch.setattr(core, "_ensure_scripts_exist", lambda: None)
+    created: list[_StubRunner] = []
+
+    def make_runner(*, repo_root: Path, dry_run: bool) -> _StubRunner:
+        created.append(_StubRunner(dry_run=dry_run))
+        return created[-1]
+
+    monkeypatch.setattr(core, "CommandRunner", make_runner)
+
+    timings = core.run_bootstrap(config, dry_run=True, skip_download=False, skip_join=False)
+
+    out = capsys.readouterr().out
+    assert "  flash[alpha] <- image, cloud-init\n" in out
+    # fan_out = false flashes one card at a time, so beta waits for alpha.
+    assert "  flash[beta] <- image, cloud-init, flash[alpha]\n" in out
+    assert "  join <- flash[alpha], flash[beta]\n" in out
+    assert "Stage timings" not in out
+    assert [timing.name for timing in timings] == [
+        "image",
+        "cloud-init",
+        "flash[alpha]",
+        "flash[beta]",
+        "join",
+    ]
+    run_calls = created[0].run_calls
+    assert str(core.INSTALL_SCRIPT) in run_calls[0]
+    assert "/dev/sdx" in run_calls[1] and "/dev/sdy" in run_calls[2]
+    assert str(core.JOIN_REHEARSAL_SCRIPT) in run_calls[3]
@@ -878,3 +878,94 @@ def test_main_json_output_respects_reveal_secret(monkeypatch, tmp_path, sample_n
     assert exit_code == 0
     payload = json.loads(output_path.read_text(encoding="utf-8"))
     assert payload["server"]["join_secret"] == "super-secret"
+
+
+def test_main_parallel_keeps_agent_order_and_caps_inflight_joins(monkeypatch, capsys, sample_nodes):
+    import threading
+    import time
+
+    lock = threading.Lock()
+    active = {"preflight": 0, "join": 0}
+    peak = {"preflight": 0, "join": 0}
+
+    def enter(kind: str) -> None:
+        with lock:
+            active[kind] += 1
+            peak[kind] = max(peak[kind], active[kind])
+
+    def leave(kind: str) -> None:
+        with lock:
+            active[kind] -= 1
+
+    hosts = [f"worker{index}" for index in range(1, 6)]
+
+    def fake_collect_server_status(args: argparse.Namespace) -> rehearsal.ServerStatus:
+        return rehearsal.ServerStatus(
+            host=args.server,
+            join_secret="secret",
+            api_url="https://10.0.0.10:6443",
+            nodes=sample_nodes[:1],
+        )
+
+    def fake_collect_agent_status(host: str, args: argparse.Namespace, api_host: str):
+        enter("preflight")
+        # Later agents finish first; summaries must still print in --agents order.
+        time.sleep(0.02 * (len(hosts) - hosts.index(host)))
+        leave("preflight")
+        return rehearsal.AgentStatus(host=host, payload={"api_reachable": True})
+
+    def fake_apply(host, index, args, server):
+        enter("join")
+        time.sleep(0.05)
+        leave("join")
+        return rehearsal.ApplyStatus(
+            host=host, node_name=f"node-{index}", success=True, message="ok"
+        )
+
+    monkeypatch.setattr(rehearsal, "collect_server_status", fake_collect_server_status)
+    monkeypatch.setattr(rehearsal, "collect_agent_status", fake_collect_agent_status)
+    monkeypatch.setattr(rehearsal, "apply_join_to_agent", fake_apply)
+
+    exit_code = rehearsal.main(
+        ["control", "--agents", *hosts, "--parallel", "5", "--no-ssh-multiplex", "--apply"]
+    )
+    output = capsys.readouterr().out
+    assert exit_code == 0
+    preflight = [line.split("]")[0] for line in output.splitlines() if "api=ok" in line]
+    assert preflight == [f"[{host}" for host in hosts]
+    joins = [line.strip() for line in output.splitlines() if ": node=" in line]
+    assert joins == [f"[{host}] PASS: node=node-{i} ok" for i, host in enumerate(hosts, 1)]
+    assert peak == {"preflight": 5, "join": rehearsal.DEFAULT_MAX_INFLIGHT_JOINS}
+
+    assert rehearsal.main(["control", "--parallel", "0"]) == 2
+
+
+def test_main_parallel_multiplexes_ssh_and_closes_masters(monkeypatch, sample_nodes):
+    commands: list[list[str]] = []
+
+    def fake_run(command):
+        commands.append(command)
+        remote = command[-1]
+        if "-O" in command:
+            return subprocess.CompletedProcess(command, 0, "", "")
+        if remote.endswith("/boot/sugarkube-node-token"):
+            return subprocess.CompletedProcess(command, 0, "K10secret\n", "")
+        if "get nodes" in remote:
+            return subprocess.CompletedProcess(command, 0, json.dumps({"items": sample_nodes}), "")
+        return subprocess.CompletedProcess(command, 0, json.dumps({"api_reachable": True}), "")
+
+    monkeypatch.setattr(rehearsal, "run_ssh", fake_run)
+
+    assert rehearsal.main(["control", "--agents", "worker1", "worker2", "--parallel", "2"]) == 0
+
+    sessions = [command for command in commands if "-O" not in command]
+    assert len(sessions) == 4
+    control_paths = {
+        option for command in sessions for option in command if option.startswith("ControlPath=")
+    }
+    assert len(control_paths) == 1
+    control_dir = pathlib.Path(control_paths.pop().partition("=")[2]).parent
+    assert all("ControlMaster=auto" in command for command in sessions)
+    exits = [command[-1] for command in commands if "-O" in command]
+    assert exits == ["pi@control", "pi@worker1", "pi@worker2"]
+    assert not control_dir.exists()
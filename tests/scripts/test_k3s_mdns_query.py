@@ -1,5 +1,7 @@
+import os
 import subprocess
 import sys
+import time
 from pathlib import Path
 
 # Add scripts/ to import path
@@ -48,7 +50,8 @@ def test_query_mdns_keeps_output_when_avahi_errors():
 
     assert results == ["host0.local"]
     assert any("255" in msg for msg in messages)
-    assert calls == ["_k3s-sugar-dev._tcp", "_https._tcp"]
+    # Service types are browsed concurrently, so only the set of calls is stable.
+    assert sorted(calls) == ["_https._tcp", "_k3s-sugar-dev._tcp"]
 
 
 def test_query_mdns_handles_avahi_timeout():
@@ -110,7 +113,8 @@ def test_query_mdns_queries_legacy_service_type_when_needed():
     )
 
     assert results == ["host0.local"]
-    assert calls == ["_k3s-sugar-dev._tcp", "_https._tcp"]
+    # Service types are browsed concurrently, so only the set of calls is stable.
+    assert sorted(calls) == ["_https._tcp", "_k3s-sugar-dev._tcp"]
 
 
 def test_query_mdns_bootstrap_leaders_uses_txt_leader(tmp_path):
@@ -223,12 +227,10 @@ def test_query_mdns_falls_back_without_resolve():
     )
 
     assert results == ["host0.local"]
-    assert calls == [
-        ("_k3s-sugar-dev._tcp", True),
-        ("_https._tcp", True),
-        ("_k3s-sugar-dev._tcp", False),
-        ("_https._tcp", False),
-    ]
+    # Each pass browses both service types concurrently; the passes run in order.
+    assert set(calls[:2]) == {("_k3s-sugar-dev._tcp", True), ("_https._tcp", True)}
+    assert set(calls[2:]) == {("_k3s-sugar-dev._tcp", False), ("_https._tcp", False)}
+    assert len(calls) == 4
 
 
 def test_query_mdns_retries_on_failure():
@@ -331,3 +333,42 @@ def test_query_mdns_uses_allow_iface():
             os.environ["ALLOW_IFACE"] = original_env
         else:
             os.environ.pop("ALLOW_IFACE", None)
+
+
+def test_query_mdns_returns_early_and_kills_outstanding_browses(tmp_path, monkeypatch):
+    """server-first stops at the first server instead of waiting out every browse."""
+
+    pid_file = tmp_path / "slow.pid"
+    fake = tmp_path / "avahi-browse"
+    fake.write_text(
+        "#!/bin/sh\n"
+        'for arg in "$@"; do service="$arg"; done\n'
+        'if [ "$service" = "_https._tcp" ]; then\n'
+        f'  echo $$ > "{pid_file}"\n'
+        "  exec sleep 30\n"
+        "fi\n"
+        f'while [ ! -f "{pid_file}" ]; do sleep 0.05; done\n'
+        "printf '%s\\n' "
+        "'=;eth0;IPv4;k3s-sugar-dev@host0 (server);_k3s-sugar-dev._tcp;local;host0.local;"
+        "192.168.1.10;6443;txt=k3s=1;txt=cluster=sugar;txt=env=dev;txt=role=server'\n",
+        encoding="utf-8",
+    )
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+    monkeypatch.setenv("SUGARKUBE_MDNS_DAEMON", "0")
+    monkeypatch.setenv("SUGARKUBE_MDNS_QUERY_TIMEOUT", "20")
+
+    started = time.monotonic()
+    results = query_mdns("server-first", "sugar", "dev")
+
+    assert results == ["host0.local"]
+    assert time.monotonic() - started < 10
+    pid = int(pid_file.read_text())
+    for _ in range(50):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.1)
+    else:
+        raise AssertionError("slow avahi-browse was left running")
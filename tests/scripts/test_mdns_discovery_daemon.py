@@ -0,0 +1,175 @@
+import os
+import stat
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add scripts/ to import path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+import mdns_discovery_daemon as daemon  # noqa: E402
+from k3s_mdns_query import query_mdns  # noqa: E402
+from mdns_helpers import _collect_mdns_records  # noqa: E402
+
+SERVER_BROWSE = "+;eth0;IPv4;k3s-sugar-dev@host0 (server);_k3s-sugar-dev._tcp;local"
+SERVER_RESOLVED = (
+    "=;eth0;IPv4;k3s-sugar-dev@host0 (server);_k3s-sugar-dev._tcp;local;host0.local;"
+    "192.168.1.10;6443;txt=k3s=1;txt=cluster=sugar;txt=env=dev;txt=role=server"
+)
+SERVER_REMOVED = "-;eth0;IPv4;k3s-sugar-dev@host0 (server);_k3s-sugar-dev._tcp;local"
+BOOTSTRAP_RESOLVED = (
+    "=;eth0;IPv4;k3s-sugar-dev@host1 (bootstrap);_k3s-sugar-dev._tcp;local;host1.local;"
+    "192.168.1.11;6443;txt=k3s=1;txt=cluster=sugar;txt=env=dev;txt=role=bootstrap"
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_service_table_tracks_resolution_removal_and_ttl():
+    clock = FakeClock()
+    table = daemon.ServiceTable(ttl=120, clock=clock)
+
+    assert table.apply(SERVER_BROWSE)
+    assert table.apply(SERVER_RESOLVED)
+    # A later browse-only sighting refreshes the TTL without discarding the resolution.
+    clock.now += 100
+    assert not table.apply(SERVER_BROWSE)
+    assert table.apply(BOOTSTRAP_RESOLVED)
+    assert not table.apply("garbage")
+
+    records = table.records("sugar", "dev")
+    assert {(r.host, r.address, r.txt["role"]) for r in records} == {
+        ("host0.local", "192.168.1.10", "server"),
+        ("host1.local", "192.168.1.11", "bootstrap"),
+    }
+    assert table.records("sugar", "prod") == []
+
+    # host1 was last seen at t=1100 and expires at t=1220; host0 was refreshed too.
+    clock.now += 121
+    assert table.lines() == []
+
+    table.apply(SERVER_RESOLVED)
+    assert len(table) == 1
+    assert table.apply(SERVER_REMOVED)
+    assert table.records("sugar", "dev") == []
+
+
+def _serve(tmp_path, service):
+    socket_path = str(tmp_path / "mdns.sock")
+    server = daemon.DiscoveryServer(socket_path, service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, socket_path
+
+
+def test_query_mdns_uses_daemon_table_without_browsing(tmp_path, monkeypatch):
+    script = tmp_path / "fake-browse.py"
+    script.write_text(textwrap.dedent(f"""
+            import sys, time
+            if sys.argv[1] == "_k3s-sugar-dev._tcp":
+                print({SERVER_RESOLVED!r}, flush=True)
+            time.sleep(30)
+            """))
+    service = daemon.DiscoveryService(
+        warmup=0.2,
+        command_factory=lambda service_type: [sys.executable, str(script), service_type],
+    )
+    server, socket_path = _serve(tmp_path, service)
+    monkeypatch.setenv(daemon.SOCKET_ENV, socket_path)
+
+    def forbidden(*_args, **_kwargs):
+        raise AssertionError("avahi-browse should not run while the daemon is serving")
+
+    try:
+        # The first query subscribes and is declined until the browsers warm up.
+        assert daemon.query_daemon("sugar", "dev") is None
+        for browser in service.ensure(daemon.service_types("sugar", "dev")):
+            assert browser.ready.wait(5)
+
+        monkeypatch.setattr(subprocess, "run", forbidden)
+        assert query_mdns("server-hosts", "sugar", "dev") == ["host0.local"]
+        records = _collect_mdns_records("sugar", "dev", subprocess.run)
+        assert [record.address for record in records] == ["192.168.1.10"]
+
+        monkeypatch.setenv(daemon.ENABLE_ENV, "0")
+        assert daemon.query_daemon("sugar", "dev") is None
+    finally:
+        service.stop()
+        server.shutdown()
+        server.server_close()
+
+    assert not Path(socket_path).exists()
+
+
+def test_empty_daemon_answer_skips_resolved_and_unresolved_browses(tmp_path, monkeypatch):
+    class Empty(daemon.DiscoveryService):
+        def handle(self, request):
+            return {"ok": True, "records": []}
+
+    def forbidden(*_args, **_kwargs):
+        raise AssertionError("an empty daemon answer must not start avahi-browse")
+
+    server, socket_path = _serve(tmp_path, Empty())
+    monkeypatch.setenv(daemon.SOCKET_ENV, socket_path)
+    monkeypatch.setattr(subprocess, "run", forbidden)
+    monkeypatch.setattr(subprocess, "Popen", forbidden)
+    try:
+        assert daemon.query_daemon("sugar", "dev") == []
+        assert query_mdns("server-hosts", "sugar", "dev") == []
+        assert _collect_mdns_records("sugar", "dev", subprocess.run) == []
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_socket_is_restricted_to_owner_and_group(tmp_path):
+    server, socket_path = _serve(tmp_path, daemon.DiscoveryService())
+    try:
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == daemon.SOCKET_MODE == 0o660
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_query_daemon_falls_back_when_socket_missing_or_broken(tmp_path):
+    assert daemon.query_daemon("sugar", "dev", socket_path=str(tmp_path / "none.sock")) is None
+
+    class Broken(daemon.DiscoveryService):
+        def handle(self, request):
+            return {"ok": True, "records": [{"host": "missing-fields"}]}
+
+    messages = []
+    server, socket_path = _serve(tmp_path, Broken())
+    try:
+        result = daemon.query_daemon("sugar", "dev", socket_path=socket_path, debug=messages.append)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert result is None
+    assert any("unavailable" in message for message in messages)
+
+
+@pytest.mark.parametrize("exit_code, ready", [(0, True), (1, False)])
+def test_service_browser_readiness_follows_subscription_health(tmp_path, exit_code, ready):
+    table = daemon.ServiceTable()
+    browser = daemon.ServiceBrowser(
+        "_k3s-sugar-dev._tcp",
+        table,
+        warmup=30,
+        command=[
+            sys.executable,
+            "-c",
+            f"print({SERVER_RESOLVED!r}); raise SystemExit({exit_code})",
+        ],
+    )
+    assert browser._run_once() is ready
+    assert len(table) == 1
@@ -1,10 +1,18 @@
+import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
 
 from k3s_mdns_parser import parse_avahi_resolved_line  # noqa: E402
-from mdns_helpers import build_publish_cmd, norm_host  # noqa: E402
+from mdns_helpers import (  # noqa: E402
+    _browse_concurrently,
+    _collect_mdns_records,
+    build_publish_cmd,
+    norm_host,
+)
 
 
 def test_build_publish_cmd_orders_args_correctly():
@@ -44,3 +52,52 @@ def test_parse_avahi_resolved_line_extracts_txt_fields():
     assert parsed["txt"]["phase"] == "server"
     assert parsed["txt"]["role"] == "server"
     assert parsed["txt"]["state"] == ""
+
+
+def test_collect_mdns_records_browses_service_types_concurrently():
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def runner(command, capture_output, text, check):
+        with lock:
+            in_flight.append(command[-1])
+            peak.append(len(in_flight))
+        time.sleep(0.3)
+        with lock:
+            in_flight.remove(command[-1])
+        stdout = ""
+        if command[-1] == "_https._tcp" and command[1] == "-rptk":
+            stdout = (
+                "=;eth0;IPv4;k3s API sugar/dev [server] on pi0;_https._tcp;local;pi0.local;"
+                "192.0.2.10;6443;txt=k3s=1;txt=cluster=sugar;txt=env=dev;txt=role=server\n"
+            )
+        return subprocess.CompletedProcess(command, 0, stdout=stdout, stderr="")
+
+    started = time.monotonic()
+    records = _collect_mdns_records("sugar", "dev", runner)
+
+    assert [record.host for record in records] == ["pi0.local"]
+    assert max(peak) == 2
+    assert time.monotonic() - started < 0.55
+
+
+def test_browse_concurrently_keeps_type_order_and_returns_early():
+    release = threading.Event()
+
+    def browse(service_type):
+        if service_type == "slow":
+            release.wait(5)
+            return ["slow-line"]
+        return [f"{service_type}-line"]
+
+    collected = _browse_concurrently(
+        ["slow", "fast"], browse, done=lambda lines: "fast-line" in lines
+    )
+    assert collected == {"fast": ["fast-line"]}
+
+    release.set()
+    assert _browse_concurrently(["slow", "fast"], browse) == {
+        "slow": ["slow-line"],
+        "fast": ["fast-line"],
+    }
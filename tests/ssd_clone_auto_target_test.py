@@ -1,6 +1,7 @@
 import importlib.util
 import json
 import os
+import shutil
 import subprocess
 import sys
 from pathlib import Path
@@ -538,3 +539,198 @@ def test_update_configs_rewrites_files(monkeypatch, tmp_path):
     assert "root=PARTUUID=root-new" in cmdline
     assert "PARTUUID=root-new / ext4" in fstab
     assert "PARTUUID=boot-new /boot" in fstab
+
+
+def test_scan_root_entry_reports_size_and_hard_links(tmp_path):
+    (tmp_path / "nested").mkdir()
+    original = tmp_path / "nested" / "original"
+    original.write_bytes(b"x" * 10)
+    os.link(original, tmp_path / "alias")
+    (tmp_path / "single").write_bytes(b"y" * 5)
+
+    size, linked = ssd_clone.scan_root_entry(str(tmp_path))
+
+    assert size == 25
+    info = original.stat()
+    assert linked == {(info.st_dev, info.st_ino)}
+    assert ssd_clone.scan_root_entry(str(tmp_path / "missing")) == (0, set())
+
+
+def test_plan_root_shards_keeps_hard_links_together_and_balances():
+    entries = {
+        "usr": (100, {(1, 7)}),
+        "opt": (5, {(1, 7)}),
+        "var": (60, set()),
+        "home": (40, set()),
+        "bin": (0, set()),
+    }
+
+    shards = ssd_clone.plan_root_shards(entries, 3)
+
+    assert shards == [["opt", "usr"], ["var"], ["bin", "home"]]
+    assert ssd_clone.plan_root_shards(entries, 1) == [sorted(entries)]
+
+
+def test_root_shard_filters_route_new_entries_to_first_shard():
+    shards = [["usr"], ["var", "we[ird]"]]
+
+    assert ssd_clone.root_shard_filters(shards, 0) == [
+        "--exclude",
+        "/var",
+        "--exclude",
+        "/we\\[ird]",
+    ]
+    assert ssd_clone.root_shard_filters(shards, 1) == [
+        "--include",
+        "/var",
+        "--include",
+        "/we\\[ird]",
+        "--exclude",
+        "/*",
+    ]
+
+
+def test_sync_root_sharded_resumes_incomplete_shards(monkeypatch, tmp_path):
+    ctx = make_context(
+        tmp_path,
+        mount_root=tmp_path,
+        parallel=True,
+        root_shards=3,
+        state={"sync_root_shards": {"shards": [["usr"], ["var"], ["home"]], "completed": [1]}},
+    )
+    monkeypatch.setattr(ssd_clone, "resolve_target_partitions", lambda _ctx: ("p1", "p2"))
+    monkeypatch.setattr(ssd_clone, "mount_partition", lambda *args, **kwargs: None)
+    monkeypatch.setattr(ssd_clone, "unmount_partition", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        ssd_clone, "scan_root_entry", lambda path: pytest.fail("saved plan should be reused")
+    )
+    commands = []
+
+    def fake_run(_ctx, command):
+        commands.append(command)
+        return subprocess.CompletedProcess(command, 0, "", "")
+
+    monkeypatch.setattr(ssd_clone, "run_command", fake_run)
+
+    ssd_clone.sync_root(ctx)
+
+    assert len(commands) == 2
+    assert all(command[-2:] == ["/", f"{tmp_path / 'root'}/"] for command in commands)
+    assert any("--include" not in command and "/var" in command for command in commands)
+    assert any(["--include", "/home", "--exclude", "/*"] == command[-6:-2] for command in commands)
+    saved = json.loads(ctx.state_file.read_text(encoding="utf-8"))
+    assert saved["sync_root_shards"]["completed"] == [0, 1, 2]
+
+
+def test_bitmap_runs_handles_partial_bytes_and_full_bytes():
+    bitmap = bytes([0b00000110, 0xFF, 0xFF, 0x00, 0b10000001])
+
+    assert ssd_clone.bitmap_runs(bitmap, 40) == [(1, 2), (8, 16), (32, 1), (39, 1)]
+    assert ssd_clone.bitmap_runs(bitmap, 36) == [(1, 2), (8, 16), (32, 1)]
+
+
+@pytest.mark.skipif(
+    not (shutil.which("mke2fs") and shutil.which("e2fsck")), reason="e2fsprogs unavailable"
+)
+@pytest.mark.parametrize("options", [["-t", "ext4"], ["-t", "ext4", "-O", "^flex_bg"]])
+def test_block_engine_copies_only_allocated_blocks(tmp_path, options):
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    payload = os.urandom(1024 * 1024)
+    (source_dir / "payload").write_bytes(payload)
+    image = tmp_path / "source.img"
+    copy = tmp_path / "copy.img"
+    with image.open("wb") as handle:
+        handle.truncate(64 * 1024 * 1024)
+    subprocess.run(["mke2fs", "-q", "-F", *options, "-d", str(source_dir), str(image)], check=True)
+
+    source_fd = os.open(image, os.O_RDONLY)
+    target_fd = os.open(copy, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        layout = ssd_clone.read_ext_layout(source_fd)
+        os.ftruncate(target_fd, layout.size_bytes)
+        extents = ssd_clone.used_block_extents(source_fd, layout)
+        copied = ssd_clone.copy_block_extents(
+            source_fd, target_fd, extents, layout.block_size, chunk_size=65536, depth=2
+        )
+    finally:
+        os.close(source_fd)
+        os.close(target_fd)
+
+    assert layout.size_bytes == 64 * 1024 * 1024
+    assert len(payload) < copied < layout.size_bytes
+    assert copied == sum(count for _first, count in extents) * layout.block_size
+    check = subprocess.run(["e2fsck", "-fn", str(copy)], capture_output=True, text=True)
+    assert check.returncode == 0, check.stdout
+
+
+def test_read_ext_layout_rejects_non_ext_filesystems(tmp_path):
+    image = tmp_path / "blank.img"
+    image.write_bytes(b"\0" * 4096)
+    fd = os.open(image, os.O_RDONLY)
+    try:
+        with pytest.raises(ssd_clone.UnsupportedFilesystem):
+            ssd_clone.read_ext_layout(fd)
+    finally:
+        os.close(fd)
+
+
+def test_sync_root_block_engine_falls_back_to_rsync(monkeypatch, tmp_path, capsys):
+    ctx = make_context(
+        tmp_path, mount_root=tmp_path, engine="block", state={"source_root_fs": "btrfs"}
+    )
+    monkeypatch.setattr(ssd_clone, "resolve_target_partitions", lambda _ctx: ("p1", "p2"))
+    monkeypatch.setattr(ssd_clone, "mount_partition", lambda *args, **kwargs: None)
+    monkeypatch.setattr(ssd_clone, "unmount_partition", lambda *args, **kwargs: None)
+    stats = "Total transferred file size: 2,097,152 bytes\n"
+    monkeypatch.setattr(
+        ssd_clone,
+        "run_command",
+        lambda _ctx, command: subprocess.CompletedProcess(command, 0, stats, ""),
+    )
+
+    ssd_clone.sync_root(ctx)
+    ssd_clone.emit_summary(ctx)
+
+    out = capsys.readouterr().out
+    assert "falling back to rsync" in out
+    assert ctx.state["root_sync"]["engine"] == "rsync"
+    assert ctx.state["root_sync"]["bytes"] == 2097152
+    assert "Root sync engine: rsync" in out
+    assert "Root sync throughput:" in out
+
+
+def test_block_engine_requires_a_read_only_root(monkeypatch, tmp_path, capsys):
+    ctx = make_context(
+        tmp_path, mount_root=tmp_path, engine="block", state={"source_root_fs": "ext4"}
+    )
+    monkeypatch.setattr(ssd_clone, "source_is_read_only", lambda path="/": False)
+    monkeypatch.setattr(
+        ssd_clone.os, "open", lambda *args: pytest.fail("a read-write root must not be block-read")
+    )
+
+    assert ssd_clone.block_copy_root(ctx, "p2") is None
+    assert "needs a read-only root mount; falling back to rsync" in capsys.readouterr().out
+
+
+@pytest.mark.skipif(not shutil.which("mke2fs"), reason="e2fsprogs unavailable")
+def test_block_engine_falls_back_when_the_target_is_smaller(monkeypatch, tmp_path, capsys):
+    image = tmp_path / "source.img"
+    with image.open("wb") as handle:
+        handle.truncate(16 * 1024 * 1024)
+    subprocess.run(["mke2fs", "-q", "-F", "-t", "ext4", str(image)], check=True)
+    ctx = make_context(
+        tmp_path,
+        mount_root=tmp_path,
+        engine="block",
+        source_root=str(image),
+        state={"source_root_fs": "ext4"},
+    )
+    monkeypatch.setattr(ssd_clone, "source_is_read_only", lambda path="/": True)
+    monkeypatch.setattr(ssd_clone, "device_size_bytes", lambda _device: 8 * 1024 * 1024)
+    monkeypatch.setattr(
+        ssd_clone, "run_command", lambda *args, **kwargs: pytest.fail("nothing should run")
+    )
+
+    assert ssd_clone.block_copy_root(ctx, "p2") is None
+    assert "smaller than the source filesystem; falling back to rsync" in (capsys.readouterr().out)
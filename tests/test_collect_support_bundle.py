@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import contextlib
+import io
 import json
 import os
 import subprocess
+import sys
+import tarfile
+import time
 from argparse import Namespace
 from datetime import datetime, timezone
 from pathlib import Path
@@ -379,3 +384,293 @@ def test_main_includes_target_results(
     summary_path = bundle_dirs[0] / "summary.json"
     summary = json.loads(summary_path.read_text())
     assert summary["targets"] == [{"path": "log.txt", "status": "success"}]
+
+
+def test_execute_specs_streams_output_and_runs_concurrently(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    def fake_ssh_command(_args, remote_command: str) -> list[str]:
+        return [sys.executable, "-c", f"import time; time.sleep(0.3); print({remote_command!r})"]
+
+    monkeypatch.setattr(collect_support_bundle, "build_ssh_command", fake_ssh_command)
+    args = Namespace(command_timeout=30, jobs=4)
+    specs = [
+        collect_support_bundle.CommandSpec(Path(f"out/{index}.txt"), f"payload-{index}", "desc")
+        for index in range(5)
+    ]
+
+    started = time.monotonic()
+    results = collect_support_bundle.execute_specs(args, specs, tmp_path)
+    elapsed = time.monotonic() - started
+
+    assert [item["command"]["output_path"] for item in results] == [
+        f"out/{index}.txt" for index in range(5)
+    ]
+    assert all(item["status"] == "success" for item in results)
+    assert all(item["duration_seconds"] >= 0.3 for item in results)
+    assert elapsed < 5 * 0.3  # the first spec runs alone, the other four share the pool
+    content = (tmp_path / "out" / "3.txt").read_text()
+    assert content == "# desc\n# Command: payload-3\n# Exit status: 0\n\npayload-3\n"
+
+
+def test_shared_connection_adds_control_path_for_ssh_and_scp() -> None:
+    args = collect_support_bundle.parse_args(["pi.local"])
+
+    with collect_support_bundle.shared_connection(args):
+        ssh_cmd = collect_support_bundle.build_ssh_command(args, "true")
+        scp_cmd = collect_support_bundle.build_scp_command(args, "/etc/hosts", Path("out"))
+        control_path = args.control_path
+
+    assert f"ControlPath={control_path}" in ssh_cmd
+    assert f"ControlPath={control_path}" in scp_cmd
+    assert "ControlMaster=auto" in ssh_cmd
+    assert args.control_path is None
+    assert not Path(control_path).parent.exists()
+
+    args.no_multiplex = True
+    with collect_support_bundle.shared_connection(args):
+        assert "ControlMaster=auto" not in collect_support_bundle.build_ssh_command(args, "true")
+
+
+def test_shared_connection_exit_reuses_port_user_and_options(monkeypatch: MonkeyPatch) -> None:
+    args = collect_support_bundle.parse_args(
+        ["pi.local", "--user", "admin", "--port", "2222", "--ssh-option", "UserKnownHostsFile=/x"]
+    )
+    commands: list[list[str]] = []
+
+    def fake_run(cmd: list[str], **_kwargs):
+        commands.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(collect_support_bundle.subprocess, "run", fake_run)
+    with collect_support_bundle.shared_connection(args):
+        control_path = args.control_path
+        Path(control_path).parent.joinpath("socket").touch()
+
+    (exit_cmd,) = commands
+    assert exit_cmd[-3:] == ["-O", "exit", "admin@pi.local"]
+    assert exit_cmd[exit_cmd.index("-p") + 1] == "2222"
+    assert "UserKnownHostsFile=/x" in exit_cmd
+    assert f"ControlPath={control_path}" in exit_cmd
+
+
+def test_resolve_nodes_merges_kubectl_discovery_with_explicit_hosts(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    class DummyCompleted:
+        returncode = 0
+        stdout = "sugar-control 10.0.0.10 true\nsugar-worker-a 10.0.0.11 \n"
+        stderr = ""
+
+    commands: list[list[str]] = []
+
+    def fake_run(cmd: list[str], **_kwargs):
+        commands.append(cmd)
+        return DummyCompleted()
+
+    monkeypatch.setattr(collect_support_bundle.subprocess, "run", fake_run)
+    args = collect_support_bundle.parse_args(
+        ["sugar-control.local", "--discover", "kubectl", "--hosts", "10.0.0.11,sugar-worker-b"]
+    )
+
+    nodes = collect_support_bundle.resolve_nodes(args)
+
+    assert [(node.name, node.address, node.server) for node in nodes] == [
+        ("sugar-control", "10.0.0.10", True),
+        ("sugar-worker-a", "10.0.0.11", False),
+        ("sugar-worker-b", "sugar-worker-b", False),
+    ]
+    assert "pi@sugar-control.local" in commands[0]
+    assert "kubectl get nodes" in commands[0][-1]
+
+
+def test_main_cluster_mode_dedupes_cluster_specs_into_one_archive(
+    tmp_path: Path, monkeypatch: MonkeyPatch, capsys: CaptureFixture[str]
+) -> None:
+    def fake_ssh_command(args, remote_command: str) -> list[str]:
+        return [sys.executable, "-c", f"print({args.host!r}, {remote_command!r})"]
+
+    monkeypatch.setattr(collect_support_bundle, "build_ssh_command", fake_ssh_command)
+    monkeypatch.setattr(
+        collect_support_bundle,
+        "default_specs",
+        lambda: [
+            collect_support_bundle.CommandSpec(
+                Path("kubernetes/pods.txt"), "kubectl get pods", "pods", scope="cluster"
+            ),
+            collect_support_bundle.CommandSpec(Path("storage/df.txt"), "df -h", "disk"),
+        ],
+    )
+
+    exit_code = collect_support_bundle.main(
+        ["--hosts", "pi-a,pi-b,pi-c", "--output-dir", str(tmp_path), "--max-parallel", "2"]
+    )
+
+    assert exit_code == 0, capsys.readouterr().err
+    archives = list(tmp_path.glob("*.tar.gz"))
+    assert len(archives) == 1
+    bundle = next(path for path in tmp_path.iterdir() if path.is_dir())
+    assert (bundle / "cluster" / "kubernetes" / "pods.txt").read_text().count("kubectl") == 2
+    for host in ("pi-a", "pi-b", "pi-c"):
+        assert host in (bundle / "nodes" / host / "storage" / "df.txt").read_text()
+        assert not (bundle / "nodes" / host / "kubernetes").exists()
+    summary = json.loads((bundle / "summary.json").read_text())
+    assert summary["cluster_host"] == "pi-a"
+    assert [entry["command"]["scope"] for entry in summary["cluster_results"]] == ["cluster"]
+    assert [node["name"] for node in summary["nodes"]] == ["pi-a", "pi-b", "pi-c"]
+    assert all(node["results"][0]["status"] == "success" for node in summary["nodes"])
+
+
+def test_main_cluster_mode_runs_cluster_specs_on_a_reachable_server(
+    tmp_path: Path, monkeypatch: MonkeyPatch, capsys: CaptureFixture[str]
+) -> None:
+    def fake_ssh_command(args, remote_command: str) -> list[str]:
+        if args.host == "pi-b" and "test -r" in remote_command:
+            return [sys.executable, "-c", "raise SystemExit(255)"]
+        return [sys.executable, "-c", f"print({args.host!r}, {remote_command!r})"]
+
+    monkeypatch.setattr(collect_support_bundle, "build_ssh_command", fake_ssh_command)
+    monkeypatch.setattr(
+        collect_support_bundle,
+        "discover_mdns_nodes",
+        lambda _cluster, _env: [
+            collect_support_bundle.NodeTarget("pi-b", "pi-b", server=True),
+            collect_support_bundle.NodeTarget("pi-c", "pi-c", server=True),
+        ],
+    )
+    monkeypatch.setattr(
+        collect_support_bundle,
+        "default_specs",
+        lambda: [
+            collect_support_bundle.CommandSpec(
+                Path("kubernetes/pods.txt"), "kubectl get pods", "pods", scope="cluster"
+            ),
+        ],
+    )
+
+    exit_code = collect_support_bundle.main(
+        [
+            "--hosts",
+            "pi-a",
+            "--discover",
+            "mdns",
+            "--control-plane",
+            "pi-b.local",
+            "--output-dir",
+            str(tmp_path),
+        ]
+    )
+
+    assert exit_code == 0, capsys.readouterr().err
+    bundle = next(path for path in tmp_path.iterdir() if path.is_dir())
+    summary = json.loads((bundle / "summary.json").read_text())
+    # --control-plane pi-b fails the kubeconfig probe, so the next server takes over.
+    assert summary["cluster_host"] == "pi-c"
+    assert "pi-c" in (bundle / "cluster" / "kubernetes" / "pods.txt").read_text()
+
+
+def test_cluster_host_candidates_prefer_control_plane_then_servers() -> None:
+    args = collect_support_bundle.parse_args(["--hosts", "pi-a", "--control-plane", "10.0.0.12"])
+    nodes = [
+        collect_support_bundle.NodeTarget("pi-a", "10.0.0.10"),
+        collect_support_bundle.NodeTarget("pi-b", "10.0.0.11", server=True),
+        collect_support_bundle.NodeTarget("pi-c", "10.0.0.12"),
+    ]
+
+    candidates = collect_support_bundle.cluster_host_candidates(args, nodes)
+
+    assert [node.name for node in candidates] == ["pi-c", "pi-b", "pi-a"]
+
+
+@pytest.mark.parametrize("compression", ["gzip", "auto"])
+def test_main_stream_archive_caps_runaway_output(
+    tmp_path: Path, monkeypatch: MonkeyPatch, capsys: CaptureFixture[str], compression: str
+) -> None:
+    def fake_ssh_command(_args, remote_command: str) -> list[str]:
+        return [sys.executable, "-c", remote_command]
+
+    monkeypatch.setattr(collect_support_bundle, "build_ssh_command", fake_ssh_command)
+    monkeypatch.setattr(
+        collect_support_bundle,
+        "default_specs",
+        lambda: [
+            collect_support_bundle.CommandSpec(
+                Path("journals/huge.log"), "print('x' * 3_000_000)", "runaway journal"
+            ),
+            collect_support_bundle.CommandSpec(Path("small.txt"), "print('small')", "small"),
+        ],
+    )
+
+    exit_code = collect_support_bundle.main(
+        [
+            "pi.local",
+            "--output-dir",
+            str(tmp_path),
+            "--stream-archive",
+            "--compression",
+            compression,
+            "--max-entry-mb",
+            "1",
+        ]
+    )
+
+    assert exit_code == 0, capsys.readouterr().err
+    assert not [path for path in tmp_path.iterdir() if path.is_dir()]
+    (archive,) = list(tmp_path.glob("pi.local-*.tar.*"))
+    if archive.suffix == ".zst":
+        tar_bytes = subprocess.run(
+            ["zstd", "-dc", str(archive)], check=True, capture_output=True
+        ).stdout
+        tar = tarfile.open(fileobj=io.BytesIO(tar_bytes), mode="r:")
+    else:
+        tar = tarfile.open(archive, mode="r:gz")
+    with tar:
+        root = tar.getnames()[0].split("/")[0]
+        huge = tar.extractfile(f"{root}/journals/huge.log").read().decode()
+        summary = json.loads(tar.extractfile(f"{root}/summary.json").read())
+        small = tar.extractfile(f"{root}/small.txt").read().decode()
+
+    header, body = huge.split("\n\n", 1)
+    assert header.endswith("# Exit status: 0")
+    assert body.startswith("x" * 1024 * 1024 + "\n# [truncated")
+    assert "# [truncated: 1951425 bytes omitted" in huge
+    assert small == "# small\n# Command: print('small')\n# Exit status: 0\n\nsmall\n"
+    assert summary["results"][0]["truncated_bytes"] == 3_000_001 - 1024 * 1024
+
+
+def test_stream_archive_conflicts_with_no_archive(capsys: CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit) as excinfo:
+        collect_support_bundle.parse_args(["pi.local", "--stream-archive", "--no-archive"])
+
+    assert excinfo.value.code == 2
+    assert "not allowed with argument" in capsys.readouterr().err
+
+
+def test_main_closes_stream_archive_when_collection_fails(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    closed: list[Path] = []
+    original_close = collect_support_bundle.StreamingArchive.close
+
+    def tracking_close(self) -> Path:
+        closed.append(self.path)
+        return original_close(self)
+
+    def broken_execute_specs(*_args, **_kwargs):
+        raise RuntimeError("ssh exploded")
+
+    monkeypatch.setattr(collect_support_bundle.StreamingArchive, "close", tracking_close)
+    monkeypatch.setattr(collect_support_bundle, "execute_specs", broken_execute_specs)
+    monkeypatch.setattr(
+        collect_support_bundle, "shared_connection", lambda _args: contextlib.nullcontext()
+    )
+
+    with pytest.raises(RuntimeError, match="ssh exploded"):
+        collect_support_bundle.main(
+            ["pi.local", "--output-dir", str(tmp_path), "--stream-archive", "--compression", "gzip"]
+        )
+
+    (archive,) = list(tmp_path.glob("pi.local-*.tar.gz"))
+    assert closed == [archive]
+    with tarfile.open(archive, mode="r:gz") as tar:
+        assert tar.getnames() == []
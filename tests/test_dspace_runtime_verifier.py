@@ -503,7 +503,8 @@ def test_verify_refreshes_terminating_snapshot_before_direct_and_smoke(
     verifier.verify(args)
 
     assert pod_fetches == 2
-    assert sleeps == [verifier.POD_SETTLE_INTERVAL_SECONDS]
+    assert len(sleeps) == 1
+    assert 0 < sleeps[0] <= verifier.POD_SETTLE_BACKOFF.initial
     assert len(direct_urls) == 4
     assert all(SENTINEL not in url for url in direct_urls)
     assert len(smoke_calls) == 1
@@ -562,11 +563,24 @@ def test_settle_selected_pods_times_out_without_filtering_or_leaking(
 
     assert str(raised.value) == "pod/replica identity"
     assert len(fetches) == 2
-    assert sleeps == [verifier.POD_SETTLE_INTERVAL_SECONDS]
+    assert len(sleeps) == 1
+    assert 0 < sleeps[0] <= verifier.POD_SETTLE_BACKOFF.initial
     captured = capsys.readouterr()
     assert SENTINEL not in str(raised.value) + captured.out + captured.err
 
 
+def test_settle_selected_pods_watch_failure_uses_the_poll_label(monkeypatch) -> None:
+    def refused(*_args, **_kwargs):
+        raise verifier.kube_api_client.KubeApiError("watch refused")
+
+    monkeypatch.setattr(verifier.readiness_wait, "kubectl_watch", lambda _argv: (None, None))
+    monkeypatch.setattr(verifier.readiness_wait, "watch_until", refused)
+    with pytest.raises(verifier.VerificationError) as raised:
+        verifier.settle_selected_pods(["kubectl", "get", "pods"])
+
+    assert str(raised.value) == "pod/replica identity"
+
+
 def test_settle_selected_pods_preserves_runner_verification_error() -> None:
     def runner(_argv: list[str]) -> str:
         raise verifier.VerificationError("cluster identity")
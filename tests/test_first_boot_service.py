@@ -139,9 +139,8 @@ def test_first_boot_service_success(monkeypatch, tmp_path):
                     ),
                     "",
                 )
-            if "--log" in args:
-                Path(args[-1]).write_text("legacy log\n")
-                return MODULE.subprocess.CompletedProcess(args, 0, "", "log stderr")
+        if args[0].endswith("lsblk"):
+            return MODULE.subprocess.CompletedProcess(args, 0, "NAME SIZE\nsda 32G\n", "")
         raise AssertionError(f"Unexpected command: {args}")
 
     monkeypatch.setattr(MODULE.subprocess, "run", fake_run)
@@ -158,7 +157,14 @@ def test_first_boot_service_success(monkeypatch, tmp_path):
     assert ok_marker.read_text().strip() == "ok"
     assert not fail_marker.exists()
     assert expand_marker.exists()
-    assert log_path.exists()
+    log_text = log_path.read_text()
+    assert "| dspace_http | pass |" in log_text
+    assert "    status: done" in log_text
+    assert "    sda 32G" in log_text
+    assert json.loads((report_dir / "verifier.json").read_text())["checks"][-1] == {
+        "name": "dspace_http",
+        "status": "pass",
+    }
     events = [(event, status) for event, status, *_ in DummyNotifier.notifications]
     assert events == [("first-boot", "starting"), ("first-boot", "success")]
 
@@ -209,9 +215,6 @@ def test_first_boot_service_records_pi_home_repo_failure(monkeypatch, tmp_path):
                     json.dumps(payload),
                     "",
                 )
-            if "--log" in args:
-                Path(args[-1]).write_text("failure log\n")
-                return MODULE.subprocess.CompletedProcess(args, 0, "", "")
         raise AssertionError(f"Unexpected command: {args}")
 
     monkeypatch.setattr(MODULE.subprocess, "run", fake_run)
@@ -436,6 +439,50 @@ def test_run_verifier_no_json(monkeypatch, tmp_path):
         MODULE._run_verifier(verifier, 1, 0)
 
 
+def test_run_verifier_retries_only_failed_checks(monkeypatch, tmp_path):
+    verifier = tmp_path / "verifier"
+    commands = []
+
+    def fake_run(args, capture_output, text, check):  # noqa: ARG001
+        commands.append(args[1:])
+        if "--only" not in args:
+            payload = {
+                "warnings": ["k3s not ready"],
+                "checks": [
+                    {"name": "cloud_init", "status": "pass"},
+                    {"name": "k3s_node_ready", "status": "fail"},
+                    {"name": "dspace_http", "status": "fail"},
+                ],
+            }
+            # The real verifier reports failed checks in JSON but still exits 0.
+            return MODULE.subprocess.CompletedProcess(args, 0, json.dumps(payload), "")
+        payload = {
+            "checks": [
+                {"name": "k3s_node_ready", "status": "pass"},
+                {"name": "dspace_http", "status": "pass"},
+            ]
+        }
+        return MODULE.subprocess.CompletedProcess(args, 0, json.dumps(payload), "")
+
+    monkeypatch.setattr(MODULE.subprocess, "run", fake_run)
+    monkeypatch.setattr(MODULE.time, "sleep", lambda _secs: None)
+
+    result = MODULE._run_verifier(verifier, 3, 0)
+
+    assert commands == [
+        ["--json", "--no-log"],
+        ["--json", "--no-log", "--only", "k3s_node_ready,dspace_http"],
+    ]
+    assert result.attempts == 2
+    assert result.data == {
+        "checks": [
+            {"name": "cloud_init", "status": "pass"},
+            {"name": "k3s_node_ready", "status": "pass"},
+            {"name": "dspace_http", "status": "pass"},
+        ]
+    }
+
+
 def test_render_summary_mixed_status(tmp_path):
     result = MODULE.VerifierResult(
         data={
@@ -496,7 +543,7 @@ def test_failure_path_clears_ok_marker(monkeypatch, tmp_path):
     monkeypatch.setattr(MODULE, "_notify_teams", lambda *args, **kwargs: None)
     monkeypatch.setattr(MODULE, "_expand_rootfs", lambda *_args, **_kwargs: None)
     monkeypatch.setattr(MODULE, "_gather_cloud_init", lambda _timeout: (None, None))
-    monkeypatch.setattr(MODULE, "_invoke_verifier_log", lambda *args, **kwargs: 0)
+    monkeypatch.setattr(MODULE, "_append_verifier_log", lambda *args, **kwargs: None)
     monkeypatch.setattr(MODULE, "_write_verifier_stderr", lambda *args, **kwargs: None)
     monkeypatch.setattr(MODULE, "_write_json", lambda *args, **kwargs: None)
     monkeypatch.setattr(MODULE, "_write_markdown", lambda *args, **kwargs: None)
@@ -568,9 +615,8 @@ def test_success_path_removes_fail_marker(monkeypatch, tmp_path):
                     ),
                     "",
                 )
-            if "--log" in args:
-                Path(args[-1]).write_text("log\n")
-                return MODULE.subprocess.CompletedProcess(args, 0, "", "")
+        if args[0].endswith("lsblk"):
+            return MODULE.subprocess.CompletedProcess(args, 0, "", "")
         raise AssertionError(f"Unexpected command: {args}")
 
     monkeypatch.setattr(MODULE.subprocess, "run", fake_run)
@@ -1927,6 +1927,8 @@ def test_app_chart_cmd_preflight_reports_ruby_psych_launch_failure(
         raise FileNotFoundError("ruby executable missing")
 
     monkeypatch.setattr(subprocess, "run", missing_ruby)
+    monkeypatch.setattr(subprocess, "Popen", missing_ruby)
+    monkeypatch.setattr(app_chart.safe_yaml, "_PARSER", app_chart.safe_yaml.SafeYamlParser())
 
     assert app_chart.cmd_preflight(_preflight_args()) == 1
     error = capsys.readouterr().err
@@ -2151,6 +2153,99 @@ spec:
     ) == []
 
 
+def test_rendered_manifest_indexes_objects_by_kind() -> None:
+    manifest = """apiVersion: v1
+kind: Service
+metadata:
+  name: tokenplace
+  namespace: tokenplace
+  labels:
+    app.kubernetes.io/instance: tokenplace
+    app.kubernetes.io/name: tokenplace
+---
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: tokenplace
+  labels:
+    app.kubernetes.io/instance: tokenplace
+spec:
+  template:
+    spec:
+      containers:
+        - name: relay
+          env:
+            - name: TOKENPLACE_IMAGE_TAG
+            - value: unnamed
+        - name: sidecar
+---
+- not an object
+"""
+
+    rendered = app_chart.RenderedManifest.parse(manifest)
+
+    assert len(rendered.documents) == 3 and len(rendered.objects) == 2
+    service, deployment = rendered.objects
+    assert rendered.kind("Service") == [service]
+    assert rendered.kind("Deployment", "Service") == [service, deployment]
+    assert rendered.release_objects("tokenplace", "Deployment") == [deployment]
+    assert rendered.release_objects("other", "Deployment") == []
+    (relay,) = app_chart.RenderedManifest.containers(deployment, {"relay"})
+    assert app_chart.RenderedManifest.env_names(relay) == {"TOKENPLACE_IMAGE_TAG"}
+
+
+def test_app_chart_cmd_preflight_parses_rendered_manifest_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    manifest = """apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: tokenplace
+  labels:
+    app.kubernetes.io/instance: tokenplace
+spec:
+  template:
+    spec:
+      containers:
+        - name: relay
+          image: ghcr.io/example/tokenplace:main-deadbee
+          env:
+            - name: TOKENPLACE_IMAGE_TAG
+            - name: TOKENPLACE_RELEASE_VERSION
+            - name: TOKENPLACE_CHART_VERSION
+            - name: TOKENPLACE_DEPLOY_ENV
+---
+apiVersion: networking.k8s.io/v1
+kind: Ingress
+metadata:
+  name: tokenplace
+  labels:
+    app.kubernetes.io/instance: tokenplace
+spec:
+  rules:
+    - host: staging.example.test
+"""
+    monkeypatch.setattr(
+        app_chart,
+        "helm_show",
+        lambda chart, version: subprocess.CompletedProcess([], 0, "apiVersion: v2\n", ""),
+    )
+    monkeypatch.setattr(
+        app_chart, "run", lambda cmd: subprocess.CompletedProcess(cmd, 0, manifest, "")
+    )
+    parsed: list[str] = []
+    original = app_chart.safe_yaml_documents
+
+    def counting(text: str) -> list[object]:
+        parsed.append(text)
+        return original(text)
+
+    monkeypatch.setattr(app_chart, "safe_yaml_documents", counting)
+
+    assert app_chart.cmd_preflight(_preflight_args()) == 0
+    assert parsed.count(manifest) == 1
+
+
 def test_app_chart_cmd_preflight_rejects_metadata_from_unrelated_deployment(
     monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
 ) -> None:
@@ -7570,11 +7665,9 @@ def test_observability_app_metrics_load_rendered_docs_malformed_is_redacted(
 ):
     candidate = tmp_path / "candidate.yaml"
     candidate.write_text("credential-looking-render", encoding="utf-8")
-    monkeypatch.setattr(
-        app_metrics.subprocess,
-        "run",
-        lambda *args, **kwargs: argparse.Namespace(stdout="not-json"),
-    )
+    parser = app_metrics.safe_yaml.SafeYamlParser()
+    monkeypatch.setattr(parser, "_exchange", lambda payload: b"not-json\n")
+    monkeypatch.setattr(app_metrics.safe_yaml, "_PARSER", parser)
     with pytest.raises(app_metrics.Error) as excinfo:
         app_metrics.load_rendered_docs(str(candidate))
     assert "rendered manifests are malformed" in str(excinfo.value)
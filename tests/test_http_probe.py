@@ -0,0 +1,155 @@
+"""Unit tests for scripts.http_probe."""
+
+from __future__ import annotations
+
+import http.server
+import threading
+import time
+
+import pytest
+
+from scripts import app_verify, http_probe
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status: int, body: bytes = b"", headers: dict[str, str] | None = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        server = self.server
+        server.peers.append((self.path, self.client_address[1]))
+        if self.path.startswith("/slow"):
+            time.sleep(0.3)
+        if self.path == "/hang":
+            time.sleep(2)
+        if self.path == "/redirect":
+            return self._reply(302, headers={"Location": "/livez"})
+        if self.path == "/elsewhere":
+            return self._reply(302, headers={"Location": "http://localhost:1/livez"})
+        if self.path == "/missing":
+            return self._reply(404, b"nope")
+        self._reply(200, self.path.encode(), {"X-Probe": "yes"})
+
+    do_OPTIONS = do_GET
+
+    def log_message(self, *_args: object) -> None:
+        return
+
+
+@pytest.fixture
+def site():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.peers = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _engine(**kwargs) -> http_probe.ProbeEngine:
+    return http_probe.ProbeEngine(allowed_schemes=("http",), **kwargs)
+
+
+def test_probe_all_runs_urls_concurrently_and_reuses_connections(site) -> None:
+    server, base = site
+    urls = [f"{base}/slow/{index}" for index in range(4)]
+
+    started = time.perf_counter()
+    with _engine() as engine:
+        results = engine.probe_all(urls, samples=3)
+    elapsed = time.perf_counter() - started
+
+    # 4 URLs x 3 samples x 0.3 s would take 3.6 s sequentially.
+    assert elapsed < 2.5
+    assert list(results) == urls
+    for url, samples in results.items():
+        assert [sample.status for sample in samples] == [200, 200, 200]
+        assert samples[0].body == url[len(base) :].encode()
+        assert samples[0].headers["x-probe"] == ["yes"]
+        assert samples[0].connect_seconds > 0
+        assert [sample.connect_seconds for sample in samples[1:]] == [0.0, 0.0]
+        assert all(
+            0 < s.start_transfer_seconds <= s.total_seconds and s.total_seconds >= 0.3
+            for s in samples
+        )
+    # Each URL's samples ran back to back on the connection its first sample opened.
+    assert len({port for _path, port in server.peers}) == len(urls)
+
+
+def test_redirects_timeouts_and_scheme_policy(site) -> None:
+    _server, base = site
+    with _engine(max_time=0.5) as engine:
+        redirected = engine.request(f"{base}/redirect")
+        assert (redirected.status, redirected.body, redirected.error) == (200, b"/livez", "none")
+        assert engine.request(f"{base}/missing").status == 404
+
+        escaped = engine.request(f"{base}/elsewhere", same_origin=True)
+        assert (escaped.status, escaped.error) == (302, "redirect")
+
+        hung = engine.request(f"{base}/hang")
+        assert hung.error == "timeout" and hung.total_seconds < 1.5
+
+    with http_probe.ProbeEngine() as https_only:
+        assert https_only.request(f"{base}/livez").error == "transport"
+    with _engine(follow_redirects=False) as engine:
+        assert engine.request(f"{base}/redirect").status == 302
+
+
+def test_summarize_reports_medians_percentiles_and_first_failure() -> None:
+    samples = [
+        http_probe.Sample(url="u", status=200, total_seconds=value, connect_seconds=0.01)
+        for value in (0.1, 0.5, 0.2, 0.4, 0.3)
+    ]
+    summary = http_probe.summarize(samples)
+    assert summary["status"] == 200 and summary["error"] == "none"
+    assert summary["samples"] == 5
+    assert summary["totalSeconds"] == 0.3
+    assert summary["totalP95Seconds"] == summary["totalMaxSeconds"] == 0.5
+
+    samples.append(http_probe.Sample(url="u", status=0, error="timeout", total_seconds=8.0))
+    failed = http_probe.summarize(samples)
+    assert (failed["status"], failed["error"], failed["samples"]) == (0, "timeout", 6)
+    assert failed["totalMaxSeconds"] == 0.5
+    assert http_probe.percentile([], 50) == 0.0
+
+
+def test_configured_samples_rejects_non_positive_values(monkeypatch) -> None:
+    assert http_probe.configured_samples() == 1
+    monkeypatch.setenv(http_probe.SAMPLES_ENV, "5")
+    assert http_probe.configured_samples() == 5
+    for value in ("0", "many"):
+        monkeypatch.setenv(http_probe.SAMPLES_ENV, value)
+        with pytest.raises(ValueError):
+            http_probe.configured_samples()
+
+
+def test_app_verify_uses_engine_when_enabled(site, monkeypatch, capsys) -> None:
+    _server, base = site
+    monkeypatch.setenv("SUGARKUBE_APP", "demo")
+    monkeypatch.setenv("SUGARKUBE_ENV", "staging")
+    monkeypatch.setenv("SUGARKUBE_VERIFY_PATHS", "/,/missing")
+    monkeypatch.setenv(http_probe.ENGINE_ENV, "http")
+    monkeypatch.setenv(http_probe.SAMPLES_ENV, "3")
+    monkeypatch.setattr(app_verify, "discover_host", lambda kube_context: ("example.test", []))
+    monkeypatch.setattr(app_verify, "base_url_from_host", lambda host: base)
+    monkeypatch.setattr(app_verify, "run_curl", lambda url: pytest.fail("curl should not run"))
+
+    assert app_verify.main([]) == 1
+
+    out = capsys.readouterr().out
+    assert "Status: OK (HTTP 200)" in out
+    assert "Status: FAILED (HTTP 404)" in out
+    assert "curl exit status: 22" in out
+    assert out.count("over 3 sample(s)") == 2
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+import subprocess
+from urllib.parse import quote
+
+import pytest
+
+from scripts import cluster_identity
+from scripts import dspace_manifest_rollback as rollback
+from scripts import dspace_runtime_verifier as verifier
+from scripts import kube_api_client
+from scripts import observability_app_metrics as app_metrics
+from scripts import prod_resilience_audit as audit
+
+NODES = {
+    "kind": "NodeList",
+    "apiVersion": "v1",
+    "items": [
+        {
+            "metadata": {
+                "name": name,
+                "labels": {"sugarkube.env": "prod", "sugarkube.cluster": "sugar"},
+            }
+        }
+        for name in ("sugarkube0", "sugarkube1", "sugarkube2")
+    ],
+}
+
+
+def _list(kind: str, api_version: str, *names: str) -> dict:
+    return {
+        "kind": f"{kind}List",
+        "apiVersion": api_version,
+        "items": [{"metadata": {"name": name}} for name in names],
+    }
+
+
+@pytest.fixture
+def no_kubectl(monkeypatch):
+    def forbidden(argv, *_args, **_kwargs):
+        raise AssertionError(f"kubectl should not run: {argv}")
+
+    monkeypatch.setattr(subprocess, "run", forbidden)
+
+
+@pytest.mark.parametrize(
+    "args, path",
+    [
+        (["get", "nodes", "-o", "json"], "/api/v1/nodes"),
+        (
+            ["-n", "kube-system", "get", "deployment", "traefik", "-o", "json"],
+            "/apis/apps/v1/namespaces/kube-system/deployments/traefik",
+        ),
+        (
+            ["get", "pods", "--namespace=dspace", "-l", "app=a,tier=web", "-o", "json"],
+            "/api/v1/namespaces/dspace/pods?labelSelector=app%3Da%2Ctier%3Dweb",
+        ),
+        (
+            ["get", "deployment", "-A", "-l", "app=x", "-o", "json"],
+            "/apis/apps/v1/deployments?labelSelector=app%3Dx",
+        ),
+        (
+            ["-n", "kube-system", "get", "endpointslices.discovery.k8s.io", "-o", "json"],
+            "/apis/discovery.k8s.io/v1/namespaces/kube-system/endpointslices",
+        ),
+    ],
+)
+def test_translate_maps_kubectl_gets_to_api_paths(args, path) -> None:
+    read = kube_api_client.translate(args)
+    assert read.path(read.resources[0]) == path
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["apply", "-f", "-"],
+        ["get", "secret", "token", "-o", "json"],
+        ["get", "nodes", "-o", "jsonpath={.items}"],
+        ["get", "nodes"],
+        ["get", "pods", "--watch", "-o", "json"],
+        ["get", "pdb,service", "name", "-o", "json"],
+        ["get", "deployments.example.com", "-o", "json"],
+        ["get", "--raw", "relative"],
+    ],
+)
+def test_translate_leaves_everything_else_to_kubectl(args) -> None:
+    with pytest.raises(kube_api_client.Unsupported):
+        kube_api_client.translate(args)
+
+
+def test_reads_share_one_keep_alive_connection(fake_kube_api, no_kubectl) -> None:
+    prom_path = audit.prom_query_path(audit.FIRING_ALERTS_QUERY)
+    fake_kube_api.routes.update(
+        {
+            "/api/v1/nodes": (200, NODES),
+            "/apis/policy/v1/namespaces/cloudflare/poddisruptionbudgets": (
+                200,
+                _list("PodDisruptionBudget", "policy/v1", "tunnel"),
+            ),
+            "/api/v1/namespaces/cloudflare/services": (200, _list("Service", "v1", "tunnel")),
+            "/apis/monitoring.coreos.com/v1/namespaces/cloudflare/servicemonitors": (
+                200,
+                _list("ServiceMonitor", "monitoring.coreos.com/v1"),
+            ),
+            prom_path: (200, {"status": "success", "data": {"result": []}}),
+        }
+    )
+
+    assert audit.run(["kubectl", "config", "current-context"]).stdout == "sugar-prod\n"
+    nodes = audit.kubectl("get", "nodes", "-o", "json")["items"]
+    assert [item["metadata"]["name"] for item in nodes] == sorted(audit.EXPECTED_NODES)
+    kinds = ",".join(audit.COALESCED_KINDS)
+    coalesced = audit.kubectl("-n", "cloudflare", "get", kinds, "-o", "json")
+    assert [(item["kind"], item["apiVersion"]) for item in coalesced["items"]] == [
+        ("PodDisruptionBudget", "policy/v1"),
+        ("Service", "v1"),
+    ]
+    assert audit.kubectl("get", "--raw", prom_path)["status"] == "success"
+
+    assert [request["path"] for request in fake_kube_api.requests] == [
+        "/api/v1/nodes",
+        "/apis/policy/v1/namespaces/cloudflare/poddisruptionbudgets",
+        "/api/v1/namespaces/cloudflare/services",
+        "/apis/monitoring.coreos.com/v1/namespaces/cloudflare/servicemonitors",
+        prom_path,
+    ]
+    assert {request["authorization"] for request in fake_kube_api.requests} == {"Bearer fake-token"}
+    assert len(fake_kube_api.connections) == 1
+
+
+def test_missing_objects_surface_like_kubectl_not_found(fake_kube_api, no_kubectl) -> None:
+    args = ("-n", "kube-system", "get", "deployment", "coredns-ha", "-o", "json")
+    assert audit.kubectl(*args, allow_missing=True) == {}
+    proc = kube_api_client.run(["kubectl", "get", "--raw", "/readyz?verbose"])
+    assert proc is not None and proc.returncode == 1
+    assert proc.stderr.startswith("Error from server (NotFound)")
+
+
+def test_tools_swap_in_the_client_behind_the_flag(fake_kube_api, no_kubectl, tmp_path) -> None:
+    kubeconfig = str(fake_kube_api.write_kubeconfig(tmp_path / "other.json"))
+    pod_path = "/api/v1/namespaces/dspace/pods/dspace-0:3000/proxy/healthz"
+    query = quote("up", safe="")
+    fake_kube_api.routes.update(
+        {
+            "/api/v1/nodes": (200, NODES),
+            pod_path: (200, b"ok"),
+            f"{app_metrics.PROM}/api/v1/query?query={query}": (
+                200,
+                {"status": "success", "data": {"resultType": "vector", "result": []}},
+            ),
+        }
+    )
+
+    assert cluster_identity.load_identity(kubeconfig, "prod") == (0, "prod")
+    assert rollback.cluster_environment(rollback.run, kubeconfig) == "prod"
+    proxy = ["kubectl", "--kubeconfig", kubeconfig, "get", "--raw", pod_path]
+    assert verifier.command(proxy) == "ok"
+    assert app_metrics.prom(f"/api/v1/query?query={query}")["result"] == []
+    # Two kubeconfig paths, two pools; each pool kept its connection alive.
+    assert len(fake_kube_api.connections) == 2
+
+
+def test_client_falls_back_when_disabled_or_unsupported(
+    fake_kube_api, monkeypatch, tmp_path
+) -> None:
+    exec_config = tmp_path / "exec.json"
+    doc = json.loads(fake_kube_api.write_kubeconfig(tmp_path / "base.json").read_text())
+    doc["users"][0]["user"] = {"exec": {"command": "aws"}}
+    exec_config.write_text(json.dumps(doc))
+
+    nodes = ["get", "nodes", "-o", "json"]
+    assert kube_api_client.run(["kubectl", "--kubeconfig", str(exec_config), *nodes]) is None
+    assert kube_api_client.run(["kubectl", "apply", "-f", "-"]) is None
+    assert kube_api_client.run(["helm", "list", "-A", "-o", "json"]) is None
+    monkeypatch.setenv(kube_api_client.ENABLE_ENV, "0")
+    assert kube_api_client.run(["kubectl", *nodes]) is None
+    assert fake_kube_api.requests == []
+
+
+def test_stale_keep_alive_connection_is_retried(fake_kube_api, no_kubectl) -> None:
+    fake_kube_api.routes["/api/v1/nodes"] = (200, NODES)
+    client = kube_api_client.client_for()
+    assert client is not None
+    client.get_json("/api/v1/nodes")
+    for conn in client._idle:
+        # Simulate the API server closing an idle connection between reads.
+        conn.sock.shutdown(2)
+    assert client.get_json("/api/v1/nodes")["kind"] == "NodeList"
+    assert len(fake_kube_api.connections) == 2
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from scripts import pi_node_verifier as verifier
+from scripts import publish_telemetry
+
+CONFIG = verifier.VerifierConfig()
+
+
+def sleeper(seconds: float, status: str = "pass"):
+    def check(ctx: verifier.CheckContext) -> str:
+        time.sleep(seconds)
+        return status
+
+    return check
+
+
+def test_independent_checks_overlap_and_keep_declared_order() -> None:
+    checks = [
+        verifier.Check("slow_a", sleeper(0.3)),
+        verifier.Check("slow_b", sleeper(0.3, "fail")),
+        verifier.Check("cheap", lambda ctx: "skip"),
+    ]
+    started = time.monotonic()
+    report = verifier.run_checks(checks, CONFIG, max_workers=3)
+
+    assert time.monotonic() - started < 0.55
+    assert [(r.name, r.status) for r in report.results] == [
+        ("slow_a", "pass"),
+        ("slow_b", "fail"),
+        ("cheap", "skip"),
+    ]
+    assert report.results[0].duration_ms >= 250
+    assert report.results[2].duration_ms < 100
+
+
+def test_dependencies_run_first_and_only_drops_unselected_ones() -> None:
+    finished: list[str] = []
+
+    def record(name: str, delay: float = 0.0):
+        def check(ctx: verifier.CheckContext) -> str:
+            time.sleep(delay)
+            finished.append(name)
+            return "pass"
+
+        return check
+
+    checks = [
+        verifier.Check("base", record("base", 0.1)),
+        verifier.Check("needs_base", record("needs_base"), after=("base",)),
+        verifier.Check("free", record("free")),
+    ]
+    verifier.run_checks(checks, CONFIG, max_workers=4)
+    assert finished.index("base") < finished.index("needs_base")
+    assert finished.index("free") < finished.index("base")
+
+    finished.clear()
+    report = verifier.run_checks(checks, CONFIG, only=["needs_base"])
+    assert finished == ["needs_base"]
+    assert [result.name for result in report.results] == ["needs_base"]
+
+    cycle = [
+        verifier.Check("a", record("a"), after=("b",)),
+        verifier.Check("b", record("b"), after=("a",)),
+    ]
+    with pytest.raises(ValueError, match="cycle"):
+        verifier.run_checks(cycle, CONFIG)
+
+
+def test_timeouts_and_errors_fail_the_check_with_a_warning() -> None:
+    def boom(ctx: verifier.CheckContext) -> str:
+        raise RuntimeError("kaput")
+
+    checks = [
+        verifier.Check("stuck", lambda ctx: ctx.run("sleep", "5") and "pass", timeout=0.2),
+        verifier.Check("boom", boom),
+    ]
+    started = time.monotonic()
+    report = verifier.run_checks(checks, CONFIG)
+
+    assert time.monotonic() - started < 2
+    assert [(r.name, r.status) for r in report.results] == [("stuck", "fail"), ("boom", "fail")]
+    assert report.warnings == ["stuck timed out after 0.2s", "boom raised RuntimeError: kaput"]
+
+
+def test_json_output_stays_compatible_with_telemetry(monkeypatch, capsys, tmp_path: Path) -> None:
+    home = tmp_path / "pi"
+    for repo in ("sugarkube", "token.place"):
+        (home / repo / ".git").mkdir(parents=True)
+    monkeypatch.setenv("PI_HOME_DIR", str(home))
+    monkeypatch.setenv("DSPACE_HEALTH_URL", "skip")
+
+    assert verifier.main(["--json", "--no-log", "--only", "pi_home_repos,dspace_http"]) == 0
+    raw = capsys.readouterr().out
+    payload = json.loads(raw)
+    assert payload["warnings"] == [f"missing repositories under {home}: dspace"]
+    assert [check["name"] for check in payload["checks"]] == ["pi_home_repos", "dspace_http"]
+    assert all(isinstance(check["duration_ms"], int) for check in payload["checks"])
+    assert publish_telemetry.parse_verifier_output(raw) == [
+        {"name": "pi_home_repos", "status": "fail"},
+        {"name": "dspace_http", "status": "skip"},
+    ]
+
+
+def test_kube_proxy_mode_and_compose_checks(monkeypatch, tmp_path: Path) -> None:
+    config_dir = tmp_path / "config.yaml.d"
+    config_dir.mkdir()
+    assert verifier.detect_kube_proxy_mode(config_dir) == "unknown"
+    (config_dir / "10-kube-proxy.yaml").write_text("kube-proxy-arg:\n  - proxy-mode=nft\n")
+    assert verifier.detect_kube_proxy_mode(config_dir) == "nftables"
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    systemctl = bin_dir / "systemctl"
+    systemctl.write_text("#!/bin/sh\necho inactive\nexit 3\n")
+    systemctl.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+    ctx = verifier.CheckContext(CONFIG, 5)
+    assert verifier.check_projects_compose(ctx) == "fail"
+    skip_ctx = verifier.CheckContext(verifier.VerifierConfig(skip_compose=True), 5)
+    assert verifier.check_projects_compose(skip_ctx) == "skip"
+
+    nft_ctx = verifier.CheckContext(verifier.VerifierConfig(kube_proxy_config_dir=config_dir), 5)
+    assert verifier.check_kube_proxy_dataplane(nft_ctx) == "fail"
+    assert nft_ctx.warnings == ["nftables mode configured but nft binary not found"]
@@ -316,6 +316,58 @@ def test_successful_status_with_transport_error_is_unhealthy() -> None:
     assert not audit.probes_unhealthy([{"status": 204, "error": "none"}])
 
 
+def test_engine_probe_rows_summarize_samples_like_curl(monkeypatch) -> None:
+    sample = audit.http_probe.Sample
+    fake_results = {
+        "https://a.example/": [
+            sample(url="", status=204, connect_seconds=0.01, total_seconds=value)
+            for value in (0.3, 0.1, 0.2)
+        ],
+        "https://b.example/": [
+            sample(url="", status=200, total_seconds=0.1),
+            sample(url="", status=0, error="timeout", total_seconds=8.0),
+            sample(url="", status=200, total_seconds=0.1),
+        ],
+    }
+    seen = {}
+
+    class FakeEngine:
+        def __init__(self, **kwargs):
+            seen.update(kwargs)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_exc):
+            return None
+
+        def probe_all(self, urls, *, samples):
+            seen["samples"] = samples
+            return {url: fake_results[url] for url in urls}
+
+    monkeypatch.setattr(audit.http_probe, "ProbeEngine", FakeEngine)
+    monkeypatch.setenv(audit.http_probe.SAMPLES_ENV, "3")
+    rows = audit.engine_probe_rows(sorted(fake_results))
+
+    assert seen == {"connect_timeout": 3, "max_time": 8, "max_workers": 8, "samples": 3}
+    assert rows[0] == {
+        "url": "https://a.example/",
+        "status": 204,
+        "error": "none",
+        "samples": 3,
+        "connectSeconds": "0.010000",
+        "startTransferSeconds": "0.000000",
+        "totalSeconds": "0.200000",
+        "totalP95Seconds": "0.300000",
+    }
+    assert (rows[1]["status"], rows[1]["error"]) == (0, "timeout")
+    assert audit.probes_unhealthy(rows)
+
+    monkeypatch.setenv(audit.http_probe.SAMPLES_ENV, "0")
+    with pytest.raises(audit.HardFailure, match="positive integer"):
+        audit.engine_probe_rows(sorted(fake_results))
+
+
 @pytest.mark.parametrize(
     "targets",
     [{}, {"example.com": []}, [], {"example.com": "path"}, {1: ["/"]}, {"x": [1]}],
@@ -559,6 +611,17 @@ if args[:1] in (["-n"], ["--namespace"]):
     ns, args = args[1], args[2:]
 kind = args[1] if args[:1] == ["get"] and len(args) > 1 else ""
 name = args[2] if len(args) > 2 and not args[2].startswith("-") else ""
+if "," in kind:
+    import subprocess
+    kinds = {"pdb": "PodDisruptionBudget", "service": "Service",
+             "servicemonitor": "ServiceMonitor"}
+    merged = []
+    for part in kind.split(","):
+        out = subprocess.run([sys.argv[0], "-n", ns, "get", part, *args[2:]],
+                             capture_output=True, text=True, check=True,
+                             env=dict(os.environ, AUDIT_COMMAND_LOG=os.devnull)).stdout
+        merged.extend(dict(item, kind=kinds[part]) for item in json.loads(out)["items"])
+    emit({"kind": "List", "items": merged}); raise SystemExit()
 pod_labels = {"app": "cloudflare"}
 anti = {"podAntiAffinity": {"requiredDuringSchedulingIgnoredDuringExecution": [
     {"topologyKey": "kubernetes.io/hostname", "labelSelector": {"matchLabels": pod_labels}}
@@ -843,6 +906,57 @@ def test_cli_compliant_gap_determinism_sanitization_and_read_only_log(audit_harn
     assert not any(command[0] == "helm" and "status" in command for command in commands)
 
 
+def test_cli_reads_are_memoized_and_coalesced(audit_harness) -> None:
+    execute, log = audit_harness
+    result, evidence = execute("snapshot")
+    assert result.returncode == 0
+    assert json.loads((evidence / "audit.json").read_text())["result"] == "PARITY_OK"
+
+    commands = [tuple(json.loads(line)) for line in log.read_text().splitlines()]
+    assert len(commands) == len(set(commands))
+    assert ("kubectl", "-n", "cloudflare", "get", "pdb,service,servicemonitor", "-o", "json") in (
+        commands
+    )
+    for kind in ("service", "servicemonitor"):
+        assert ("kubectl", "-n", "cloudflare", "get", kind, "-o", "json") not in commands
+
+
+def test_read_snapshot_runs_concurrently_and_memoizes(monkeypatch) -> None:
+    import threading
+    import time
+
+    calls = []
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_run(argv, **kwargs):
+        with lock:
+            calls.append(tuple(argv))
+            active.append(argv)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(argv)
+        return subprocess.CompletedProcess(argv, 0, stdout='{"items": []}')
+
+    monkeypatch.setattr(audit.subprocess, "run", fake_run)
+    nodes = ["kubectl", "get", "nodes", "-o", "json"]
+    with audit.read_snapshot() as snapshot:
+        audit.prefetch(nodes)
+        audit.prefetch_kubectl("-n", "kube-system", "get", "pdb", "-o", "json")
+        assert audit.list_items("get", "nodes", "-o", "json") == []
+        assert audit.kubectl("get", "nodes", "-o", "json") == {"items": []}
+        assert audit.list_items("-n", "kube-system", "get", "pdb", "-o", "json") == []
+        with pytest.raises(audit.HardFailure, match="safety policy"):
+            snapshot.submit(["kubectl", "delete", "node", "x"])
+    assert audit._SNAPSHOT is None
+    assert sorted(calls) == sorted(
+        [tuple(nodes), ("kubectl", "-n", "kube-system", "get", "pdb", "-o", "json")]
+    )
+    assert max(peak) == 2
+
+
 def test_cli_completed_gap_exit_contract(audit_harness) -> None:
     execute, _ = audit_harness
     default, evidence = execute("gap-default", gap=True)
@@ -966,6 +1080,8 @@ def test_cli_endpoint_timeout_isolation_is_concurrent_and_sanitized(audit_harnes
 
     assert result.returncode == 0
     rows = (evidence / "endpoints.tsv").read_text().splitlines()
+    # The curl path keeps the original layout; engine-only columns are not emitted.
+    assert rows[0] == "url\tstatus\tconnect_seconds\tstart_transfer_seconds\ttotal_seconds\terror"
     assert any(
         row.startswith("https://danielsmith.io/\t0\t") and row.endswith("\ttimeout") for row in rows
     )
@@ -797,3 +797,31 @@ def test_write_markdown_snapshot_defaults_without_instance(tmp_path):
     payload = {"instance": None}
     path = MODULE.write_markdown_snapshot(payload, tmp_path)
     assert path.name == "telemetry-snapshot.md"
+
+
+def test_main_reuses_fresh_verifier_result(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv("SUGARKUBE_TELEMETRY_ENABLE", "true")
+    result_path = tmp_path / "verifier.json"
+    result_path.write_text(json.dumps({"checks": [{"name": "ready", "status": "pass"}]}))
+
+    def fail(*args, **kwargs):  # noqa: ANN001, ANN002
+        raise AssertionError("verifier should not run")
+
+    monkeypatch.setattr(MODULE, "discover_verifier_path", fail)
+    monkeypatch.setattr(MODULE, "hashed_identifier", lambda **_: "id")
+    monkeypatch.setattr(MODULE, "collect_environment", lambda: {"kernel": "Linux"})
+    argv = ["--dry-run", "--verifier-result", str(result_path)]
+    assert MODULE.main(argv) == 0
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["verifier"]["checks"] == [{"name": "ready", "status": "pass"}]
+
+    os.utime(result_path, (0, 0))
+    monkeypatch.setattr(MODULE, "discover_verifier_path", lambda value: "verifier")
+    monkeypatch.setattr(
+        MODULE,
+        "run_verifier",
+        lambda path, timeout: ([{"name": "ready", "status": "fail"}], []),
+    )
+    assert MODULE.main(argv) == 0
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["verifier"]["checks"] == [{"name": "ready", "status": "fail"}]
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import subprocess
+
+import pytest
+
+from scripts import dspace_runtime_verifier as verifier
+from scripts import kube_api_client, readiness_wait
+
+PODS_PATH = "/api/v1/namespaces/dspace/pods?labelSelector=app%3Ddspace"
+POD_ARGV = ["kubectl", "-n", "dspace", "get", "pods", "-l", "app=dspace", "-o", "json"]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def pod(name: str, *, terminating: bool = False, version: str = "1") -> dict:
+    metadata = {"name": name, "namespace": "dspace", "resourceVersion": version}
+    if terminating:
+        metadata["deletionTimestamp"] = "2026-10-01T00:00:00Z"
+    return {"metadata": metadata}
+
+
+def pod_list(*pods: dict, version: str = "10") -> dict:
+    return {"kind": "PodList", "metadata": {"resourceVersion": version}, "items": list(pods)}
+
+
+@pytest.fixture
+def no_kubectl(monkeypatch):
+    def forbidden(argv, *_args, **_kwargs):
+        raise AssertionError(f"kubectl should not run: {argv}")
+
+    monkeypatch.setattr(subprocess, "run", forbidden)
+
+
+def test_poll_until_backs_off_to_the_cap_and_never_sleeps_past_the_deadline() -> None:
+    clock = FakeClock()
+    result = readiness_wait.poll_until(
+        lambda: clock.now,
+        lambda _value: False,
+        timeout=5.0,
+        backoff=readiness_wait.Backoff(initial=0.25, maximum=2.0),
+        clock=clock,
+        sleeper=clock.sleep,
+        rng=lambda: 0.0,
+    )
+
+    assert result.ok is False
+    assert clock.sleeps == [0.25, 0.5, 1.0, 2.0, 1.25]
+    assert result.attempts == 6
+    assert clock.now == pytest.approx(5.0)
+
+    calls = iter([False, False, True])
+    result = readiness_wait.poll_until(
+        lambda: next(calls), bool, timeout=None, sleeper=lambda _seconds: None
+    )
+    assert (result.ok, result.attempts) == (True, 3)
+
+
+def test_backoff_jitter_only_shortens_delays() -> None:
+    delays = readiness_wait.Backoff(initial=1.0, maximum=4.0, jitter=0.5).delays(lambda: 1.0)
+    assert [next(delays) for _ in range(4)] == [0.5, 1.0, 2.0, 2.0]
+
+
+def test_watch_until_returns_on_the_deletion_event(fake_kube_api, no_kubectl) -> None:
+    fake_kube_api.routes[PODS_PATH] = (
+        200,
+        pod_list(pod("web-a"), pod("web-old", terminating=True)),
+    )
+    fake_kube_api.watches["/api/v1/namespaces/dspace/pods"] = (
+        200,
+        [
+            {"type": "MODIFIED", "object": pod("web-a", version="11")},
+            {"type": "BOOKMARK", "object": {"metadata": {"resourceVersion": "12"}}},
+            {"type": "DELETED", "object": pod("web-old", terminating=True, version="13")},
+            {"type": "ADDED", "object": pod("web-late", version="14")},
+        ],
+    )
+    client, read = readiness_wait.kubectl_watch(POD_ARGV)
+
+    result = readiness_wait.watch_until(
+        client, read, verifier._settled, timeout=10.0, sleeper=pytest.fail
+    )
+
+    assert result.ok is True
+    assert [item["metadata"]["name"] for item in result.value] == ["web-a"]
+    assert result.value[0]["kind"] == "Pod"
+    watch = fake_kube_api.requests[-1]["path"]
+    assert watch.startswith(PODS_PATH + "&")
+    assert "watch=1" in watch and "resourceVersion=10" in watch
+
+
+def test_watch_until_polls_when_the_watch_is_refused(fake_kube_api, no_kubectl) -> None:
+    fake_kube_api.routes[PODS_PATH] = (200, pod_list(pod("web-old", terminating=True)))
+    fake_kube_api.watches["/api/v1/namespaces/dspace/pods"] = (
+        403,
+        [{"kind": "Status", "reason": "Forbidden", "message": "watch is forbidden"}],
+    )
+    client, read = readiness_wait.kubectl_watch(POD_ARGV)
+
+    def sleeper(_seconds: float) -> None:
+        fake_kube_api.routes[PODS_PATH] = (200, pod_list(pod("web-new")))
+
+    result = readiness_wait.watch_until(
+        client, read, verifier._settled, timeout=10.0, sleeper=sleeper
+    )
+
+    assert result.ok is True
+    assert [item["metadata"]["name"] for item in result.value] == ["web-new"]
+    assert [request["path"] for request in fake_kube_api.requests].count(PODS_PATH) == 2
+
+
+def test_settle_selected_pods_watches_when_the_api_client_is_enabled(
+    fake_kube_api, no_kubectl, monkeypatch
+) -> None:
+    assert readiness_wait.kubectl_watch(["kubectl", "get", "pods", "web", "-o", "json"]) is None
+    fake_kube_api.routes[PODS_PATH] = (200, pod_list(pod("web-old", terminating=True)))
+    fake_kube_api.watches["/api/v1/namespaces/dspace/pods"] = (
+        200,
+        [{"type": "DELETED", "object": pod("web-old", version="11")}],
+    )
+    assert verifier.settle_selected_pods(POD_ARGV, sleeper=pytest.fail) == []
+
+    monkeypatch.delenv(kube_api_client.ENABLE_ENV)
+    assert readiness_wait.kubectl_watch(POD_ARGV) is None
+    snapshot = json.dumps(pod_list(pod("web-a")))
+    pods = verifier.settle_selected_pods(POD_ARGV, runner=lambda _argv: snapshot)
+    assert [item["metadata"]["name"] for item in pods] == ["web-a"]
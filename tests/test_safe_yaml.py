@@ -0,0 +1,95 @@
+"""Unit tests for scripts.safe_yaml."""
+
+from __future__ import annotations
+
+import pytest
+
+from scripts import safe_yaml
+
+MANIFEST = """\
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: demo
+spec:
+  replicas: 2
+  template:
+    spec:
+      containers:
+        - name: app
+          env:
+            - {name: FLAG, value: "true"}
+            - {name: EMPTY, value: null}
+---
+kind: Service
+"""
+
+
+@pytest.fixture
+def parser():
+    parser = safe_yaml.SafeYamlParser()
+    try:
+        yield parser
+    finally:
+        parser.close()
+
+
+def test_worker_parses_json_compatible_documents(parser) -> None:
+    documents = parser.documents(MANIFEST)
+    assert documents[0]["spec"]["replicas"] == 2
+    assert documents[0]["spec"]["template"]["spec"]["containers"][0]["env"] == [
+        {"name": "FLAG", "value": "true"},
+        {"name": "EMPTY", "value": None},
+    ]
+    assert documents[1] == {"kind": "Service"}
+    assert parser.documents("") == []
+    assert parser.documents("name: 'é'\n") == [{"name": "é"}]
+
+
+@pytest.mark.parametrize(
+    ("text", "message"),
+    [
+        ("value: !ruby/object:Object x\n", "unsafe YAML tag"),
+        ("a: &anchor 1\nb: *anchor\n", "aliases are not allowed"),
+        ("a: [\n", "did not find expected"),
+    ],
+)
+def test_worker_rejects_tags_aliases_and_syntax_errors(parser, text, message) -> None:
+    with pytest.raises(ValueError, match=message):
+        parser.documents(text)
+    # The worker survives a rejected document and keeps serving.
+    assert parser.documents("ok: true\n") == [{"ok": True}]
+
+
+def test_one_worker_serves_every_call_and_results_are_memoized(parser, monkeypatch) -> None:
+    first = parser.documents(MANIFEST)
+    process = parser._process
+    exchanges = []
+    original = parser._exchange
+
+    def counting(payload):
+        exchanges.append(1)
+        return original(payload)
+
+    monkeypatch.setattr(parser, "_exchange", counting)
+
+    first[0]["kind"] = "Mutated"
+    again = parser.documents(MANIFEST)
+    assert again[0]["kind"] == "Deployment"  # callers get fresh objects
+    assert exchanges == []
+    parser.documents("other: 1\n")
+    assert exchanges == [1]
+    assert parser._process is process
+
+
+def test_worker_restarts_after_exit(parser) -> None:
+    parser.documents("a: 1\n")
+    parser._process.kill()
+    parser._process.wait()
+    assert parser.documents("b: 2\n") == [{"b": 2}]
+
+
+def test_launch_failure_is_reported_as_value_error() -> None:
+    parser = safe_yaml.SafeYamlParser(command=["/nonexistent/ruby"])
+    with pytest.raises(ValueError, match="YAML parser launch failed"):
+        parser.documents("a: 1\n")
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import argparse
+import struct
+from pathlib import Path
+
+import pytest
+
+from scripts import ssd_health_history as history_mod
+from scripts import ssd_health_monitor
+
+DAY = history_mod.SECONDS_PER_DAY
+START = 1_700_000_000.0
+
+
+def nvme_payload(percentage_used: int, written: int, media_errors: int = 0) -> dict:
+    return {
+        "serial_number": "S1 ABC/9",
+        "temperature": {"current": 41},
+        "power_on_time": {"hours": 1200},
+        "nvme_smart_health_information_log": {
+            "percentage_used": percentage_used,
+            "available_spare": 100,
+            "critical_warning": 0,
+            "media_errors": media_errors,
+            "data_units_written": written,
+            "unsafe_shutdowns": 3,
+        },
+    }
+
+
+def test_sample_round_trips_and_marks_missing_fields() -> None:
+    sample = history_mod.sample_from_smartctl(nvme_payload(7, 1000), timestamp=START)
+    assert history_mod.HealthSample.unpack(sample.pack()) == sample
+    values = sample.as_dict()
+    assert values["percentage_used"] == 7
+    assert values["temperature_c"] == 41.0
+    assert values["life_left"] is None
+
+    ata = {
+        "ata_smart_attributes": {
+            "table": [{"name": "Percent_Lifetime_Remain", "value": 88}],
+        }
+    }
+    sample = history_mod.sample_from_smartctl(ata, timestamp=START)
+    assert sample.life_left == 88
+    assert sample.as_dict()["percentage_used"] is None
+    assert sample.as_dict()["temperature_c"] is None
+
+
+def test_history_reads_only_the_requested_window(tmp_path: Path) -> None:
+    path = history_mod.history_path(tmp_path, "/dev/nvme0n1", nvme_payload(1, 1))
+    assert path.name == "S1-ABC-9.bin"
+    history = history_mod.HealthHistory(path)
+    for day in range(10):
+        history.append(history_mod.HealthSample(timestamp=START + day * DAY, percentage_used=day))
+
+    assert history.count() == 10
+    assert path.stat().st_size == history_mod.HEADER.size + 10 * history_mod.RECORD.size
+    window = history.read(since=START + 3.5 * DAY, until=START + 6 * DAY)
+    assert [sample.percentage_used for sample in window] == [4, 5, 6]
+    assert history.read(since=START + 20 * DAY) == []
+    assert len(history.read()) == 10
+
+
+def test_history_drops_partial_records_and_rejects_foreign_files(tmp_path: Path) -> None:
+    path = tmp_path / "drive.bin"
+    history = history_mod.HealthHistory(path)
+    history.append(history_mod.HealthSample(timestamp=START, percentage_used=1))
+    with path.open("ab") as handle:
+        handle.write(b"\x00" * 5)
+    assert history.count() == 1
+    history.append(history_mod.HealthSample(timestamp=START + DAY, percentage_used=2))
+    assert [sample.percentage_used for sample in history.read()] == [1, 2]
+
+    foreign = tmp_path / "foreign.bin"
+    foreign.write_bytes(struct.pack("<4sHH8x", b"NOPE", 1, history_mod.RECORD.size))
+    with pytest.raises(ValueError, match="not a version 1"):
+        history_mod.HealthHistory(foreign).append(history_mod.HealthSample(timestamp=START))
+
+
+def test_analyze_projects_wear_and_write_budget() -> None:
+    samples = [
+        history_mod.sample_from_smartctl(
+            nvme_payload(10 + day, 10_000 + day * 1_000, media_errors=day // 5),
+            timestamp=START + day * DAY,
+        )
+        for day in range(11)
+    ]
+    trend = history_mod.analyze(samples)
+
+    wear = trend["projections"]["percentage_used"]
+    assert wear["per_day"] == pytest.approx(1.0)
+    assert wear["days_remaining"] == pytest.approx(80.0)
+    writes = trend["projections"]["data_units_written"]
+    assert writes["bytes_per_day"] == 1_000 * history_mod.NVME_DATA_UNIT_BYTES
+    # 20k units written at 20% used implies a 100k budget: 80k more at 1k/day.
+    assert writes["days_remaining"] == pytest.approx(80.0)
+    assert trend["days_remaining"] == pytest.approx(80.0)
+    assert trend["media_errors"] == {"current": 2, "growth": 2}
+    assert trend["projected_end_of_life"] == history_mod._date((START + 90 * DAY) / DAY)
+
+    flat = [
+        history_mod.HealthSample(timestamp=START + day * DAY, percentage_used=5) for day in (0, 1)
+    ]
+    assert "days_remaining" not in history_mod.analyze(flat)
+    assert history_mod.analyze([]) == {"samples": 0}
+
+
+def monitor_args(tmp_path: Path, **overrides) -> argparse.Namespace:
+    values = {
+        "history_dir": None,
+        "report_dir": tmp_path,
+        "report_prefix": "ssd-health",
+        "history_window_days": 30.0,
+        "warn_eol_days": 180.0,
+    }
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+def test_monitor_records_history_and_warns_on_projected_end_of_life(tmp_path: Path) -> None:
+    args = monitor_args(tmp_path)
+    first = ssd_health_monitor.record_history(nvme_payload(10, 10_000), "/dev/nvme0n1", args, START)
+    assert first.status == ssd_health_monitor.MonitorStatus.PASS
+    assert "no wear trend" in first.summary
+    assert first.data["history"] == str(tmp_path / "ssd-health" / "history" / "S1-ABC-9.bin")
+
+    check = ssd_health_monitor.record_history(
+        nvme_payload(11, 11_000), "/dev/nvme0n1", args, START + DAY
+    )
+    assert check.status == ssd_health_monitor.MonitorStatus.WARN
+    assert "89 days" in check.summary
+    assert check.data["samples"] == 2
+
+    relaxed = monitor_args(tmp_path, warn_eol_days=30.0, history_window_days=0.5)
+    check = ssd_health_monitor.record_history(
+        nvme_payload(11, 11_000), "/dev/nvme0n1", relaxed, START + 2 * DAY
+    )
+    assert check.status == ssd_health_monitor.MonitorStatus.PASS
+    assert check.data["samples"] == 1
+
+
+def test_history_rejects_samples_older_than_the_last_record(tmp_path: Path) -> None:
+    history = history_mod.HealthHistory(tmp_path / "drive.bin")
+    history.append(history_mod.HealthSample(timestamp=START + DAY, percentage_used=2))
+    history.append(history_mod.HealthSample(timestamp=START + DAY, percentage_used=3))
+    with pytest.raises(ValueError, match="older than the last record"):
+        history.append(history_mod.HealthSample(timestamp=START, percentage_used=1))
+    assert [sample.percentage_used for sample in history.read()] == [2, 3]
+
+    args = monitor_args(tmp_path)
+    ssd_health_monitor.record_history(nvme_payload(1, 1), "/dev/nvme0n1", args, START + DAY)
+    check = ssd_health_monitor.record_history(nvme_payload(1, 1), "/dev/nvme0n1", args, START)
+    assert check.status == ssd_health_monitor.MonitorStatus.WARN
+    assert "older than the last record" in check.summary
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from scripts import ssd_health_history as history_mod
+from scripts import ssd_health_monitor
+
+START = 1_700_000_000.0
+
+
+def nvme_payload(percentage_used: int, written: int) -> dict:
+    return {
+        "serial_number": "S1 ABC/9",
+        "temperature": {"current": 41},
+        "nvme_smart_health_information_log": {
+            "percentage_used": percentage_used,
+            "available_spare": 100,
+            "data_units_written": written,
+        },
+    }
+
+
+def fake_smartctl(calls: list, payload: dict):
+    def run(device: str) -> ssd_health_monitor.SmartctlResult:
+        calls.append(device)
+        return ssd_health_monitor.SmartctlResult(
+            payload=payload, return_code=0, stdout=json.dumps(payload), stderr=""
+        )
+
+    return run
+
+
+def test_smartctl_cache_serves_recent_results_only(tmp_path: Path, monkeypatch) -> None:
+    calls: list = []
+    monkeypatch.setattr(ssd_health_monitor, "_run_smartctl", fake_smartctl(calls, {"a": 1}))
+
+    first = ssd_health_monitor.run_smartctl("/dev/nvme0n1", tmp_path, 60)
+    second = ssd_health_monitor.run_smartctl("/dev/nvme0n1", tmp_path, 60)
+    assert calls == ["/dev/nvme0n1"]
+    assert not first.cached and second.cached
+    assert second.payload == {"a": 1}
+
+    ssd_health_monitor.run_smartctl("/dev/sda", tmp_path, 60)
+    cache = ssd_health_monitor.smartctl_cache_path(tmp_path, "/dev/nvme0n1")
+    os.utime(cache, (0, 0))
+    assert not ssd_health_monitor.run_smartctl("/dev/nvme0n1", tmp_path, 60).cached
+    ssd_health_monitor.run_smartctl("/dev/nvme0n1", tmp_path, 0)
+    assert calls == ["/dev/nvme0n1", "/dev/sda", "/dev/nvme0n1", "/dev/nvme0n1"]
+
+
+def test_smartctl_cache_dir_is_private_and_refuses_foreign_or_symlinked_paths(
+    tmp_path: Path, monkeypatch
+) -> None:
+    calls: list = []
+    monkeypatch.setattr(ssd_health_monitor, "_run_smartctl", fake_smartctl(calls, {"a": 1}))
+    assert ssd_health_monitor.DEFAULT_CACHE_DIR == Path("/run/sugarkube/ssd-health")
+
+    cache_dir = tmp_path / "cache"
+    ssd_health_monitor.run_smartctl("/dev/sda", cache_dir, 60)
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+    assert ssd_health_monitor.run_smartctl("/dev/sda", cache_dir, 60).cached
+
+    # A lock planted as a symlink is not followed, so the target is never touched.
+    target = tmp_path / "target"
+    target.write_text("keep")
+    lock = ssd_health_monitor.smartctl_cache_path(cache_dir, "/dev/sdb").with_suffix(".lock")
+    lock.symlink_to(target)
+    ssd_health_monitor.run_smartctl("/dev/sdb", cache_dir, 60)
+    assert not ssd_health_monitor.run_smartctl("/dev/sdb", cache_dir, 60).cached
+    assert target.read_text() == "keep"
+
+    # A directory owned by someone else is never trusted.
+    monkeypatch.setattr(ssd_health_monitor.os, "geteuid", lambda: os.getuid() + 1)
+    assert not ssd_health_monitor.run_smartctl("/dev/sda", cache_dir, 60).cached
+    assert calls == ["/dev/sda", "/dev/sdb", "/dev/sdb", "/dev/sda"]
+
+
+def test_textfile_metrics_cover_wear_throughput_and_checks() -> None:
+    payload = {
+        **nvme_payload(12, 2_000),
+        "model_name": 'Fast "SSD"',
+        "smart_status": {"passed": True},
+    }
+    payload["nvme_smart_health_information_log"]["data_units_read"] = 3_000
+    checks = [
+        ssd_health_monitor.MonitorCheck("Temperature", "warn", "hot", {}),
+        ssd_health_monitor.MonitorCheck("Wear trend", "pass", "ok", {"days_remaining": 412.5}),
+    ]
+    text = ssd_health_monitor.build_textfile_metrics("/dev/nvme0n1", checks, payload, now=START)
+    labels = 'device="/dev/nvme0n1",model="Fast \\"SSD\\"",serial="S1 ABC/9"'
+
+    assert f"sugarkube_ssd_smartctl_up{{{labels}}} 1\n" in text
+    assert f"sugarkube_ssd_last_run_timestamp_seconds{{{labels}}} 1700000000\n" in text
+    assert f"sugarkube_ssd_temperature_celsius{{{labels}}} 41\n" in text
+    assert f"sugarkube_ssd_percentage_used{{{labels}}} 12\n" in text
+    assert f"sugarkube_ssd_data_written_bytes{{{labels}}} 1024000000\n" in text
+    assert f"sugarkube_ssd_data_read_bytes{{{labels}}} 1536000000\n" in text
+    assert f"sugarkube_ssd_projected_eol_days{{{labels}}} 412.5\n" in text
+    assert f'sugarkube_ssd_check_status{{{labels},check="Temperature"}} 1\n' in text
+    assert "life_left_percent" not in text
+    assert text.count("# TYPE sugarkube_ssd_check_status gauge") == 1
+
+    ata = {"ata_smart_attributes": {"table": [{"name": "Total_LBAs_Written", "raw": {"value": 4}}]}}
+    assert ssd_health_monitor.data_bytes(ata, "written") == 2048
+    assert ssd_health_monitor.data_bytes(ata, "read") is None
+
+
+def test_exporter_mode_writes_textfile_without_reports(tmp_path: Path, monkeypatch) -> None:
+    calls: list = []
+    payload = {**nvme_payload(12, 2_000), "smart_status": {"passed": True}}
+    monkeypatch.setattr(ssd_health_monitor, "_run_smartctl", fake_smartctl(calls, payload))
+    monkeypatch.setattr(
+        ssd_health_monitor,
+        "resolve_device",
+        lambda _: (ssd_health_monitor.MonitorCheck("Detect SSD device", "pass", "", {}), "/dev/x"),
+    )
+    argv = [
+        "ssd_health_monitor.py",
+        "--exporter",
+        "--report-dir",
+        str(tmp_path / "reports"),
+        "--textfile-dir",
+        str(tmp_path / "textfile"),
+        "--cache-dir",
+        str(tmp_path / "cache"),
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+
+    assert ssd_health_monitor.main() == 0
+    assert ssd_health_monitor.main() == 0
+    assert calls == ["/dev/x"]
+    metrics = (tmp_path / "textfile" / ssd_health_monitor.TEXTFILE_NAME).read_text()
+    assert 'check="Run smartctl"} 0' in metrics
+    assert [path.name for path in (tmp_path / "textfile").iterdir()] == [
+        ssd_health_monitor.TEXTFILE_NAME
+    ]
+    history = tmp_path / "reports" / "ssd-health" / "history" / "S1-ABC-9.bin"
+    assert history_mod.HealthHistory(history).count() == 1
+    assert sorted(path.name for path in (tmp_path / "reports" / "ssd-health").iterdir()) == [
+        "history"
+    ]
+
+
+def test_unwritable_textfile_dir_becomes_a_warning(tmp_path: Path) -> None:
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    args = argparse.Namespace(textfile_dir=blocker / "textfile")
+    check = ssd_health_monitor.write_textfile(args, "/dev/x", [], None)
+    assert check is not None
+    assert check.status == ssd_health_monitor.MonitorStatus.WARN
+    assert check.data == {"textfile": str(blocker / "textfile" / ssd_health_monitor.TEXTFILE_NAME)}
+    assert (
+        ssd_health_monitor.write_textfile(argparse.Namespace(textfile_dir=None), "", [], None)
+        is None
+    )
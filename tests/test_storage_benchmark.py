@@ -0,0 +1,88 @@
+"""Tests for the storage benchmark and its post-clone validation report."""
+
+from __future__ import annotations
+
+import json
+
+from scripts import ssd_post_clone_validate as validate
+from scripts import storage_benchmark
+
+SMALL = storage_benchmark.BenchmarkConfig(size_mb=2, queue_depth=3, random_ops=64, fsync_samples=4)
+
+
+def test_run_benchmark_reports_every_test_and_removes_scratch_file(tmp_path) -> None:
+    result = storage_benchmark.run_benchmark(tmp_path, SMALL)
+
+    assert result["schema_version"] == storage_benchmark.SCHEMA_VERSION
+    assert isinstance(result["direct"], bool)
+    tests = result["tests"]
+    assert set(tests) == {"seq_write", "seq_read", "rand_write_4k", "rand_read_4k", "fsync"}
+    assert tests["seq_write"]["bytes"] == tests["seq_read"]["bytes"] == 2 * 1024 * 1024
+    assert tests["rand_read_4k"]["queue_depth"] == 3
+    assert tests["rand_write_4k"]["bytes"] == 64 * 4096
+    assert tests["fsync"]["samples"] == 4
+    assert tests["fsync"]["p50_ms"] <= tests["fsync"]["p99_ms"] <= tests["fsync"]["max_ms"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_pattern_blocks_are_incompressible_and_aligned() -> None:
+    pattern = storage_benchmark.Pattern(64 * 1024)
+
+    first, second = pattern.block(0, 4096), pattern.block(1, 4096)
+    assert bytes(first) != bytes(second)
+    assert bytes(first) != b"\0" * 4096
+    assert bytes(pattern.block(16, 4096)) == bytes(first)
+
+
+def test_compare_reports_speedups_as_positive_changes() -> None:
+    baseline = {
+        "schema_version": 1,
+        "direct": True,
+        "tests": {"seq_read": {"mb_s": 100.0}, "fsync": {"p99_ms": 4.0, "samples": 8}},
+    }
+    current = {
+        "schema_version": 1,
+        "direct": True,
+        "tests": {"seq_read": {"mb_s": 40.0}, "fsync": {"p99_ms": 2.0, "samples": 8}},
+    }
+
+    comparison = storage_benchmark.compare(baseline, current)
+
+    assert comparison["comparable"] is True
+    assert comparison["metrics"]["seq_read.mb_s"]["change_pct"] == -60.0
+    assert comparison["metrics"]["fsync.p99_ms"]["change_pct"] == 50.0
+    assert "fsync.samples" not in comparison["metrics"]
+    assert storage_benchmark.compare({**baseline, "direct": False}, current) == {
+        "comparable": False,
+        "metrics": {},
+    }
+
+
+def test_stress_test_warns_when_slower_than_baseline(tmp_path) -> None:
+    fast = storage_benchmark.run_benchmark(tmp_path / "first", SMALL)
+    for values in fast["tests"].values():
+        for metric in ("mb_s", "iops"):
+            if metric in values:
+                values[metric] = values[metric] * 1000
+    baseline = tmp_path / "report.json"
+    baseline.write_text(
+        json.dumps({"checks": [{"name": "SSD stress test", "data": {"benchmark": fast}}]}),
+        encoding="utf-8",
+    )
+
+    result = validate.stress_test(tmp_path / "scratch", 2, SMALL, baseline)
+
+    assert result["status"] == validate.ValidationStatus.WARN
+    assert "Slower than baseline: " in result["details"]
+    assert "seq_read.mb_s" in result["details"]
+    assert result["read_mb_s"] == result["benchmark"]["tests"]["seq_read"]["mb_s"]
+    check = validate.CheckResult("SSD stress test", result["status"], result["details"], result)
+    markdown = validate.build_markdown("now", [check])
+    assert "| rand_read_4k |" in markdown
+
+
+def test_stress_test_warns_when_baseline_is_unreadable(tmp_path) -> None:
+    result = validate.stress_test(tmp_path, 2, SMALL, tmp_path / "missing.json")
+
+    assert result["status"] == validate.ValidationStatus.WARN
+    assert "Baseline unavailable" in result["details"]